@@ -8,11 +8,12 @@ from calendar_utils import (
     # NEW: Time input functions
     handle_time_input, handle_time_confirmation, handle_retry_time_or_help,
     # NEW: Edit functions
-    show_edit_options, handle_edit_choice
+    show_edit_options, handle_edit_choice, handle_slot_taken
 )
+from slot_holds import insert_held_booking, SlotUnavailableError
 from utils import (
     send_whatsapp_message, send_interactive_menu, translate_template,
-    gt_t_tt, gt_tt, send_image_message, send_document
+    gt_t_tt, gt_tt, send_image_message, send_document, get_user_language
 )
 import time
 
@@ -23,16 +24,8 @@ def handle_report_booking(whatsapp_number, user_id, supabase, user_data, message
     state = user_data.get(whatsapp_number, {}).get("state", "IDLE")
     logger.info(f"Report-booking for {whatsapp_number}, state: {state}")
 
-    language = "en"
-    try:
-        resp = supabase.table("whatsapp_users") \
-            .select("language") \
-            .eq("whatsapp_number", whatsapp_number.lstrip("+")) \
-            .limit(1).execute()
-        if resp.data:
-            language = resp.data[0]["language"]
-    except Exception as e:
-        logger.error(f"Language fetch error: {e}")
+    # Cached profile lookup; falls back to "en"
+    language = get_user_language(supabase, whatsapp_number)
 
     if state == "IDLE":
         user_data[whatsapp_number] = {
@@ -388,7 +381,7 @@ def handle_report_booking(whatsapp_number, user_id, supabase, user_data, message
             if user_data[whatsapp_number].get("doctor_id"):
                 booking_payload["doctor_id"] = user_data[whatsapp_number]["doctor_id"]
             try:
-                supabase.table("c_s_pending_bookings").insert(booking_payload).execute()
+                insert_held_booking(supabase, user_data[whatsapp_number], "c_s_pending_bookings", booking_payload)
                 supabase.table("c_report_consult") \
                     .update({"is_deleted": True}) \
                     .eq("id", user_data[whatsapp_number]["report_id"]) \
@@ -402,6 +395,9 @@ def handle_report_booking(whatsapp_number, user_id, supabase, user_data, message
                         supabase)}}
                 )
                 logger.info(f"Report booking {pending_id} saved successfully")
+            except SlotUnavailableError as e:
+                handle_slot_taken(whatsapp_number, user_id, supabase, user_data, "checkup_result_booking", e)
+                return False
             except Exception as e:
                 logger.error(f"Booking save error: {e}")
                 send_whatsapp_message(
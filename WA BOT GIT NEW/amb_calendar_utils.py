@@ -1,7 +1,16 @@
 import logging
+import os
+import threading
+import time
 import uuid
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from dotenv import load_dotenv
 from utils import send_whatsapp_message, translate_template, gt_tt
+from ambulance_dispatch import rank_ambulances, get_ambulance_index
+
+# Load environment variables
+load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,6 +20,128 @@ DEFAULT_TRIP_DURATION = 2  # hours
 BUFFER_BEFORE = 30  # minutes
 BUFFER_AFTER = 30  # minutes
 
+# How long a day's fleet calendar is reused before it is read again (seconds)
+FLEET_SNAPSHOT_TTL = float(os.getenv("FLEET_SNAPSHOT_TTL", "30"))
+# Vehicles that can take future trips; "assigned" only means a trip is on the calendar
+SCHEDULABLE_STATUSES = ["available", "assigned"]
+# Pickup offsets (minutes) offered inside each 2-hour slot by the booking modules
+PICKUP_OFFSETS = [0, 15, 30, 45, 60, 75, 90]
+
+
+# ----------------------------------------------------------------
+# FLEET CALENDAR (one read per day, bisect conflict checks)
+# ----------------------------------------------------------------
+
+def _minutes(value) -> int:
+    parts = str(value).split(":")
+    return int(parts[0]) * 60 + int(parts[1])
+
+
+def _day_minutes(date_obj, dt) -> int:
+    """Minutes from midnight of date_obj; trips running past midnight go above 1440."""
+    return int((dt - datetime.combine(date_obj, datetime.min.time())).total_seconds() // 60)
+
+
+class FleetDay:
+    """
+    Every vehicle's trips on one date as sorted, merged intervals in minutes,
+    each padded by BUFFER_BEFORE/BUFFER_AFTER. A vehicle is free for a trip when
+    the trip's padded window overlaps none of them.
+    """
+
+    def __init__(self, date: str, ambulances: list, rows: list):
+        self.date = date
+        self.ambulances = ambulances
+        self.loaded_at = time.time()
+        trips = {}
+        for row in rows:
+            if not row.get("start_time") or not row.get("end_time"):
+                continue
+            start, end = _minutes(row["start_time"]), _minutes(row["end_time"])
+            if end <= start:
+                end += 24 * 60
+            trips.setdefault(row["ambulance_id"], []).append((start - BUFFER_BEFORE, end + BUFFER_AFTER))
+        self._starts, self._ends = {}, {}
+        for ambulance_id, intervals in trips.items():
+            merged = []
+            for start, end in sorted(intervals):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[ambulance_id] = [s for s, _ in merged]
+            self._ends[ambulance_id] = [e for _, e in merged]
+
+    def is_free(self, ambulance_id, start: int, end: int) -> bool:
+        ends = self._ends.get(ambulance_id)
+        if not ends:
+            return True
+        # First trip still running after the new window opens; free if it starts after the window closes
+        i = bisect_right(ends, start - BUFFER_BEFORE)
+        return i == len(ends) or self._starts[ambulance_id][i] >= end + BUFFER_AFTER
+
+    def free_ambulances(self, start: int, end: int) -> list:
+        return [a for a in self.ambulances if self.is_free(a["id"], start, end)]
+
+
+_fleet_days = {}
+_fleet_lock = threading.Lock()
+
+
+def get_fleet_day(supabase, date: str, ambulance_type=None, refresh: bool = False) -> FleetDay:
+    """Fleet calendar for a date from two queries, reused for FLEET_SNAPSHOT_TTL seconds."""
+    key = (date, ambulance_type)
+    if not refresh:
+        with _fleet_lock:
+            cached = _fleet_days.get(key)
+        if cached and time.time() - cached.loaded_at < FLEET_SNAPSHOT_TTL:
+            return cached
+
+    query = supabase.table("ambulances").select("*").in_("status", SCHEDULABLE_STATUSES)
+    if ambulance_type:
+        query = query.eq("ambulance_type", ambulance_type)
+    ambulances = query.execute().data or []
+    rows = supabase.table("ambulance_availability").select("ambulance_id, start_time, end_time").eq("date", date).execute().data or []
+    day = FleetDay(date, ambulances, rows)
+    logger.info(f"Loaded fleet calendar for {date}: {len(ambulances)} vehicles, {len(rows)} trips")
+    with _fleet_lock:
+        _fleet_days[key] = day
+    return day
+
+
+def invalidate_fleet_day(date: str = None):
+    """Drop a cached day (or all days) after the ambulance calendar changes."""
+    with _fleet_lock:
+        for key in [k for k in _fleet_days if date is None or k[0] == date]:
+            del _fleet_days[key]
+
+
+def free_pickup_starts(supabase, date: str, starts, duration_hours=DEFAULT_TRIP_DURATION, ambulance_type=None) -> set:
+    """
+    The pickup times (minutes) in `starts` at which at least one vehicle is free
+    for the whole trip. With no fleet registered, or if the calendar cannot be
+    read, every time is returned so booking is never blocked by the lookup.
+    """
+    starts = list(starts)
+    try:
+        day = get_fleet_day(supabase, date, ambulance_type)
+    except Exception as e:
+        logger.error(f"Error loading fleet calendar for {date}: {e}", exc_info=True)
+        return set(starts)
+    if not day.ambulances:
+        logger.warning(f"No schedulable ambulances registered; offering all times on {date}")
+        return set(starts)
+    duration = int(duration_hours * 60)
+    return {start for start in starts if day.free_ambulances(start, start + duration)}
+
+
+def filter_bookable_slots(supabase, date: str, slots: list, duration_hours=DEFAULT_TRIP_DURATION) -> list:
+    """TIME_SLOTS entries with at least one pickup time that has a vehicle free."""
+    starts = {slot["start_hour"] * 60 + offset for slot in slots for offset in PICKUP_OFFSETS}
+    free = free_pickup_starts(supabase, date, starts, duration_hours)
+    return [slot for slot in slots if any(slot["start_hour"] * 60 + offset in free for offset in PICKUP_OFFSETS)]
+
+
 def get_available_ambulances(supabase, date, start_time, end_time, ambulance_type=None):
     """Get available ambulances for a given time slot."""
     try:
@@ -30,27 +161,8 @@ def get_available_ambulances(supabase, date, start_time, end_time, ambulance_typ
         else:
             end_datetime = datetime.combine(date_obj, end_time)
         
-        # Get all ambulances
-        query = supabase.table("ambulances").select("*").eq("status", "available")
-        
-        if ambulance_type:
-            query = query.eq("ambulance_type", ambulance_type)
-        
-        response = query.execute()
-        all_ambulances = response.data
-        
-        available_ambulances = []
-        
-        for ambulance in all_ambulances:
-            ambulance_id = ambulance["id"]
-            
-            # Check if ambulance is available in the calendar
-            is_available = check_ambulance_slot_availability(
-                supabase, ambulance_id, start_datetime, end_datetime
-            )
-            
-            if is_available:
-                available_ambulances.append(ambulance)
+        day = get_fleet_day(supabase, date_obj.strftime("%Y-%m-%d"), ambulance_type)
+        available_ambulances = day.free_ambulances(_day_minutes(date_obj, start_datetime), _day_minutes(date_obj, end_datetime))
         
         return available_ambulances
         
@@ -58,25 +170,12 @@ def get_available_ambulances(supabase, date, start_time, end_time, ambulance_typ
         logger.error(f"Error getting available ambulances: {e}", exc_info=True)
         return []
 
-def check_ambulance_slot_availability(supabase, ambulance_id, start_datetime, end_datetime):
-    """Check if an ambulance is available for a specific time slot."""
+def check_ambulance_slot_availability(supabase, ambulance_id, start_datetime, end_datetime, refresh=False):
+    """Check if an ambulance is available for a specific time slot, including turnaround buffers."""
     try:
-        date_str = start_datetime.strftime("%Y-%m-%d")
-        
-        # Get all bookings for this ambulance on the given date
-        response = supabase.table("ambulance_availability").select("*").eq("ambulance_id", ambulance_id).eq("date", date_str).execute()
-        existing_bookings = response.data
-        
-        # Check for conflicts
-        for booking in existing_bookings:
-            booking_start = datetime.strptime(f"{date_str} {booking['start_time']}", "%Y-%m-%d %H:%M:%S")
-            booking_end = datetime.strptime(f"{date_str} {booking['end_time']}", "%Y-%m-%d %H:%M:%S")
-            
-            # Check for overlap
-            if start_datetime < booking_end and end_datetime > booking_start:
-                return False
-        
-        return True
+        date_obj = start_datetime.date()
+        day = get_fleet_day(supabase, date_obj.strftime("%Y-%m-%d"), refresh=refresh)
+        return day.is_free(ambulance_id, _day_minutes(date_obj, start_datetime), _day_minutes(date_obj, end_datetime))
         
     except Exception as e:
         logger.error(f"Error checking ambulance slot availability: {e}", exc_info=True)
@@ -90,8 +189,8 @@ def book_ambulance_slot(supabase, ambulance_id, booking_type, booking_reference,
         start_time_str = start_datetime.strftime("%H:%M:%S")
         end_time_str = end_datetime.strftime("%H:%M:%S")
         
-        # Check availability first
-        if not check_ambulance_slot_availability(supabase, ambulance_id, start_datetime, end_datetime):
+        # Check availability first, against a fresh read of the day
+        if not check_ambulance_slot_availability(supabase, ambulance_id, start_datetime, end_datetime, refresh=True):
             return False, "Time slot not available"
         
         # Create calendar entry
@@ -109,6 +208,7 @@ def book_ambulance_slot(supabase, ambulance_id, booking_type, booking_reference,
             calendar_data["notes"] = notes
         
         response = supabase.table("ambulance_availability").insert(calendar_data).execute()
+        invalidate_fleet_day(date_str)
         
         if response.data:
             # Update ambulance status if needed
@@ -149,14 +249,8 @@ def suggest_available_slots(supabase, date, duration_hours=2, ambulance_type=Non
         else:
             date_obj = date
         
-        # Get available ambulances for the day
-        query = supabase.table("ambulances").select("*").eq("status", "available")
-        
-        if ambulance_type:
-            query = query.eq("ambulance_type", ambulance_type)
-        
-        response = query.execute()
-        ambulances = response.data
+        day = get_fleet_day(supabase, date_obj.strftime("%Y-%m-%d"), ambulance_type)
+        ambulances = day.ambulances
         
         if not ambulances:
             return []
@@ -173,19 +267,16 @@ def suggest_available_slots(supabase, date, duration_hours=2, ambulance_type=Non
             end_time = current_time + timedelta(hours=duration_hours)
             
             # Check if any ambulance is available for this slot
-            for ambulance in ambulances:
-                ambulance_id = ambulance["id"]
-                
-                if check_ambulance_slot_availability(supabase, ambulance_id, current_time, end_time):
-                    slot_info = {
-                        "start_time": current_time.strftime("%H:%M"),
-                        "end_time": end_time.strftime("%H:%M"),
-                        "ambulance_id": ambulance_id,
-                        "ambulance_number": ambulance["ambulance_number"],
-                        "ambulance_type": ambulance["ambulance_type"]
-                    }
-                    available_slots.append(slot_info)
-                    break  # Found an ambulance for this slot
+            free = day.free_ambulances(_day_minutes(date_obj, current_time), _day_minutes(date_obj, end_time))
+            if free:
+                ambulance = free[0]
+                available_slots.append({
+                    "start_time": current_time.strftime("%H:%M"),
+                    "end_time": end_time.strftime("%H:%M"),
+                    "ambulance_id": ambulance["id"],
+                    "ambulance_number": ambulance["ambulance_number"],
+                    "ambulance_type": ambulance["ambulance_type"]
+                })
             
             current_time += timedelta(minutes=30)  # Check every 30 minutes
         
@@ -207,6 +298,7 @@ def cancel_ambulance_booking(supabase, booking_reference, booking_type):
             
             # Delete calendar entry
             supabase.table("ambulance_availability").delete().eq("id", entry["id"]).execute()
+            invalidate_fleet_day(entry.get("date"))
             
             # Update ambulance status if no other bookings
             other_bookings = supabase.table("ambulance_availability").select("*").eq("ambulance_id", ambulance_id).gte("date", datetime.now().strftime("%Y-%m-%d")).execute()
@@ -242,23 +334,21 @@ def update_ambulance_status(supabase, ambulance_id, status, next_available=None)
         return False
 
 def get_nearest_available_ambulance(supabase, latitude, longitude, ambulance_type=None):
-    """Find the nearest available ambulance (simplified version)."""
+    """
+    Find the available ambulance with the shortest ETA to the given point.
+    The few nearest vehicles come from the spatial index; only they are
+    re-ranked by road time. Vehicles without a known position are used only
+    when none has one.
+    """
     try:
-        query = supabase.table("ambulances").select("*").eq("status", "available")
-        
-        if ambulance_type:
-            query = query.eq("ambulance_type", ambulance_type)
-        
-        response = query.execute()
-        ambulances = response.data
-        
-        if not ambulances:
-            return None
+        ranked = rank_ambulances(supabase, latitude, longitude, ambulance_type=ambulance_type)
+        if ranked:
+            return ranked[0]
         
-        # In a real system, you would calculate distance using coordinates
-        # For now, return the first available ambulance
-        return ambulances[0]
+        unlocated = [a for a in get_ambulance_index(supabase).unlocated
+                     if not ambulance_type or a.get("ambulance_type") == ambulance_type]
+        return unlocated[0] if unlocated else None
         
     except Exception as e:
         logger.error(f"Error finding nearest ambulance: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -21,6 +21,7 @@ from utils import (
     send_location_request,
     translate_template  # Added for static text translation
 )
+from amb_calendar_utils import filter_bookable_slots, free_pickup_starts
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -1528,6 +1529,18 @@ def ask_schedule_timeslot(whatsapp_number: str, user_data: dict, supabase, perio
         # Get time slots for the selected period
         slots = TIME_SLOTS.get(period, [])
         
+        # Only offer slots in which at least one ambulance is free
+        slots = filter_bookable_slots(supabase, schedule_data.get("date"), slots)
+        if not slots:
+            send_whatsapp_message(
+                whatsapp_number,
+                "text",
+                {"text": {"body": translate_template(whatsapp_number, "No ambulance is available in this period on the selected date. Please choose another date.", supabase)}},
+                supabase
+            )
+            ask_schedule_date(whatsapp_number, user_data, supabase, "pickup")
+            return
+        
         # Create sections with rows for time slot selection
         sections = []
         rows = []
@@ -1643,6 +1656,19 @@ def ask_schedule_minute(whatsapp_number: str, user_data: dict, supabase):
                     "minute": minute
                 })
         
+        # Drop pickup times at which no ambulance is free
+        free = free_pickup_starts(supabase, schedule_data.get("date"), [iv["hour"] * 60 + iv["minute"] for iv in intervals])
+        intervals = [iv for iv in intervals if iv["hour"] * 60 + iv["minute"] in free]
+        if not intervals:
+            send_whatsapp_message(
+                whatsapp_number,
+                "text",
+                {"text": {"body": translate_template(whatsapp_number, "This time slot has just been fully booked. Please choose another time slot.", supabase)}},
+                supabase
+            )
+            ask_schedule_timeslot(whatsapp_number, user_data, supabase, period)
+            return
+        
         # Create sections with rows for minute selection
         sections = []
         rows = []
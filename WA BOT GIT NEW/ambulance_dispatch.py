@@ -0,0 +1,229 @@
+# ambulance_dispatch.py - NEAREST-AMBULANCE LOOKUP ON A GRID INDEX WITH ROAD-TIME RE-RANKING
+import logging
+import math
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from http_session import http_get
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Columns holding each vehicle's last known position in the ambulances table
+AMBULANCE_LAT_COLUMN = os.getenv("AMBULANCE_LAT_COLUMN", "current_latitude")
+AMBULANCE_LNG_COLUMN = os.getenv("AMBULANCE_LNG_COLUMN", "current_longitude")
+# Positions go stale as vehicles move; the index is rebuilt from one query after this (seconds)
+AMBULANCE_INDEX_TTL = float(os.getenv("AMBULANCE_INDEX_TTL", "15"))
+# Grid cell edge in degrees (~5.5 km at the equator)
+GRID_CELL_DEGREES = float(os.getenv("AMBULANCE_GRID_CELL_DEGREES", "0.05"))
+# Only this many straight-line nearest vehicles are re-ranked by road time
+ROAD_RERANK_CANDIDATES = int(os.getenv("ROAD_RERANK_CANDIDATES", "3"))
+# The road-time lookup is on the emergency path; give up quickly and use the estimate
+ROAD_RERANK_TIMEOUT = float(os.getenv("ROAD_RERANK_TIMEOUT", "3"))
+# Used for an ETA when road times are unavailable
+AVERAGE_SPEED_KMH = float(os.getenv("AMBULANCE_AVERAGE_SPEED_KMH", "40"))
+
+EARTH_RADIUS_KM = 6371.0
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+
+_stats_lock = threading.Lock()
+_stats = {"builds": 0, "lookups": 0, "road_rerank_calls": 0, "road_rerank_failures": 0}
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class AmbulanceIndex:
+    """
+    Vehicles bucketed into GRID_CELL_DEGREES cells. k-nearest search visits
+    rings of cells outward from the query cell and stops once no unvisited
+    cell can hold anything closer than the current k-th vehicle.
+    """
+
+    def __init__(self, ambulances: list):
+        self.built_at = time.time()
+        self.cells = {}
+        self.unlocated = []
+        for ambulance in ambulances:
+            try:
+                lat = float(ambulance[AMBULANCE_LAT_COLUMN])
+                lng = float(ambulance[AMBULANCE_LNG_COLUMN])
+            except (KeyError, TypeError, ValueError):
+                self.unlocated.append(ambulance)
+                continue
+            self.cells.setdefault(self._cell(lat, lng), []).append((lat, lng, ambulance))
+        self.size = sum(len(v) for v in self.cells.values())
+
+    @staticmethod
+    def _cell(lat: float, lng: float):
+        return int(math.floor(lat / GRID_CELL_DEGREES)), int(math.floor(lng / GRID_CELL_DEGREES))
+
+    @staticmethod
+    def _ring(ci: int, cj: int, ring: int):
+        """Cells exactly `ring` cells away from (ci, cj) - the square's perimeter only."""
+        if ring == 0:
+            yield ci, cj
+            return
+        for j in range(cj - ring, cj + ring + 1):
+            yield ci - ring, j
+            yield ci + ring, j
+        for i in range(ci - ring + 1, ci + ring):
+            yield i, cj - ring
+            yield i, cj + ring
+
+    def nearest(self, lat: float, lng: float, k: int = 1, ambulance_type=None) -> list:
+        """Up to k (distance_km, ambulance) pairs, nearest first, by straight-line distance."""
+        matching = sum(
+            1 for vehicles in self.cells.values() for _, _, ambulance in vehicles
+            if not ambulance_type or ambulance.get("ambulance_type") == ambulance_type
+        )
+        if not matching:
+            return []
+        k = min(k, matching)
+        ci, cj = self._cell(lat, lng)
+        max_ring = max(max(abs(i - ci), abs(j - cj)) for i, j in self.cells)
+
+        def _matches(cell):
+            return [
+                (haversine_km(lat, lng, v_lat, v_lng), ambulance)
+                for v_lat, v_lng, ambulance in self.cells.get(cell, ())
+                if not ambulance_type or ambulance.get("ambulance_type") == ambulance_type
+            ]
+
+        # Sparse fleet far from the query: walking rings costs more than checking every occupied cell
+        if (max_ring + 1) ** 2 > len(self.cells):
+            found = [item for cell in self.cells for item in _matches(cell)]
+            found.sort(key=lambda item: item[0])
+            return found[:k]
+
+        # Narrowest width of a cell in km; anything outside ring r is at least r cells away
+        cell_km = GRID_CELL_DEGREES * math.pi / 180 * EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 0.01)
+        found = []
+        for ring in range(max_ring + 1):
+            for cell in self._ring(ci, cj, ring):
+                found.extend(_matches(cell))
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                if len(found) == matching or found[k - 1][0] <= ring * cell_km:
+                    break
+        found.sort(key=lambda item: item[0])
+        return found[:k]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ambulance_index(supabase, refresh: bool = False) -> AmbulanceIndex:
+    """Index of available vehicles, rebuilt from one query every AMBULANCE_INDEX_TTL seconds."""
+    global _index
+    with _index_lock:
+        index = _index
+    if index and not refresh and time.time() - index.built_at < AMBULANCE_INDEX_TTL:
+        return index
+    ambulances = supabase.table("ambulances").select("*").eq("status", "available").execute().data or []
+    index = AmbulanceIndex(ambulances)
+    _count("builds")
+    if index.unlocated:
+        logger.warning(f"{len(index.unlocated)} available ambulances have no known position and cannot be ranked")
+    with _index_lock:
+        _index = index
+    return index
+
+
+def invalidate_ambulance_index():
+    """Force the next lookup to re-read vehicle positions (after a dispatch or status change)."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def road_travel_minutes(origins: list, dest_lat: float, dest_lng: float) -> list:
+    """
+    Driving minutes from each (lat, lng) origin to the destination in ONE
+    Distance Matrix request. Entries are None where no route was returned;
+    returns None when the API is not configured or the call fails.
+    """
+    api_key = os.getenv("VITE_GOOGLE_MAPS_API_KEY")
+    if not api_key or api_key == "your_google_maps_api_key_here" or not origins:
+        return None
+    params = {
+        "origins": "|".join(f"{lat},{lng}" for lat, lng in origins),
+        "destinations": f"{dest_lat},{dest_lng}",
+        "key": api_key,
+        "units": "metric",
+        "region": "my",  # Malaysia
+        "mode": "driving",
+        "departure_time": "now"
+    }
+    _count("road_rerank_calls")
+    try:
+        response = http_get(DISTANCE_MATRIX_URL, params=params, timeout=ROAD_RERANK_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        _count("road_rerank_failures")
+        logger.error(f"Distance Matrix request failed, ranking by straight-line distance: {e}")
+        return None
+    if data.get("status") != "OK" or len(data.get("rows", [])) != len(origins):
+        _count("road_rerank_failures")
+        logger.warning(f"Distance Matrix returned {data.get('status', 'Unknown error')}, ranking by straight-line distance")
+        return None
+    minutes = []
+    for row in data["rows"]:
+        element = row["elements"][0]
+        duration = element.get("duration_in_traffic") or element.get("duration")
+        minutes.append(duration["value"] / 60 if element.get("status") == "OK" and duration else None)
+    return minutes
+
+
+def rank_ambulances(supabase, latitude, longitude, k: int = ROAD_RERANK_CANDIDATES, ambulance_type=None) -> list:
+    """
+    The k nearest available vehicles ordered by ETA. Each entry is a copy of
+    the ambulance row with distance_km, eta_minutes and eta_source
+    ("road" or "estimate") added.
+    """
+    _count("lookups")
+    nearest = get_ambulance_index(supabase).nearest(float(latitude), float(longitude), k, ambulance_type)
+    if not nearest:
+        return []
+    road_minutes = road_travel_minutes(
+        [(a[AMBULANCE_LAT_COLUMN], a[AMBULANCE_LNG_COLUMN]) for _, a in nearest], latitude, longitude
+    )
+    ranked = []
+    for position, (distance_km, ambulance) in enumerate(nearest):
+        minutes = road_minutes[position] if road_minutes else None
+        ranked.append({
+            **ambulance,
+            "distance_km": round(distance_km, 2),
+            "eta_minutes": round(minutes if minutes is not None else distance_km / AVERAGE_SPEED_KMH * 60, 1),
+            "eta_source": "road" if minutes is not None else "estimate"
+        })
+    ranked.sort(key=lambda a: (a["eta_source"] != "road", a["eta_minutes"]))
+    return ranked
+
+
+def get_dispatch_index_stats() -> dict:
+    with _index_lock:
+        index = _index
+    with _stats_lock:
+        return {
+            **_stats,
+            "indexed_vehicles": index.size if index else 0,
+            "unlocated_vehicles": len(index.unlocated) if index else 0,
+            "index_age_seconds": round(time.time() - index.built_at, 1) if index else None,
+        }
@@ -1,7 +1,9 @@
 import logging
+import threading
 import uuid
 from datetime import datetime
-from utils import send_whatsapp_message, translate_template, gt_tt, gt_t_tt, send_location_request, calculate_distance, geocode_address
+from utils import send_whatsapp_message, translate_template, gt_tt, gt_t_tt, send_location_request, geocode_address, find_serving_clinics, find_nearest_clinic, CLINIC_RADIUS_COLUMN, AMBULANCE_BASE_COLUMN
+from amb_calendar_utils import get_nearest_available_ambulance
 import base64
 import tempfile
 import os
@@ -9,10 +11,10 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Clinic location coordinates
-CLINIC_LATITUDE = 2.99170000
-CLINIC_LONGITUDE = 101.61560000
+# Emergency service radius for ambulance clinics (AMBULANCE_BASE_COLUMN set in c_a_clinics)
+# without their own radius; with none marked, the configured clinic is the only base
 MAX_DISTANCE_KM = 15  # Changed from 20 to 15km
+DEFAULT_CLINIC_ADDRESS = "No. 33, 1, Jalan PU 7/4, Taman Puchong Utama, 47140 Puchong, Selangor"
 
 # Default provider ID from your data
 DEFAULT_PROVIDER_ID = "aff725c1-c333-4039-bd2d-000000000000"
@@ -254,6 +256,47 @@ def geocode_and_save_address(whatsapp_number, supabase, user_data, address_text)
         }, supabase)
         return False
 
+def assign_nearest_ambulance(whatsapp_number, supabase, emergency_data, db_alert_id, patient_lat, patient_lng):
+    """Pick the ETA-ranked nearest ambulance, record it and keep the ETA for the patient's next reply."""
+    try:
+        alert_id_string = emergency_data.get("alert_id", "Unknown")
+        # Nearest few by straight line, re-ranked by road time
+        assignment = get_nearest_available_ambulance(supabase, patient_lat, patient_lng)
+        if not assignment:
+            logger.warning(f"No available ambulance found for {alert_id_string}")
+            return
+        
+        emergency_data["ambulance_id"] = assignment.get("id")
+        supabase.table("a_s_2_emergency").insert({
+            "emergency_id": db_alert_id,
+            "step_name": "ambulance_assignment",
+            "data_type": "text",
+            "data_value": f"Ambulance: {assignment.get('ambulance_number', assignment.get('id'))}, "
+                          f"Distance: {assignment.get('distance_km', 'unknown')} km, "
+                          f"ETA: {assignment.get('eta_minutes', 'unknown')} min ({assignment.get('eta_source', 'unranked')})",
+            "step_order": 2,
+            "provider_id": DEFAULT_PROVIDER_ID
+        }).execute()
+        
+        if assignment.get("eta_minutes") is not None:
+            logger.info(f"Nearest ambulance for {alert_id_string}: {assignment.get('id')} "
+                        f"({assignment['distance_km']} km, ETA {assignment['eta_minutes']} min, {assignment['eta_source']})")
+            # Sent from the patient's own message handling (send_pending_ambulance_eta), so it
+            # cannot interleave with the questionnaire
+            emergency_data["ambulance_eta_minutes"] = assignment["eta_minutes"]
+    except Exception as e:
+        logger.error(f"Error assigning ambulance for {whatsapp_number}: {e}", exc_info=True)
+
+def send_pending_ambulance_eta(whatsapp_number, supabase, emergency_data):
+    """Tell the patient the ambulance ETA found by assign_nearest_ambulance, once."""
+    eta_minutes = emergency_data.pop("ambulance_eta_minutes", None)
+    if eta_minutes is None:
+        return
+    send_whatsapp_message(whatsapp_number, "text", {
+        "text": {"body": gt_tt(whatsapp_number, "🚑 *Nearest ambulance:* about {minutes} min away", supabase).format(
+            minutes=f"{eta_minutes:.0f}")}
+    }, supabase)
+
 def check_distance_and_handle(whatsapp_number, supabase, user_data, location_info):
     """Check distance from clinic and handle accordingly."""
     try:
@@ -280,18 +323,20 @@ def check_distance_and_handle(whatsapp_number, supabase, user_data, location_inf
             patient_lat = location_info["latitude"]
             patient_lng = location_info["longitude"]
             
-            # Calculate distance from clinic
-            distance_km = calculate_distance(
-                CLINIC_LATITUDE, CLINIC_LONGITUDE,
-                patient_lat, patient_lng
-            )
+            # Nearest ambulance clinic whose service radius covers the patient; otherwise the nearest one overall
+            serving = find_serving_clinics(supabase, patient_lat, patient_lng, MAX_DISTANCE_KM, only=AMBULANCE_BASE_COLUMN)
+            within_service_area = bool(serving)
+            clinic, distance_km = serving[0] if serving else find_nearest_clinic(
+                supabase, patient_lat, patient_lng, only=AMBULANCE_BASE_COLUMN)
+            radius_km = float(clinic.get(CLINIC_RADIUS_COLUMN) or MAX_DISTANCE_KM)
             
             if distance_km is None:
                 logger.error(f"Failed to calculate distance for {whatsapp_number}")
                 # Assume within distance and proceed
                 distance_km = 0  # Default to 0 if calculation fails
+                within_service_area = True
             
-            logger.info(f"Distance from clinic for {whatsapp_number}: {distance_km:.2f} km")
+            logger.info(f"Distance from clinic {clinic.get('id', 'default')} for {whatsapp_number}: {distance_km:.2f} km")
             
             # Update a_s_1_emergency table with distance
             update_data = {
@@ -308,8 +353,8 @@ def check_distance_and_handle(whatsapp_number, supabase, user_data, location_inf
             if not response.data:
                 logger.error(f"Failed to update location for alert {db_alert_id}")
             
-            # Check if distance exceeds 15km
-            if distance_km > MAX_DISTANCE_KM:
+            # Outside the service radius of every ambulance clinic
+            if not within_service_area:
                 # Update status to call_back
                 update_status_data = {
                     "status": "call_back",
@@ -319,14 +364,14 @@ def check_distance_and_handle(whatsapp_number, supabase, user_data, location_inf
                 supabase.table("a_s_1_emergency").update(update_status_data).eq("id", db_alert_id).execute()
                 
                 # Send message to call 999
-                clinic_address = "No. 33, 1, Jalan PU 7/4, Taman Puchong Utama, 47140 Puchong, Selangor"
+                clinic_address = clinic.get("address") or DEFAULT_CLINIC_ADDRESS
                 
                 distance_message = gt_tt(whatsapp_number,
                     f"🚨 *DISTANCE ALERT*\n\n"
                     f"Your location is {distance_km:.1f} km away from our clinic.\n\n"
                     f"*Our Clinic Location:*\n"
                     f"{clinic_address}\n\n"
-                    f"*Service Radius:* 15 km\n"
+                    f"*Service Radius:* {radius_km:g} km\n"
                     f"*Your Distance:* {distance_km:.1f} km\n\n"
                     f"⚠️ *You are outside our service area.*\n\n"
                     f"**Please call 999 immediately for emergency assistance.**\n\n"
@@ -400,6 +445,13 @@ def check_distance_and_handle(whatsapp_number, supabase, user_data, location_inf
                 
                 supabase.table("a_s_2_emergency").insert(detail_data).execute()
                 
+                # ETA ranking may wait on a road-time lookup, so it runs after the patient has the confirmation
+                threading.Thread(
+                    target=assign_nearest_ambulance,
+                    args=(whatsapp_number, supabase, emergency_data, db_alert_id, patient_lat, patient_lng),
+                    daemon=True
+                ).start()
+                
                 # Set next step and ask first question
                 emergency_data["location"] = location_info
                 emergency_data["distance_km"] = distance_km
@@ -1327,6 +1379,7 @@ def handle_emergency_response(whatsapp_number, user_id, supabase, user_data, mes
         current_step = emergency_data.get("step", "life_risk")
         
         logger.info(f"Emergency response for {whatsapp_number}, step: {current_step}, message type: {message.get('type')}")
+        send_pending_ambulance_eta(whatsapp_number, supabase, emergency_data)
         
         # Handle cancel ambulance service
         if message.get("type") == "interactive":
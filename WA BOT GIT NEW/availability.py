@@ -0,0 +1,513 @@
+# availability.py - IN-MEMORY DOCTOR AVAILABILITY FOR SLOT SEARCH (CLINIC AND TCM)
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+from clinic_schedule import get_clinic_schedule_template, schedule_window, CLINIC_SCHEDULE_TABLE, TCM_CLINIC_SCHEDULE_TABLE
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# How long a loaded day is reused before bookings are re-read (seconds)
+AVAILABILITY_SNAPSHOT_TTL = float(os.getenv("AVAILABILITY_SNAPSHOT_TTL", "30"))
+# Clinic doctor lists change rarely
+CLINIC_ROSTER_TTL = float(os.getenv("CLINIC_ROSTER_TTL", "300"))
+# How equally loaded doctors are chosen between: roster, round_robin or least_minutes
+DOCTOR_ASSIGNMENT_TIE_BREAK = os.getenv("DOCTOR_ASSIGNMENT_TIE_BREAK", "roster")
+
+SLOT_MINUTES = 15
+CELLS_PER_DAY = 24 * 60 // SLOT_MINUTES  # 96 quarter-hour cells
+DEFAULT_DURATION_MINUTES = 30
+
+BOOKING_TABLES = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
+RESCHEDULE_TABLE = "c_s_reschedule_requests"
+UNAVAILABILITY_TABLE = "c_a_doctor_unavailability"
+DOCTORS_TABLE = "c_a_doctors"
+TCM_BOOKINGS_TABLE = "tcm_s_bookings"
+TCM_DOCTORS_TABLE = "tcm_a_doctors"
+
+
+class AvailabilityProvider:
+    """
+    Table set for one booking system. Each booking source is
+    (table, date_column, time_columns, filters): every non-empty time column of
+    a row blocks duration_minutes from that time on date_column. Filters are
+    (query_method, column, value) triples applied to every read.
+    """
+
+    def __init__(self, name: str, booking_sources, doctors_table: str, schedule_table: str, unavailability_table: str = None):
+        self.name = name
+        self.booking_sources = booking_sources
+        self.doctors_table = doctors_table
+        self.schedule_table = schedule_table
+        self.unavailability_table = unavailability_table
+
+
+CLINIC = AvailabilityProvider(
+    "clinic",
+    [(table, "date", ("time",), ()) for table in BOOKING_TABLES]
+    + [(RESCHEDULE_TABLE, "new_date", ("new_time",), (("eq", "status", "confirmed"),))],
+    DOCTORS_TABLE, CLINIC_SCHEDULE_TABLE, UNAVAILABILITY_TABLE
+)
+# A TCM booking blocks both its original and its rescheduled time on original_date
+TCM = AvailabilityProvider(
+    "tcm",
+    [(TCM_BOOKINGS_TABLE, "original_date", ("original_time", "new_time"), (("in_", "status", ["confirmed", "pending"]),))],
+    TCM_DOCTORS_TABLE, TCM_CLINIC_SCHEDULE_TABLE
+)
+
+
+# ----------------------------------------------------------------
+# TIME HELPERS
+# ----------------------------------------------------------------
+
+def to_minutes(value):
+    """'HH:MM' or 'HH:MM:SS' -> minutes since midnight (None for empty values)."""
+    if not value:
+        return None
+    hour, minute = value[:5].split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _overlaps(intervals, start: int, end: int) -> bool:
+    return any(s < end and start < e for s, e in intervals)
+
+
+def slot_starts(clinic_schedule, duration: int, window_start: int = None, window_end: int = None, not_before: int = None,
+                window=None):
+    """
+    Candidate 15-minute slot starts for a day: the appointment must end by
+    closing time and must not start inside a break. Optionally limited to
+    [window_start, window_end) and to starts at or after not_before. A
+    precomputed schedule_window() can be passed as window instead of the schedule.
+    """
+    window = window or schedule_window(clinic_schedule)
+    if not window:
+        return []
+    open_at, close_at, breaks = window
+    starts = []
+    for start in range(open_at, close_at, SLOT_MINUTES):
+        if start + duration > close_at:
+            continue
+        if any(s <= start < e for s, e in breaks):
+            continue
+        if window_start is not None and start < window_start:
+            continue
+        if window_end is not None and start >= window_end:
+            continue
+        if not_before is not None and start < not_before:
+            continue
+        starts.append(start)
+    return starts
+
+
+# ----------------------------------------------------------------
+# QUARTER-HOUR BITMAPS
+# ----------------------------------------------------------------
+# A day is a 96-bit int, bit i = the cell [15*i, 15*i + 15) minutes.
+
+def cell_mask(start: int, end: int) -> int:
+    """Bits of every cell that overlaps [start, end) minutes."""
+    first = max(0, start // SLOT_MINUTES)
+    last = min(CELLS_PER_DAY, -(-end // SLOT_MINUTES))
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def schedule_masks(clinic_schedule, not_before: int = None, window=None):
+    """
+    (open_mask, start_mask) for a schedule: open_mask holds the cells between
+    opening and closing time, start_mask the cells an appointment may start in
+    (not inside a break, not before not_before). Returns None when there is no
+    schedule or the opening time is not on the quarter-hour grid. Like
+    slot_starts, takes a precomputed window instead of the schedule.
+    """
+    window = window or schedule_window(clinic_schedule)
+    if not window:
+        return None
+    open_at, close_at, breaks = window
+    if open_at % SLOT_MINUTES:
+        return None
+    first, last = open_at // SLOT_MINUTES, close_at // SLOT_MINUTES
+    open_mask = ((1 << (last - first)) - 1) << first if last > first else 0
+    start_mask = open_mask
+    for start, end in breaks:
+        # Cells whose start time falls inside the break
+        start_mask &= ~cell_mask(-(-start // SLOT_MINUTES) * SLOT_MINUTES, end)
+    if not_before is not None:
+        start_mask &= ~cell_mask(0, not_before)
+    return open_mask, start_mask
+
+
+def fit_mask(free: int, start_mask: int, duration: int) -> int:
+    """Start cells from which `duration` minutes of consecutive free cells follow."""
+    result = start_mask
+    for shift in range(-(-duration // SLOT_MINUTES)):
+        result &= free >> shift
+    return result
+
+
+# ----------------------------------------------------------------
+# DAY SNAPSHOT
+# ----------------------------------------------------------------
+
+class DayAvailability:
+    """
+    Busy intervals for every doctor on one date, built from a single read of
+    the booking, reschedule and unavailability tables. All slot questions for
+    that date are answered from memory.
+    """
+
+    def __init__(self, date: str, busy: dict, unavailable: dict, load: dict = None):
+        self.date = date
+        self.busy = busy                # doctor_id -> [(start, end)] bookings + confirmed reschedules
+        self.unavailable = unavailable  # doctor_id -> [(start, end)] declared unavailability
+        self.load = load or {}          # doctor_id -> [appointments, booked minutes]
+        self.loaded_at = time.time()
+        self._busy_masks = {}
+
+    def doctor_status(self, doctor_id, start: int, duration: int):
+        """(available, reason) for one doctor, with the same reasons as check_slot_availability."""
+        end = start + duration
+        if _overlaps(self.unavailable.get(doctor_id, ()), start, end):
+            return False, "doctor_unavailable"
+        if _overlaps(self.busy.get(doctor_id, ()), start, end):
+            return False, "slot_booked"
+        return True, "available"
+
+    def free_doctors(self, doctor_ids, start: int, duration: int) -> list:
+        return [d for d in doctor_ids if self.doctor_status(d, start, duration)[0]]
+
+    def slot_status(self, start: int, duration: int, doctor_id=None, is_any_doctor: bool = False, doctor_ids=()):
+        if not is_any_doctor:
+            return self.doctor_status(doctor_id, start, duration)
+        if self.free_doctors(doctor_ids, start, duration):
+            return True, "available"
+        return False, "no_available_doctors"
+
+    def appointment_count(self, doctor_id) -> int:
+        return self.load.get(doctor_id, (0, 0))[0]
+
+    def booked_minutes(self, doctor_id) -> int:
+        return self.load.get(doctor_id, (0, 0))[1]
+
+    def busy_mask(self, doctor_id) -> int:
+        """Bookings and unavailability of one doctor as a 96-bit cell mask."""
+        mask = self._busy_masks.get(doctor_id)
+        if mask is None:
+            mask = 0
+            for start, end in self.busy.get(doctor_id, []) + self.unavailable.get(doctor_id, []):
+                mask |= cell_mask(start, end)
+            self._busy_masks[doctor_id] = mask
+        return mask
+
+    def free_start_mask(self, doctor_ids, open_mask: int, start_mask: int, duration: int) -> int:
+        """Cells where at least one of doctor_ids can start a `duration`-minute appointment."""
+        result = 0
+        for doctor_id in doctor_ids:
+            result |= fit_mask(open_mask & ~self.busy_mask(doctor_id), start_mask, duration)
+        return result
+
+    def available_slots(self, starts, duration: int, doctor_id=None, is_any_doctor: bool = False, doctor_ids=()) -> list:
+        """Filter candidate starts (minutes) down to the bookable ones, as 'HH:MM' strings."""
+        return [
+            format_minutes(start) for start in starts
+            if self.slot_status(start, duration, doctor_id, is_any_doctor, doctor_ids)[0]
+        ]
+
+
+def _add_interval(intervals: dict, doctor_id, start, duration):
+    if doctor_id is None or start is None:
+        return
+    intervals.setdefault(doctor_id, []).append((start, start + (duration or DEFAULT_DURATION_MINUTES)))
+
+
+def _date_range(start_date: str, end_date: str) -> list:
+    first = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last = datetime.strptime(end_date, "%Y-%m-%d").date()
+    return [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((last - first).days + 1)]
+
+
+def load_range_availability(supabase, start_date: str, end_date: str, provider: AvailabilityProvider = CLINIC) -> dict:
+    """
+    Read bookings and unavailability for every date in [start_date, end_date]
+    with one range query per table (6 queries for the clinic, 1 for TCM).
+    Returns {date: DayAvailability}, including days without any rows.
+    """
+    busy = {date: {} for date in _date_range(start_date, end_date)}
+    unavailable = {date: {} for date in busy}
+    load = {date: {} for date in busy}
+
+    for table, date_column, time_columns, filters in provider.booking_sources:
+        query = supabase.table(table).select(f"doctor_id, {date_column}, {', '.join(time_columns)}, duration_minutes") \
+            .gte(date_column, start_date).lte(date_column, end_date)
+        for method, column, value in filters:
+            query = getattr(query, method)(column, value)
+        for row in query.execute().data or []:
+            if row.get(date_column) not in busy:
+                continue
+            if row.get("doctor_id") is not None:
+                totals = load[row[date_column]].setdefault(row["doctor_id"], [0, 0])
+                totals[0] += 1
+                totals[1] += row.get("duration_minutes") or DEFAULT_DURATION_MINUTES
+            for time_column in time_columns:
+                _add_interval(busy[row[date_column]], row.get("doctor_id"), to_minutes(row.get(time_column)), row.get("duration_minutes"))
+
+    if provider.unavailability_table:
+        rows = supabase.table(provider.unavailability_table).select("doctor_id, date, start_time, end_time") \
+            .gte("date", start_date).lte("date", end_date).execute().data or []
+        for row in rows:
+            start, end = to_minutes(row.get("start_time")), to_minutes(row.get("end_time"))
+            if row.get("date") in unavailable and row.get("doctor_id") and start is not None and end is not None:
+                unavailable[row["date"]].setdefault(row["doctor_id"], []).append((start, end))
+
+    days = {}
+    for date in busy:
+        for intervals in (busy[date], unavailable[date]):
+            for doctor_id in intervals:
+                intervals[doctor_id].sort()
+        days[date] = DayAvailability(date, busy[date], unavailable[date], load[date])
+    return days
+
+
+def load_day_availability(supabase, date: str, provider: AvailabilityProvider = CLINIC) -> DayAvailability:
+    """Read one date's bookings and unavailability."""
+    return load_range_availability(supabase, date, date, provider)[date]
+
+
+_snapshots = {}
+_rosters = {}
+_cache_lock = threading.Lock()
+
+
+def get_day_availability(supabase, date: str, refresh: bool = False, provider: AvailabilityProvider = CLINIC) -> DayAvailability:
+    """
+    Return the snapshot for a date, reloading it when older than
+    AVAILABILITY_SNAPSHOT_TTL or when refresh=True (use before writing a booking).
+    """
+    key = (provider.name, date)
+    with _cache_lock:
+        snapshot = _snapshots.get(key)
+    if snapshot and not refresh and time.time() - snapshot.loaded_at < AVAILABILITY_SNAPSHOT_TTL:
+        return snapshot
+    snapshot = load_day_availability(supabase, date, provider)
+    with _cache_lock:
+        _snapshots[key] = snapshot
+        # Keep only recent days around
+        for stale in [k for k, s in _snapshots.items() if time.time() - s.loaded_at > AVAILABILITY_SNAPSHOT_TTL * 10]:
+            del _snapshots[stale]
+    return snapshot
+
+
+def preload_day_availability(supabase, start_date: str, end_date: str, provider: AvailabilityProvider = CLINIC):
+    """
+    Make sure every date in [start_date, end_date] has a fresh snapshot, loading
+    the whole range at once when any of them is missing or stale.
+    """
+    dates = _date_range(start_date, end_date)
+    now = time.time()
+    with _cache_lock:
+        fresh = all(
+            (provider.name, d) in _snapshots and now - _snapshots[(provider.name, d)].loaded_at < AVAILABILITY_SNAPSHOT_TTL
+            for d in dates
+        )
+    if fresh:
+        return
+    days = load_range_availability(supabase, start_date, end_date, provider)
+    with _cache_lock:
+        _snapshots.update({(provider.name, date): day for date, day in days.items()})
+
+
+_last_assigned = {}
+
+
+def pick_doctor(day: DayAvailability, candidates, score=None, tie_break: str = None, rotation_key=None):
+    """
+    Choose among available doctors (in roster order) the one with the lowest
+    score - by default the number of appointments on the day. Ties are broken by
+    tie_break (DOCTOR_ASSIGNMENT_TIE_BREAK by default):
+    - roster: first in roster order
+    - least_minutes: fewest booked minutes, then roster order
+    - round_robin: the next tied doctor after the last one picked for rotation_key
+    Returns None when there are no candidates.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return None
+    score = score or day.appointment_count
+    tie_break = tie_break or DOCTOR_ASSIGNMENT_TIE_BREAK
+    best = min(score(d) for d in candidates)
+    tied = [d for d in candidates if score(d) == best]
+
+    if tie_break == "least_minutes":
+        choice = min(tied, key=day.booked_minutes)
+    elif tie_break == "round_robin" and len(tied) > 1:
+        with _cache_lock:
+            last = _last_assigned.get(rotation_key)
+        position = candidates.index(last) if last in candidates else -1
+        later = [d for d in tied if candidates.index(d) > position]
+        choice = later[0] if later else tied[0]
+    else:
+        choice = tied[0]
+
+    with _cache_lock:
+        _last_assigned[rotation_key] = choice
+    return choice
+
+
+def invalidate_day_availability(date: str = None, provider: AvailabilityProvider = None):
+    """Drop a cached day (or all days) after a booking is written; provider=None covers both systems."""
+    with _cache_lock:
+        for key in [k for k in _snapshots if (date is None or k[1] == date) and (provider is None or k[0] == provider.name)]:
+            del _snapshots[key]
+
+
+def get_clinic_doctor_ids(supabase, clinic_id, provider: AvailabilityProvider = CLINIC) -> list:
+    """Doctor ids for a clinic, cached for CLINIC_ROSTER_TTL seconds."""
+    key = (provider.name, clinic_id)
+    with _cache_lock:
+        cached = _rosters.get(key)
+    if cached and time.time() - cached[0] < CLINIC_ROSTER_TTL:
+        return cached[1]
+    rows = supabase.table(provider.doctors_table).select("id").eq("clinic_id", clinic_id).execute().data or []
+    doctor_ids = [row["id"] for row in rows]
+    with _cache_lock:
+        _rosters[key] = (time.time(), doctor_ids)
+    return doctor_ids
+
+
+# ----------------------------------------------------------------
+# AVAILABILITY SERVICE (shared by calendar_utils and tcm_calendar_utils)
+# ----------------------------------------------------------------
+
+def earliest_start(date_str: str):
+    """Earliest bookable minute on date_str: now for today, end of day for past dates."""
+    now = datetime.now()
+    today_str = now.strftime("%Y-%m-%d")
+    if date_str == today_str:
+        return now.hour * 60 + now.minute + (1 if now.second or now.microsecond else 0)
+    if date_str < today_str:
+        return 24 * 60
+    return None
+
+
+def clinic_schedule_for(supabase, clinic_id, date, provider: AvailabilityProvider = CLINIC):
+    """Opening hours for a date from the cached clinic template, or None when closed."""
+    template = get_clinic_schedule_template(supabase, clinic_id, provider.schedule_table)
+    return template.for_date(date) if template else None
+
+
+def clinic_window_for(supabase, clinic_id, date, provider: AvailabilityProvider = CLINIC):
+    """schedule_window() for a date, worked out once per clinic template; None when closed."""
+    template = get_clinic_schedule_template(supabase, clinic_id, provider.schedule_table)
+    return template.window(date) if template else None
+
+
+def candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor: bool, provider: AvailabilityProvider = CLINIC) -> list:
+    """The chosen doctor, or the whole clinic roster for "any doctor" (or when none is chosen)."""
+    if is_any_doctor or not doctor_id:
+        return get_clinic_doctor_ids(supabase, clinic_id, provider)
+    return [doctor_id]
+
+
+def doctor_slot_availability(supabase, doctor_id, date: str, time_slot: str, duration: int, provider: AvailabilityProvider = CLINIC):
+    """(available, reason) for one doctor at date/time_slot."""
+    return get_day_availability(supabase, date, provider=provider).doctor_status(doctor_id, to_minutes(time_slot), duration)
+
+
+def slot_availability(supabase, date: str, time_slot: str, clinic_id, doctor_id, is_any_doctor: bool, duration: int,
+                      provider: AvailabilityProvider = CLINIC, check_hours: bool = False):
+    """
+    (available, reason) for a slot. With check_hours the slot must also fit the
+    clinic's opening hours and not start in a break.
+    """
+    start = to_minutes(time_slot)
+    if check_hours:
+        window = clinic_window_for(supabase, clinic_id, datetime.strptime(date, "%Y-%m-%d").date(), provider)
+        if not window:
+            return False, "clinic_closed"
+        open_at, close_at, breaks = window
+        if start < open_at or start + duration > close_at:
+            return False, "outside_clinic_hours"
+        if any(s <= start < e for s, e in breaks):
+            return False, "during_break"
+    day = get_day_availability(supabase, date, provider=provider)
+    if not is_any_doctor and doctor_id:
+        return day.doctor_status(doctor_id, start, duration)
+    return day.slot_status(start, duration, is_any_doctor=True, doctor_ids=get_clinic_doctor_ids(supabase, clinic_id, provider))
+
+
+def available_slots_for_day(supabase, date: str, clinic_id, doctor_id, is_any_doctor: bool, duration: int,
+                            provider: AvailabilityProvider = CLINIC) -> list:
+    """Every bookable 'HH:MM' start on a date, answered from one snapshot of the day."""
+    window = clinic_window_for(supabase, clinic_id, datetime.strptime(date, "%Y-%m-%d").date(), provider)
+    if not window:
+        return []
+    day = get_day_availability(supabase, date, provider=provider)
+    starts = slot_starts(None, duration, window=window)
+    if not is_any_doctor and doctor_id:
+        return day.available_slots(starts, duration, doctor_id)
+    return day.available_slots(starts, duration, is_any_doctor=True, doctor_ids=get_clinic_doctor_ids(supabase, clinic_id, provider))
+
+
+def date_availability(supabase, date_obj, clinic_id, doctor_ids, duration: int = DEFAULT_DURATION_MINUTES,
+                      provider: AvailabilityProvider = CLINIC):
+    """
+    (available, reason) for a whole date: True when one of doctor_ids can take a
+    `duration`-minute appointment that has not already started. Reasons are
+    clinic_closed, no_slots, no_available_doctors and available.
+    """
+    date_str = date_obj.strftime("%Y-%m-%d")
+    window = clinic_window_for(supabase, clinic_id, date_obj, provider)
+    if not window:
+        return False, "clinic_closed"
+
+    not_before = earliest_start(date_str)
+    masks = schedule_masks(None, not_before, window=window)
+    day = get_day_availability(supabase, date_str, provider=provider)
+    if masks is None:
+        # Opening time off the 15-minute grid: use the interval check instead
+        starts = slot_starts(None, duration, not_before=not_before, window=window)
+        if not starts:
+            return False, "no_slots"
+        if any(day.free_doctors(doctor_ids, start, duration) for start in starts):
+            return True, "available"
+        return False, "no_available_doctors"
+
+    open_mask, start_mask = masks
+    if not start_mask:
+        return False, "no_slots"
+    # One free/busy bitmap per doctor, AND-ed over the slots the service needs
+    if day.free_start_mask(doctor_ids, open_mask, start_mask, duration):
+        return True, "available"
+    return False, "no_available_doctors"
+
+
+def nearest_available_dates(supabase, target_date, clinic_id, doctor_ids, duration: int = DEFAULT_DURATION_MINUTES,
+                            provider: AvailabilityProvider = CLINIC, max_dates: int = 8, search_range: int = 30) -> list:
+    """Available dates after target_date (nearest first), then before it, up to max_dates."""
+    # Load bookings for the whole horizon at once; past dates never have free slots
+    first = max((target_date - timedelta(days=search_range)).strftime("%Y-%m-%d"), datetime.today().strftime("%Y-%m-%d"))
+    last = (target_date + timedelta(days=search_range)).strftime("%Y-%m-%d")
+    if first <= last:
+        preload_day_availability(supabase, first, last, provider)
+
+    available_dates = []
+    offsets = list(range(0, search_range + 1)) + [-d for d in range(1, search_range + 1)]
+    for offset in offsets:
+        check_date = target_date + timedelta(days=offset)
+        if date_availability(supabase, check_date, clinic_id, doctor_ids, duration, provider)[0]:
+            available_dates.append(check_date)
+            if len(available_dates) >= max_dates:
+                break
+    return available_dates
@@ -2,7 +2,14 @@ import logging
 import uuid
 import re
 from datetime import datetime, timedelta
-from utils import send_whatsapp_message, send_interactive_menu, translate_template, gt_tt, gt_t_tt, gt_dt_tt
+from utils import send_whatsapp_message, send_interactive_menu, translate_template, gt_tt, gt_t_tt, gt_dt_tt, translate_many
+from time_input import parse_time_input, format_time_for_display, round_to_15_minutes
+from availability import (
+    get_day_availability, preload_day_availability, get_clinic_doctor_ids,
+    slot_starts, to_minutes, format_minutes, clinic_schedule_for, candidate_doctor_ids,
+    available_slots_for_day, slot_availability, doctor_slot_availability, date_availability, nearest_available_dates
+)
+from slot_holds import hold_user_slot, release_user_hold, insert_held_booking, SlotUnavailableError
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -11,206 +18,6 @@ logger = logging.getLogger(__name__)
 # Cache for unavailable slots
 unavailable_slots_cache = {}
 
-# New time input parsing functions
-def parse_time_input(time_str):
-    """Parse various time input formats and convert to HH:MM format (24-hour)."""
-    try:
-        if not time_str or not isinstance(time_str, str):
-            return None
-            
-        # Remove whitespace and convert to lowercase
-        time_str = time_str.strip().lower()
-        
-        # Remove any dots at the end
-        time_str = time_str.rstrip('.')
-        
-        # Handle AM/PM variations
-        has_am = False
-        has_pm = False
-        
-        # Check for AM/PM indicators (more comprehensive)
-        am_patterns = ['a.m.', 'a.m', 'am', 'a']
-        pm_patterns = ['p.m.', 'p.m', 'pm', 'p']
-        
-        for pattern in am_patterns:
-            if pattern in time_str:
-                has_am = True
-                time_str = time_str.replace(pattern, '')
-                break
-                
-        if not has_am:
-            for pattern in pm_patterns:
-                if pattern in time_str:
-                    has_pm = True
-                    time_str = time_str.replace(pattern, '')
-                    break
-        
-        # Remove all non-digit characters except colon and dot
-        time_str = re.sub(r'[^0-9:.]', '', time_str)
-        
-        # If empty after cleaning, return None
-        if not time_str:
-            return None
-        
-        # Replace dots with colons for consistent parsing
-        time_str = time_str.replace('.', ':')
-        
-        # Handle different formats
-        # Case 1: Has colon separator (e.g., "9:30", "14:00")
-        if ':' in time_str:
-            parts = time_str.split(':')
-            if len(parts) == 2:
-                hour_str = parts[0]
-                minute_str = parts[1]
-                
-                # Pad single digit hour
-                if len(hour_str) == 1:
-                    hour_str = '0' + hour_str
-                
-                # Pad minute if needed
-                if len(minute_str) == 1:
-                    minute_str = minute_str + '0'
-                elif len(minute_str) > 2:
-                    minute_str = minute_str[:2]
-                
-                hour = int(hour_str)
-                minute = int(minute_str[:2])
-                
-                # Validate
-                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
-                    return None
-                
-                # Handle AM/PM conversion
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-        
-        # Case 2: No separator (e.g., "0930", "1400", "9", "14")
-        elif time_str.isdigit():
-            length = len(time_str)
-            
-            if length == 4:  # HHMM format
-                hour = int(time_str[:2])
-                minute = int(time_str[2:])
-                
-                # Validate
-                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
-                    return None
-                
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-                
-            elif length == 3:  # HMM format (e.g., "930" for 9:30)
-                hour = int(time_str[0])
-                minute = int(time_str[1:])
-                
-                # Validate minute
-                if minute < 0 or minute > 59:
-                    return None
-                
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-                
-            elif length == 2:  # HH format
-                hour = int(time_str)
-                minute = 0
-                
-                # Validate hour
-                if hour < 0 or hour > 23:
-                    return None
-                
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-                
-            elif length == 1:  # H format
-                hour = int(time_str)
-                minute = 0
-                
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error parsing time input '{time_str}': {str(e)}")
-        return None
-
-def convert_12_to_24_hour(hour, minute, has_am, has_pm):
-    """Convert 12-hour format to 24-hour format."""
-    # If no AM/PM specified, assume 24-hour format
-    if not has_am and not has_pm:
-        # If hour is 0-11 and we have no AM/PM, could be ambiguous
-        # But we'll assume 24-hour format for consistency
-        if hour == 12:
-            hour = 12  # 12:00 in 24-hour is 12:00
-        elif hour > 12 and hour <= 23:
-            # Already in 24-hour format
-            pass
-        # hour 0-11 stays as is in 24-hour format
-    
-    # Handle AM
-    elif has_am:
-        if hour == 12:
-            hour = 0  # 12 AM = 00
-        elif hour > 12:
-            return None  # Invalid for AM
-        # hour 1-11 stays as is
-    
-    # Handle PM
-    elif has_pm:
-        if hour == 12:
-            hour = 12  # 12 PM = 12
-        elif hour < 12:
-            hour += 12
-    
-    return f"{hour:02d}:{minute:02d}"
-
-def format_time_for_display(time_str):
-    """Convert 24-hour time to 12-hour format with AM/PM."""
-    try:
-        if not time_str:
-            return ""
-        
-        # Parse the time
-        hour, minute = map(int, time_str.split(':'))
-        
-        # Convert to 12-hour format
-        if hour == 0:
-            return f"12:{minute:02d} AM"
-        elif hour < 12:
-            return f"{hour}:{minute:02d} AM"
-        elif hour == 12:
-            return f"12:{minute:02d} PM"
-        else:
-            return f"{hour-12}:{minute:02d} PM"
-            
-    except Exception as e:
-        logger.error(f"Error formatting time '{time_str}': {str(e)}")
-        return time_str
-
-def round_to_15_minutes(time_str):
-    """Round time to nearest 15-minute interval."""
-    try:
-        hour, minute = map(int, time_str.split(':'))
-        
-        # Calculate remainder
-        remainder = minute % 15
-        
-        if remainder == 0:
-            # Already on 15-minute interval
-            return f"{hour:02d}:{minute:02d}"
-        elif remainder <= 7:
-            # Round down
-            minute = minute - remainder
-        else:
-            # Round up
-            minute = minute + (15 - remainder)
-            if minute >= 60:
-                hour += 1
-                minute = 0
-                if hour >= 24:
-                    hour = 0
-        
-        return f"{hour:02d}:{minute:02d}"
-        
-    except Exception as e:
-        logger.error(f"Error rounding time '{time_str}': {str(e)}")
-        return time_str
-
 def find_closest_available_time(whatsapp_number, user_id, supabase, user_data, module_name, target_time_str):
     """Find the closest available time slot to the user's input time."""
     try:
@@ -222,35 +29,16 @@ def find_closest_available_time(whatsapp_number, user_id, supabase, user_data, m
         
         logger.info(f"Finding closest time to {target_time_str} for {whatsapp_number} on {date}")
         
-        # Parse target time
-        target_hour, target_minute = map(int, target_time_str.split(':'))
-        target_datetime = datetime.strptime(f"{date} {target_time_str}", "%Y-%m-%d %H:%M")
-        
-        # Get clinic schedule
-        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return None, None
-        
-        # Get all available time slots for the day
+        # Get all available time slots for the day (empty when the clinic is closed)
         all_slots = get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, duration, supabase)
         
         if not all_slots:
             return None, None
         
-        # Find closest slot
-        closest_slot = None
-        min_difference = timedelta.max
-        
-        for slot in all_slots:
-            slot_datetime = datetime.strptime(f"{date} {slot}", "%Y-%m-%d %H:%M")
-            difference = abs(slot_datetime - target_datetime)
-            
-            if difference < min_difference:
-                min_difference = difference
-                closest_slot = slot
-        
-        return closest_slot, min_difference
+        # Find closest slot (earliest wins a tie, as slots are in time order)
+        target = to_minutes(target_time_str)
+        closest_slot = min(all_slots, key=lambda slot: abs(to_minutes(slot) - target))
+        return closest_slot, timedelta(minutes=abs(to_minutes(closest_slot) - target))
         
     except Exception as e:
         logger.error(f"Error finding closest time for {whatsapp_number}: {str(e)}")
@@ -259,76 +47,7 @@ def find_closest_available_time(whatsapp_number, user_id, supabase, user_data, m
 def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, duration, supabase):
     """Get all available 15-minute time slots for a specific day."""
     try:
-        # Get clinic schedule
-        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return []
-        
-        # Helper function to parse time
-        def parse_time(t):
-            if not t:
-                return None
-            t = t[:5]  # keep only HH:MM
-            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
-        
-        clinic_start = parse_time(clinic_schedule["start_time"])
-        clinic_end = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-        dinner_start = parse_time(clinic_schedule["dinner_start"])
-        dinner_end = parse_time(clinic_schedule["dinner_end"])
-        
-        # Parse all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-        
-        # Check if time slot is during any break
-        def is_during_breaks(slot_time):
-            # Check lunch break
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            # Check dinner break
-            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
-                return True
-            # Check additional breaks
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-        
-        # Generate all possible 15-minute slots
-        all_slots = []
-        current = clinic_start
-        
-        while current < clinic_end:
-            slot_str = current.strftime("%H:%M")
-            slot_end = current + timedelta(minutes=duration)
-            
-            # Check if slot is valid
-            if slot_end > clinic_end:
-                current += timedelta(minutes=15)
-                continue
-            
-            if is_during_breaks(current):
-                current += timedelta(minutes=15)
-                continue
-            
-            # Check availability for this slot
-            is_available, _ = check_slot_availability(
-                date, slot_str, clinic_id, doctor_id, is_any_doctor, duration, supabase
-            )
-            
-            if is_available:
-                all_slots.append(slot_str)
-            
-            current += timedelta(minutes=15)
-        
-        return all_slots
+        return available_slots_for_day(supabase, date, clinic_id, doctor_id, is_any_doctor, duration)
         
     except Exception as e:
         logger.error(f"Error getting all slots for {date}: {str(e)}")
@@ -337,59 +56,7 @@ def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, d
 def check_slot_availability(date, time_slot, clinic_id, doctor_id, is_any_doctor, duration, supabase):
     """Check if a specific time slot is available."""
     try:
-        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
-        slot_end = slot_time + timedelta(minutes=duration)
-        
-        # Check doctor unavailability
-        if not is_any_doctor:
-            unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date).execute().data
-            for u in unavailability:
-                u_start = datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M")
-                u_end = datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
-                if slot_time < u_end and slot_end > u_start:
-                    return False, "doctor_unavailable"
-        
-        # Check existing bookings
-        tables = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
-        for table in tables:
-            if is_any_doctor:
-                bookings = supabase.table(table).select("time, duration_minutes, doctor_id").eq("date", date).execute().data
-            else:
-                bookings = supabase.table(table).select("time, duration_minutes").eq("doctor_id", doctor_id).eq("date", date).execute().data
-            
-            for b in bookings:
-                b_start = datetime.strptime(f"{date} {b['time']}", "%Y-%m-%d %H:%M")
-                b_end = b_start + timedelta(minutes=b["duration_minutes"])
-                if slot_time < b_end and slot_end > b_start:
-                    return False, "slot_booked"
-        
-        # Check reschedule requests
-        if is_any_doctor:
-            reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes, doctor_id").eq("new_date", date).eq("status", "confirmed").execute().data
-        else:
-            reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes").eq("doctor_id", doctor_id).eq("new_date", date).eq("status", "confirmed").execute().data
-        
-        for r in reschedule_bookings:
-            r_start = datetime.strptime(f"{date} {r['new_time']}", "%Y-%m-%d %H:%M")
-            r_end = r_start + timedelta(minutes=r["duration_minutes"])
-            if slot_time < r_end and slot_end > r_start:
-                return False, "slot_booked"
-        
-        # For "any doctor", check if at least one doctor is available
-        if is_any_doctor:
-            doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-            
-            for doctor in doctors:
-                # Check if this specific doctor is available
-                is_available, _ = check_slot_availability(
-                    date, time_slot, clinic_id, doctor["id"], False, duration, supabase
-                )
-                if is_available:
-                    return True, "available"
-            
-            return False, "no_available_doctors"
-        
-        return True, "available"
+        return slot_availability(supabase, date, time_slot, clinic_id, doctor_id, is_any_doctor, duration)
         
     except Exception as e:
         logger.error(f"Error checking slot availability: {str(e)}")
@@ -1009,84 +676,14 @@ def get_doctors(whatsapp_number, user_id, supabase, user_data, module_name):
 def get_clinic_schedule(supabase, clinic_id, date):
     """Fetch clinic schedule for a given date including all breaks."""
     try:
-        date_str = date.strftime("%Y-%m-%d")
-        day_name = date.strftime("%A").lower()
-        day_key = "public_holiday" if day_name == "public holiday" else day_name
-
-        response = supabase.table("c_a_clinic_available_time").select("*").eq("clinic_id", clinic_id).execute()
-        logger.info(f"Supabase response for clinic_id {clinic_id}: {response}")
-        schedule = response.data[0] if response.data and len(response.data) > 0 else None
-
+        # The clinic's row is decoded once and reused until CLINIC_SCHEDULE_TTL expires
+        schedule = clinic_schedule_for(supabase, clinic_id, date)
         if not schedule:
-            logger.error(f"No schedule found for clinic_id: {clinic_id} on {date_str}")
-            return None
-
-        if schedule.get("holiday_self_declared") and date_str in schedule["holiday_self_declared"]:
-            logger.info(f"Date {date_str} is a self-declared holiday for clinic_id: {clinic_id}")
-            return None
-
-        special_dates = schedule.get("special_dates", [])
-        if special_dates is None:
-            special_dates = []
-        if isinstance(special_dates, str):
-            import json
-            special_dates = json.loads(special_dates)
-        for sd in special_dates:
-            if sd.get("date") == date_str:
-                if not sd.get("start_time") or not sd.get("end_time"):
-                    logger.info(f"Special date {date_str} has no valid hours (null start_time or end_time)")
-                    return None
-                
-                # Extract all breaks for special date
-                breaks = []
-                for i in range(1, 6):
-                    break_start = sd.get(f"break{i}_start")
-                    break_end = sd.get(f"break{i}_end")
-                    if break_start and break_end:
-                        breaks.append({"start": break_start, "end": break_end})
-                
-                return {
-                    "start_time": sd.get("start_time"),
-                    "end_time": sd.get("end_time"),
-                    "lunch_start": sd.get("lunch_start"),
-                    "lunch_end": sd.get("lunch_end"),
-                    "dinner_start": sd.get("dinner_start"),
-                    "dinner_end": sd.get("dinner_end"),
-                    "breaks": breaks
-                }
-
-        start_time = schedule.get(f"{day_key}_start")
-        end_time = schedule.get(f"{day_key}_end")
-        lunch_start = schedule.get(f"{day_key}_lunch_start")
-        lunch_end = schedule.get(f"{day_key}_lunch_end")
-        dinner_start = schedule.get(f"{day_key}_dinner_start")
-        dinner_end = schedule.get(f"{day_key}_dinner_end")
-
-        # Extract all breaks for regular day
-        breaks = []
-        for i in range(1, 6):
-            break_start = schedule.get(f"{day_key}_break{i}_start")
-            break_end = schedule.get(f"{day_key}_break{i}_end")
-            if break_start and break_end:
-                breaks.append({"start": break_start, "end": break_end})
-
-        if not start_time or not end_time:
-            logger.info(f"Clinic is closed on {day_name} ({date_str}) due to null start_time or end_time")
-            return None
-
-        logger.info(f"Schedule for {day_name} ({date_str}): start={start_time}, end={end_time}, lunch={lunch_start}-{lunch_end}, dinner={dinner_start}-{dinner_end}, breaks={len(breaks)}")
-        return {
-            "start_time": start_time,
-            "end_time": end_time,
-            "lunch_start": lunch_start,
-            "lunch_end": lunch_end,
-            "dinner_start": dinner_start,
-            "dinner_end": dinner_end,
-            "breaks": breaks
-        }
+            logger.info(f"Clinic {clinic_id} is closed on {date.strftime('%A').lower()} ({date.strftime('%Y-%m-%d')})")
+        return schedule
 
     except Exception as e:
-        logger.error(f"Error fetching clinic schedule for {clinic_id} on {date_str}: {str(e)}", exc_info=True)
+        logger.error(f"Error fetching clinic schedule for {clinic_id} on {date}: {str(e)}", exc_info=True)
         return None
 
 def parse_date_input(date_str):
@@ -1137,126 +734,25 @@ def format_date_for_button(date_obj):
     """Format date for button display (DD/MM/YYYY format)."""
     return date_obj.strftime("%d/%m/%Y")
 
-def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase):
-    """Check if a specific date is available for booking."""
+def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, duration=30):
+    """Check if a specific date has at least one bookable slot of `duration` minutes."""
     try:
-        date_str = date_obj.strftime("%Y-%m-%d")
-        
-        # Check clinic schedule
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return False, "clinic_closed"
-            
-        # Parse clinic times
-        def parse_time(t):
-            if not t:
-                return None
-            t = t[:5]  # keep only HH:MM
-            return datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %H:%M")
-
-        start_time = parse_time(clinic_schedule["start_time"])
-        end_time = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-        
-        # Check all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-
-        def is_during_breaks(slot_time):
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-
-        # Generate time slots and check availability
-        time_slots = []
-        current_slot = start_time
-        while current_slot < end_time:
-            if is_during_breaks(current_slot):
-                current_slot += timedelta(minutes=15)
-                continue
-            time_slots.append((current_slot, current_slot.strftime("%H:%M")))
-            current_slot += timedelta(minutes=15)
-
-        if not time_slots:
-            return False, "no_slots"
-
-        # Check doctor availability for at least one slot
-        if is_any_doctor:
-            doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-            for slot_time, slot_str in time_slots:
-                unavailability = supabase.table("c_a_doctor_unavailability").select("doctor_id, start_time, end_time").eq("date", date_str).execute().data
-                unavailable_doctor_ids = {
-                    u["doctor_id"] for u in unavailability
-                    if datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
-                }
-                booked_doctor_ids = set()
-                # Check all booking tables including c_s_vaccination
-                for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                    bookings = supabase.table(table).select("doctor_id").eq("date", date_str).eq("time", slot_str).execute().data
-                    booked_doctor_ids.update(b["doctor_id"] for b in bookings)
-                reschedule_bookings = supabase.table("c_s_reschedule_requests").select("doctor_id").eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                booked_doctor_ids.update(b["doctor_id"] for b in reschedule_bookings)
-                if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
-                    return True, "available"
-        else:
-            for slot_time, slot_str in time_slots:
-                unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date_str).execute().data
-                is_unavailable = any(
-                    datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
-                    for u in unavailability
-                )
-                if is_unavailable:
-                    continue
-                is_booked = False
-                # Check all booking tables including c_s_vaccination
-                for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                    bookings = supabase.table(table).select("id").eq("doctor_id", doctor_id).eq("date", date_str).eq("time", slot_str).execute().data
-                    if bookings:
-                        is_booked = True
-                        break
-                reschedule_bookings = supabase.table("c_s_reschedule_requests").select("id").eq("doctor_id", doctor_id).eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                if reschedule_bookings:
-                    is_booked = True
-                if not is_booked:
-                    return True, "available"
-
-        return False, "no_available_doctors"
+        doctor_ids = candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor)
+        return date_availability(supabase, date_obj, clinic_id, doctor_ids, duration)
 
     except Exception as e:
         logger.error(f"Error checking date availability: {str(e)}")
         return False, "error"
 
-def find_nearest_available_dates(target_date, clinic_id, doctor_id, is_any_doctor, supabase, max_dates=8, search_range=30):
+def find_nearest_available_dates(target_date, clinic_id, doctor_id, is_any_doctor, supabase, max_dates=8, search_range=30, duration=30):
     """Find nearest available dates within search_range days from target_date."""
-    available_dates = []
-    
-    # Search forward from target_date
-    for days_after in range(0, search_range + 1):
-        check_date = target_date + timedelta(days=days_after)
-        is_available, reason = check_date_availability(check_date, clinic_id, doctor_id, is_any_doctor, supabase)
-        if is_available:
-            available_dates.append(check_date)
-            if len(available_dates) >= max_dates:
-                return available_dates
-    
-    # Search backward from target_date
-    for days_before in range(1, search_range + 1):
-        check_date = target_date - timedelta(days=days_before)
-        is_available, reason = check_date_availability(check_date, clinic_id, doctor_id, is_any_doctor, supabase)
-        if is_available:
-            available_dates.append(check_date)
-            if len(available_dates) >= max_dates:
-                return available_dates
-                
-    return available_dates
+    try:
+        doctor_ids = candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor)
+        return nearest_available_dates(supabase, target_date, clinic_id, doctor_ids, duration, max_dates=max_dates, search_range=search_range)
+
+    except Exception as e:
+        logger.error(f"Error finding nearest available dates: {str(e)}")
+        return []
 
 def handle_future_date_input(whatsapp_number, user_id, supabase, user_data, module_name, date_input):
     """Handle future date input from user."""
@@ -1356,9 +852,10 @@ def handle_future_date_confirmation(whatsapp_number, user_id, supabase, user_dat
         clinic_id = user_data[whatsapp_number].get("clinic_id", "76d39438-a2c4-4e79-83e8-000000000000")
         doctor_id = user_data[whatsapp_number].get("doctor_id")
         is_any_doctor = user_data[whatsapp_number].get("any_doctor", False)
+        duration = user_data[whatsapp_number].get("duration_minutes", 30)
 
         # Check if the date is available
-        is_available, reason = check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase)
+        is_available, reason = check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, duration)
         
         if is_available:
             # Date is available, proceed to next step
@@ -1384,7 +881,7 @@ def handle_future_date_confirmation(whatsapp_number, user_id, supabase, user_dat
         else:
             # Date not available, suggest nearest dates
             formatted_date_short = format_date_for_button(date_obj)
-            nearest_dates = find_nearest_available_dates(date_obj, clinic_id, doctor_id, is_any_doctor, supabase)
+            nearest_dates = find_nearest_available_dates(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, duration=duration)
             
             if nearest_dates:
                 # Create buttons for nearest dates using DD/MM/YYYY format
@@ -1455,134 +952,26 @@ def get_calendar(whatsapp_number, user_id, supabase, user_data, module_name):
         
         logger.info(f"Querying calendar for {whatsapp_number}, clinic_id: {clinic_id}, doctor_id: {doctor_id}, any_doctor: {is_any_doctor}, from {start_date} to {end_date}")
 
-        available_dates = []
-        for i in range(14):
-            date = start_date + timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            # Use translate_template for day names
-            day_name = date.strftime("%A")
-            translated_day = translate_template(whatsapp_number, day_name, supabase)
-            display_str = f"{date.strftime('%d-%m-%Y')} ({translated_day})"
+        # Translate all day names and list labels up front (language resolved once)
+        dates = [start_date + timedelta(days=i) for i in range(14)]
+        translated_days = translate_many(whatsapp_number, [d.strftime("%A") for d in dates], supabase, kind="template")
+        future_date_title, choose_date_label, available_dates_label = translate_many(
+            whatsapp_number, ["📅 Future Date", "Choose Date", "Available Dates"], supabase, kind="gt_t"
+        )
 
-            clinic_schedule = get_clinic_schedule(supabase, clinic_id, date)
-            if not clinic_schedule:
-                logger.info(f"Clinic is closed on {date_str}")
-                continue
+        duration = user_data[whatsapp_number].get("duration_minutes", 30)
 
-            try:
-                start_time = datetime.strptime(f"{date_str} {clinic_schedule['start_time']}", "%Y-%m-%d %H:%M")
-                logger.info(f"Parsed start_time {clinic_schedule['start_time']} for {date_str} with format %Y-%m-%d %H:%M")
-            except ValueError:
-                try:
-                    start_time = datetime.strptime(f"{date_str} {clinic_schedule['start_time']}", "%Y-%m-%d %H:%M:%S")
-                    logger.info(f"Parsed start_time {clinic_schedule['start_time']} for {date_str} with format %Y-%m-%d %H:%M:%S")
-                except ValueError as e:
-                    logger.error(f"Failed to parse start_time {clinic_schedule['start_time']} for {date_str}: {str(e)}")
-                    continue
+        # All 14 days of bookings in one read, then one bitmap check per day
+        preload_day_availability(supabase, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
 
-            try:
-                end_time = datetime.strptime(f"{date_str} {clinic_schedule['end_time']}", "%Y-%m-%d %H:%M")
-                logger.info(f"Parsed end_time {clinic_schedule['end_time']} for {date_str} with format %Y-%m-%d %H:%M")
-            except ValueError:
-                try:
-                    end_time = datetime.strptime(f"{date_str} {clinic_schedule['end_time']}", "%Y-%m-%d %H:%M:%S")
-                    logger.info(f"Parsed end_time {clinic_schedule['end_time']} for {date_str} with format %Y-%m-d %H:%M:%S")
-                except ValueError as e:
-                    logger.error(f"Failed to parse end_time {clinic_schedule['end_time']} for {date_str}: {str(e)}")
-                    continue
-
-            lunch_start = None
-            if clinic_schedule["lunch_start"]:
-                try:
-                    lunch_start = datetime.strptime(f"{date_str} {clinic_schedule['lunch_start']}", "%Y-%m-%d %H:%M")
-                    logger.info(f"Parsed lunch_start {clinic_schedule['lunch_start']} for {date_str} with format %Y-%m-%d %H:%M")
-                except ValueError:
-                    try:
-                        lunch_start = datetime.strptime(f"{date_str} {clinic_schedule['lunch_start']}", "%Y-%m-%d %H:%M:%S")
-                        logger.info(f"Parsed lunch_start {clinic_schedule['lunch_start']} for {date_str} with format %Y-%m-%d %H:%M:%S")
-                    except ValueError as e:
-                        logger.error(f"Failed to parse lunch_start {clinic_schedule['lunch_start']} for {date_str}: {str(e)}")
-                        lunch_start = None
-
-            lunch_end = None
-            if clinic_schedule["lunch_end"]:
-                try:
-                    lunch_end = datetime.strptime(f"{date_str} {clinic_schedule['lunch_end']}", "%Y-%m-%d %H:%M")
-                    logger.info(f"Parsed lunch_end {clinic_schedule['lunch_end']} for {date_str} with format %Y-%m-%d %H:%M")
-                except ValueError:
-                    try:
-                        lunch_end = datetime.strptime(f"{date_str} {clinic_schedule['lunch_end']}", "%Y-%m-%d %H:%M:%S")
-                        logger.info(f"Parsed lunch_end {clinic_schedule['lunch_end']} for {date_str} with format %Y-%m-%d %H:%M:%S")
-                    except ValueError as e:
-                        logger.error(f"Failed to parse lunch_end {clinic_schedule['lunch_end']} for {date_str}: {str(e)}")
-                        lunch_end = None
-
-            total_duration = end_time - start_time
-            lunch_duration = (lunch_end - lunch_start) if lunch_start and lunch_end else timedelta(0)
-            available_duration = total_duration - lunch_duration
-            if available_duration <= timedelta(0):
-                logger.info(f"No available time slots for {date_str}")
-                continue
-
-            time_slots = []
-            current_slot = start_time
-            while current_slot < end_time:
-                if lunch_start and lunch_end and lunch_start <= current_slot < lunch_end:
-                    current_slot += timedelta(minutes=15)
-                    continue
-                time_slots.append((current_slot, current_slot.strftime("%H:%M")))
-                current_slot += timedelta(minutes=15)
-
-            if not time_slots:
-                logger.info(f"No available time slots for {date_str}")
-                continue
-
-            if is_any_doctor:
-                doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-                has_available_slot = False
-                for slot_time, slot_str in time_slots:
-                    unavailability = supabase.table("c_a_doctor_unavailability").select("doctor_id, start_time, end_time").eq("date", date_str).execute().data
-                    unavailable_doctor_ids = {
-                        u["doctor_id"] for u in unavailability
-                        if datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
-                    }
-                    booked_doctor_ids = set()
-                    # Check all booking tables including c_s_vaccination
-                    for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                        bookings = supabase.table(table).select("doctor_id").eq("date", date_str).eq("time", slot_str).execute().data
-                        booked_doctor_ids.update(b["doctor_id"] for b in bookings)
-                    reschedule_bookings = supabase.table("c_s_reschedule_requests").select("doctor_id").eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                    booked_doctor_ids.update(b["doctor_id"] for b in reschedule_bookings)
-                    if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
-                        has_available_slot = True
-                        break
-                if has_available_slot:
-                    available_dates.append({"id": date_str, "title": display_str})
+        available_dates = []
+        for date, translated_day in zip(dates, translated_days):
+            date_str = date.strftime("%Y-%m-%d")
+            is_available, reason = check_date_availability(date, clinic_id, doctor_id, is_any_doctor, supabase, duration)
+            if is_available:
+                available_dates.append({"id": date_str, "title": f"{date.strftime('%d-%m-%Y')} ({translated_day})"})
             else:
-                has_available_slot = False
-                for slot_time, slot_str in time_slots:
-                    unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date_str).execute().data
-                    is_unavailable = any(
-                        datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
-                        for u in unavailability
-                    )
-                    if is_unavailable:
-                        continue
-                    is_booked = False
-                    # Check all booking tables including c_s_vaccination
-                    for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                        bookings = supabase.table(table).select("id").eq("doctor_id", doctor_id).eq("date", date_str).eq("time", slot_str).execute().data
-                        if bookings:
-                            is_booked = True
-                            break
-                    reschedule_bookings = supabase.table("c_s_reschedule_requests").select("id").eq("doctor_id", doctor_id).eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                    if reschedule_bookings:
-                        is_booked = True
-                    if not is_booked:
-                        has_available_slot = True
-                        break
-                if has_available_slot:
-                    available_dates.append({"id": date_str, "title": display_str})
+                logger.info(f"No availability on {date_str}: {reason}")
 
         # Add Future Date option - FIXED: Always reserve 1 slot for Future Date
         # Only show maximum 9 available dates to leave room for Future Date option
@@ -1591,7 +980,7 @@ def get_calendar(whatsapp_number, user_id, supabase, user_data, module_name):
         # Add Future Date option
         display_dates.append({
             "id": "future_date",
-            "title": gt_t_tt(whatsapp_number, "📅 Future Date", supabase)
+            "title": future_date_title
         })
 
         if not display_dates:
@@ -1627,9 +1016,9 @@ def get_calendar(whatsapp_number, user_id, supabase, user_data, module_name):
                     "type": "list",
                     "body": {"text": translate_template(whatsapp_number, "Select a date for your appointment:", supabase)},
                     "action": {
-                        "button": gt_t_tt(whatsapp_number, "Choose Date", supabase),
+                        "button": choose_date_label,
                         "sections": [{
-                            "title": gt_t_tt(whatsapp_number, "Available Dates", supabase),
+                            "title": available_dates_label,
                             "rows": display_dates  # Use display_dates instead of available_dates[:10]
                         }]
                     }
@@ -1689,127 +1078,45 @@ def select_period(whatsapp_number, user_id, supabase, user_data, module_name):
             get_calendar(whatsapp_number, user_id, supabase, user_data, module_name)
             return
 
-        # Helper function to parse time
-        def parse_time(t):
-            if not t:
-                return None
-            t = t[:5]  # keep only HH:MM
-            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
-
-        start_time = parse_time(clinic_schedule["start_time"])
-        end_time = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-        dinner_start = parse_time(clinic_schedule["dinner_start"])
-        dinner_end = parse_time(clinic_schedule["dinner_end"])
-        
-        # Parse all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-
-        # Check if time slot is during any break
-        def is_during_breaks(slot_time):
-            # Check lunch break
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            # Check dinner break
-            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
-                return True
-            # Check additional breaks
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-
-        # Calculate blocks
-        current_block_start = start_time.replace(minute=0, second=0, microsecond=0)
+        # Bookable starts for the whole appointment, answered from one snapshot of the day
+        duration = user_data[whatsapp_number].get("duration_minutes", 30)
+        not_before = None
+        if is_today:
+            not_before = current_time.hour * 60 + current_time.minute + (1 if current_time.second or current_time.microsecond else 0)
+        day = get_day_availability(supabase, date)
+        doctor_ids = get_clinic_doctor_ids(supabase, clinic_id) if is_any_doctor else ()
+        available_starts = [
+            to_minutes(slot) for slot in day.available_slots(
+                slot_starts(clinic_schedule, duration, not_before=not_before),
+                duration, doctor_id, is_any_doctor, doctor_ids
+            )
+        ]
+
+        start_time = to_minutes(clinic_schedule["start_time"])
+        end_time = to_minutes(clinic_schedule["end_time"])
+
+        # Calculate 2-hour blocks
+        current_block_start = start_time - start_time % 60
         am_blocks = []
         pm_blocks = []
         while current_block_start < end_time:
             block_start = current_block_start
-            block_end = block_start + timedelta(hours=2)
+            block_end = block_start + 120
             if block_end > end_time:
                 break
-            last_slot_start = block_start + timedelta(hours=1, minutes=45)
+            last_slot_start = block_start + 105
             if last_slot_start >= end_time:
                 break
-            block_id = f"{block_start.strftime('%H:%M')}-{last_slot_start.strftime('%H:%M')}"
-            has_available_slot = False
-            
-            for sub in range(2):
-                sub_hour_start = block_start + timedelta(hours=sub)
-                if sub_hour_start >= end_time:
-                    break
-                if is_today and sub_hour_start < current_time:
-                    continue
-                    
-                for minute in [0, 15, 30, 45]:
-                    slot_time = sub_hour_start + timedelta(minutes=minute)
-                    slot_str = slot_time.strftime("%H:%M")
-                    
-                    if slot_time >= end_time:
-                        continue
-                    if is_today and slot_time < current_time:
-                        continue
-                    if is_during_breaks(slot_time):
-                        continue
-                    if slot_time < start_time:
-                        continue
-                        
-                    if is_any_doctor:
-                        doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-                        unavailability = supabase.table("c_a_doctor_unavailability").select("doctor_id, start_time, end_time").eq("date", date).execute().data
-                        unavailable_doctor_ids = {
-                            u["doctor_id"] for u in unavailability
-                            if datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
-                        }
-                        booked_doctor_ids = set()
-                        # Check all booking tables including c_s_vaccination
-                        for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                            bookings = supabase.table(table).select("doctor_id").eq("date", date).eq("time", slot_str).execute().data
-                            booked_doctor_ids.update(b["doctor_id"] for b in bookings)
-                        reschedule_bookings = supabase.table("c_s_reschedule_requests").select("doctor_id").eq("new_date", date).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                        booked_doctor_ids.update(b["doctor_id"] for b in reschedule_bookings)
-                        if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
-                            has_available_slot = True
-                            break
-                    else:
-                        unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date).execute().data
-                        is_unavailable = any(
-                            datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
-                            for u in unavailability
-                        )
-                        if is_unavailable:
-                            continue
-                        is_booked = False
-                        # Check all booking tables including c_s_vaccination
-                        for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
-                            bookings = supabase.table(table).select("id").eq("doctor_id", doctor_id).eq("date", date).eq("time", slot_str).execute().data
-                            if bookings:
-                                is_booked = True
-                                break
-                        reschedule_bookings = supabase.table("c_s_reschedule_requests").select("id").eq("doctor_id", doctor_id).eq("new_date", date).eq("new_time", slot_str).eq("status", "confirmed").execute().data
-                        if reschedule_bookings:
-                            is_booked = True
-                        if not is_booked:
-                            has_available_slot = True
-                            break
-                if has_available_slot:
-                    break
-                    
-            if has_available_slot:
-                block_hour = block_start.hour
+            block_id = f"{format_minutes(block_start)}-{format_minutes(last_slot_start)}"
+
+            if any(block_start <= slot < block_end for slot in available_starts):
                 row = {"id": block_id, "title": block_id}
-                if block_hour < 12:
+                if block_start < 12 * 60:
                     am_blocks.append(row)
                 else:
                     pm_blocks.append(row)
-                    
-            current_block_start += timedelta(hours=2)
+
+            current_block_start += 120
 
         user_data[whatsapp_number]["am_blocks"] = am_blocks
         user_data[whatsapp_number]["pm_blocks"] = pm_blocks
@@ -1976,140 +1283,30 @@ def get_time_slots(whatsapp_number, user_id, supabase, user_data, module_name):
             user_data[whatsapp_number]["state"] = "SELECT_HOUR"
             return
 
-        # ------------------------------------------------------------------ #
-        # Helper – parse HH:MM (or HH:MM:SS) into full datetime for the day
-        # ------------------------------------------------------------------ #
-        def parse_time(t):
-            if not t:
-                return None
-            t = t[:5]                     # keep only HH:MM
-            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
-
-        clinic_start = parse_time(clinic_schedule["start_time"])
-        clinic_end   = parse_time(clinic_schedule["end_time"])
-        lunch_start  = parse_time(clinic_schedule["lunch_start"])
-        lunch_end    = parse_time(clinic_schedule["lunch_end"])
-        dinner_start = parse_time(clinic_schedule["dinner_start"])
-        dinner_end   = parse_time(clinic_schedule["dinner_end"])
-        
-        # Parse all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-
-        # Check if time slot is during any break
-        def is_during_breaks(slot_time):
-            # Check lunch break
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            # Check dinner break
-            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
-                return True
-            # Check additional breaks
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-
         # ------------------------------------------------------------------ #
         # Parse the selected 2-hour block (e.g. "09:00-10:45")
         # ------------------------------------------------------------------ #
         block_start_str, block_end_str = hour.split("-")
-        block_start = parse_time(block_start_str)
-        block_end   = parse_time(block_end_str) + timedelta(minutes=15)   # include last slot
-
-        # ------------------------------------------------------------------ #
-        # 1. Gather **all** blocked intervals (including their own duration)
-        # ------------------------------------------------------------------ #
-        def blocked_intervals(doctor_filter=None):
-            blocked = []
-            tables = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
-
-            for tbl in tables:
-                q = supabase.table(tbl).select("time, duration_minutes, doctor_id") \
-                                    .eq("date", date)
-                if doctor_filter:
-                    q = q.eq("doctor_id", doctor_filter)
-                for b in q.execute().data:
-                    s = parse_time(b["time"])
-                    e = s + timedelta(minutes=b["duration_minutes"])
-                    blocked.append((s, e, b["doctor_id"]))
-
-            # reschedule_requests
-            q = supabase.table("c_s_reschedule_requests") \
-                        .select("new_time, duration_minutes, doctor_id") \
-                        .eq("new_date", date).eq("status", "confirmed")
-            for r in q.execute().data:
-                s = parse_time(r["new_time"])
-                e = s + timedelta(minutes=r["duration_minutes"])
-                blocked.append((s, e, r["doctor_id"]))
-
-            return blocked
-
-        blocked = blocked_intervals() if is_any_doctor else blocked_intervals(doctor_id)
+        block_start = to_minutes(block_start_str)
+        block_end   = to_minutes(block_end_str) + 15   # include last slot
+
+        # Past slots are never offered
+        now = datetime.now()
+        today_str = now.strftime("%Y-%m-%d")
+        not_before = None
+        if date == today_str:
+            not_before = now.hour * 60 + now.minute + (1 if now.second or now.microsecond else 0)
+        elif date < today_str:
+            not_before = 24 * 60
 
         # ------------------------------------------------------------------ #
-        # 2. Walk through the block in 15-min steps and test the *full* duration
+        # 1-2. Test every slot's *full* duration against the day's bookings,
+        #      reschedules and doctor unavailability, all held in memory
         # ------------------------------------------------------------------ #
-        slots = []
-        cur = block_start
-
-        while cur < block_end:
-            slot_str = cur.strftime("%H:%M")
-            slot_end = cur + timedelta(minutes=duration)          # <-- end of *new* booking
-
-            # ---- basic guards ------------------------------------------------
-            if cur < datetime.now():                                     # past
-                cur += timedelta(minutes=15); continue
-            if slot_end > clinic_end:                                    # exceeds clinic close
-                cur += timedelta(minutes=15); continue
-            if is_during_breaks(cur):                                    # during any break
-                cur += timedelta(minutes=15); continue
-
-            # ---- overlap with any existing booking (full duration) ----------
-            overlap = False
-            for bs, be, _ in blocked:
-                if cur < be and slot_end > bs:       # any intersection → blocked
-                    overlap = True
-                    break
-            if overlap:
-                cur += timedelta(minutes=15); continue
-
-            # ---- doctor-specific unavailability (only when a doctor is fixed) --
-            if not is_any_doctor:
-                unavail = supabase.table("c_a_doctor_unavailability") \
-                                 .select("start_time, end_time") \
-                                 .eq("doctor_id", doctor_id).eq("date", date).execute().data
-                for u in unavail:
-                    us = parse_time(u["start_time"])
-                    ue = parse_time(u["end_time"])
-                    if cur < ue and slot_end > us:
-                        overlap = True
-                        break
-                if overlap:
-                    cur += timedelta(minutes=15); continue
-
-            # ---- for "any doctor" we need at least ONE free doctor ----------
-            if is_any_doctor:
-                doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-                free = False
-                for d in doctors:
-                    d_blocked = any(
-                        cur < be and slot_end > bs and bd == d["id"]
-                        for bs, be, bd in blocked
-                    )
-                    if not d_blocked:
-                        free = True
-                        break
-                if not free:
-                    cur += timedelta(minutes=15); continue
-
-            # ---- slot is good ------------------------------------------------
-            slots.append(slot_str)
-            cur += timedelta(minutes=15)
+        starts = slot_starts(clinic_schedule, duration, block_start, block_end, not_before)
+        day = get_day_availability(supabase, date)
+        doctor_ids = get_clinic_doctor_ids(supabase, clinic_id) if is_any_doctor else ()
+        slots = day.available_slots(starts, duration, doctor_id, is_any_doctor, doctor_ids)
 
         # ------------------------------------------------------------------ #
         # 3. No slots → fallback
@@ -2201,6 +1398,32 @@ def get_service_duration(supabase, service_id):
         logger.error(f"Error getting duration for {service_id}: {str(e)}")
         return 30
 
+def ask_for_another_time(whatsapp_number, user_id, supabase, user_data, module_name, message, show_time_slots=None):
+    """
+    Tell the user their slot is gone and send them back to picking a time.
+    show_time_slots lets the TCM flow pass its own get_time_slots.
+    """
+    send_whatsapp_message(
+        whatsapp_number,
+        "text",
+        {"text": {"body": translate_template(whatsapp_number, message, supabase)}}
+    )
+    user_data[whatsapp_number].pop("time_slot", None)
+    if user_data[whatsapp_number].get("hour"):
+        user_data[whatsapp_number]["state"] = "SELECT_TIME_SLOT"
+        (show_time_slots or get_time_slots)(whatsapp_number, user_id, supabase, user_data, module_name)
+        return
+    send_whatsapp_message(
+        whatsapp_number,
+        "text",
+        {"text": {"body": translate_template(
+            whatsapp_number,
+            "Please enter your preferred time (e.g., 9:30, 2pm, 1430):",
+            supabase
+        )}}
+    )
+    user_data[whatsapp_number]["state"] = "AWAITING_TIME_INPUT"
+
 def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_name):
     """Confirm the selected doctor or find the best fit doctor for the selected time slot."""
     try:
@@ -2219,6 +1442,14 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
             doctor_response = supabase.table("c_a_doctors").select("name").eq("id", doctor_id).execute()
             # Keep doctor name in English (don't translate)
             doctor_name = doctor_response.data[0]["name"] if doctor_response.data else "Doctor"
+            
+            # Reserve the slot while the user reviews the booking
+            held, reason = hold_user_slot(supabase, user_data, whatsapp_number)
+            if not held:
+                logger.info(f"Slot {date} {time_slot} for doctor {doctor_id} no longer available for {whatsapp_number}: {reason}")
+                ask_for_another_time(whatsapp_number, user_id, supabase, user_data, module_name,
+                                     "Sorry, this time slot was just taken. Please select another.")
+                return
         else:
             # "Any Doctor" was selected OR no specific doctor chosen
             # Need to find the best fit doctor
@@ -2297,9 +1528,18 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
             # Sort by score (lower is better)
             available_doctors_metrics.sort(key=lambda x: x["score"])
             
-            # Select the doctor with the best (lowest) score
-            selected_doctor = available_doctors_metrics[0]
-            user_data[whatsapp_number]["doctor_id"] = selected_doctor["id"]
+            # Select the doctor with the best (lowest) score whose slot can still be held
+            selected_doctor = None
+            for candidate in available_doctors_metrics:
+                user_data[whatsapp_number]["doctor_id"] = candidate["id"]
+                if hold_user_slot(supabase, user_data, whatsapp_number)[0]:
+                    selected_doctor = candidate
+                    break
+            if not selected_doctor:
+                user_data[whatsapp_number]["doctor_id"] = None
+                ask_for_another_time(whatsapp_number, user_id, supabase, user_data, module_name,
+                                     "No doctors available for this time slot. Please select another.")
+                return
             # Keep doctor name in English
             doctor_name = selected_doctor["name"]
             
@@ -2543,42 +1783,27 @@ def handle_edit_choice(whatsapp_number, user_id, supabase, user_data, module_nam
 def check_doctor_availability_at_slot(doctor_id, date, time_slot, duration, supabase):
     """Check if a specific doctor is available at a given time slot."""
     try:
-        # Parse time
-        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
-        slot_end = slot_time + timedelta(minutes=duration)
-        
-        # Check unavailability
-        unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date).execute().data
-        for u in unavailability:
-            u_start = datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M")
-            u_end = datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
-            if slot_time < u_end and slot_end > u_start:
-                return False, "doctor_unavailable"
-        
-        # Check existing bookings
-        tables = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
-        for table in tables:
-            bookings = supabase.table(table).select("time, duration_minutes").eq("doctor_id", doctor_id).eq("date", date).execute().data
-            for b in bookings:
-                b_start = datetime.strptime(f"{date} {b['time']}", "%Y-%m-%d %H:%M")
-                b_end = b_start + timedelta(minutes=b["duration_minutes"])
-                if slot_time < b_end and slot_end > b_start:
-                    return False, "slot_booked"
-        
-        # Check reschedule requests
-        reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes").eq("doctor_id", doctor_id).eq("new_date", date).eq("status", "confirmed").execute().data
-        for r in reschedule_bookings:
-            r_start = datetime.strptime(f"{date} {r['new_time']}", "%Y-%m-%d %H:%M")
-            r_end = r_start + timedelta(minutes=r["duration_minutes"])
-            if slot_time < r_end and slot_end > r_start:
-                return False, "slot_booked"
-        
-        return True, "available"
+        return doctor_slot_availability(supabase, doctor_id, date, time_slot, duration)
     
     except Exception as e:
         logger.error(f"Error checking doctor availability: {str(e)}")
         return False, "error"
 
+def handle_slot_taken(whatsapp_number, user_id, supabase, user_data, module_name, error, show_calendar=None):
+    """
+    The held slot expired and was taken before confirmation - send the user back to the calendar.
+    show_calendar lets the TCM flow pass its own get_calendar.
+    """
+    logger.warning(f"Slot no longer available for {whatsapp_number}: {error}")
+    send_whatsapp_message(
+        whatsapp_number,
+        "text",
+        {"text": {"body": translate_template(whatsapp_number, "Sorry, this time slot is no longer available. Please choose another date and time.", supabase)}}
+    )
+    user_data[whatsapp_number].pop("time_slot", None)
+    user_data[whatsapp_number]["state"] = "SELECT_DATE"
+    (show_calendar or get_calendar)(whatsapp_number, user_id, supabase, user_data, module_name)
+
 def handle_confirm_booking(whatsapp_number, user_id, supabase, user_data, module_name):
     """Unified confirm-booking handler for all modules."""
     try:
@@ -2650,10 +1875,14 @@ def handle_confirm_booking(whatsapp_number, user_id, supabase, user_data, module
         
         logger.info(f"Inserting pending booking for {whatsapp_number}: {booking_data}")
         
-        # Insert into pending_bookings
+        # Insert into pending_bookings, promoting the hold placed when the slot was picked.
+        # Only an expired or missing hold costs a fresh availability check here.
         try:
-            response = supabase.table("c_s_pending_bookings").insert(booking_data).execute()
+            response = insert_held_booking(supabase, user_data[whatsapp_number], "c_s_pending_bookings", booking_data)
             logger.info(f"Supabase insert response: {response}")
+        except SlotUnavailableError as e:
+            handle_slot_taken(whatsapp_number, user_id, supabase, user_data, module_name, e)
+            return
         except Exception as e:
             logger.error(f"Failed to insert booking for {whatsapp_number}: {str(e)}")
             send_whatsapp_message(
@@ -2731,6 +1960,9 @@ def handle_cancel_booking(whatsapp_number, user_id, supabase, user_data):
     """Handle cancel booking - Clear booking data from user_data and reset state."""
     logger.info(f"👋 User {whatsapp_number} CANCELLED - CLEARING BOOKING DATA")
     
+    # Give the held slot back straight away instead of waiting for it to expire
+    release_user_hold(supabase, user_data, whatsapp_number)
+    
     # Clear booking-related data from user_data
     booking_keys = [
         "pending_id", "doctor_id", "date", "time_slot", "duration_minutes",
@@ -0,0 +1,182 @@
+# clinic_schedule.py - CACHED, PRE-PARSED CLINIC OPENING HOURS
+import json
+import logging
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Opening hours are edited rarely; bookings are not part of this cache
+CLINIC_SCHEDULE_TTL = float(os.getenv("CLINIC_SCHEDULE_TTL", "300"))
+
+CLINIC_SCHEDULE_TABLE = "c_a_clinic_available_time"
+TCM_CLINIC_SCHEDULE_TABLE = "tcm_a_clinic_available_time"
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def _to_minutes(value):
+    if not value:
+        return None
+    hour, minute = str(value)[:5].split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _day_schedule(source: dict, prefix: str = "", start_key: str = "start_time", end_key: str = "end_time"):
+    """
+    Schedule dict in the shape get_clinic_schedule() has always returned, or
+    None when the clinic is closed (missing start or end time).
+    """
+    start_time = source.get(f"{prefix}{start_key}")
+    end_time = source.get(f"{prefix}{end_key}")
+    if not start_time or not end_time:
+        return None
+    breaks = []
+    for i in range(1, 6):
+        break_start = source.get(f"{prefix}break{i}_start")
+        break_end = source.get(f"{prefix}break{i}_end")
+        if break_start and break_end:
+            breaks.append({"start": break_start, "end": break_end})
+    return {
+        "start_time": start_time,
+        "end_time": end_time,
+        "lunch_start": source.get(f"{prefix}lunch_start"),
+        "lunch_end": source.get(f"{prefix}lunch_end"),
+        "dinner_start": source.get(f"{prefix}dinner_start"),
+        "dinner_end": source.get(f"{prefix}dinner_end"),
+        "breaks": breaks
+    }
+
+
+def schedule_window(clinic_schedule):
+    """
+    (open, close, breaks) in minutes for a get_clinic_schedule() result.
+    Breaks include lunch and dinner. Returns None when the schedule is empty.
+    """
+    if not clinic_schedule:
+        return None
+    open_at = _to_minutes(clinic_schedule.get("start_time"))
+    close_at = _to_minutes(clinic_schedule.get("end_time"))
+    if open_at is None or close_at is None:
+        return None
+    breaks = []
+    for start_key, end_key in (("lunch_start", "lunch_end"), ("dinner_start", "dinner_end")):
+        start, end = _to_minutes(clinic_schedule.get(start_key)), _to_minutes(clinic_schedule.get(end_key))
+        if start is not None and end is not None:
+            breaks.append((start, end))
+    for break_schedule in clinic_schedule.get("breaks", []):
+        start, end = _to_minutes(break_schedule.get("start")), _to_minutes(break_schedule.get("end"))
+        if start is not None and end is not None:
+            breaks.append((start, end))
+    return open_at, close_at, breaks
+
+
+def _parse_json_list(value, label: str, clinic_id):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            logger.warning(f"Could not parse {label} for clinic_id {clinic_id}")
+            return []
+    return value if isinstance(value, list) else []
+
+
+class ClinicSchedule:
+    """
+    One clinic's availability row decoded once: a schedule per weekday,
+    special dates keyed by date and the self-declared holiday set. The slot
+    engine's (open, close, breaks) window is worked out once per weekday or
+    special date.
+    """
+
+    def __init__(self, clinic_id, row: dict):
+        self.clinic_id = clinic_id
+        self.loaded_at = time.time()
+        self.holidays = {str(d) for d in _parse_json_list(row.get("holiday_self_declared"), "holiday_self_declared", clinic_id)}
+        self.weekly = {day: _day_schedule(row, f"{day}_", "start", "end") for day in WEEKDAYS}
+        self.special = {}
+        for sd in _parse_json_list(row.get("special_dates"), "special_dates", clinic_id):
+            if isinstance(sd, dict) and sd.get("date"):
+                self.special.setdefault(sd["date"], _day_schedule(sd))
+        self._windows = {}
+
+    def for_date(self, date):
+        """Schedule dict for a date/datetime, or None when the clinic is closed."""
+        date_str = date.strftime("%Y-%m-%d")
+        if date_str in self.holidays:
+            return None
+        if date_str in self.special:
+            return self.special[date_str]
+        return self.weekly.get(date.strftime("%A").lower())
+
+    def window(self, date):
+        """schedule_window() of the date's schedule, or None when the clinic is closed."""
+        date_str = date.strftime("%Y-%m-%d")
+        if date_str in self.holidays:
+            return None
+        key = date_str if date_str in self.special else date.strftime("%A").lower()
+        if key not in self._windows:
+            self._windows[key] = schedule_window(self.for_date(date))
+        return self._windows[key]
+
+
+_schedules = {}
+_schedule_lock = threading.Lock()
+_stats = {"hits": 0, "loads": 0, "invalidations": 0}
+
+
+def get_clinic_schedule_template(supabase, clinic_id, table: str = CLINIC_SCHEDULE_TABLE):
+    """
+    Parsed schedule for a clinic, read from `table` at most once per
+    CLINIC_SCHEDULE_TTL seconds. Returns None when the clinic has no row.
+    """
+    key = (table, clinic_id)
+    with _schedule_lock:
+        cached = _schedules.get(key)
+        if cached and time.time() - cached[0] < CLINIC_SCHEDULE_TTL:
+            _stats["hits"] += 1
+            return cached[1]
+
+    response = supabase.table(table).select("*").eq("clinic_id", clinic_id).execute()
+    template = ClinicSchedule(clinic_id, response.data[0]) if response.data else None
+    if template is None:
+        logger.error(f"No schedule found in {table} for clinic_id: {clinic_id}")
+    else:
+        logger.info(f"Loaded schedule for clinic_id {clinic_id} from {table} "
+                    f"({len(template.special)} special dates, {len(template.holidays)} holidays)")
+    with _schedule_lock:
+        _schedules[key] = (time.time(), template)
+        _stats["loads"] += 1
+    return template
+
+
+def invalidate_clinic_schedule(clinic_id=None):
+    """
+    Drop a clinic's cached schedule (or every clinic's) after its hours are
+    edited. The bot itself never writes the schedule tables; hours are edited
+    from the admin dashboard, so a process that applies such an edit (or an
+    admin hook in front of it) should call this. Without a call, an edit shows
+    up within CLINIC_SCHEDULE_TTL seconds.
+    """
+    with _schedule_lock:
+        if clinic_id is None:
+            _schedules.clear()
+        else:
+            for key in [k for k in _schedules if k[1] == clinic_id]:
+                del _schedules[key]
+        _stats["invalidations"] += 1
+
+
+def get_clinic_schedule_cache_stats() -> dict:
+    with _schedule_lock:
+        return {**_stats, "clinics": len(_schedules)}
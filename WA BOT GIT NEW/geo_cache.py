@@ -0,0 +1,174 @@
+# geo_cache.py - PERSISTENT CACHE AND RATE LIMITS FOR GEOCODING AND ROAD-DISTANCE LOOKUPS
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from notification_dispatch import TokenBucket
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+GEO_CACHE_PATH = os.getenv(
+    "GEO_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo_cache.sqlite3")
+)
+GEO_CACHE_SIZE = int(os.getenv("GEO_CACHE_SIZE", "5000"))
+# Addresses and coordinates rarely change meaning; road times drift with roadworks
+GEOCODE_TTL = float(os.getenv("GEOCODE_TTL", str(30 * 86400)))
+ROAD_DISTANCE_TTL = float(os.getenv("ROAD_DISTANCE_TTL", str(7 * 86400)))
+# "No result" answers are kept for less time so a fixed typo or new road shows up
+GEO_NEGATIVE_TTL = float(os.getenv("GEO_NEGATIVE_TTL", "3600"))
+# Coordinates are rounded to this many decimals for cache keys (4 = ~11 m)
+GEO_CELL_DECIMALS = int(os.getenv("GEO_CELL_DECIMALS", "4"))
+
+# Per-provider request rates; Nominatim's usage policy allows at most 1 request/second
+GEO_PROVIDER_RATES = {
+    "google": float(os.getenv("GOOGLE_MAPS_RATE_PER_SECOND", "10")),
+    "nominatim": float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1")),
+}
+_provider_buckets = {name: TokenBucket(rate, capacity=1.0) for name, rate in GEO_PROVIDER_RATES.items()}
+
+_MISSING = object()
+
+
+def normalize_address(address: str) -> str:
+    """Case, spacing and punctuation differences should not miss the cache."""
+    address = re.sub(r"[\s,]+", " ", address.lower().replace(".", " "))
+    return address.strip(" ,")
+
+
+def coordinate_cell(lat, lng) -> str:
+    return f"{round(float(lat), GEO_CELL_DECIMALS)},{round(float(lng), GEO_CELL_DECIMALS)}"
+
+
+def throttle(provider: str):
+    """Block until the provider's rate limit allows another request."""
+    bucket = _provider_buckets.get(provider)
+    if bucket:
+        bucket.acquire()
+
+
+class GeoCache:
+    """
+    Two-tier geo lookup memo, like the translation cache:
+    - in-memory LRU for the hot set
+    - SQLite table on disk so lookups survive restarts
+    Values are JSON; None records a definitive "no result" (negative entry).
+    """
+
+    def __init__(self, path: str = GEO_CACHE_PATH, maxsize: int = GEO_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stats = {}
+
+    def _connection(self):
+        if self._conn is None:
+            try:
+                self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS geo_lookups ("
+                    " key TEXT PRIMARY KEY,"
+                    " kind TEXT NOT NULL,"
+                    " value TEXT,"
+                    " expires_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                logger.error(f"Could not open geo cache at {self.path}: {e}")
+                self._conn = None
+        return self._conn
+
+    def _count(self, kind: str, field: str):
+        counters = self._stats.setdefault(kind, {"memory_hits": 0, "disk_hits": 0, "negative_hits": 0, "misses": 0, "writes": 0})
+        counters[field] += 1
+
+    def _remember(self, key: str, value, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, kind: str, key: str):
+        """Cached value (possibly None for a negative entry), or _MISSING."""
+        full_key = f"{kind}:{key}"
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(full_key)
+                self._count(kind, "memory_hits" if entry[0] is not None else "negative_hits")
+                return entry[0]
+
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    row = conn.execute("SELECT value, expires_at FROM geo_lookups WHERE key = ?", (full_key,)).fetchone()
+                    if row and row[1] > now:
+                        value = json.loads(row[0]) if row[0] is not None else None
+                        self._remember(full_key, value, row[1])
+                        self._count(kind, "disk_hits" if value is not None else "negative_hits")
+                        return value
+                except Exception as e:
+                    logger.warning(f"Geo cache read failed: {e}")
+
+            self._count(kind, "misses")
+            return _MISSING
+
+    def put(self, kind: str, key: str, value, ttl: float):
+        full_key = f"{kind}:{key}"
+        expires_at = time.time() + (ttl if value is not None else min(ttl, GEO_NEGATIVE_TTL))
+        with self._lock:
+            self._remember(full_key, value, expires_at)
+            self._count(kind, "writes")
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO geo_lookups (key, kind, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (full_key, kind, json.dumps(value) if value is not None else None, expires_at)
+                )
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"Geo cache write failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {"memory_size": len(self._memory)}
+            for kind, counters in self._stats.items():
+                hits = counters["memory_hits"] + counters["disk_hits"] + counters["negative_hits"]
+                lookups = hits + counters["misses"]
+                result[kind] = {**counters, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+            return result
+
+
+_geo_cache = GeoCache()
+
+
+def get_cached_geo(kind: str, key: str):
+    """(found, value) for a lookup; value is None for a cached "no result"."""
+    value = _geo_cache.get(kind, key)
+    return (False, None) if value is _MISSING else (True, value)
+
+
+def store_geo(kind: str, key: str, value, ttl: float = GEOCODE_TTL):
+    """Cache a provider answer; pass value=None only for a definitive "no result"."""
+    _geo_cache.put(kind, key, value, ttl)
+
+
+def get_geo_cache_stats() -> dict:
+    return _geo_cache.stats()
@@ -10,12 +10,13 @@ from calendar_utils import (
     handle_cancel_booking, handle_future_date_input, handle_future_date_confirmation,
     handle_time_input, handle_time_confirmation, handle_retry_time_or_help,
     # NEW: Edit functions
-    show_edit_options, handle_edit_choice
+    show_edit_options, handle_edit_choice, handle_slot_taken
 )
+from slot_holds import insert_held_booking, SlotUnavailableError
 
 from utils import (
     send_whatsapp_message, send_interactive_menu, translate_template,
-    gt_t_tt, gt_tt, send_image_message, gt_dt_tt
+    gt_t_tt, gt_tt, send_image_message, gt_dt_tt, get_user_language
 )
 from clinicfd import handle_clinic_enquiries
 
@@ -29,16 +30,7 @@ def handle_healthsp(whatsapp_number, user_id, supabase, user_data, message):
     # ------------------------------------------------------------------
     # 1. FETCH USER LANGUAGE
     # ------------------------------------------------------------------
-    language = "en"
-    try:
-        resp = supabase.table("whatsapp_users") \
-            .select("language") \
-            .eq("whatsapp_number", whatsapp_number.lstrip("+")) \
-            .limit(1).execute()
-        if resp.data:
-            language = resp.data[0]["language"]
-    except Exception as e:
-        logger.error(f"Error fetching language for {whatsapp_number}: {e}")
+    language = get_user_language(supabase, whatsapp_number)
 
     # ------------------------------------------------------------------
     # 2. IDLE → show category image + service list
@@ -355,7 +347,7 @@ def handle_healthsp(whatsapp_number, user_id, supabase, user_data, message):
             }
 
             try:
-                supabase.table("c_s_pending_bookings").insert(booking).execute()
+                insert_held_booking(supabase, user_data[whatsapp_number], "c_s_pending_bookings", booking)
                 logger.info(f"Health screening booking {pending_id} saved. Details: {booking['details']}")
                 
                 send_whatsapp_message(
@@ -372,6 +364,9 @@ def handle_healthsp(whatsapp_number, user_id, supabase, user_data, message):
                     supabase
                 )
                 
+            except SlotUnavailableError as e:
+                handle_slot_taken(whatsapp_number, user_id, supabase, user_data, "health_screening", e)
+                return False
             except Exception as e:
                 logger.error(f"Failed to save health screening booking: {e}")
                 send_whatsapp_message(
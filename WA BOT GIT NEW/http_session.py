@@ -0,0 +1,95 @@
+# http_session.py - SHARED KEEP-ALIVE HTTP SESSION FOR OUTBOUND API CALLS
+import logging
+import os
+import threading
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+# Keep-alive sockets kept per host; requests beyond this still go out, they just are not kept
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "errors": 0}
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # Only connection failures are retried: the request never reached the server,
+    # so resending a POST cannot duplicate a message
+    retry = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.3, allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                logger.info(f"Created pooled HTTP session (pool size {HTTP_POOL_SIZE}, timeout {DEFAULT_TIMEOUT})")
+    return _session
+
+
+def http_request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests-compatible call through the shared session, with a default timeout."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    with _stats_lock:
+        _stats["requests"] += 1
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.exceptions.RequestException:
+        with _stats_lock:
+            _stats["errors"] += 1
+        raise
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    return http_request("POST", url, **kwargs)
+
+
+def get_http_stats() -> dict:
+    """Requests sent vs sockets opened; a reuse ratio near 1 means keep-alive is working."""
+    connections_opened = 0
+    hosts = {}
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections_opened += pool.num_connections
+                hosts[pool.host] = {"requests": pool.num_requests, "connections_opened": pool.num_connections}
+    with _stats_lock:
+        sent = _stats["requests"]
+        return {
+            "requests": sent,
+            "errors": _stats["errors"],
+            "connections_opened": connections_opened,
+            "reuse_ratio": round(1 - connections_opened / sent, 4) if sent else 0.0,
+            "hosts": hosts,
+        }
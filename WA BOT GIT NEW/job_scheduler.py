@@ -0,0 +1,168 @@
+# job_scheduler.py - IN-PROCESS PERIODIC JOBS ON A HEAP OF NEXT-FIRE TIMES
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Threads running jobs; jobs in different families run side by side
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+# Each interval is stretched or shrunk by up to this fraction so jobs do not fire in lockstep
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+
+
+class Job:
+    def __init__(self, name: str, func, interval: float, family: str, jitter: float, leader_only: bool = False):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.family = family
+        self.jitter = jitter
+        self.leader_only = leader_only
+        self.running = False
+        self.stats = {"runs": 0, "failures": 0, "skipped_overlaps": 0, "skipped_not_leader": 0, "last_duration": None,
+                      "max_duration": 0.0, "total_duration": 0.0, "last_lag": None, "max_lag": 0.0,
+                      "last_started_at": None}
+
+    def next_interval(self) -> float:
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class JobScheduler:
+    """
+    One dispatcher thread sleeps until the earliest entry of a heap of
+    (fire time, job) and hands due jobs to a worker pool. A job still running
+    when it comes due again is skipped, not queued (overlap protection), and
+    jobs of the same family share a lock so they never run at the same time,
+    while other families carry on. leader_only jobs run only while
+    leader_check() is true, so with several processes just one runs them.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self.workers = workers
+        self._jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._family_locks = {}
+        self._cond = threading.Condition()
+        self._pool = None
+        self._thread = None
+        self.leader_check = lambda: True
+
+    def add_job(self, name: str, interval: float, func, family: str = None, jitter: float = SCHEDULER_JITTER,
+                first_delay: float = None, leader_only: bool = False) -> Job:
+        """Run func every interval seconds (first run after first_delay, default one interval)."""
+        with self._cond:
+            if name in self._jobs:
+                return self._jobs[name]
+            job = Job(name, func, interval, family or name, jitter, leader_only)
+            self._jobs[name] = job
+            self._family_locks.setdefault(job.family, threading.Lock())
+            delay = job.next_interval() if first_delay is None else first_delay
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._sequence), job))
+            self._cond.notify()
+            return job
+
+    def start(self) -> bool:
+        """Start the dispatcher; a second call in the same process is a no-op."""
+        with self._cond:
+            if self._thread is not None:
+                return False
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+            self._thread = threading.Thread(target=self._dispatch, name="job-scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"Job scheduler started with {len(self._jobs)} jobs: {', '.join(self._jobs)}")
+        return True
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(timeout=self._heap[0][0] - time.monotonic() if self._heap else None)
+                scheduled, _, job = heapq.heappop(self._heap)
+                now = time.monotonic()
+                # Fixed rate from the planned time; after a stall, restart from now instead of catching up
+                next_run = scheduled + job.next_interval()
+                if next_run <= now:
+                    next_run = now + job.next_interval()
+                heapq.heappush(self._heap, (next_run, next(self._sequence), job))
+                if job.running:
+                    job.stats["skipped_overlaps"] += 1
+                    logger.warning(f"Job {job.name} is still running, skipping this run")
+                    continue
+                if job.leader_only and not self.leader_check():
+                    job.stats["skipped_not_leader"] += 1
+                    continue
+                job.running = True
+            try:
+                self._pool.submit(self._run, job, scheduled)
+            except RuntimeError:
+                # Interpreter shutting down; the pool no longer accepts work
+                job.running = False
+                return
+
+    def _run(self, job: Job, scheduled: float):
+        try:
+            with self._family_locks[job.family]:
+                started = time.monotonic()
+                lag = started - scheduled
+                try:
+                    job.func()
+                    failed = False
+                except Exception as e:
+                    failed = True
+                    logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+                duration = time.monotonic() - started
+            with self._cond:
+                stats = job.stats
+                stats["runs"] += 1
+                stats["failures"] += int(failed)
+                stats["last_duration"] = round(duration, 3)
+                stats["max_duration"] = round(max(stats["max_duration"], duration), 3)
+                stats["total_duration"] += duration
+                stats["last_lag"] = round(lag, 3)
+                stats["max_lag"] = round(max(stats["max_lag"], lag), 3)
+                stats["last_started_at"] = time.time() - duration
+        finally:
+            job.running = False
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            next_runs = {job.name: when for when, _, job in self._heap}
+            result = {"started": self.started, "jobs": {}}
+            for name, job in self._jobs.items():
+                stats = dict(job.stats)
+                total = stats.pop("total_duration")
+                stats["avg_duration"] = round(total / stats["runs"], 3) if stats["runs"] else None
+                stats["interval"] = job.interval
+                stats["family"] = job.family
+                stats["leader_only"] = job.leader_only
+                stats["running"] = job.running
+                stats["next_run_in"] = round(next_runs[name] - now, 1) if name in next_runs else None
+                result["jobs"][name] = stats
+            return result
+
+
+# The process-wide scheduler
+scheduler = JobScheduler()
+
+
+def get_scheduler_stats() -> dict:
+    return scheduler.stats()
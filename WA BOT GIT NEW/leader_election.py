@@ -0,0 +1,209 @@
+# leader_election.py - ONE SCHEDULER LEADER ACROSS WORKERS AND REPLICAS
+#
+# Background jobs (notifications, reminders, follow-ups) must run in exactly one
+# process even when several gunicorn workers or containers serve webhooks. The
+# process holding the lease runs them; everyone else only handles webhooks.
+#
+# Backends (SCHEDULER_LEADER_BACKEND):
+#   file      - exclusive flock on a local file; all workers on one host (default)
+#   supabase  - a row in scheduler_leases renewed by heartbeat; works across hosts
+#   none      - every process is leader (single-process development)
+#
+#   create table scheduler_leases (
+#       name text primary key,
+#       holder text not null,
+#       expires_at timestamptz not null,
+#       renewed_at timestamptz not null default now()
+#   );
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; the file backend then always leads
+    fcntl = None
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+SCHEDULER_LEADER_BACKEND = os.getenv("SCHEDULER_LEADER_BACKEND", "file").lower()
+SCHEDULER_LEASE_NAME = os.getenv("SCHEDULER_LEASE_NAME", "wa-bot-scheduler")
+# A leader that stops renewing is replaced after this long (seconds)
+SCHEDULER_LEASE_TTL = int(os.getenv("SCHEDULER_LEASE_TTL", "30"))
+SCHEDULER_LOCK_PATH = os.getenv(
+    "SCHEDULER_LOCK_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scheduler.lock")
+)
+LEASES_TABLE = "scheduler_leases"
+
+
+def _is_duplicate_key(error: Exception) -> bool:
+    return getattr(error, "code", None) == "23505" or "duplicate key" in str(error).lower()
+
+
+class FileLease:
+    """Exclusive flock held for the life of the process; released by the OS if it dies."""
+
+    def __init__(self, path: str, holder: str):
+        self.path = path
+        self.holder = holder
+        self._file = None
+
+    def acquire(self) -> bool:
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            return True
+        handle = open(self.path, "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(f"{self.holder}\n")
+        handle.flush()
+        self._file = handle
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class SupabaseLease:
+    """
+    Lease row taken with a conditional update (ours, or expired) and created
+    on first use; the primary key makes two simultaneous creators collide.
+    """
+
+    def __init__(self, supabase, name: str, holder: str, ttl: int):
+        self.supabase = supabase
+        self.name = name
+        self.holder = holder
+        self.ttl = ttl
+
+    def acquire(self) -> bool:
+        now = datetime.now(timezone.utc)
+        row = {"holder": self.holder, "expires_at": (now + timedelta(seconds=self.ttl)).isoformat(),
+               "renewed_at": now.isoformat()}
+        taken = self.supabase.table(LEASES_TABLE).update(row).eq("name", self.name) \
+            .or_(f'holder.eq."{self.holder}",expires_at.lt."{now.isoformat()}"').execute().data
+        if taken:
+            return True
+        try:
+            self.supabase.table(LEASES_TABLE).insert({"name": self.name, **row}).execute()
+            return True
+        except Exception as e:
+            if _is_duplicate_key(e):
+                return False
+            raise
+
+    def release(self):
+        self.supabase.table(LEASES_TABLE).delete().eq("name", self.name).eq("holder", self.holder).execute()
+
+
+class LeaderElector:
+    """
+    heartbeat() (run every heartbeat_interval seconds) takes or renews the
+    lease; is_leader() says whether this process should run leader-only jobs.
+    If renewing fails, leadership is kept only until the last lease would
+    expire, so two replicas can never both believe they lead past the TTL.
+    """
+
+    def __init__(self, backend, ttl: int = SCHEDULER_LEASE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.heartbeat_interval = max(1.0, ttl / 3)
+        self._lock = threading.Lock()
+        self._leader = backend is None
+        self._valid_until = float("inf") if backend is None else 0.0
+        self._stats = {"acquired": 0, "lost": 0, "errors": 0, "leader_since": None}
+
+    def heartbeat(self):
+        if self.backend is None:
+            return
+        try:
+            held = self.backend.acquire()
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"Scheduler lease heartbeat failed: {e}")
+            return
+        with self._lock:
+            if held and not self._leader:
+                self._stats["acquired"] += 1
+                self._stats["leader_since"] = time.time()
+                logger.info(f"This process ({self.backend.holder}) is now the scheduler leader")
+            elif not held and self._leader:
+                self._stats["lost"] += 1
+                self._stats["leader_since"] = None
+                logger.warning(f"Scheduler lease lost by {self.backend.holder}")
+            self._leader = held
+            self._valid_until = time.monotonic() + self.ttl if held else 0.0
+
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._leader and time.monotonic() < self._valid_until
+
+    def release(self):
+        if self.backend is None:
+            return
+        try:
+            self.backend.release()
+        except Exception as e:
+            logger.warning(f"Could not release scheduler lease: {e}")
+        with self._lock:
+            self._leader = False
+            self._valid_until = 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "backend": {FileLease: "file", SupabaseLease: "supabase"}.get(type(self.backend), "none"),
+                "holder": getattr(self.backend, "holder", None),
+                "is_leader": self._leader and time.monotonic() < self._valid_until,
+            }
+
+
+_elector = None
+_elector_lock = threading.Lock()
+
+
+def get_leader_elector(supabase=None) -> LeaderElector:
+    """The process-wide elector for SCHEDULER_LEADER_BACKEND (created on first call)."""
+    global _elector
+    with _elector_lock:
+        if _elector is None:
+            holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            if SCHEDULER_LEADER_BACKEND == "supabase" and supabase is not None:
+                backend = SupabaseLease(supabase, SCHEDULER_LEASE_NAME, holder, SCHEDULER_LEASE_TTL)
+            elif SCHEDULER_LEADER_BACKEND == "none":
+                backend = None
+            else:
+                if SCHEDULER_LEADER_BACKEND != "file":
+                    logger.warning(f"Unknown SCHEDULER_LEADER_BACKEND {SCHEDULER_LEADER_BACKEND!r}, using a file lock")
+                backend = FileLease(SCHEDULER_LOCK_PATH, holder)
+            _elector = LeaderElector(backend)
+        return _elector
+
+
+def get_leader_stats() -> dict:
+    with _elector_lock:
+        elector = _elector
+    return elector.stats() if elector else {"backend": None, "is_leader": False}
@@ -4,9 +4,10 @@ import threading
 import time
 import logging
 from supabase import create_client, Client
-import schedule
-from utils import get_user_id, send_whatsapp_message, send_interactive_menu, translate_template, gt_t_tt, gt_tt, get_user_language, lookup_clinic_by_keyword
+from utils import get_user_id, send_whatsapp_message, send_interactive_menu, translate_template, gt_t_tt, gt_tt, get_user_language, lookup_clinic_by_keyword, invalidate_user_profile
 from notification import process_notifications, check_and_send_reminder_notifications, display_and_clear_notifications, handle_notification_noted, check_and_send_booking_confirmations, send_immediate_booking_confirmations
+from job_scheduler import scheduler
+from leader_election import get_leader_elector
 from menu import handle_menu_selection
 from report_symptoms import handle_symptoms
 from checkup_booking import handle_checkup
@@ -52,6 +53,7 @@ from individual import handle_individual_response, handle_individual_start
 import os
 from dotenv import load_dotenv
 import json
+from collections import deque
 from datetime import datetime, timedelta
 import pytz
 
@@ -71,11 +73,6 @@ logger = logging.getLogger(__name__)
 
 
 
-scheduler_lock = threading.Lock()
-
-
-
-
 # Replace the hardcoded Supabase credentials:
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
@@ -94,6 +91,17 @@ initialize_matcher(supabase)
 user_data = {}
 
 
+# Per-user mailboxes serializing handle_message calls
+mailboxes = {}
+mailbox_lock = threading.Lock()
+mailbox_stats = {"processed": 0, "queued": 0, "coalesced": 0, "evicted": 0}
+# Identical button/list replies within this window are treated as a double tap
+MAILBOX_COALESCE_SECONDS = float(os.getenv("MAILBOX_COALESCE_SECONDS", "3"))
+# A drained mailbox is kept this long (for redelivered-webhook dedupe), then dropped
+MAILBOX_IDLE_SECONDS = float(os.getenv("MAILBOX_IDLE_SECONDS", "300"))
+_last_mailbox_sweep = 0.0
+
+
 
 
 # ===== UPDATED MAIN_MENU_IDS WITH NEW STRUCTURE =====
@@ -389,8 +397,8 @@ def restore_previous_state(whatsapp_number, user_id, supabase, user_data):
 
 
 
-def handle_message(value):
-    """Handle incoming webhook messages."""
+def _process_message(value):
+    """Handle one incoming webhook message. Only called from the sender's mailbox drain."""
     logger.info(f"Received webhook message: {value}")
     messages = value.get("messages", [])
     contacts = value.get("contacts", [])
@@ -421,6 +429,7 @@ def handle_message(value):
                     "language": "en"
                 }
             ).execute()
+            invalidate_user_profile(whatsapp_number)
             logger.info(f"Stored/updated user: {whatsapp_number}, {user_name}")
             user_data[whatsapp_number] = {"state": "SELECT_LANGUAGE", "processing": False, "module": None}
             send_language_selection_menu(whatsapp_number, supabase)
@@ -439,11 +448,6 @@ def handle_message(value):
         user_data[whatsapp_number] = {"state": "IDLE", "processing": False, "module": None}
 
 
-    if user_data[whatsapp_number].get("processing"):
-        logger.info(f"Skipping message for {whatsapp_number} due to ongoing processing")
-        return
-
-
     logger.info(f"Current state for {whatsapp_number}: {user_data[whatsapp_number]}")
     message = messages[0]
     user_data[whatsapp_number]["processing"] = True
@@ -709,6 +713,7 @@ def handle_message(value):
                 supabase.table("whatsapp_users").update(
                     {"language": selected_language}
                 ).eq("id", user_id).execute()
+                invalidate_user_profile(whatsapp_number, language=selected_language)
                 logger.info(f"Updated language for {whatsapp_number} to {selected_language}")
                 send_whatsapp_message(
                     whatsapp_number,
@@ -1178,47 +1183,144 @@ def handle_message(value):
         user_data[whatsapp_number]["processing"] = False
 
 
-# ===== SCHEDULER FUNCTIONS =====
-def safe_process_notifications():
-    """Process notifications with proper locking and rate limiting."""
-    with scheduler_lock:
-        logger.info("=== Running notification processing ===")
-        try:
-            process_notifications(supabase)
-            check_and_send_reminder_notifications(supabase)
-            check_and_send_booking_confirmations(supabase)
-        except Exception as e:
-            logger.error(f"Error in safe_process_notifications: {e}", exc_info=True)
+# ===== PER-USER MAILBOX =====
+def _reply_id(message):
+    """Button/list reply id of an interactive message, None for anything else."""
+    if message.get("type") != "interactive":
+        return None
+    interactive = message.get("interactive", {})
+    reply = interactive.get("button_reply") or interactive.get("list_reply") or {}
+    return reply.get("id")
 
 
-def safe_check_followups():
-    """Prevent concurrent execution of follow-up checks."""
-    with scheduler_lock:
-        logger.info("=== Running follow-up check ===")
-        check_and_send_followup_messages(supabase)
+def _is_duplicate(mailbox, message):
+    """Redelivered webhooks and double-tapped replies are dropped instead of queued."""
+    message_id = message.get("id")
+    if message_id and message_id in mailbox["recent_ids"]:
+        return True
+    reply_id = _reply_id(message)
+    if reply_id is None:
+        return False
+    last_reply_id, last_reply_at = mailbox["last_reply"]
+    return reply_id == last_reply_id and time.time() - last_reply_at < MAILBOX_COALESCE_SECONDS
 
 
-def run_scheduler():
-    """Run scheduled tasks for notifications and follow-ups."""
-    logger.info("Starting scheduler...")
-   
-    schedule.every(5).minutes.do(safe_process_notifications)
-    schedule.every(1).minutes.do(safe_check_followups)
+def _sweep_idle_mailboxes(now):
+    """Drop mailboxes drained more than MAILBOX_IDLE_SECONDS ago. Caller holds mailbox_lock."""
+    global _last_mailbox_sweep
+    if now - _last_mailbox_sweep < MAILBOX_IDLE_SECONDS / 5:
+        return
+    _last_mailbox_sweep = now
+    idle = [number for number, mailbox in mailboxes.items()
+            if not mailbox["active"] and now - mailbox["idle_since"] > MAILBOX_IDLE_SECONDS]
+    for number in idle:
+        del mailboxes[number]
+    mailbox_stats["evicted"] += len(idle)
+
+
+def handle_message(value):
+    """
+    Handle incoming webhook messages.
+    Each user has a mailbox: a message that arrives while that user's previous
+    message is still being handled is queued and processed in order afterwards,
+    instead of being dropped.
+    """
+    messages = value.get("messages", [])
+    if not messages:
+        logger.info("No messages received")
+        return
 
+    whatsapp_number = messages[0]["from"]
+    message = messages[0]
 
+    with mailbox_lock:
+        _sweep_idle_mailboxes(time.time())
+        mailbox = mailboxes.setdefault(
+            whatsapp_number,
+            {"pending": deque(), "active": False, "recent_ids": deque(maxlen=50), "last_reply": (None, 0.0),
+             "idle_since": time.time()}
+        )
+        if _is_duplicate(mailbox, message):
+            mailbox_stats["coalesced"] += 1
+            logger.info(f"Coalesced duplicate message {message.get('id')} from {whatsapp_number}")
+            return
+        if message.get("id"):
+            mailbox["recent_ids"].append(message["id"])
+        reply_id = _reply_id(message)
+        if reply_id is not None:
+            mailbox["last_reply"] = (reply_id, time.time())
+
+        mailbox["pending"].append(value)
+        if mailbox["active"]:
+            mailbox_stats["queued"] += 1
+            logger.info(f"Queued message for {whatsapp_number} ({len(mailbox['pending'])} waiting)")
+            return
+        mailbox["active"] = True
+
+    # This thread owns the mailbox until it is empty
     while True:
+        with mailbox_lock:
+            if not mailbox["pending"]:
+                mailbox["active"] = False
+                mailbox["idle_since"] = time.time()
+                return
+            next_value = mailbox["pending"].popleft()
         try:
-            schedule.run_pending()
-            time.sleep(1)
+            _process_message(next_value)
+            with mailbox_lock:
+                mailbox_stats["processed"] += 1
         except Exception as e:
-            logger.error(f"Error in scheduler: {e}", exc_info=True)
-            time.sleep(1)
+            logger.error(f"Unhandled error in mailbox for {whatsapp_number}: {e}", exc_info=True)
+
+
+def get_mailbox_stats() -> dict:
+    with mailbox_lock:
+        return {
+            **mailbox_stats,
+            "mailboxes": len(mailboxes),
+            "active": sum(1 for m in mailboxes.values() if m["active"]),
+            "waiting": sum(len(m["pending"]) for m in mailboxes.values()),
+        }
 
 
-# Start the scheduler in a separate thread
-scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-scheduler_thread.start()
-logger.info("Scheduler thread started")
+# ===== SCHEDULER FUNCTIONS =====
+# Job families: jobs in one family never overlap; different families run side by side
+NOTIFICATION_JOB_INTERVAL = int(os.getenv("NOTIFICATION_JOB_INTERVAL", "300"))
+FOLLOWUP_JOB_INTERVAL = int(os.getenv("FOLLOWUP_JOB_INTERVAL", "60"))
+
+
+def safe_process_notifications():
+    """Send pending notifications, then generate reminders and booking confirmations."""
+    logger.info("=== Running notification processing ===")
+    try:
+        process_notifications(supabase)
+        check_and_send_reminder_notifications(supabase)
+        check_and_send_booking_confirmations(supabase)
+    except Exception as e:
+        logger.error(f"Error in safe_process_notifications: {e}", exc_info=True)
+
+
+def safe_check_followups():
+    """Send due follow-up messages."""
+    logger.info("=== Running follow-up check ===")
+    check_and_send_followup_messages(supabase)
+
+
+def start_scheduler():
+    """
+    Register the notification and follow-up jobs and start the process-wide
+    scheduler once. Every process heartbeats the scheduler lease; only the
+    lease holder runs the jobs, so extra workers/replicas just serve webhooks.
+    """
+    elector = get_leader_elector(supabase)
+    scheduler.leader_check = elector.is_leader
+    scheduler.add_job("leader_heartbeat", elector.heartbeat_interval, elector.heartbeat, jitter=0, first_delay=0)
+    scheduler.add_job("notifications", NOTIFICATION_JOB_INTERVAL, safe_process_notifications,
+                      family="notifications", leader_only=True)
+    scheduler.add_job("followups", FOLLOWUP_JOB_INTERVAL, safe_check_followups,
+                      family="followups", leader_only=True)
+    if not scheduler.start():
+        logger.info("Scheduler already running in this process")
 
 
 def test_immediate_followup():
@@ -1234,6 +1336,7 @@ def test_immediate_followup():
 
 if __name__ == "__main__":
     logger.info("WhatsApp Bot Server Started")
+    start_scheduler()
    
     # Test booking confirmations immediately
     send_immediate_booking_confirmations()
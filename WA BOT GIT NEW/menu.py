@@ -10,7 +10,9 @@ from utils import (
     translate_template,
     send_image_message,
     get_notification_badge,
-    send_non_emergency_menu_updated
+    send_non_emergency_menu_updated,
+    invalidate_user_profile,
+    translate_many
 )
 from report_symptoms import handle_symptoms
 from checkup_booking import handle_checkup
@@ -116,18 +118,19 @@ def send_services_menu(whatsapp_number: str, supabase, clinic_id: str, category:
             send_clinic_selection_menu(whatsapp_number, supabase)
             return False
         
-        # Prepare service rows with proper truncation using gt_t_tt for titles and gt_dt_tt for descriptions
+        # Prepare service rows with proper truncation: gt_t_tt rules for titles and gt_dt_tt rules for descriptions,
+        # translated in one batch instead of once per row
+        shown_services = services[:8]  # WhatsApp allows max 8 rows
+        names = [service["service_name"] for service in shown_services]
+        descriptions = [service.get("description", "") or "" for service in shown_services]
+        translated = translate_many(
+            whatsapp_number, names + descriptions, supabase,
+            kind=["gt_t"] * len(names) + ["gt_dt"] * len(descriptions)
+        )
+        display_names, display_descriptions = translated[:len(names)], translated[len(names):]
+
         rows = []
-        for service in services[:8]:  # WhatsApp allows max 8 rows
-            service_name = service["service_name"]
-            description = service.get("description", "") or ""
-            
-            # Use gt_t_tt for service name (title) - 24 character limit
-            display_name = gt_t_tt(whatsapp_number, service_name, supabase)
-            
-            # Use gt_dt_tt for description - 72 character limit
-            display_description = gt_dt_tt(whatsapp_number, description, supabase) if description else ""
-            
+        for service, display_name, display_description in zip(shown_services, display_names, display_descriptions):
             rows.append({
                 "id": f"service_{service['id']}",
                 "title": display_name,
@@ -1215,6 +1218,7 @@ def _handle_interactive_message(whatsapp_number, user_id, supabase, user_data, m
             selected_language = lang_map.get(list_id, "en")
             try:
                 supabase.table("whatsapp_users").update({"language": selected_language}).eq("id", user_id).execute()
+                invalidate_user_profile(whatsapp_number, language=selected_language)
                 logger.info(f"Updated language for {whatsapp_number} to {selected_language}")
                 send_whatsapp_message(
                     whatsapp_number, "text",
@@ -2,7 +2,7 @@ import logging
 from datetime import datetime, timedelta
 import pytz
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from utils import send_free_notification, send_interactive_menu, translate_template, gt_t_tt, gt_tt, send_whatsapp_message, send_notification_with_fallback, send_template_for_notification
+from utils import send_free_notification, send_interactive_menu, translate_template, gt_t_tt, gt_tt, send_whatsapp_message, send_notification_with_fallback, send_notification_digest, send_template_for_notification, prime_user_profiles
 from supabase import create_client, Client
 import httpx
 import uuid
@@ -10,7 +10,14 @@ from collections import defaultdict
 import threading
 import traceback
 import os
+import time
+import random
 from dotenv import load_dotenv
+from notification_dispatch import dispatch_notifications, record_coalesced
+from reminder_schedule import (
+    SOURCE_BY_TABLE, REMINDER_MAX_LATENESS_SECONDS, booking_datetime, booking_is_live, claim_due_reminders,
+    record_outcomes, refresh_booking_reminders, reminder_notification_id, sync_reminder_schedule, unclaim_reminders
+)
 
 # Load environment variables
 load_dotenv()
@@ -30,7 +37,18 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 # Global variables for rate limiting and spam prevention
 notification_lock = threading.Lock()
 last_notification_time = {}
-processed_notification_ids = {}  # Track {notification_id: timestamp}
+
+# Rows fetched per page and wall-clock budget per run (the job runs every 5 minutes)
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "200"))
+NOTIFICATION_RUN_BUDGET_SECONDS = float(os.getenv("NOTIFICATION_RUN_BUDGET_SECONDS", "240"))
+# A claimed row not finished within this long (worker crashed) becomes claimable again
+NOTIFICATION_CLAIM_SECONDS = int(os.getenv("NOTIFICATION_CLAIM_SECONDS", "300"))
+# Failed sends are retried after base * 2^(attempts-1) seconds, capped, up to max attempts
+NOTIFICATION_RETRY_BASE_SECONDS = int(os.getenv("NOTIFICATION_RETRY_BASE_SECONDS", "60"))
+NOTIFICATION_RETRY_MAX_SECONDS = int(os.getenv("NOTIFICATION_RETRY_MAX_SECONDS", "3600"))
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "6"))
+# Due notifications for one user are coalesced into a single digest message, up to this many
+NOTIFICATION_DIGEST_MAX = int(os.getenv("NOTIFICATION_DIGEST_MAX", "10"))
 
 # -------------------------
 # Insert notification helper - UPDATED
@@ -127,298 +145,194 @@ def get_clinic_id_for_booking(booking, provider_cat):
 # -------------------------
 # Check and send booking confirmations (UPDATED FOR VACCINATION TABLE + TCM)
 # -------------------------
+def _checkup_confirmation(booking, whatsapp_number, supabase):
+    template = "Your checkup booking is confirmed on {date} at {time}."
+    return gt_tt(whatsapp_number, template, supabase).format(date=booking.get("date"), time=booking.get("time"))
+
+
+def _consultation_confirmation(booking, whatsapp_number, supabase):
+    template = "Your consultation booking is confirmed on {date} at {time}."
+    return gt_tt(whatsapp_number, template, supabase).format(date=booking.get("date"), time=booking.get("time"))
+
+
+def _vaccination_confirmation(booking, whatsapp_number, supabase):
+    # USE vaccine_type FOR VACCINATION
+    translated_vaccine = gt_tt(whatsapp_number, booking.get("vaccine_type", "Vaccination"), supabase)
+    template = "Your vaccination booking for {vaccine_type} is confirmed on {date} at {time}."
+    return gt_tt(whatsapp_number, template, supabase).format(
+        vaccine_type=translated_vaccine, date=booking.get("date"), time=booking.get("time"))
+
+
+def _tcm_confirmation(booking, whatsapp_number, supabase):
+    # Use new date/time if the booking was rescheduled, otherwise original
+    translated_type = gt_tt(whatsapp_number, booking.get("booking_type", "consultation"), supabase)
+    template = "Your TCM {booking_type} booking is confirmed on {date} at {time}."
+    return gt_tt(whatsapp_number, template, supabase).format(
+        booking_type=translated_type,
+        date=booking.get("new_date") or booking.get("original_date"),
+        time=booking.get("new_time") or booking.get("original_time"))
+
+
+# (table, columns, provider_cat, message builder, only confirmed rows)
+BOOKING_CONFIRMATION_SOURCES = [
+    ("c_s_checkup", "id, user_id, date, time, details, repeated_visit_uuid, created_at, doctor_id",
+     "clinic", _checkup_confirmation, False),
+    ("c_s_consultation", "id, user_id, date, time, details, repeated_visit_uuid, created_at, doctor_id",
+     "clinic", _consultation_confirmation, False),
+    ("c_s_vaccination", "id, user_id, date, time, vaccine_type, repeated_visit_uuid, created_at, doctor_id",
+     "clinic", _vaccination_confirmation, False),
+    ("tcm_s_bookings", "id, user_id, original_date, original_time, new_date, new_time, booking_type, details, "
+     "repeated_visit_uuid, created_at, status, doctor_id",
+     "tcm", _tcm_confirmation, True),
+]
+
+# provider_cat -> doctor table holding clinic_id
+DOCTOR_TABLES = {"clinic": "c_a_doctors", "tcm": "tcm_a_doctors"}
+
+
+def _fetch_doctor_clinics(supabase, doctor_ids_by_cat):
+    """Resolve {(provider_cat, doctor_id): clinic_id} with one in_() query per doctor table."""
+    clinics = {}
+    for provider_cat, doctor_ids in doctor_ids_by_cat.items():
+        if not doctor_ids:
+            continue
+        try:
+            resp = supabase.table(DOCTOR_TABLES[provider_cat]).select("id, clinic_id").in_("id", list(doctor_ids)).execute()
+            for row in resp.data or []:
+                clinics[(provider_cat, row["id"])] = row.get("clinic_id")
+        except Exception as e:
+            logger.error(f"Error getting clinic_id for {provider_cat} bookings: {e}")
+    return clinics
+
+
+def _insert_notifications_bulk(rows):
+    """Insert all rows in one call; if that fails (e.g. a duplicate raced in), fall back to row by row."""
+    if not rows:
+        return 0
+    try:
+        supabase.table("c_notifications").insert(rows).execute()
+        return len(rows)
+    except Exception as e:
+        logger.warning(f"Bulk notification insert failed ({e}), inserting {len(rows)} rows individually")
+    inserted = 0
+    for row in rows:
+        if insert_notification(
+            whatsapp_number=row["whatsapp_number"],
+            case_id=row["case_id"],
+            message=row["notification"],
+            user_id=row["user_id"],
+            reminder_type=row["reminder_type"],
+            provider_cat=row["provider_cat"],
+            clinic_id=row["clinic_id"]
+        ):
+            inserted += 1
+    return inserted
+
+
 def check_and_send_booking_confirmations(supabase):
     """
     Check for new bookings in checkup, consultation, vaccination, and TCM tables
     and send confirmation notifications.
-    Handles both single bookings and repeated visits.
+    Runs as a batch: one query per booking table, then users, doctor clinics and
+    existing notifications are resolved with in_() queries and all new
+    notifications are inserted in a single call.
     """
     try:
-        logger.info(translate_template("+1234567890", "Checking for new bookings to send confirmations...", supabase))
-        
+        logger.info("Checking for new bookings to send confirmations...")
+
         now = datetime.now(MALAYSIA_TZ)
         one_hour_ago = (now - timedelta(hours=1)).isoformat()
-        
-        # Check checkup bookings - UPDATED with doctor_id
-        try:
-            checkup_resp = supabase.table("c_s_checkup").select(
-                "id, user_id, date, time, details, repeated_visit_uuid, created_at, doctor_id"
-            ).gte("created_at", one_hour_ago).execute()
-            
-            logger.info(translate_template("+1234567890", "Found {count} new bookings in c_s_checkup", supabase).format(count=len(checkup_resp.data or [])))
-            
-            for booking in checkup_resp.data or []:
-                try:
-                    user_id = booking["user_id"]
-                    repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                    
-                    # Get user's WhatsApp number
-                    user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", user_id).execute()
-                    if not user_resp.data:
-                        logger.error(translate_template("+1234567890", "No user found for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                        
-                    whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                    if not whatsapp_number:
-                        logger.error(translate_template("+1234567890", "No WhatsApp number for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                    
-                    # Get clinic_id for clinic booking
-                    clinic_id = get_clinic_id_for_booking(booking, "clinic")
-                    
-                    # Check if notification already exists for this booking
-                    existing = supabase.table("c_notifications").select("id").eq("user_id", user_id).eq("case_id", booking["id"]).eq("reminder_type", "confirm").execute()
-                    if existing.data:
-                        logger.info(translate_template(whatsapp_number, "Notification already exists for booking {booking_id}. Skipping.", supabase).format(booking_id=booking['id']))
-                        continue
-                    
-                    # Single booking - create individual notification
-                    booking_date = booking.get("date")
-                    booking_time = booking.get("time")
-                    
-                    # Get booking details
-                    details = booking.get("details", "Checkup")
-                    template = "Your checkup booking is confirmed on {date} at {time}."
-                    notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                        date=booking_date,
-                        time=booking_time
-                    )
-                    
-                    # Insert single booking notification
-                    insert_notification(
-                        whatsapp_number=whatsapp_number,
-                        case_id=booking["id"],
-                        message=notification_msg,
-                        user_id=user_id,
-                        reminder_type="confirm",
-                        provider_cat="clinic",
-                        clinic_id=clinic_id
-                    )
-                    logger.info(translate_template(whatsapp_number, "Created single checkup notification for {whatsapp_number}, booking {booking_id}", supabase).format(
-                        whatsapp_number=whatsapp_number, booking_id=booking['id']))
-                        
-                except Exception as e:
-                    logger.error(translate_template("+1234567890", "Error processing checkup booking {booking_id}: {error}", supabase).format(
-                        booking_id=booking.get('id'), error=str(e)), exc_info=True)
-                    continue
-                    
-        except Exception as e:
-            logger.error(translate_template("+1234567890", "Error fetching from c_s_checkup: {error}", supabase).format(error=str(e)), exc_info=True)
-        
-        # Check consultation bookings - UPDATED with doctor_id
-        try:
-            consultation_resp = supabase.table("c_s_consultation").select(
-                "id, user_id, date, time, details, repeated_visit_uuid, created_at, doctor_id"
-            ).gte("created_at", one_hour_ago).execute()
-            
-            logger.info(translate_template("+1234567890", "Found {count} new bookings in c_s_consultation", supabase).format(count=len(consultation_resp.data or [])))
-            
-            for booking in consultation_resp.data or []:
-                try:
-                    user_id = booking["user_id"]
-                    repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                    
-                    # Get user's WhatsApp number
-                    user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", user_id).execute()
-                    if not user_resp.data:
-                        logger.error(translate_template("+1234567890", "No user found for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                        
-                    whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                    if not whatsapp_number:
-                        logger.error(translate_template("+1234567890", "No WhatsApp number for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                    
-                    # Get clinic_id for clinic booking
-                    clinic_id = get_clinic_id_for_booking(booking, "clinic")
-                    
-                    # Check if notification already exists for this booking
-                    existing = supabase.table("c_notifications").select("id").eq("user_id", user_id).eq("case_id", booking["id"]).eq("reminder_type", "confirm").execute()
-                    if existing.data:
-                        logger.info(translate_template(whatsapp_number, "Notification already exists for booking {booking_id}. Skipping.", supabase).format(booking_id=booking['id']))
-                        continue
-                    
-                    # Single booking - create individual notification
-                    booking_date = booking.get("date")
-                    booking_time = booking.get("time")
-                    
-                    # Get booking details
-                    details = booking.get("details", "Consultation")
-                    template = "Your consultation booking is confirmed on {date} at {time}."
-                    notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                        date=booking_date,
-                        time=booking_time
-                    )
-                    
-                    # Insert single booking notification
-                    insert_notification(
-                        whatsapp_number=whatsapp_number,
-                        case_id=booking["id"],
-                        message=notification_msg,
-                        user_id=user_id,
-                        reminder_type="confirm",
-                        provider_cat="clinic",
-                        clinic_id=clinic_id
-                    )
-                    logger.info(translate_template(whatsapp_number, "Created single consultation notification for {whatsapp_number}, booking {booking_id}", supabase).format(
-                        whatsapp_number=whatsapp_number, booking_id=booking['id']))
-                        
-                except Exception as e:
-                    logger.error(translate_template("+1234567890", "Error processing consultation booking {booking_id}: {error}", supabase).format(
-                        booking_id=booking.get('id'), error=str(e)), exc_info=True)
+
+        # 1. New bookings from every source table
+        bookings = []  # (provider_cat, builder, booking)
+        for table, columns, provider_cat, builder, confirmed_only in BOOKING_CONFIRMATION_SOURCES:
+            try:
+                query = supabase.table(table).select(columns).gte("created_at", one_hour_ago)
+                if confirmed_only:
+                    query = query.eq("status", "confirmed")
+                rows = query.execute().data or []
+                logger.info(f"Found {len(rows)} new bookings in {table}")
+                bookings.extend((provider_cat, builder, booking) for booking in rows)
+            except Exception as e:
+                logger.error(f"Error fetching from {table}: {e}", exc_info=True)
+
+        if not bookings:
+            return
+
+        # 2. Resolve users, doctor clinics and existing notifications in bulk
+        user_ids = list({booking["user_id"] for _, _, booking in bookings if booking.get("user_id")})
+        users_resp = supabase.table("whatsapp_users").select(
+            "id, whatsapp_number, language, user_name"
+        ).in_("id", user_ids).execute()
+        users = {row["id"]: row for row in users_resp.data or []}
+        prime_user_profiles(users_resp.data)
+
+        doctor_ids_by_cat = {}
+        for provider_cat, _, booking in bookings:
+            if booking.get("doctor_id"):
+                doctor_ids_by_cat.setdefault(provider_cat, set()).add(booking["doctor_id"])
+        doctor_clinics = _fetch_doctor_clinics(supabase, doctor_ids_by_cat)
+
+        # One confirmation per booking; a TCM booking is also skipped when a confirmation
+        # was already written under its series uuid (as the baseline lookup did)
+        case_ids = set()
+        for _, _, booking in bookings:
+            case_ids.add(booking["id"])
+            if booking.get("repeated_visit_uuid"):
+                case_ids.add(booking["repeated_visit_uuid"])
+        existing_resp = supabase.table("c_notifications").select("user_id, case_id").eq(
+            "reminder_type", "confirm"
+        ).in_("case_id", list(case_ids)).execute()
+        existing = {(row["user_id"], row["case_id"]) for row in existing_resp.data or []}
+
+        # 3. Diff in memory
+        new_rows = []
+        for provider_cat, builder, booking in bookings:
+            try:
+                user_id = booking["user_id"]
+                user = users.get(user_id)
+                if not user:
+                    logger.error(f"No user found for user_id {user_id}")
                     continue
-                    
-        except Exception as e:
-            logger.error(translate_template("+1234567890", "Error fetching from c_s_consultation: {error}", supabase).format(error=str(e)), exc_info=True)
-        
-        # Check vaccination bookings (USING vaccine_type INSTEAD OF details) - UPDATED with doctor_id
-        try:
-            vaccination_resp = supabase.table("c_s_vaccination").select(
-                "id, user_id, date, time, vaccine_type, repeated_visit_uuid, created_at, doctor_id"
-            ).gte("created_at", one_hour_ago).execute()
-            
-            logger.info(translate_template("+1234567890", "Found {count} new bookings in c_s_vaccination", supabase).format(count=len(vaccination_resp.data or [])))
-            
-            for booking in vaccination_resp.data or []:
-                try:
-                    user_id = booking["user_id"]
-                    repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                    
-                    # Get user's WhatsApp number
-                    user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", user_id).execute()
-                    if not user_resp.data:
-                        logger.error(translate_template("+1234567890", "No user found for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                        
-                    whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                    if not whatsapp_number:
-                        logger.error(translate_template("+1234567890", "No WhatsApp number for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                    
-                    # Get clinic_id for clinic booking
-                    clinic_id = get_clinic_id_for_booking(booking, "clinic")
-                    
-                    # Check if notification already exists for this booking
-                    existing = supabase.table("c_notifications").select("id").eq("user_id", user_id).eq("case_id", booking["id"]).eq("reminder_type", "confirm").execute()
-                    if existing.data:
-                        logger.info(translate_template(whatsapp_number, "Notification already exists for booking {booking_id}. Skipping.", supabase).format(booking_id=booking['id']))
-                        continue
-                    
-                    # Single booking - create individual notification
-                    booking_date = booking.get("date")
-                    booking_time = booking.get("time")
-                    
-                    # Get booking details - USE vaccine_type FOR VACCINATION
-                    details = booking.get("vaccine_type", "Vaccination")
-                    translated_vaccine = gt_tt(whatsapp_number, details, supabase)
-                    template = "Your vaccination booking for {vaccine_type} is confirmed on {date} at {time}."
-                    notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                        vaccine_type=translated_vaccine,
-                        date=booking_date,
-                        time=booking_time
-                    )
-                    
-                    # Insert single booking notification
-                    insert_notification(
-                        whatsapp_number=whatsapp_number,
-                        case_id=booking["id"],
-                        message=notification_msg,
-                        user_id=user_id,
-                        reminder_type="confirm",
-                        provider_cat="clinic",
-                        clinic_id=clinic_id
-                    )
-                    logger.info(translate_template(whatsapp_number, "Created single vaccination notification for {whatsapp_number}, booking {booking_id}", supabase).format(
-                        whatsapp_number=whatsapp_number, booking_id=booking['id']))
-                        
-                except Exception as e:
-                    logger.error(translate_template("+1234567890", "Error processing vaccination booking {booking_id}: {error}", supabase).format(
-                        booking_id=booking.get('id'), error=str(e)), exc_info=True)
+                whatsapp_number = (user.get("whatsapp_number") or "").lstrip('+')
+                if not whatsapp_number:
+                    logger.error(f"No WhatsApp number for user_id {user_id}")
                     continue
-                    
-        except Exception as e:
-            logger.error(translate_template("+1234567890", "Error fetching from c_s_vaccination: {error}", supabase).format(error=str(e)), exc_info=True)
 
-        # Check TCM bookings
-        try:
-            tcm_resp = supabase.table("tcm_s_bookings").select(
-                "id, user_id, original_date, original_time, new_date, new_time, booking_type, details, repeated_visit_uuid, created_at, status, doctor_id"
-            ).gte("created_at", one_hour_ago).eq("status", "confirmed").execute()
-            
-            logger.info(translate_template("+1234567890", "Found {count} new TCM bookings", supabase).format(count=len(tcm_resp.data or [])))
-            
-            for booking in tcm_resp.data or []:
-                try:
-                    user_id = booking["user_id"]
-                    repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                    
-                    # Get user's WhatsApp number
-                    user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", user_id).execute()
-                    if not user_resp.data:
-                        logger.error(translate_template("+1234567890", "No user found for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                        
-                    whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                    if not whatsapp_number:
-                        logger.error(translate_template("+1234567890", "No WhatsApp number for user_id {user_id}", supabase).format(user_id=user_id))
-                        continue
-                    
-                    # Get clinic_id for TCM booking (from doctor to clinic relationship)
-                    clinic_id = None
-                    try:
-                        # Get doctor's clinic
-                        if booking.get("doctor_id"):
-                            doctor_resp = supabase.table("tcm_a_doctors").select("clinic_id").eq("id", booking["doctor_id"]).execute()
-                            if doctor_resp.data and doctor_resp.data[0].get("clinic_id"):
-                                clinic_id = doctor_resp.data[0]["clinic_id"]
-                    except Exception as clinic_err:
-                        logger.error(translate_template("+1234567890", "Error getting clinic_id for TCM booking: {error}", supabase).format(error=str(clinic_err)))
-                    
-                    # Check if notification already exists for this booking
-                    case_id_to_check = repeated_visit_uuid if repeated_visit_uuid else booking["id"]
-                    
-                    existing = supabase.table("c_notifications").select("id").eq("user_id", user_id).eq("case_id", case_id_to_check).eq("reminder_type", "confirm").execute()
-                    if existing.data:
-                        logger.info(translate_template(whatsapp_number, "Notification already exists for TCM booking {booking_id}. Skipping.", supabase).format(booking_id=booking['id']))
-                        continue
-                    
-                    # Get appointment date and time (use new if available, otherwise original)
-                    booking_date = booking.get("new_date") or booking.get("original_date")
-                    booking_time = booking.get("new_time") or booking.get("original_time")
-                    
-                    # Single booking - create individual notification
-                    details = booking.get("details", "TCM Consultation")
-                    booking_type = booking.get("booking_type", "consultation")
-                    translated_type = gt_tt(whatsapp_number, booking_type, supabase)
-                    template = "Your TCM {booking_type} booking is confirmed on {date} at {time}."
-                    notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                        booking_type=translated_type,
-                        date=booking_date,
-                        time=booking_time
-                    )
-                    
-                    # Insert single booking notification
-                    insert_notification(
-                        whatsapp_number=whatsapp_number,
-                        case_id=booking["id"],
-                        message=notification_msg,
-                        user_id=user_id,
-                        reminder_type="confirm",
-                        provider_cat="tcm",
-                        clinic_id=clinic_id
-                    )
-                    logger.info(translate_template(whatsapp_number, "Created single TCM notification for {whatsapp_number}, booking {booking_id}", supabase).format(
-                        whatsapp_number=whatsapp_number, booking_id=booking['id']))
-                        
-                except Exception as e:
-                    logger.error(translate_template("+1234567890", "Error processing TCM booking {booking_id}: {error}", supabase).format(
-                        booking_id=booking.get('id'), error=str(e)), exc_info=True)
+                case_keys = {(user_id, booking["id"])}
+                if provider_cat == "tcm" and booking.get("repeated_visit_uuid"):
+                    case_keys.add((user_id, booking["repeated_visit_uuid"]))
+                if case_keys & existing:
+                    logger.info(f"Notification already exists for {provider_cat} booking {booking['id']}. Skipping.")
                     continue
-                    
-        except Exception as e:
-            logger.error(translate_template("+1234567890", "Error fetching from tcm_s_bookings: {error}", supabase).format(error=str(e)), exc_info=True)
+                # Rows are written under the booking id, so later bookings of the same
+                # series still get theirs in this batch, exactly as on the next tick
+                existing.add((user_id, booking["id"]))
+
+                new_rows.append({
+                    "id": str(uuid.uuid4()),
+                    "whatsapp_number": whatsapp_number,
+                    "case_id": booking["id"],
+                    "notification": builder(booking, whatsapp_number, supabase),
+                    "user_id": user_id,
+                    "sent": False,
+                    "prompted": False,
+                    "seen": False,
+                    "noted": False,
+                    "time": datetime.now(MALAYSIA_TZ).isoformat(),
+                    "reminder_type": "confirm",
+                    "provider_cat": provider_cat,
+                    "clinic_id": doctor_clinics.get((provider_cat, booking.get("doctor_id")))
+                })
+            except Exception as e:
+                logger.error(f"Error processing {provider_cat} booking {booking.get('id')}: {e}", exc_info=True)
+
+        # 4. One insert for everything new
+        inserted = _insert_notifications_bulk(new_rows)
+        logger.info(f"Created {inserted} booking confirmation notifications from {len(bookings)} new bookings")
+
     except Exception as e:
-        logger.error(translate_template("+1234567890", "Error fetching from tcm_s_bookings: {error}", supabase).format(error=str(e)), exc_info=True)
+        logger.error(f"Error in check_and_send_booking_confirmations: {e}", exc_info=True)
 
 # -------------------------
 # NEW: Check and send ambulance notifications for a_day reminder_type
@@ -596,142 +510,255 @@ def send_immediate_booking_confirmations():
 
 # notification.py - UPDATED process_notifications function
 
+def _select_sendable(rows, now):
+    """
+    Drop rows that must not be sent in this run: no number, or the user already
+    got a notification within 5 minutes (retry timing is handled by
+    next_attempt_at). Up to NOTIFICATION_DIGEST_MAX rows per number are
+    selected; they go out together as one message (see _group_by_number).
+    The throttle is only read here; _stamp_claimed sets it once rows are claimed.
+    """
+    sendable = []
+    selected = defaultdict(int)
+    for row in rows:
+        wnum = row.get("whatsapp_number")
+        if not wnum:
+            continue
+
+        if not selected[wnum]:
+            last_time = last_notification_time.get(wnum, 0)
+            if now - last_time < 300:  # 300 seconds = 5 minutes throttle per user
+                logger.debug(f"Throttling notification for {wnum} - last sent {now - last_time:.1f}s ago")
+                continue
+        elif selected[wnum] >= NOTIFICATION_DIGEST_MAX:
+            continue
+
+        selected[wnum] += 1
+        sendable.append(row)
+    return sendable
+
+
+def _stamp_claimed(rows, now):
+    """Start the 5-minute throttle for the numbers this worker actually claimed."""
+    for row in rows:
+        last_notification_time[row["whatsapp_number"]] = now
+
+
+def _group_by_number(rows):
+    """
+    One send unit per number: {"id", "whatsapp_number", "rows"} with the rows
+    oldest first. A unit with several rows is delivered as a digest.
+    """
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row["whatsapp_number"]].append(row)
+    return [
+        {"id": wnum, "whatsapp_number": wnum, "rows": sorted(group, key=lambda row: row["time"])}
+        for wnum, group in groups.items()
+    ]
+
+
+# c_notifications is an outbox. Delivery columns (sent stays the "delivered" flag
+# the badge and notification list read):
+#
+#   alter table c_notifications
+#       add column status text not null default 'queued',      -- queued, claimed, sent, failed
+#       add column claimed_until timestamptz,
+#       add column attempts integer not null default 0,
+#       add column next_attempt_at timestamptz not null default now();
+#   update c_notifications set status = 'sent' where sent;
+#   create index on c_notifications (next_attempt_at) where status in ('queued', 'claimed');
+
+def _claimable_filter(now_iso):
+    """Queued rows whose retry time has come, or claims whose lease ran out."""
+    return f'and(status.eq.queued,next_attempt_at.lte."{now_iso}"),and(status.eq.claimed,claimed_until.lt."{now_iso}")'
+
+
+def _claimable_page_filter(now_iso, cursor=None):
+    """
+    _claimable_filter restricted to rows after cursor = (time, id) in
+    (time desc, id desc) order. PostgREST takes one or= per query, so the two
+    ORs are multiplied out into a single one.
+    """
+    if not cursor:
+        return _claimable_filter(now_iso)
+    claimable = [f'status.eq.queued,next_attempt_at.lte."{now_iso}"',
+                 f'status.eq.claimed,claimed_until.lt."{now_iso}"']
+    last_time, last_id = cursor
+    after = [f'time.lt."{last_time}"', f'time.eq."{last_time}",id.lt."{last_id}"']
+    return ",".join(f"and({term},{page})" for term in claimable for page in after)
+
+
+def _claim_notifications(supabase, rows):
+    """
+    Claim rows for this worker with a lease: a conditional update that only
+    matches rows still claimable with the attempt count we read, so two
+    workers can never claim the same row. Returns the rows actually claimed.
+    """
+    if not rows:
+        return []
+    now = datetime.now(MALAYSIA_TZ)
+    claimed_until = (now + timedelta(seconds=NOTIFICATION_CLAIM_SECONDS)).isoformat()
+    by_attempts = defaultdict(list)
+    for row in rows:
+        by_attempts[row.get("attempts") or 0].append(row["id"])
+
+    claimed_ids = set()
+    for attempts, ids in by_attempts.items():
+        try:
+            result = supabase.table("c_notifications").update({
+                "status": "claimed",
+                "claimed_until": claimed_until,
+                "attempts": attempts + 1
+            }).in_("id", ids).eq("attempts", attempts).or_(_claimable_filter(now.isoformat())).execute()
+            claimed_ids.update(row["id"] for row in result.data or [])
+        except Exception as e:
+            logger.error(f"Error claiming {len(ids)} notifications: {e}")
+
+    if len(claimed_ids) < len(rows):
+        logger.info(f"Claimed {len(claimed_ids)} of {len(rows)} notifications (others taken by another worker)")
+    return [{**row, "attempts": (row.get("attempts") or 0) + 1} for row in rows if row["id"] in claimed_ids]
+
+
+def _complete_notifications(supabase, notification_ids):
+    """Mark delivered rows sent in a single write."""
+    if not notification_ids:
+        return
+    try:
+        supabase.table("c_notifications").update({
+            "status": "sent",
+            "sent": True,
+            "claimed_until": None
+        }).in_("id", notification_ids).execute()
+    except Exception as e:
+        logger.error(f"Error marking {len(notification_ids)} notifications sent: {e}")
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with +/-20% jitter for a row that has failed `attempts` times."""
+    delay = min(NOTIFICATION_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), NOTIFICATION_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _release_notifications(supabase, rows):
+    """
+    Put failed rows back in the queue with exponential backoff, one write per
+    attempt count; rows out of attempts are parked as failed.
+    """
+    by_attempts = defaultdict(list)
+    for row in rows:
+        by_attempts[row["attempts"]].append(row["id"])
+    now = datetime.now(MALAYSIA_TZ)
+    for attempts, ids in by_attempts.items():
+        if attempts >= NOTIFICATION_MAX_ATTEMPTS:
+            update = {"status": "failed", "claimed_until": None}
+            logger.warning(f"Giving up on {len(ids)} notifications after {attempts} attempts")
+        else:
+            update = {"status": "queued", "claimed_until": None,
+                      "next_attempt_at": (now + timedelta(seconds=retry_delay_seconds(attempts))).isoformat()}
+        try:
+            supabase.table("c_notifications").update(update).in_("id", ids).execute()
+        except Exception as e:
+            # Still claimed; the lease expiry makes them claimable again
+            logger.error(f"Error releasing {len(ids)} failed notifications: {e}")
+
+
+def _send_notification_row(row, supabase):
+    wnum = row["whatsapp_number"]
+    reminder_type = row.get("reminder_type") or "general"
+    logger.info(f"Processing notification {row['id']} for {wnum}, type: {reminder_type}, "
+                f"provider_cat: {row.get('provider_cat')}, clinic_id: {row.get('clinic_id')}")
+    # Interactive notification with header/footer/button first, template fallback
+    return send_notification_with_fallback(
+        to=wnum,
+        message=row["notification"],
+        reminder_type=reminder_type,
+        supabase=supabase
+    )
+
+
+def _send_notification_unit(unit, supabase):
+    rows = unit["rows"]
+    if len(rows) == 1:
+        return _send_notification_row(rows[0], supabase)
+    logger.info(f"Coalescing {len(rows)} notifications for {unit['whatsapp_number']} into one digest")
+    return send_notification_digest(
+        to=unit["whatsapp_number"],
+        messages=[row["notification"] for row in rows],
+        reminder_types=[row.get("reminder_type") or "general" for row in rows],
+        supabase=supabase
+    )
+
+
 def process_notifications(supabase):
     """
     Send WhatsApp messages for notifications using the free-first, template-fallback strategy.
+    Claimable rows (queued and due, or with an expired claim) are pulled in pages of
+    NOTIFICATION_BATCH_SIZE, claimed with a lease, coalesced into one message per user
+    and sent concurrently through notification_dispatch (bounded pool + business-wide
+    token bucket) until the backlog is empty or NOTIFICATION_RUN_BUDGET_SECONDS is used
+    up. Failed sends are retried
+    with exponential backoff; a crash mid-send leaves rows claimed until the lease ends.
     """
     try:
-        # Get all unsent notifications from the last 24 hours only
+        started = time.monotonic()
+        # Get all undelivered notifications from the last 24 hours only
         twenty_four_hours_ago = (datetime.now(MALAYSIA_TZ) - timedelta(hours=24)).isoformat()
-        
-        with notification_lock:
-            # Get notifications that are not sent and not currently being processed
-            resp = supabase.table("c_notifications").select(
-                "id, user_id, whatsapp_number, notification, time, reminder_type, case_id, sent, provider_cat, clinic_id"
-            ).eq("sent", False).gte("time", twenty_four_hours_ago).order("time", desc=True).limit(50).execute()
-            
-            logger.info(translate_template("+1234567890", "Found {count} total unsent notifications to process (last 24 hours)", supabase).format(
-                count=len(resp.data or [])))
-            
-            if not resp.data:
-                return
+        total_sent = total_failed = 0
 
-            now = datetime.now().timestamp()
-            
-            # Track which notifications we're processing in this batch
-            processing_ids = []
-            for row in resp.data:
-                notification_id = row['id']
-                wnum = row.get("whatsapp_number")
-                
-                if not wnum:
-                    continue
+        with notification_lock:
+            cursor = None
+            while time.monotonic() - started < NOTIFICATION_RUN_BUDGET_SECONDS:
+                now = datetime.now().timestamp()
+                rows = supabase.table("c_notifications").select(
+                    "id, user_id, whatsapp_number, notification, time, reminder_type, case_id, sent, provider_cat, "
+                    "clinic_id, status, attempts"
+                ).or_(_claimable_page_filter(datetime.now(MALAYSIA_TZ).isoformat(), cursor)) \
+                    .gte("time", twenty_four_hours_ago) \
+                    .order("time", desc=True).order("id", desc=True) \
+                    .limit(NOTIFICATION_BATCH_SIZE).execute().data or []
 
-                # Skip if processed recently (within last 5 minutes)
-                if notification_id in processed_notification_ids:
-                    last_processed = processed_notification_ids[notification_id]
-                    if now - last_processed < 300:  # 5 minutes cooldown
-                        logger.debug(translate_template("+1234567890", "Skipping notification {notification_id} - processed recently", supabase).format(
-                            notification_id=notification_id))
-                        continue
-                
-                # Add to processing batch
-                processing_ids.append(notification_id)
-            
-            if not processing_ids:
-                return
-            
-            # Now mark these notifications as being processed (atomic update)
-            try:
-                mark_result = supabase.table("c_notifications").update({
-                    "sent": True  # Mark as sent immediately to prevent other processes from picking it up
-                }).in_("id", processing_ids).eq("sent", False).execute()
-                
-                if not mark_result.data:
-                    logger.warning(translate_template("+1234567890", "No notifications were marked for processing (already being processed?)", supabase))
-                    return
-                    
-            except Exception as e:
-                logger.error(translate_template("+1234567890", "Error marking notifications for processing: {error}", supabase).format(error=str(e)))
-                return
-            
-            # Now process each marked notification
-            for row in resp.data:
-                notification_id = row['id']
-                if notification_id not in processing_ids:
-                    continue
-                    
-                wnum = row.get("whatsapp_number")
-                if not wnum:
-                    continue
+                # Throttled rows stay queued, so page on (time, id) past everything already looked at
+                if not rows:
+                    break
+                cursor = (rows[-1]["time"], rows[-1]["id"])
+                fresh = rows
+                logger.info(f"Found {len(fresh)} claimable notifications to process (last 24 hours)")
 
-                # Apply rate limiting per user
-                last_time = last_notification_time.get(wnum, 0)
-                if now - last_time < 300:  # 300 seconds = 5 minutes throttle per user
-                    logger.debug(translate_template("+1234567890", "Throttling notification for {wnum} - last sent {time_diff:.1f}s ago", supabase).format(
-                        wnum=wnum, time_diff=now - last_time))
-                    # Unmark this notification since we're skipping it
-                    try:
-                        supabase.table("c_notifications").update({
-                            "sent": False
-                        }).eq("id", notification_id).execute()
-                    except:
-                        pass
-                    continue
-                
-                last_notification_time[wnum] = now
+                # Claims that expired on their last attempt (worker died) are not retried again
+                exhausted = [row for row in fresh if (row.get("attempts") or 0) >= NOTIFICATION_MAX_ATTEMPTS]
+                if exhausted:
+                    _release_notifications(supabase, exhausted)
+                    fresh = [row for row in fresh if (row.get("attempts") or 0) < NOTIFICATION_MAX_ATTEMPTS]
 
-                notification_message = row['notification']
-                reminder_type = row.get('reminder_type', 'general')
-                provider_cat = row.get('provider_cat')
-                clinic_id = row.get('clinic_id')
-                
-                # LOG THE FIELDS TO SEE WHAT WE HAVE
-                logger.info(translate_template("+1234567890", "Processing notification {notification_id} for {wnum}, type: {reminder_type}, provider_cat: {provider_cat}, clinic_id: {clinic_id}", supabase).format(
-                    notification_id=notification_id, wnum=wnum, reminder_type=reminder_type, provider_cat=provider_cat, clinic_id=clinic_id))
-                
-                try:
-                    # Use the proper strategy: interactive notification with header/footer/button first, template fallback
-                    # PASS THE ACTUAL reminder_type FROM DATABASE ROW
-                    success = send_notification_with_fallback(
-                        to=wnum,
-                        message=notification_message,
-                        reminder_type=reminder_type,  # PASSING THE ACTUAL reminder_type
-                        supabase=supabase
+                claimed = _claim_notifications(supabase, _select_sendable(fresh, now))
+                if claimed:
+                    _stamp_claimed(claimed, now)
+                    units = _group_by_number(claimed)
+                    digests = [unit for unit in units if len(unit["rows"]) > 1]
+                    if digests:
+                        record_coalesced(len(digests), sum(len(unit["rows"]) for unit in digests))
+                    sent_numbers, failed_numbers = dispatch_notifications(
+                        units, lambda unit: _send_notification_unit(unit, supabase)
                     )
-                    
-                    if success:
-                        # Already marked as sent above, just update the timestamp
-                        processed_notification_ids[notification_id] = now
-                        logger.info(translate_template("+1234567890", "Successfully sent notification {notification_id} for {wnum} with reminder_type: {reminder_type}", supabase).format(
-                            notification_id=notification_id, wnum=wnum, reminder_type=reminder_type))
-                    else:
-                        logger.error(translate_template("+1234567890", "Failed to send notification {notification_id} to {wnum} (all methods failed)", supabase).format(
-                            notification_id=notification_id, wnum=wnum))
-                        # Mark as not sent so it can be retried
-                        try:
-                            supabase.table("c_notifications").update({
-                                "sent": False
-                            }).eq("id", notification_id).execute()
-                        except:
-                            pass
-                        # Still track as processed to avoid immediate retry
-                        processed_notification_ids[notification_id] = now
-                        
-                except Exception as e:
-                    logger.error(translate_template("+1234567890", "Error sending notification {notification_id} to {wnum}: {error}", supabase).format(
-                        notification_id=notification_id, wnum=wnum, error=str(e)), exc_info=True)
-                    # Mark as not sent for retry
-                    try:
-                        supabase.table("c_notifications").update({
-                            "sent": False
-                        }).eq("id", notification_id).execute()
-                    except:
-                        pass
-                    processed_notification_ids[notification_id] = now
+                    rows_by_number = {unit["id"]: unit["rows"] for unit in units}
+                    sent_ids = [row["id"] for wnum in sent_numbers for row in rows_by_number[wnum]]
+                    failed_rows = [row for wnum in failed_numbers for row in rows_by_number[wnum]]
+                    _complete_notifications(supabase, sent_ids)
+                    _release_notifications(supabase, failed_rows)
+                    total_sent += len(sent_ids)
+                    total_failed += len(failed_rows)
+
+                if len(rows) < NOTIFICATION_BATCH_SIZE:
+                    break
+
+        elapsed = time.monotonic() - started
+        if total_sent or total_failed:
+            logger.info(f"process_notifications: {total_sent} sent, {total_failed} failed in {elapsed:.1f}s "
+                        f"({total_sent / elapsed if elapsed else 0:.1f} sends/sec)")
 
     except Exception as e:
-        logger.error(translate_template("+1234567890", "Error in process_notifications: {error}", supabase).format(error=str(e)), exc_info=True)
+        logger.error(f"Error in process_notifications: {e}", exc_info=True)
 # -------------------------
 # Update notification seen status
 # -------------------------
@@ -912,13 +939,12 @@ def display_and_clear_notifications(supabase, whatsapp_number: str):
 # Helper function to get user language
 # -------------------------
 def get_user_language(supabase, whatsapp_number: str) -> str:
-    """Get user's language preference from database."""
+    """Get user's language preference (served from the utils profile cache)."""
     try:
-        from_number_norm = whatsapp_number.lstrip("+").strip()
-        number_variants = [from_number_norm, f"+{from_number_norm}"]
-        response = supabase.table("whatsapp_users").select("language").in_("whatsapp_number", number_variants).limit(1).execute()
-        if response.data:
-            return response.data[0]["language"]
+        from utils import get_user_profile
+        profile = get_user_profile(supabase, whatsapp_number)
+        if profile:
+            return profile["language"]
         return "en"
     except Exception as e:
         logger.error(translate_template("+1234567890", "Error fetching language for {whatsapp_number}: {error}", supabase).format(
@@ -926,666 +952,226 @@ def get_user_language(supabase, whatsapp_number: str) -> str:
         return "en"
 
 # -------------------------
-# Reminder scheduler (UPDATED FOR dayc, weekc, customc REMINDER TYPES + AMBULANCE a_day)
+# Reminder scheduler (dayc, weekc, customc from the c_reminder_schedule due-time index)
 # -------------------------
-def check_and_send_reminder_notifications(supabase):
-    """
-    Generate reminders at 1 week and 1 day before bookings.
-    Sets appropriate reminder_type based on timing.
-    """
-    now = datetime.now(MALAYSIA_TZ)
-    TOLERANCE_SECONDS = 120  # 2 minute window
-    
-    logger.info(translate_template("+1234567890", "Checking for time-based reminders...", supabase))
+def _reminder_message(table, booking, reminder_type, whatsapp_number, supabase):
+    """Reminder text for a clinic or TCM booking, worded as before the schedule index."""
+    # Template strings are kept exactly as before so their cached translations still apply
+    if table == "tcm_s_bookings":
+        placeholder = "booking_type"
+        subject = gt_tt(whatsapp_number, booking.get("booking_type") or "consultation", supabase)
+        standard = "Reminder: Your TCM {booking_type} is in {time_desc}"
+        custom = "Custom reminder: Your TCM {booking_type} is in {reminder_duration} hours"
+    else:
+        # USE vaccine_type FOR VACCINATION
+        if table == "c_s_vaccination":
+            details = booking.get("vaccine_type") or "Vaccination"
+        else:
+            details = booking.get("details") or "Appointment"
+        placeholder = "details"
+        subject = gt_tt(whatsapp_number, details, supabase)
+        standard = "Reminder: Your {details} is in {time_desc}"
+        custom = "Custom reminder: Your {details} is in {reminder_duration} hours"
 
-    # Check checkup bookings (weekc AND dayc REMINDERS)
-    try:
-        checkup_resp = supabase.table("c_s_checkup").select(
-            "id, user_id, date, time, details, reminder_duration, reminder_remark, repeated_visit_uuid, doctor_id"
-        ).gte("date", now.date().isoformat()).execute()
-        
-        logger.info(translate_template("+1234567890", "Fetched {count} bookings from c_s_checkup", supabase).format(
-            count=len(checkup_resp.data or [])))
-        
-        for booking in checkup_resp.data or []:
-            try:
-                booking_time = (booking.get("time") or "00:00").zfill(5)
-                booking_date = booking.get("date")
-                if not booking_date:
-                    continue
-                    
-                # Create booking datetime
-                booking_dt = MALAYSIA_TZ.localize(
-                    datetime.strptime(f"{booking_date} {booking_time}", "%Y-%m-%d %H:%M")
-                )
-                
-                if booking_dt <= now:
-                    continue
+    if reminder_type == "customc":
+        message = gt_tt(whatsapp_number, custom, supabase).format(
+            **{placeholder: subject}, reminder_duration=booking.get("reminder_duration"))
+    else:
+        time_desc = gt_tt(whatsapp_number, "1 week" if reminder_type == "weekc" else "1 day", supabase)
+        message = gt_tt(whatsapp_number, standard, supabase).format(**{placeholder: subject}, time_desc=time_desc)
 
-                # Determine booking details
-                details = booking.get("details", "Appointment")
-                remark = str(booking.get("reminder_remark") or "").strip()
-                repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                
-                # Get clinic_id for clinic booking
-                clinic_id = get_clinic_id_for_booking(booking, "clinic")
-
-                # Check standard time-based reminders (weekc and dayc)
-                time_reminders = [
-                    ("weekc", 168),  # 1 week = 168 hours
-                    ("dayc", 24),    # 1 day = 24 hours
-                ]
-                
-                for reminder_type, hours in time_reminders:
-                    target_time = booking_dt - timedelta(hours=hours)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                if reminder_type == "weekc":
-                                    time_desc_source = "1 week"
-                                elif reminder_type == "dayc":
-                                    time_desc_source = "1 day"
-                                else:
-                                    time_desc_source = f"{hours} hours"
-                                
-                                translated_time_desc = gt_tt(whatsapp_number, time_desc_source, supabase)
-                                template = "Reminder: Your {details} is in {time_desc}"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    time_desc=translated_time_desc
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Check if this reminder already exists and was sent
-                                existing = supabase.table("c_notifications").select("id, sent").eq("user_id", booking["user_id"]).eq("case_id", case_id).eq("reminder_type", reminder_type).execute()
-                                if existing.data:
-                                    # Check if already sent
-                                    for exist in existing.data:
-                                        if exist.get("sent") == True:
-                                            logger.info(translate_template("+1234567890", "Reminder already sent for booking {booking_id}, type {reminder_type}. Skipping.", supabase).format(
-                                                booking_id=booking['id'], reminder_type=reminder_type))
-                                            continue
-                                        else:
-                                            # Update existing unsent reminder
-                                            logger.info(translate_template("+1234567890", "Updating existing unsent reminder for booking {booking_id}", supabase).format(
-                                                booking_id=booking['id']))
-                                            supabase.table("c_notifications").update({
-                                                "notification": notification_msg,
-                                                "time": datetime.now(MALAYSIA_TZ).isoformat(),
-                                                "provider_cat": "clinic",
-                                                "clinic_id": clinic_id
-                                            }).eq("id", exist["id"]).execute()
-                                            break
-                                    else:
-                                        # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                                else:
-                                    # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                        
-                        break  # Only create one reminder per booking
+    remark = str(booking.get("reminder_remark") or "").strip()
+    if remark:
+        message += gt_tt(whatsapp_number, f" - {remark}", supabase)
+    return message
 
-                # Check custom reminder (reminder_duration from booking) - now customc
-                reminder_duration = booking.get("reminder_duration")
-                if reminder_duration is not None:
-                    target_time = booking_dt - timedelta(hours=reminder_duration)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                template = "Custom reminder: Your {details} is in {reminder_duration} hours"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    reminder_duration=reminder_duration
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Insert with customc reminder_type
-                                insert_notification(
-                                    whatsapp_number=whatsapp_number,
-                                    case_id=case_id,
-                                    message=notification_msg,
-                                    user_id=booking["user_id"],
-                                    reminder_type="customc",
-                                    provider_cat="clinic",
-                                    clinic_id=clinic_id
-                                )
-                                logger.info(translate_template("+1234567890", "Created customc reminder for {whatsapp_number}", supabase).format(
-                                    whatsapp_number=whatsapp_number))
 
-            except Exception as e:
-                logger.error(translate_template("+1234567890", "Error processing checkup booking {booking_id}: {error}", supabase).format(
-                    booking_id=booking.get('id'), error=str(e)), exc_info=True)
-                continue
-                
-    except Exception as e:
-        logger.error(translate_template("+1234567890", "Failed to fetch c_s_checkup: {error}", supabase).format(error=str(e)), exc_info=True)
+def _is_duplicate_notification(error):
+    """True for a unique violation on c_notifications (unique_notification or the primary key)."""
+    message = str(error).lower()
+    return getattr(error, "code", None) == "23505" or "unique_notification" in message or "duplicate key" in message
 
-    # Check consultation bookings (weekc AND dayc REMINDERS)
-    try:
-        consultation_resp = supabase.table("c_s_consultation").select(
-            "id, user_id, date, time, details, reminder_duration, reminder_remark, repeated_visit_uuid, doctor_id"
-        ).gte("date", now.date().isoformat()).execute()
-        
-        logger.info(translate_template("+1234567890", "Fetched {count} bookings from c_s_consultation", supabase).format(
-            count=len(consultation_resp.data or [])))
-        
-        for booking in consultation_resp.data or []:
-            try:
-                booking_time = (booking.get("time") or "00:00").zfill(5)
-                booking_date = booking.get("date")
-                if not booking_date:
-                    continue
-                    
-                # Create booking datetime
-                booking_dt = MALAYSIA_TZ.localize(
-                    datetime.strptime(f"{booking_date} {booking_time}", "%Y-%m-%d %H:%M")
-                )
-                
-                if booking_dt <= now:
-                    continue
 
-                # Determine booking details
-                details = booking.get("details", "Appointment")
-                remark = str(booking.get("reminder_remark") or "").strip()
-                repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                
-                # Get clinic_id for clinic booking
-                clinic_id = get_clinic_id_for_booking(booking, "clinic")
-
-                # Check standard time-based reminders (weekc and dayc)
-                time_reminders = [
-                    ("weekc", 168),  # 1 week = 168 hours
-                    ("dayc", 24),    # 1 day = 24 hours
-                ]
-                
-                for reminder_type, hours in time_reminders:
-                    target_time = booking_dt - timedelta(hours=hours)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                if reminder_type == "weekc":
-                                    time_desc_source = "1 week"
-                                elif reminder_type == "dayc":
-                                    time_desc_source = "1 day"
-                                else:
-                                    time_desc_source = f"{hours} hours"
-                                
-                                translated_time_desc = gt_tt(whatsapp_number, time_desc_source, supabase)
-                                template = "Reminder: Your {details} is in {time_desc}"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    time_desc=translated_time_desc
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Check if this reminder already exists and was sent
-                                existing = supabase.table("c_notifications").select("id, sent").eq("user_id", booking["user_id"]).eq("case_id", case_id).eq("reminder_type", reminder_type).execute()
-                                if existing.data:
-                                    # Check if already sent
-                                    for exist in existing.data:
-                                        if exist.get("sent") == True:
-                                            logger.info(translate_template("+1234567890", "Reminder already sent for booking {booking_id}, type {reminder_type}. Skipping.", supabase).format(
-                                                booking_id=booking['id'], reminder_type=reminder_type))
-                                            continue
-                                        else:
-                                            # Update existing unsent reminder
-                                            logger.info(translate_template("+1234567890", "Updating existing unsent reminder for booking {booking_id}", supabase).format(
-                                                booking_id=booking['id']))
-                                            supabase.table("c_notifications").update({
-                                                "notification": notification_msg,
-                                                "time": datetime.now(MALAYSIA_TZ).isoformat(),
-                                                "provider_cat": "clinic",
-                                                "clinic_id": clinic_id
-                                            }).eq("id", exist["id"]).execute()
-                                            break
-                                    else:
-                                        # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                                else:
-                                    # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                        
-                        break  # Only create one reminder per booking
+def _existing_reminder_notifications(supabase, rows):
+    """Stored notifications for the rows' bookings, keyed by (user_id, case_id, reminder_type)."""
+    resp = supabase.table("c_notifications").select("id, user_id, case_id, reminder_type, sent") \
+        .in_("case_id", list({str(row["case_id"]) for row in rows})) \
+        .in_("reminder_type", list({row["reminder_type"] for row in rows})).execute()
+    return {(row["user_id"], row["case_id"], row["reminder_type"]): row for row in resp.data or []}
 
-                # Check custom reminder (reminder_duration from booking) - now customc
-                reminder_duration = booking.get("reminder_duration")
-                if reminder_duration is not None:
-                    target_time = booking_dt - timedelta(hours=reminder_duration)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                template = "Custom reminder: Your {details} is in {reminder_duration} hours"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    reminder_duration=reminder_duration
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Insert with customc reminder_type
-                                insert_notification(
-                                    whatsapp_number=whatsapp_number,
-                                    case_id=case_id,
-                                    message=notification_msg,
-                                    user_id=booking["user_id"],
-                                    reminder_type="customc",
-                                    provider_cat="clinic",
-                                    clinic_id=clinic_id
-                                )
-                                logger.info(translate_template("+1234567890", "Created customc reminder for {whatsapp_number}", supabase).format(
-                                    whatsapp_number=whatsapp_number))
 
-            except Exception as e:
-                logger.error(translate_template("+1234567890", "Error processing consultation booking {booking_id}: {error}", supabase).format(
-                    booking_id=booking.get('id'), error=str(e)), exc_info=True)
+def _build_reminder_notifications(supabase, claimed, now):
+    """
+    Check claimed reminders against their bookings and write their notifications.
+    Returns (outcomes, stale bookings to re-plan, schedule ids to hand back).
+    """
+    failed = []
+
+    # 1. Current state of every booking behind a due reminder, one in_() query per table
+    ids_by_table = defaultdict(set)
+    for reminder in claimed:
+        ids_by_table[reminder["source_table"]].add(str(reminder["booking_id"]))
+    bookings = {}
+    for table, booking_ids in ids_by_table.items():
+        try:
+            columns = SOURCE_BY_TABLE[table][1]
+            for booking in supabase.table(table).select(columns).in_("id", list(booking_ids)).execute().data or []:
+                bookings[(table, str(booking["id"]))] = booking
+        except Exception as e:
+            logger.error(f"Error fetching {table} bookings for reminders: {e}", exc_info=True)
+            failed.extend(r["id"] for r in claimed if r["source_table"] == table)
+    claimed = [r for r in claimed if r["id"] not in failed]
+
+    # 2. Users and doctor clinics in bulk
+    user_ids = list({b["user_id"] for b in bookings.values() if b.get("user_id")})
+    users = {}
+    if user_ids:
+        users_resp = supabase.table("whatsapp_users").select(
+            "id, whatsapp_number, language, user_name"
+        ).in_("id", user_ids).execute()
+        users = {row["id"]: row for row in users_resp.data or []}
+        prime_user_profiles(users_resp.data)
+    doctor_ids_by_cat = defaultdict(set)
+    for (table, _), booking in bookings.items():
+        if booking.get("doctor_id"):
+            doctor_ids_by_cat[SOURCE_BY_TABLE[table][2]].add(booking["doctor_id"])
+    doctor_clinics = _fetch_doctor_clinics(supabase, doctor_ids_by_cat)
+
+    # 3. Check each reminder against its booking and build the notifications
+    outcomes = defaultdict(list)
+    stale = []
+    new_rows = []  # (schedule id, notification row)
+    for reminder in claimed:
+        table = reminder["source_table"]
+        booking = bookings.get((table, str(reminder["booking_id"])))
+        try:
+            if not booking or not booking_is_live(table, booking):
+                outcomes["cancelled"].append(reminder["id"])
+                continue
+            booking_at = booking_datetime(booking)
+            if booking_at != datetime.fromisoformat(str(reminder["booking_at"]).replace("Z", "+00:00")):
+                # Moved without the schedule hearing about it; re-planned below for the new time
+                outcomes["stale"].append(reminder["id"])
+                stale.append((table, booking["id"]))
+                continue
+            fire_at = datetime.fromisoformat(str(reminder["fire_at"]).replace("Z", "+00:00"))
+            if booking_at <= now or (now - fire_at).total_seconds() > REMINDER_MAX_LATENESS_SECONDS:
+                outcomes["expired"].append(reminder["id"])
+                continue
+            user = users.get(booking.get("user_id"))
+            whatsapp_number = ((user or {}).get("whatsapp_number") or "").lstrip('+')
+            if not whatsapp_number:
+                outcomes["no_user"].append(reminder["id"])
                 continue
-                
-    except Exception as e:
-        logger.error(translate_template("+1234567890", "Failed to fetch c_s_consultation: {error}", supabase).format(error=str(e)), exc_info=True)
 
-    # Check vaccination bookings (weekc AND dayc REMINDERS)
-    try:
-        vaccination_resp = supabase.table("c_s_vaccination").select(
-            "id, user_id, date, time, vaccine_type, reminder_duration, reminder_remark, repeated_visit_uuid, doctor_id"
-        ).gte("date", now.date().isoformat()).execute()
-        
-        logger.info(translate_template("+1234567890", "Fetched {count} bookings from c_s_vaccination", supabase).format(
-            count=len(vaccination_resp.data or [])))
-        
-        for booking in vaccination_resp.data or []:
-            try:
-                booking_time = (booking.get("time") or "00:00").zfill(5)
-                booking_date = booking.get("date")
-                if not booking_date:
-                    continue
-                    
-                # Create booking datetime
-                booking_dt = MALAYSIA_TZ.localize(
-                    datetime.strptime(f"{booking_date} {booking_time}", "%Y-%m-%d %H:%M")
-                )
-                
-                if booking_dt <= now:
-                    continue
+            provider_cat = SOURCE_BY_TABLE[table][2]
+            new_rows.append((reminder["id"], {
+                "id": reminder_notification_id(reminder),
+                "whatsapp_number": whatsapp_number,
+                "case_id": booking["id"],
+                "notification": _reminder_message(table, booking, reminder["reminder_type"], whatsapp_number, supabase),
+                "user_id": booking["user_id"],
+                "sent": False,
+                "prompted": False,
+                "seen": False,
+                "noted": False,
+                "time": datetime.now(MALAYSIA_TZ).isoformat(),
+                "reminder_type": reminder["reminder_type"],
+                "provider_cat": provider_cat,
+                "clinic_id": doctor_clinics.get((provider_cat, booking.get("doctor_id")))
+            }))
+        except Exception as e:
+            logger.error(f"Error building {reminder.get('reminder_type')} reminder for {table} booking {reminder.get('booking_id')}: {e}", exc_info=True)
+            failed.append(reminder["id"])
 
-                # Determine booking details - USE vaccine_type FOR VACCINATION
-                details = booking.get("vaccine_type", "Vaccination")
-                remark = str(booking.get("reminder_remark") or "").strip()
-                repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                
-                # Get clinic_id for clinic booking
-                clinic_id = get_clinic_id_for_booking(booking, "clinic")
-
-                # Check standard time-based reminders (weekc and dayc)
-                time_reminders = [
-                    ("weekc", 168),  # 1 week = 168 hours
-                    ("dayc", 24),    # 1 day = 24 hours
-                ]
-                
-                for reminder_type, hours in time_reminders:
-                    target_time = booking_dt - timedelta(hours=hours)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                if reminder_type == "weekc":
-                                    time_desc_source = "1 week"
-                                elif reminder_type == "dayc":
-                                    time_desc_source = "1 day"
-                                else:
-                                    time_desc_source = f"{hours} hours"
-                                
-                                translated_time_desc = gt_tt(whatsapp_number, time_desc_source, supabase)
-                                template = "Reminder: Your {details} is in {time_desc}"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    time_desc=translated_time_desc
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Check if this reminder already exists and was sent
-                                existing = supabase.table("c_notifications").select("id, sent").eq("user_id", booking["user_id"]).eq("case_id", case_id).eq("reminder_type", reminder_type).execute()
-                                if existing.data:
-                                    # Check if already sent
-                                    for exist in existing.data:
-                                        if exist.get("sent") == True:
-                                            logger.info(translate_template("+1234567890", "Reminder already sent for booking {booking_id}, type {reminder_type}. Skipping.", supabase).format(
-                                                booking_id=booking['id'], reminder_type=reminder_type))
-                                            continue
-                                        else:
-                                            # Update existing unsent reminder
-                                            logger.info(translate_template("+1234567890", "Updating existing unsent reminder for booking {booking_id}", supabase).format(
-                                                booking_id=booking['id']))
-                                            supabase.table("c_notifications").update({
-                                                "notification": notification_msg,
-                                                "time": datetime.now(MALAYSIA_TZ).isoformat(),
-                                                "provider_cat": "clinic",
-                                                "clinic_id": clinic_id
-                                            }).eq("id", exist["id"]).execute()
-                                            break
-                                    else:
-                                        # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                                else:
-                                    # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="clinic",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                        
-                        break  # Only create one reminder per booking
+    # 4. unique_notification allows one row per (user_id, case_id, reminder_type), so, as
+    #    before the schedule existed, a reminder re-planned after a reschedule refreshes the
+    #    unsent row and skips a sent one. Only the rest are inserted; their ids come from the
+    #    reminder, so a row already written by a run that died before recording its outcome
+    #    is skipped, not duplicated.
+    inserts = []
+    if new_rows:
+        existing = _existing_reminder_notifications(supabase, [row for _, row in new_rows])
+        for schedule_id, row in new_rows:
+            current = existing.get((row["user_id"], row["case_id"], row["reminder_type"]))
+            if current is None:
+                inserts.append((schedule_id, row))
+            elif current.get("sent"):
+                logger.info(f"Reminder already sent for booking {row['case_id']}, type {row['reminder_type']}. Skipping.")
+            elif current["id"] != row["id"]:
+                try:
+                    supabase.table("c_notifications").update({
+                        "notification": row["notification"],
+                        "time": row["time"],
+                        "provider_cat": row["provider_cat"],
+                        "clinic_id": row["clinic_id"]
+                    }).eq("id", current["id"]).eq("sent", False).execute()
+                except Exception as e:
+                    logger.error(f"Error updating unsent reminder for booking {row['case_id']}: {e}")
+                    failed.append(schedule_id)
+    if inserts:
+        try:
+            supabase.table("c_notifications").upsert(
+                [row for _, row in inserts], on_conflict="id", ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            logger.warning(f"Bulk reminder insert failed ({e}), inserting {len(inserts)} rows individually")
+            for schedule_id, row in inserts:
+                try:
+                    supabase.table("c_notifications").upsert(row, on_conflict="id", ignore_duplicates=True).execute()
+                except Exception as row_error:
+                    if _is_duplicate_notification(row_error):
+                        # Written by another path since the lookup above; the booking has its reminder
+                        continue
+                    logger.error(f"Error inserting reminder notification for {row['whatsapp_number']}: {row_error}")
+                    failed.append(schedule_id)
+    outcomes["sent"] = [schedule_id for schedule_id, _ in new_rows if schedule_id not in failed]
+    return outcomes, stale, failed
 
-                # Check custom reminder (reminder_duration from booking) - now customc
-                reminder_duration = booking.get("reminder_duration")
-                if reminder_duration is not None:
-                    target_time = booking_dt - timedelta(hours=reminder_duration)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_details = gt_tt(whatsapp_number, details, supabase)
-                                template = "Custom reminder: Your {details} is in {reminder_duration} hours"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    details=translated_details,
-                                    reminder_duration=reminder_duration
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Insert with customc reminder_type
-                                insert_notification(
-                                    whatsapp_number=whatsapp_number,
-                                    case_id=case_id,
-                                    message=notification_msg,
-                                    user_id=booking["user_id"],
-                                    reminder_type="customc",
-                                    provider_cat="clinic",
-                                    clinic_id=clinic_id
-                                )
-                                logger.info(translate_template("+1234567890", "Created customc reminder for {whatsapp_number}", supabase).format(
-                                    whatsapp_number=whatsapp_number))
 
-            except Exception as e:
-                logger.error(translate_template("+1234567890", "Error processing vaccination booking {booking_id}: {error}", supabase).format(
-                    booking_id=booking.get('id'), error=str(e)), exc_info=True)
-                continue
-                
+def check_and_send_reminder_notifications(supabase):
+    """
+    Generate week, day and custom reminders for clinic and TCM bookings.
+    Reminders are planned once per booking into c_reminder_schedule (kept in
+    step with new, rescheduled and cancelled bookings), so each run only reads
+    the reminders that are due. Each due reminder is claimed before its
+    notification is written; anything that fails is handed back for the next
+    run, and a run that dies mid-way has its claims retaken after
+    REMINDER_CLAIM_TIMEOUT_SECONDS. The notification id is derived from the
+    reminder, so a retry never writes a second notification.
+    """
+    now = datetime.now(MALAYSIA_TZ)
+    logger.info("Checking for time-based reminders...")
+
+    try:
+        sync_reminder_schedule(supabase)
     except Exception as e:
-        logger.error(translate_template("+1234567890", "Failed to fetch c_s_vaccination: {error}", supabase).format(error=str(e)), exc_info=True)
+        logger.error(f"Reminder schedule sync failed: {e}", exc_info=True)
 
-    # Check TCM bookings (weekc AND dayc REMINDERS)
     try:
-        tcm_resp = supabase.table("tcm_s_bookings").select(
-            "id, user_id, original_date, original_time, new_date, new_time, booking_type, details, reminder_duration, reminder_remark, repeated_visit_uuid, status, doctor_id"
-        ).eq("status", "confirmed").execute()
-        
-        logger.info(translate_template("+1234567890", "Fetched {count} TCM bookings", supabase).format(count=len(tcm_resp.data or [])))
-        
-        for booking in tcm_resp.data or []:
-            try:
-                # Get appointment date and time (use new if available, otherwise original)
-                booking_date = booking.get("new_date") or booking.get("original_date")
-                booking_time = booking.get("new_time") or booking.get("original_time")
-                
-                if not booking_date or not booking_time:
-                    continue
-                    
-                # Create booking datetime
-                booking_dt = MALAYSIA_TZ.localize(
-                    datetime.strptime(f"{booking_date} {booking_time}", "%Y-%m-%d %H:%M")
-                )
-                
-                if booking_dt <= now:
-                    continue
+        claimed = claim_due_reminders(supabase, now)
+    except Exception as e:
+        logger.error(f"Could not claim due reminders: {e}", exc_info=True)
+        return
+    if not claimed:
+        return
 
-                # Determine booking details
-                details = booking.get("details", "TCM Appointment")
-                booking_type = booking.get("booking_type", "consultation")
-                remark = str(booking.get("reminder_remark") or "").strip()
-                repeated_visit_uuid = booking.get("repeated_visit_uuid")
-                
-                # Get clinic_id for TCM booking
-                clinic_id = None
-                try:
-                    if booking.get("doctor_id"):
-                        doctor_resp = supabase.table("tcm_a_doctors").select("clinic_id").eq("id", booking["doctor_id"]).execute()
-                        if doctor_resp.data and doctor_resp.data[0].get("clinic_id"):
-                            clinic_id = doctor_resp.data[0]["clinic_id"]
-                except Exception as clinic_err:
-                    logger.error(translate_template("+1234567890", "Error getting clinic_id for TCM reminder: {error}", supabase).format(error=str(clinic_err)))
-
-                # Check standard time-based reminders (weekc and dayc)
-                time_reminders = [
-                    ("weekc", 168),  # 1 week = 168 hours
-                    ("dayc", 24),    # 1 day = 24 hours
-                ]
-                
-                for reminder_type, hours in time_reminders:
-                    target_time = booking_dt - timedelta(hours=hours)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_booking_type = gt_tt(whatsapp_number, booking_type, supabase)
-                                if reminder_type == "weekc":
-                                    time_desc_source = "1 week"
-                                elif reminder_type == "dayc":
-                                    time_desc_source = "1 day"
-                                else:
-                                    time_desc_source = f"{hours} hours"
-                                
-                                translated_time_desc = gt_tt(whatsapp_number, time_desc_source, supabase)
-                                template = "Reminder: Your TCM {booking_type} is in {time_desc}"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    booking_type=translated_booking_type,
-                                    time_desc=translated_time_desc
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Check if this reminder already exists and was sent
-                                existing = supabase.table("c_notifications").select("id, sent").eq("user_id", booking["user_id"]).eq("case_id", case_id).eq("reminder_type", reminder_type).execute()
-                                if existing.data:
-                                    # Check if already sent
-                                    for exist in existing.data:
-                                        if exist.get("sent") == True:
-                                            logger.info(translate_template("+1234567890", "TCM reminder already sent for booking {booking_id}, type {reminder_type}. Skipping.", supabase).format(
-                                                booking_id=booking['id'], reminder_type=reminder_type))
-                                            continue
-                                        else:
-                                            # Update existing unsent reminder
-                                            logger.info(translate_template("+1234567890", "Updating existing unsent TCM reminder for booking {booking_id}", supabase).format(
-                                                booking_id=booking['id']))
-                                            supabase.table("c_notifications").update({
-                                                "notification": notification_msg,
-                                                "time": datetime.now(MALAYSIA_TZ).isoformat(),
-                                                "provider_cat": "tcm",
-                                                "clinic_id": clinic_id
-                                            }).eq("id", exist["id"]).execute()
-                                            break
-                                    else:
-                                        # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="tcm",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created TCM {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                                else:
-                                    # Insert new reminder
-                                        insert_notification(
-                                            whatsapp_number=whatsapp_number,
-                                            case_id=case_id,
-                                            message=notification_msg,
-                                            user_id=booking["user_id"],
-                                            reminder_type=reminder_type,
-                                            provider_cat="tcm",
-                                            clinic_id=clinic_id
-                                        )
-                                        logger.info(translate_template("+1234567890", "Created TCM {reminder_type} reminder for {whatsapp_number}", supabase).format(
-                                            reminder_type=reminder_type, whatsapp_number=whatsapp_number))
-                        
-                        break  # Only create one reminder per booking
+    try:
+        outcomes, stale, failed = _build_reminder_notifications(supabase, claimed, now)
+    except Exception as e:
+        # Nothing recorded yet: hand every claim back (re-inserting an already written row is a no-op)
+        logger.error(f"Error creating reminder notifications, releasing {len(claimed)} claims: {e}", exc_info=True)
+        unclaim_reminders(supabase, [reminder["id"] for reminder in claimed])
+        return
 
-                # Check custom reminder (reminder_duration from booking) - now customc
-                reminder_duration = booking.get("reminder_duration")
-                if reminder_duration is not None:
-                    target_time = booking_dt - timedelta(hours=reminder_duration)
-                    diff_seconds = abs((now - target_time).total_seconds())
-                    
-                    if diff_seconds <= TOLERANCE_SECONDS:
-                        user_resp = supabase.table("whatsapp_users").select("whatsapp_number").eq("id", booking["user_id"]).execute()
-                        if user_resp.data:
-                            whatsapp_number = user_resp.data[0].get("whatsapp_number", "").lstrip('+')
-                            if whatsapp_number:
-                                translated_booking_type = gt_tt(whatsapp_number, booking_type, supabase)
-                                template = "Custom reminder: Your TCM {booking_type} is in {reminder_duration} hours"
-                                notification_msg = gt_tt(whatsapp_number, template, supabase).format(
-                                    booking_type=translated_booking_type,
-                                    reminder_duration=reminder_duration
-                                )
-                                
-                                if remark:
-                                    notification_msg += gt_tt(whatsapp_number, f" - {remark}", supabase)
-                                
-                                case_id = booking["id"]
-                                
-                                # Insert with customc reminder_type
-                                insert_notification(
-                                    whatsapp_number=whatsapp_number,
-                                    case_id=case_id,
-                                    message=notification_msg,
-                                    user_id=booking["user_id"],
-                                    reminder_type="customc",
-                                    provider_cat="tcm",
-                                    clinic_id=clinic_id
-                                )
-                                logger.info(translate_template("+1234567890", "Created TCM customc reminder for {whatsapp_number}", supabase).format(
-                                    whatsapp_number=whatsapp_number))
+    unclaim_reminders(supabase, failed)
+    record_outcomes(supabase, outcomes)
+    for table, booking_id in stale:
+        refresh_booking_reminders(supabase, table, booking_id)
 
-            except Exception as e:
-                logger.error(translate_template("+1234567890", "Error processing TCM booking {booking_id}: {error}", supabase).format(
-                    booking_id=booking.get('id'), error=str(e)), exc_info=True)
-                continue
-                
-    except Exception as e:
-        logger.error(translate_template("+1234567890", "Failed to fetch tcm_s_bookings: {error}", supabase).format(error=str(e)), exc_info=True)
+    logger.info(f"Reminders: {len(claimed)} due, {len(outcomes['sent'])} created, "
+                f"{len(outcomes['cancelled'])} cancelled, {len(outcomes['stale'])} stale, "
+                f"{len(outcomes['expired'])} expired, {len(failed)} retried next run")
 
 # -------------------------
 # NEW: Check ambulance bookings for a_day reminders
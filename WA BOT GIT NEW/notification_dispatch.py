@@ -0,0 +1,100 @@
+# notification_dispatch.py - CONCURRENT, RATE-LIMITED NOTIFICATION SENDING
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "8"))
+# Business-wide send rate. Cloud API allows 80 msg/s by default; a notification can
+# cost two POSTs (interactive + template fallback), so stay well under half of that.
+NOTIFICATION_RATE_PER_SECOND = float(os.getenv("NOTIFICATION_RATE_PER_SECOND", "20"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared across runs so back-to-back batches cannot burst past the limit
+business_bucket = TokenBucket(NOTIFICATION_RATE_PER_SECOND)
+
+_stats_lock = threading.Lock()
+_stats = {"runs": 0, "sent": 0, "failed": 0, "digests": 0, "coalesced_rows": 0, "last_run": {}}
+
+
+def dispatch_notifications(rows, send_one, max_workers: int = NOTIFICATION_WORKERS, bucket: TokenBucket = None):
+    """
+    Send rows concurrently on a bounded thread pool, one bucket token per row.
+    send_one(row) returns True on success; exceptions count as failures.
+    Returns (sent_ids, failed_ids). Callers must not pass two rows for the same
+    number in one call if per-number ordering matters.
+    """
+    bucket = bucket or business_bucket
+    sent_ids, failed_ids = [], []
+
+    def _send(row):
+        bucket.acquire()
+        try:
+            return row["id"], bool(send_one(row))
+        except Exception as e:
+            logger.error(f"Error sending notification {row.get('id')} to {row.get('whatsapp_number')}: {e}", exc_info=True)
+            return row["id"], False
+
+    started = time.monotonic()
+    if rows:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(rows))), thread_name_prefix="notify") as pool:
+            for notification_id, ok in pool.map(_send, rows):
+                (sent_ids if ok else failed_ids).append(notification_id)
+    record_dispatch_run(len(sent_ids), len(failed_ids), time.monotonic() - started)
+    return sent_ids, failed_ids
+
+
+def record_dispatch_run(sent: int, failed: int, seconds: float):
+    rate = sent / seconds if seconds > 0 else 0.0
+    with _stats_lock:
+        _stats["runs"] += 1
+        _stats["sent"] += sent
+        _stats["failed"] += failed
+        _stats["last_run"] = {"sent": sent, "failed": failed, "seconds": round(seconds, 2), "sends_per_sec": round(rate, 2)}
+    if sent or failed:
+        logger.info(f"Dispatched {sent} notifications ({failed} failed) in {seconds:.1f}s - {rate:.1f} sends/sec")
+
+
+def record_coalesced(digests: int, rows: int):
+    """Count digests sent in place of `rows` separate messages."""
+    with _stats_lock:
+        _stats["digests"] += digests
+        _stats["coalesced_rows"] += rows
+
+
+def get_dispatch_stats() -> dict:
+    with _stats_lock:
+        return {**_stats, "last_run": dict(_stats["last_run"])}
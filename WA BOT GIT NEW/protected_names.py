@@ -0,0 +1,150 @@
+# protected_names.py - SHARED PROTECTED-NAME INDEX FOR TRANSLATORS
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# How often the doctor/clinic directory is re-read (seconds)
+PROTECTED_NAMES_REFRESH_SECONDS = int(os.getenv("PROTECTED_NAMES_REFRESH_SECONDS", "300"))
+
+# Keywords that are never translated, regardless of the directory tables
+BASE_PROTECTED_KEYWORDS = [
+    "AnyHealth", "language:", "lang:", "தமிழ்", "English", "Bahasa Malaysia", "中文",
+    "🌐change language", "change language", "🌐change_language"
+]
+
+# (table, required) - TCM tables are optional, failures there are only warnings
+DIRECTORY_TABLES = [
+    ("c_a_doctors", True),
+    ("c_a_clinics", True),
+    ("tcm_a_doctors", False),
+    ("tcm_a_clinics", False),
+]
+
+
+def _compile_alternation(keywords, flags=0):
+    """Compile keywords into one regex, longest first so overlaps prefer the full name."""
+    keywords = sorted({k for k in keywords if k}, key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(k) for k in keywords), flags)
+
+
+class ProtectedNameIndex:
+    """
+    Immutable index over protected keywords and doctor/clinic names.
+    - contains_protected(text): one regex scan instead of a per-keyword loop
+    - protect(text): swaps every name for a placeholder in a single pass
+    """
+
+    def __init__(self, names=(), fingerprint: str = ""):
+        self.names = sorted({n for n in names if n})
+        self.fingerprint = fingerprint
+        self._keyword_re = _compile_alternation(BASE_PROTECTED_KEYWORDS + self.names, re.IGNORECASE)
+        self._name_re = _compile_alternation(self.names)
+
+    def contains_protected(self, text: str) -> bool:
+        if not text or self._keyword_re is None:
+            return False
+        return self._keyword_re.search(text.strip()) is not None
+
+    def protect(self, text: str):
+        """Return (text_with_placeholders, {placeholder: name})."""
+        placeholders = {}
+        if not text or self._name_re is None:
+            return text, placeholders
+
+        seen = {}
+
+        def _swap(match):
+            name = match.group(0)
+            if name not in seen:
+                placeholder = f"__PROTECTED_{len(placeholders)}__"
+                placeholders[placeholder] = name
+                seen[name] = placeholder
+            return seen[name]
+
+        return self._name_re.sub(_swap, text), placeholders
+
+
+def restore_placeholders(text: str, placeholders: dict) -> str:
+    """Put protected names back after translation."""
+    for placeholder, name in placeholders.items():
+        text = text.replace(placeholder, name)
+    return text
+
+
+# Base-only index used when no Supabase client is available
+BASE_INDEX = ProtectedNameIndex()
+
+_index = None
+_index_loaded_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _fetch_directory_names(supabase):
+    names = []
+    for table, required in DIRECTORY_TABLES:
+        try:
+            rows = supabase.table(table).select("name").execute().data or []
+            names.extend(row.get("name") for row in rows)
+        except Exception as e:
+            if required:
+                raise
+            logger.warning(f"Could not fetch names from {table}: {e}")
+    return [n for n in names if n]
+
+
+def _fingerprint(names) -> str:
+    return hashlib.sha1("\n".join(sorted(set(names))).encode("utf-8")).hexdigest()
+
+
+def get_protected_index(supabase=None) -> ProtectedNameIndex:
+    """
+    Return the shared index, refreshing it from the directory tables at most
+    once per PROTECTED_NAMES_REFRESH_SECONDS. The regex is only recompiled when
+    the set of names actually changed. On fetch errors the previous index is kept.
+    """
+    global _index, _index_loaded_at
+
+    if not supabase:
+        return BASE_INDEX
+
+    if _index is not None and time.time() - _index_loaded_at < PROTECTED_NAMES_REFRESH_SECONDS:
+        return _index
+
+    with _index_lock:
+        # Another thread may have refreshed while we waited
+        if _index is not None and time.time() - _index_loaded_at < PROTECTED_NAMES_REFRESH_SECONDS:
+            return _index
+        try:
+            names = _fetch_directory_names(supabase)
+            fingerprint = _fingerprint(names)
+            if _index is None or _index.fingerprint != fingerprint:
+                _index = ProtectedNameIndex(names, fingerprint)
+                logger.info(f"Protected name index rebuilt with {len(_index.names)} names")
+        except Exception as e:
+            logger.error(f"Error fetching doctor or clinic names: {e}")
+            if _index is None:
+                # Retry on the next call rather than caching an empty directory
+                return BASE_INDEX
+        _index_loaded_at = time.time()
+        return _index
+
+
+def invalidate_protected_names():
+    """Force the next get_protected_index call to re-read the directory tables."""
+    global _index_loaded_at
+    with _index_lock:
+        _index_loaded_at = 0.0
@@ -0,0 +1,348 @@
+# reminder_schedule.py - DUE-TIME INDEX FOR BOOKING REMINDERS
+#
+# Each booking's week/day/custom reminders are planned once into one table,
+# so the scheduler only reads reminders that are due instead of rescanning
+# every future booking:
+#
+#   create table c_reminder_schedule (
+#       id uuid primary key default gen_random_uuid(),
+#       source_table text not null,          -- c_s_checkup, c_s_consultation, c_s_vaccination, tcm_s_bookings
+#       booking_id uuid not null,
+#       reminder_type text not null,         -- weekc, dayc, customc
+#       fire_at timestamptz not null,
+#       booking_at timestamptz not null,     -- appointment time the reminder was planned for
+#       user_id uuid,
+#       fired_at timestamptz,                -- set when claimed; taken again only if the claim is abandoned
+#       outcome text,                        -- sent, stale, cancelled, expired, no_user
+#       unique (source_table, booking_id, reminder_type)
+#   );
+#   create index on c_reminder_schedule (fire_at) where fired_at is null;
+#   create index on c_reminder_schedule (fired_at) where outcome is null;
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytz
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+MALAYSIA_TZ = pytz.timezone("Asia/Kuala_Lumpur")
+
+REMINDER_SCHEDULE_TABLE = "c_reminder_schedule"
+# Due reminders claimed per scheduler tick
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "200"))
+# A reminder found this late (bot down, missed ticks) is still sent; later than this it is dropped
+REMINDER_MAX_LATENESS_SECONDS = int(os.getenv("REMINDER_MAX_LATENESS_SECONDS", "1800"))
+# A claim with no outcome after this long belongs to a run that died; it is claimed again
+REMINDER_CLAIM_TIMEOUT_SECONDS = int(os.getenv("REMINDER_CLAIM_TIMEOUT_SECONDS", "600"))
+# Bookings created or changed since the last tick are re-read with this much overlap
+REMINDER_SYNC_OVERLAP_SECONDS = int(os.getenv("REMINDER_SYNC_OVERLAP_SECONDS", "900"))
+# Full pass over future bookings to catch edits made outside the bot (admin dashboard)
+REMINDER_RECONCILE_SECONDS = int(os.getenv("REMINDER_RECONCILE_SECONDS", "3600"))
+
+# Standard reminders: (reminder_type, hours before the appointment)
+TIME_REMINDERS = [
+    ("weekc", 168),  # 1 week = 168 hours
+    ("dayc", 24),    # 1 day = 24 hours
+]
+
+# (table, columns, provider_cat, only confirmed rows, extra "changed since" column)
+REMINDER_SOURCES = [
+    ("c_s_checkup", "id, user_id, date, time, details, reminder_duration, reminder_remark, doctor_id",
+     "clinic", False, None),
+    ("c_s_consultation", "id, user_id, date, time, details, reminder_duration, reminder_remark, doctor_id",
+     "clinic", False, None),
+    ("c_s_vaccination", "id, user_id, date, time, vaccine_type, reminder_duration, reminder_remark, doctor_id",
+     "clinic", False, None),
+    ("tcm_s_bookings", "id, user_id, original_date, original_time, new_date, new_time, booking_type, details, "
+     "reminder_duration, reminder_remark, status, doctor_id",
+     "tcm", True, "updated_at"),
+]
+SOURCE_BY_TABLE = {source[0]: source for source in REMINDER_SOURCES}
+
+_sync_lock = threading.Lock()
+_last_sync = None       # datetime the last incremental sync started
+_last_reconcile = 0.0   # time.time() of the last full pass
+
+_stats_lock = threading.Lock()
+_stats = {"planned": 0, "replanned": 0, "removed": 0, "claimed": 0, "sent": 0, "stale": 0,
+          "cancelled": 0, "expired": 0, "no_user": 0, "released": 0, "reconciles": 0, "last_due": 0}
+
+
+def _count(key: str, amount: int = 1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def booking_datetime(booking: dict):
+    """Appointment time of a clinic or TCM booking row (new date/time wins for TCM), or None."""
+    booking_date = booking.get("new_date") or booking.get("original_date") or booking.get("date")
+    booking_time = booking.get("new_time") or booking.get("original_time") or booking.get("time") or "00:00"
+    if not booking_date:
+        return None
+    try:
+        hour, minute = str(booking_time).split(":")[:2]
+        return MALAYSIA_TZ.localize(datetime.strptime(f"{booking_date} {int(hour):02d}:{int(minute):02d}", "%Y-%m-%d %H:%M"))
+    except (TypeError, ValueError):
+        logger.warning(f"Unparseable appointment time {booking_date} {booking_time} on booking {booking.get('id')}")
+        return None
+
+
+def _parse_ts(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def plan_reminders(booking: dict, now=None, include_late: bool = False) -> dict:
+    """
+    {reminder_type: (fire_at, booking_at)} for the reminders this booking
+    should still get. Reminders due more than REMINDER_MAX_LATENESS_SECONDS
+    ago are left out unless include_late is set.
+    """
+    now = now or datetime.now(MALAYSIA_TZ)
+    booking_at = booking_datetime(booking)
+    if booking_at is None or booking_at <= now:
+        return {}
+    hours_by_type = dict(TIME_REMINDERS)
+    if booking.get("reminder_duration") is not None:
+        try:
+            hours_by_type["customc"] = float(booking["reminder_duration"])
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring reminder_duration {booking['reminder_duration']!r} on booking {booking.get('id')}")
+    earliest = now - timedelta(seconds=REMINDER_MAX_LATENESS_SECONDS)
+    plan = {}
+    for reminder_type, hours in hours_by_type.items():
+        fire_at = booking_at - timedelta(hours=hours)
+        if include_late or fire_at > earliest:
+            plan[reminder_type] = (fire_at, booking_at)
+    return plan
+
+
+def booking_is_live(table: str, booking: dict) -> bool:
+    """TCM bookings only get reminders while confirmed; clinic bookings while they exist."""
+    return not SOURCE_BY_TABLE[table][3] or booking.get("status") == "confirmed"
+
+
+def _apply_plans(supabase, table: str, bookings: list, existing_rows: list, now, remove_missing: bool = False) -> int:
+    """
+    Diff the wanted reminders of these bookings against their schedule rows and
+    write only the difference. An appointment that moved gets fresh, unfired
+    reminders; reminders no longer wanted are removed unless already fired.
+    With remove_missing, unfired rows of bookings not in the list are removed too.
+    """
+    existing = {}
+    for row in existing_rows:
+        existing[(str(row["booking_id"]), row["reminder_type"])] = row
+
+    upserts, keep = [], set()
+    earliest = now - timedelta(seconds=REMINDER_MAX_LATENESS_SECONDS)
+    for booking in bookings:
+        booking_id = str(booking["id"])
+        plan = plan_reminders(booking, now, include_late=True) if booking_is_live(table, booking) else {}
+        for reminder_type, (fire_at, booking_at) in plan.items():
+            # An unchanged row stays, even overdue, so the firing side can record it as expired
+            keep.add((booking_id, reminder_type))
+            row = existing.get((booking_id, reminder_type))
+            if row and _parse_ts(row["booking_at"]) == booking_at and _parse_ts(row["fire_at"]) == fire_at:
+                continue
+            if fire_at <= earliest:
+                continue
+            upserts.append({
+                "source_table": table,
+                "booking_id": booking_id,
+                "reminder_type": reminder_type,
+                "fire_at": fire_at.isoformat(),
+                "booking_at": booking_at.isoformat(),
+                "user_id": booking.get("user_id"),
+                "fired_at": None,
+                "outcome": None,
+            })
+            _count("replanned" if row else "planned")
+
+    seen_bookings = {str(booking["id"]) for booking in bookings}
+    removals = [
+        row["id"] for key, row in existing.items()
+        if key not in keep and not row.get("fired_at") and (remove_missing or key[0] in seen_bookings)
+    ]
+
+    if upserts:
+        supabase.table(REMINDER_SCHEDULE_TABLE).upsert(
+            upserts, on_conflict="source_table,booking_id,reminder_type"
+        ).execute()
+    if removals:
+        supabase.table(REMINDER_SCHEDULE_TABLE).delete().in_("id", removals).execute()
+        _count("removed", len(removals))
+    return len(upserts)
+
+
+def _schedule_rows_for(supabase, table: str, booking_ids: list) -> list:
+    if not booking_ids:
+        return []
+    return supabase.table(REMINDER_SCHEDULE_TABLE).select(
+        "id, booking_id, reminder_type, fire_at, booking_at, fired_at"
+    ).eq("source_table", table).in_("booking_id", booking_ids).execute().data or []
+
+
+def refresh_booking_reminders(supabase, table: str, booking_id):
+    """Re-plan one booking's reminders after it was created, rescheduled or cancelled."""
+    if table not in SOURCE_BY_TABLE:
+        return
+    try:
+        bookings = supabase.table(table).select(SOURCE_BY_TABLE[table][1]).eq("id", booking_id).execute().data or []
+        rows = _schedule_rows_for(supabase, table, [str(booking_id)])
+        # A deleted booking has no row left; its unfired reminders go with it
+        _apply_plans(supabase, table, bookings, rows, datetime.now(MALAYSIA_TZ), remove_missing=not bookings)
+    except Exception as e:
+        logger.error(f"Could not refresh reminders for {table} booking {booking_id}: {e}")
+
+
+def cancel_booking_reminders(supabase, table: str, booking_ids):
+    """Drop the unfired reminders of deleted or cancelled bookings."""
+    booking_ids = [str(b) for b in (booking_ids if isinstance(booking_ids, (list, tuple, set)) else [booking_ids]) if b]
+    if not booking_ids:
+        return
+    try:
+        supabase.table(REMINDER_SCHEDULE_TABLE).delete().eq("source_table", table) \
+            .in_("booking_id", booking_ids).is_("fired_at", "null").execute()
+    except Exception as e:
+        logger.error(f"Could not cancel reminders for {table} bookings {booking_ids}: {e}")
+
+
+def _all_rows(build_query, page_size: int = 1000) -> list:
+    """Every row of a query, read in pages (PostgREST caps a single response)."""
+    rows, offset = [], 0
+    while True:
+        page = build_query().order("id").range(offset, offset + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def _future_bookings(supabase, table: str, columns: str, confirmed_only: bool, today: str) -> list:
+    if confirmed_only:
+        # TCM appointments can be moved to new_date, so they are filtered by status alone
+        return _all_rows(lambda: supabase.table(table).select(columns).eq("status", "confirmed"))
+    return _all_rows(lambda: supabase.table(table).select(columns).gte("date", today))
+
+
+def sync_reminder_schedule(supabase, full: bool = False) -> int:
+    """
+    Bring the schedule up to date. Normally only bookings created (or, for TCM,
+    updated) since the previous sync are read; every REMINDER_RECONCILE_SECONDS
+    or with full=True all future bookings are compared with the schedule.
+    Returns the number of reminder rows written.
+    """
+    global _last_sync, _last_reconcile
+    with _sync_lock:
+        now = datetime.now(MALAYSIA_TZ)
+        full = full or _last_sync is None or time.time() - _last_reconcile >= REMINDER_RECONCILE_SECONDS
+        since = None if full else (_last_sync - timedelta(seconds=REMINDER_SYNC_OVERLAP_SECONDS)).isoformat()
+        written = 0
+        failed = False
+        for table, columns, _, confirmed_only, changed_column in REMINDER_SOURCES:
+            try:
+                if full:
+                    bookings = _future_bookings(supabase, table, columns, confirmed_only, now.date().isoformat())
+                    rows = _all_rows(lambda: supabase.table(REMINDER_SCHEDULE_TABLE).select(
+                        "id, booking_id, reminder_type, fire_at, booking_at, fired_at"
+                    ).eq("source_table", table).gte("booking_at", now.isoformat()))
+                else:
+                    by_id = {}
+                    for column in ("created_at", changed_column):
+                        if column:
+                            for booking in supabase.table(table).select(columns).gte(column, since).execute().data or []:
+                                by_id[str(booking["id"])] = booking
+                    bookings = list(by_id.values())
+                    rows = _schedule_rows_for(supabase, table, list(by_id))
+                written += _apply_plans(supabase, table, bookings, rows, now, remove_missing=full)
+            except Exception as e:
+                failed = True
+                logger.error(f"Reminder schedule sync failed for {table}: {e}", exc_info=True)
+        # A failed source is retried with the same window next tick
+        if not failed:
+            _last_sync = now
+            if full:
+                _last_reconcile = time.time()
+                _count("reconciles")
+        logger.info(f"Reminder schedule {'reconciled' if full else 'synced'}: {written} rows written")
+        return written
+
+
+def _claimable_filter(now) -> str:
+    """Unfired reminders, or claims left without an outcome past REMINDER_CLAIM_TIMEOUT_SECONDS."""
+    abandoned_before = (now - timedelta(seconds=REMINDER_CLAIM_TIMEOUT_SECONDS)).isoformat()
+    return f'fired_at.is.null,and(outcome.is.null,fired_at.lt."{abandoned_before}")'
+
+
+def claim_due_reminders(supabase, now=None) -> list:
+    """
+    Due reminders, claimed by stamping fired_at. The stamp is a conditional
+    update, so a reminder claimed by another worker (or an earlier tick) is not
+    returned again while that claim is live. A claim whose run died before
+    recording an outcome is handed out again after REMINDER_CLAIM_TIMEOUT_SECONDS;
+    notification ids derived from the reminder (reminder_notification_id) keep
+    that retry from writing a second notification.
+    """
+    now = now or datetime.now(MALAYSIA_TZ)
+    due = supabase.table(REMINDER_SCHEDULE_TABLE).select("id").or_(_claimable_filter(now)) \
+        .lte("fire_at", now.isoformat()).order("fire_at").limit(REMINDER_BATCH_SIZE).execute().data or []
+    with _stats_lock:
+        _stats["last_due"] = len(due)
+    if not due:
+        return []
+    claimed = supabase.table(REMINDER_SCHEDULE_TABLE).update({"fired_at": now.isoformat()}) \
+        .in_("id", [row["id"] for row in due]).or_(_claimable_filter(now)).execute().data or []
+    _count("claimed", len(claimed))
+    return claimed
+
+
+def reminder_notification_id(reminder: dict) -> str:
+    """
+    c_notifications id for a claimed reminder, the same every time that
+    reminder (for that fire time) is processed, so re-inserting is a no-op.
+    A re-planned reminder has a new fire_at and gets a new id.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{REMINDER_SCHEDULE_TABLE}/{reminder['id']}/{reminder['fire_at']}"))
+
+
+def record_outcomes(supabase, outcomes: dict):
+    """Store how claimed reminders ended, one update per outcome ({outcome: [schedule ids]})."""
+    for outcome, ids in outcomes.items():
+        if not ids:
+            continue
+        _count(outcome, len(ids))
+        try:
+            supabase.table(REMINDER_SCHEDULE_TABLE).update({"outcome": outcome}).in_("id", ids).execute()
+        except Exception as e:
+            logger.warning(f"Could not record reminder outcome {outcome} for {len(ids)} rows: {e}")
+
+
+def unclaim_reminders(supabase, ids: list):
+    """Hand claimed reminders back (the notification could not be written) so the next tick retries them."""
+    if not ids:
+        return
+    try:
+        supabase.table(REMINDER_SCHEDULE_TABLE).update({"fired_at": None, "outcome": None}).in_("id", ids).execute()
+        _count("released", len(ids))
+    except Exception as e:
+        logger.error(f"Could not release {len(ids)} claimed reminders: {e}")
+
+
+def get_reminder_schedule_stats() -> dict:
+    with _stats_lock:
+        return {
+            **_stats,
+            "last_sync": _last_sync.isoformat() if _last_sync else None,
+            "seconds_since_reconcile": round(time.time() - _last_reconcile, 1) if _last_reconcile else None,
+        }
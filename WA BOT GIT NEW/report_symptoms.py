@@ -9,11 +9,12 @@ from calendar_utils import (
     # NEW: Time input functions
     handle_time_input, handle_time_confirmation, handle_retry_time_or_help,
     # NEW: Edit functions
-    show_edit_options, handle_edit_choice
+    show_edit_options, handle_edit_choice, handle_slot_taken
 )
+from slot_holds import insert_held_booking, SlotUnavailableError
 from utils import (
     send_whatsapp_message, send_interactive_menu, translate_template,
-    gt_t_tt, gt_tt, send_image_message, gt_dt_tt
+    gt_t_tt, gt_tt, send_image_message, gt_dt_tt, get_user_language
 )
 from clinicfd import handle_clinic_enquiries
 
@@ -24,16 +25,7 @@ def handle_symptoms(whatsapp_number, user_id, supabase, user_data, message):
     state = user_data.get(whatsapp_number, {}).get("state", "IDLE")
     logger.info(f"Handling symptoms reporting for {whatsapp_number}, state: {state}")
 
-    language = "en"
-    try:
-        resp = supabase.table("whatsapp_users") \
-            .select("language") \
-            .eq("whatsapp_number", whatsapp_number.lstrip("+")) \
-            .limit(1).execute()
-        if resp.data:
-            language = resp.data[0]["language"]
-    except Exception as e:
-        logger.error(f"Error fetching language for {whatsapp_number}: {e}")
+    language = get_user_language(supabase, whatsapp_number)
 
     if state == "IDLE":
         clinic_id = user_data[whatsapp_number].get("clinic_id")
@@ -360,7 +352,7 @@ def handle_symptoms(whatsapp_number, user_id, supabase, user_data, message):
                 "created_by": user_id
             }
             try:
-                supabase.table("c_s_pending_bookings").insert(booking).execute()
+                insert_held_booking(supabase, user_data[whatsapp_number], "c_s_pending_bookings", booking)
                 logger.info(f"GP consultation booking {pending_id} saved to pending_bookings")
                 
                 doctor_name = "Any available doctor"
@@ -424,6 +416,9 @@ def handle_symptoms(whatsapp_number, user_id, supabase, user_data, message):
                 except Exception as e:
                     logger.warning(f"Could not save to c_s_consultation table: {e}")
                 
+            except SlotUnavailableError as e:
+                handle_slot_taken(whatsapp_number, user_id, supabase, user_data, "report_symptoms", e)
+                return False
             except Exception as e:
                 logger.error(f"Failed to save GP consultation booking: {e}")
                 error_msg = translate_template(
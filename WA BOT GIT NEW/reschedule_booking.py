@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 from calendar_utils import get_calendar, select_period, get_available_hours, get_time_slots, handle_future_date_input, handle_future_date_confirmation
 from utils import send_whatsapp_message, send_interactive_menu, translate_template, gt_t_tt
+from reminder_schedule import cancel_booking_reminders
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -629,6 +630,7 @@ def handle_reschedule(whatsapp_number, user_id, supabase, user_data, message):
 
                 # Delete the booking from the appropriate table
                 supabase.table(table_name).delete().eq("id", original_id).execute()
+                cancel_booking_reminders(supabase, table_name, original_id)
                 logger.info(f"Cancelled booking {original_id} from {table_name} for {whatsapp_number}")
                 send_whatsapp_message(
                     whatsapp_number,
@@ -0,0 +1,190 @@
+# slot_holds.py - SHORT-LIVED SLOT RESERVATIONS BETWEEN PICKING A TIME AND CONFIRMING
+#
+# Holds live in one table with a row per held quarter-hour cell. The primary key
+# makes overlapping holds for the same doctor fail inside the database, so two
+# users can never hold the same time even when they pick it at the same moment:
+#
+#   create table c_s_slot_holds (
+#       hold_id uuid not null,
+#       provider text not null,              -- 'clinic' or 'tcm'
+#       doctor_id uuid not null,
+#       date date not null,
+#       cell smallint not null,              -- quarter-hour of the day, 0..95
+#       time text not null,
+#       duration_minutes integer not null,
+#       whatsapp_number text,
+#       expires_at timestamptz not null,
+#       created_at timestamptz not null default now(),
+#       primary key (provider, doctor_id, date, cell)
+#   );
+#   create index on c_s_slot_holds (hold_id);
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from availability import (
+    CLINIC, SLOT_MINUTES, get_day_availability, invalidate_day_availability, to_minutes
+)
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+SLOT_HOLDS_TABLE = "c_s_slot_holds"
+# How long a picked slot stays reserved while the user reviews the booking (seconds)
+SLOT_HOLD_TTL_SECONDS = int(os.getenv("SLOT_HOLD_TTL_SECONDS", "600"))
+# A hold this close to expiry is renewed before it is promoted
+SLOT_HOLD_RENEW_MARGIN = 15
+
+_stats_lock = threading.Lock()
+_stats = {"placed": 0, "conflicts_booked": 0, "conflicts_held": 0, "promoted": 0,
+          "reheld_at_confirm": 0, "released": 0, "errors": 0}
+
+
+class SlotUnavailableError(Exception):
+    """The slot was taken by another booking or hold before it could be reserved."""
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _is_duplicate_key(error: Exception) -> bool:
+    return getattr(error, "code", None) == "23505" or "duplicate key" in str(error).lower()
+
+
+def _cells(time_slot: str, duration: int) -> list:
+    start = to_minutes(time_slot)
+    return list(range(start // SLOT_MINUTES, -(-(start + duration) // SLOT_MINUTES)))
+
+
+def place_hold(supabase, doctor_id, date: str, time_slot: str, duration: int, whatsapp_number: str = None, provider=CLINIC):
+    """
+    Reserve doctor/date/time for SLOT_HOLD_TTL_SECONDS.
+    Returns (hold, reason): hold is a dict to keep in user_data, or None with
+    reason slot_booked / doctor_unavailable / slot_held. If the holds table
+    cannot be used the hold is skipped (hold_id None) and the booking falls back
+    to the fresh availability check alone.
+    """
+    # The expensive check happens here, once, when the user picks the slot
+    is_available, reason = get_day_availability(supabase, date, refresh=True, provider=provider).doctor_status(
+        doctor_id, to_minutes(time_slot), duration
+    )
+    if not is_available:
+        _count("conflicts_booked")
+        logger.info(f"Hold refused for {doctor_id} {date} {time_slot}: {reason}")
+        return None, reason
+
+    hold_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=SLOT_HOLD_TTL_SECONDS)
+    hold = {"id": hold_id, "provider": provider.name, "doctor_id": doctor_id, "date": date, "time": time_slot,
+            "duration": duration, "expires_at": time.time() + SLOT_HOLD_TTL_SECONDS}
+    try:
+        # Expired holds for this doctor and day no longer block anyone
+        supabase.table(SLOT_HOLDS_TABLE).delete().eq("provider", provider.name).eq("doctor_id", doctor_id) \
+            .eq("date", date).lt("expires_at", now.isoformat()).execute()
+        supabase.table(SLOT_HOLDS_TABLE).insert([
+            {"hold_id": hold_id, "provider": provider.name, "doctor_id": doctor_id, "date": date, "cell": cell,
+             "time": time_slot, "duration_minutes": duration, "whatsapp_number": whatsapp_number,
+             "expires_at": expires_at.isoformat()}
+            for cell in _cells(time_slot, duration)
+        ]).execute()
+    except Exception as e:
+        if _is_duplicate_key(e):
+            _count("conflicts_held")
+            logger.info(f"Hold refused for {doctor_id} {date} {time_slot}: held by another user")
+            return None, "slot_held"
+        _count("errors")
+        logger.error(f"Could not place slot hold for {doctor_id} {date} {time_slot}: {e}")
+        hold["id"] = None
+        return hold, "available"
+
+    _count("placed")
+    logger.info(f"Held {doctor_id} {date} {time_slot} ({duration}min) for {whatsapp_number}, hold {hold_id}")
+    return hold, "available"
+
+
+def release_hold(supabase, hold):
+    """Give a held slot back (cancel, edit or after the booking row exists)."""
+    if not hold or not hold.get("id"):
+        return
+    try:
+        supabase.table(SLOT_HOLDS_TABLE).delete().eq("hold_id", hold["id"]).execute()
+        _count("released")
+    except Exception as e:
+        logger.warning(f"Could not release slot hold {hold['id']}: {e}")
+
+
+def hold_user_slot(supabase, user_data: dict, whatsapp_number: str, provider=CLINIC):
+    """
+    Hold the doctor/date/time_slot currently in the user's booking state,
+    releasing any earlier hold of theirs. Returns (True, "available") or
+    (False, reason) when someone else has the slot.
+    """
+    state = user_data[whatsapp_number]
+    doctor_id, date, time_slot = state.get("doctor_id"), state.get("date"), state.get("time_slot")
+    duration = state.get("duration_minutes", 30)
+    previous = state.get("slot_hold")
+    if previous and (previous["doctor_id"], previous["date"], previous["time"], previous["duration"]) == (doctor_id, date, time_slot, duration) \
+            and previous["expires_at"] - time.time() > SLOT_HOLD_RENEW_MARGIN:
+        return True, "available"
+    release_hold(supabase, state.pop("slot_hold", None))
+    if not (doctor_id and date and time_slot):
+        return True, "available"
+    hold, reason = place_hold(supabase, doctor_id, date, time_slot, duration, whatsapp_number, provider)
+    if not hold:
+        return False, reason
+    state["slot_hold"] = hold
+    return True, "available"
+
+
+def release_user_hold(supabase, user_data: dict, whatsapp_number: str):
+    state = user_data.get(whatsapp_number) or {}
+    release_hold(supabase, state.pop("slot_hold", None))
+
+
+def insert_held_booking(supabase, user_state: dict, table: str, booking: dict, provider=CLINIC):
+    """
+    Promote the user's hold into a booking row: insert, then drop the hold.
+    With a live hold no availability check is needed. Without one (expired,
+    or the slot was never held) the slot is held first and SlotUnavailableError
+    is raised if that fails. Returns the insert response.
+    """
+    hold = user_state.get("slot_hold")
+    doctor_id = booking.get("doctor_id")
+    date = booking.get("date") or booking.get("original_date")
+    time_slot = booking.get("time") or booking.get("original_time")
+    duration = booking.get("duration_minutes") or 30
+    live = hold and (hold["doctor_id"], hold["date"], hold["time"], hold["duration"]) == (doctor_id, date, time_slot, duration) \
+        and hold["expires_at"] - time.time() > SLOT_HOLD_RENEW_MARGIN
+
+    if not live and doctor_id and date and time_slot:
+        release_hold(supabase, user_state.pop("slot_hold", None))
+        hold, reason = place_hold(supabase, doctor_id, date, time_slot, duration, provider=provider)
+        _count("reheld_at_confirm")
+        if not hold:
+            raise SlotUnavailableError(f"{date} {time_slot} is no longer available ({reason})")
+
+    response = supabase.table(table).insert(booking).execute()
+    invalidate_day_availability(date, provider)
+    if hold:
+        _count("promoted")
+        release_hold(supabase, hold)
+    user_state.pop("slot_hold", None)
+    return response
+
+
+def get_slot_hold_stats() -> dict:
+    with _stats_lock:
+        attempts = _stats["placed"] + _stats["conflicts_booked"] + _stats["conflicts_held"]
+        conflicts = _stats["conflicts_booked"] + _stats["conflicts_held"]
+        return {**_stats, "conflict_rate": round(conflicts / attempts, 4) if attempts else 0.0}
@@ -2,9 +2,18 @@
 import logging
 import uuid
 import re
-import json
 from datetime import datetime, timedelta
 from utils import send_whatsapp_message, send_interactive_menu, translate_template, gt_tt, gt_t_tt
+from availability import (
+    TCM, get_day_availability, preload_day_availability, invalidate_day_availability, get_clinic_doctor_ids,
+    clinic_schedule_for, pick_doctor, to_minutes,
+    candidate_doctor_ids, available_slots_for_day, slot_availability, doctor_slot_availability,
+    date_availability, nearest_available_dates
+)
+from time_input import parse_time_input, format_time_for_display, round_to_15_minutes
+from slot_holds import hold_user_slot, release_user_hold, insert_held_booking, SlotUnavailableError
+from calendar_utils import ask_for_another_time, handle_slot_taken
+from reminder_schedule import refresh_booking_reminders, cancel_booking_reminders
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -55,54 +64,29 @@ def get_service_assigned_doctors(supabase, service_id):
         logger.error(f"[TCM] Error fetching service assigned doctors: {str(e)}")
         return [], None
 
-def find_least_busy_available_doctor(clinic_id, date, time_slot, duration, supabase):
+def find_least_busy_available_doctor(clinic_id, date, time_slot, duration, supabase, tie_break=None):
     """Find the least busy available doctor for a given time slot."""
     try:
         # Get all doctors in the clinic
-        doctors = supabase.table("tcm_a_doctors").select("id, name").eq("clinic_id", clinic_id).execute().data
+        doctor_ids = get_clinic_doctor_ids(supabase, clinic_id, TCM)
        
-        if not doctors:
+        if not doctor_ids:
             logger.warning(f"[TCM] No doctors found for clinic {clinic_id}")
             return None, "no_doctors_in_clinic"
        
-        # Find available doctors and their appointment counts
-        available_doctors = []
+        # One fresh read of the day gives every doctor's busy intervals and appointment count
+        day = get_day_availability(supabase, date, refresh=True, provider=TCM)
+        available_doctor_ids = day.free_doctors(doctor_ids, to_minutes(time_slot), duration)
        
-        for doctor in doctors:
-            doctor_id = doctor["id"]
-           
-            # Check if doctor is available at this slot
-            is_available, reason = check_doctor_availability_at_slot(
-                doctor_id, date, time_slot, duration, supabase
-            )
-           
-            if is_available:
-                # Count appointments for this doctor on this day
-                appointments = supabase.table("tcm_s_bookings").select("id", count="exact") \
-                    .eq("doctor_id", doctor_id) \
-                    .eq("original_date", date) \
-                    .in_("status", ["confirmed", "pending"]) \
-                    .execute()
-               
-                count = appointments.count or 0
-                available_doctors.append({
-                    "id": doctor_id,
-                    "name": doctor["name"],
-                    "appointment_count": count
-                })
-       
-        if not available_doctors:
+        if not available_doctor_ids:
             logger.warning(f"[TCM] No doctors available for {date} at {time_slot}")
             return None, "no_doctors_available"
        
-        # Sort by appointment count (least busy first)
-        available_doctors.sort(key=lambda x: x["appointment_count"])
+        # Least busy first; ties broken by the configured policy
+        selected_id = pick_doctor(day, available_doctor_ids, tie_break=tie_break, rotation_key=(TCM.name, clinic_id))
+        logger.info(f"[TCM] Selected least busy doctor {selected_id} with {day.appointment_count(selected_id)} appointments")
        
-        # Return the least busy available doctor
-        selected_doctor = available_doctors[0]
-        logger.info(f"[TCM] Selected least busy doctor {selected_doctor['id']} ({selected_doctor['name']}) with {selected_doctor['appointment_count']} appointments")
-       
-        return selected_doctor["id"], "available"
+        return selected_id, "available"
        
     except Exception as e:
         logger.error(f"[TCM] Error finding least busy doctor: {str(e)}")
@@ -282,6 +266,8 @@ def request_tcm_reschedule(booking_id, new_date, new_time, supabase):
         }
        
         response = supabase.table("tcm_s_bookings").update(update_data).eq("id", booking_id).execute()
+        invalidate_day_availability(provider=TCM)
+        refresh_booking_reminders(supabase, "tcm_s_bookings", booking_id)
         return True, "Reschedule requested successfully"
     except Exception as e:
         logger.error(f"Error requesting TCM reschedule: {e}")
@@ -290,84 +276,14 @@ def request_tcm_reschedule(booking_id, new_date, new_time, supabase):
 def get_clinic_schedule(supabase, clinic_id, date):
     """Fetch TCM clinic schedule for a given date including all breaks."""
     try:
-        date_str = date.strftime("%Y-%m-%d")
-        day_name = date.strftime("%A").lower()
-        day_key = day_name
-       
-        response = supabase.table("tcm_a_clinic_available_time").select("*").eq("clinic_id", clinic_id).execute()
-       
-        if not response.data:
-            logger.error(f"[TCM] No schedule found for clinic_id: {clinic_id}")
-            return None
-           
-        schedule = response.data[0]
-        # Check self-declared holidays
-        holiday_self_declared = schedule.get("holiday_self_declared")
-        if holiday_self_declared and isinstance(holiday_self_declared, list) and date_str in holiday_self_declared:
-            logger.info(f"[TCM] Date {date_str} is a self-declared holiday for clinic_id: {clinic_id}")
-            return None
-        special_dates = schedule.get("special_dates", [])
-        if special_dates is None:
-            special_dates = []
-        elif isinstance(special_dates, str):
-            try:
-                special_dates = json.loads(special_dates)
-            except json.JSONDecodeError:
-                special_dates = []
-       
-        # Check special dates
-        for sd in special_dates:
-            if sd.get("date") == date_str:
-                if not sd.get("start_time") or not sd.get("end_time"):
-                    logger.info(f"[TCM] Special date {date_str} has no valid hours (null start_time or end_time)")
-                    return None
-               
-                # Extract all breaks for special date
-                breaks = []
-                for i in range(1, 6):
-                    break_start = sd.get(f"break{i}_start")
-                    break_end = sd.get(f"break{i}_end")
-                    if break_start and break_end:
-                        breaks.append({"start": break_start, "end": break_end})
-               
-                return {
-                    "start_time": sd.get("start_time"),
-                    "end_time": sd.get("end_time"),
-                    "lunch_start": sd.get("lunch_start"),
-                    "lunch_end": sd.get("lunch_end"),
-                    "dinner_start": sd.get("dinner_start"),
-                    "dinner_end": sd.get("dinner_end"),
-                    "breaks": breaks
-                }
-        # Get regular schedule for the day
-        start_time = schedule.get(f"{day_key}_start")
-        end_time = schedule.get(f"{day_key}_end")
-        lunch_start = schedule.get(f"{day_key}_lunch_start")
-        lunch_end = schedule.get(f"{day_key}_lunch_end")
-        dinner_start = schedule.get(f"{day_key}_dinner_start")
-        dinner_end = schedule.get(f"{day_key}_dinner_end")
-        # Extract all breaks for regular day
-        breaks = []
-        for i in range(1, 6):
-            break_start = schedule.get(f"{day_key}_break{i}_start")
-            break_end = schedule.get(f"{day_key}_break{i}_end")
-            if break_start and break_end:
-                breaks.append({"start": break_start, "end": break_end})
-        if not start_time or not end_time:
-            logger.info(f"[TCM] Clinic is closed on {day_name} ({date_str}) due to null start_time or end_time")
-            return None
-        logger.info(f"[TCM] Schedule for {day_name} ({date_str}): start={start_time}, end={end_time}, lunch={lunch_start}-{lunch_end}, dinner={dinner_start}-{dinner_end}, breaks={len(breaks)}")
-        return {
-            "start_time": start_time,
-            "end_time": end_time,
-            "lunch_start": lunch_start,
-            "lunch_end": lunch_end,
-            "dinner_start": dinner_start,
-            "dinner_end": dinner_end,
-            "breaks": breaks
-        }
+        # The clinic's row is decoded once and reused until CLINIC_SCHEDULE_TTL expires
+        schedule = clinic_schedule_for(supabase, clinic_id, date, TCM)
+        if not schedule:
+            logger.info(f"[TCM] Clinic {clinic_id} is closed on {date.strftime('%A').lower()} ({date.strftime('%Y-%m-%d')})")
+        return schedule
+
     except Exception as e:
-        logger.error(f"[TCM] Error fetching clinic schedule for {clinic_id} on {date_str}: {str(e)}", exc_info=True)
+        logger.error(f"[TCM] Error fetching clinic schedule for {clinic_id} on {date}: {str(e)}", exc_info=True)
         return None
 
 def parse_date_input(date_str):
@@ -421,34 +337,8 @@ def format_date_for_button(date_obj):
 def check_doctor_availability_at_slot(doctor_id, date, time_slot, duration, supabase):
     """Check if a specific doctor is available at a given time slot."""
     try:
-        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
-        slot_end = slot_time + timedelta(minutes=duration)
-       
-        # Check existing bookings in tcm_s_bookings - BOTH original and new times
-        bookings = supabase.table("tcm_s_bookings").select(
-            "original_time, new_time, duration_minutes, status"
-        ).eq("doctor_id", doctor_id) \
-         .eq("original_date", date) \
-         .in_("status", ["confirmed", "pending"]) \
-         .execute().data
-       
-        for b in bookings:
-            # Check original time
-            if b["original_time"]:
-                b_start = datetime.strptime(f"{date} {b['original_time']}", "%Y-%m-%d %H:%M")
-                b_end = b_start + timedelta(minutes=b["duration_minutes"])
-                # Check if slot overlaps with this booking
-                if slot_time < b_end and slot_end > b_start:
-                    return False, "slot_booked"
-           
-            # Check new time for rescheduled appointments
-            if b["new_time"]:
-                r_start = datetime.strptime(f"{date} {b['new_time']}", "%Y-%m-%d %H:%M")
-                r_end = r_start + timedelta(minutes=b["duration_minutes"])
-                if slot_time < r_end and slot_end > r_start:
-                    return False, "slot_booked"
-       
-        return True, "available"
+        # Original and rescheduled times of confirmed/pending bookings both block the doctor
+        return doctor_slot_availability(supabase, doctor_id, date, time_slot, duration, TCM)
    
     except Exception as e:
         logger.error(f"[TCM] Error checking doctor availability: {str(e)}")
@@ -495,12 +385,11 @@ def get_assigned_doctor_for_slot(service_id, date, time_slot, duration, supabase
         else:
             # No assigned doctors - check any available doctor in the clinic
             logger.info(f"[TCM] Service {service_id} has no assigned doctors. Checking any available doctor.")
-            doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-            if not doctors:
+            doctor_ids = get_clinic_doctor_ids(supabase, clinic_id, TCM)
+            if not doctor_ids:
                 logger.warning(f"[TCM] No doctors found for clinic {clinic_id}")
                 return None, "no_doctors_in_clinic"
-            for doctor in doctors:
-                doctor_id = doctor["id"]
+            for doctor_id in doctor_ids:
                 is_available, reason = check_doctor_availability_at_slot(
                     doctor_id, date, time_slot, duration, supabase
                 )
@@ -512,141 +401,27 @@ def get_assigned_doctor_for_slot(service_id, date, time_slot, duration, supabase
         logger.error(f"[TCM] Error finding assigned doctor: {str(e)}")
         return None, "error"
 
-def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, service_id=None):
-    """Check if a specific date is available for booking in TCM clinic."""
+def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, service_id=None, duration=30):
+    """Check if a specific date has at least one bookable slot in the TCM clinic."""
     try:
-        date_str = date_obj.strftime("%Y-%m-%d")
-       
-        # Check clinic schedule
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return False, "clinic_closed"
-           
-        # Parse clinic times
-        def parse_time(t):
-            if not t:
-                return None
-            if len(t) > 5:
-                t = t[:5] # keep only HH:MM
-            return datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %H:%M")
-        start_time = parse_time(clinic_schedule["start_time"])
-        end_time = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-       
-        # Check all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-        def is_during_breaks(slot_time):
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-        # Generate time slots and check availability
-        time_slots = []
-        current_slot = start_time
-        while current_slot < end_time:
-            if is_during_breaks(current_slot):
-                current_slot += timedelta(minutes=15)
-                continue
-            time_slots.append((current_slot, current_slot.strftime("%H:%M")))
-            current_slot += timedelta(minutes=15)
-        if not time_slots:
-            return False, "no_slots"
-        # Check doctor availability for at least one slot
-        if is_any_doctor:
-            doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-            for slot_time, slot_str in time_slots:
-                unavailable_doctor_ids = set()
-               
-                booked_doctor_ids = set()
-                # Check tcm_s_bookings table for confirmed bookings
-                bookings_query = supabase.table("tcm_s_bookings").select("doctor_id, original_time, new_time") \
-                    .eq("original_date", date_str) \
-                    .in_("status", ["confirmed", "pending"])
-               
-                # Only add doctor_id filter if it's not None and not "None"
-                if doctor_id and doctor_id != "None":
-                    bookings_query = bookings_query.eq("doctor_id", doctor_id)
-               
-                bookings = bookings_query.execute().data
-               
-                for booking in bookings:
-                    # Check original time slot
-                    if booking["original_time"] == slot_str:
-                        booked_doctor_ids.add(booking["doctor_id"])
-                    # Check new time slot for rescheduled appointments
-                    if booking["new_time"] == slot_str:
-                        booked_doctor_ids.add(booking["doctor_id"])
-               
-                if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
-                    return True, "available"
-        else:
-            for slot_time, slot_str in time_slots:
-                # Check if specific doctor is booked
-                is_booked = False
-               
-                # Check tcm_s_bookings table - FIXED: Only filter by doctor_id if it's not None
-                if doctor_id and doctor_id != "None":
-                    bookings = supabase.table("tcm_s_bookings").select("id, original_time, new_time") \
-                        .eq("doctor_id", doctor_id) \
-                        .eq("original_date", date_str) \
-                        .in_("status", ["confirmed", "pending"]) \
-                        .execute().data
-                   
-                    for booking in bookings:
-                        if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
-                            is_booked = True
-                            break
-                else:
-                    # If doctor_id is None, check if any bookings exist for this time slot
-                    bookings = supabase.table("tcm_s_bookings").select("id, original_time, new_time") \
-                        .eq("original_date", date_str) \
-                        .in_("status", ["confirmed", "pending"]) \
-                        .execute().data
-                   
-                    # If there are any bookings at this time, it's booked
-                    for booking in bookings:
-                        if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
-                            is_booked = True
-                            break
-               
-                if not is_booked:
-                    return True, "available"
-        return False, "no_available_doctors"
+        if doctor_id == "None":
+            doctor_id = None
+        doctor_ids = candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor, TCM)
+        return date_availability(supabase, date_obj, clinic_id, doctor_ids, duration, TCM)
     except Exception as e:
         logger.error(f"[TCM] Error checking date availability: {str(e)}", exc_info=True)
         return False, "error"
 
-def find_nearest_available_dates(target_date, clinic_id, doctor_id, is_any_doctor, supabase, max_dates=8, search_range=30):
+def find_nearest_available_dates(target_date, clinic_id, doctor_id, is_any_doctor, supabase, max_dates=8, search_range=30, duration=30):
     """Find nearest available dates within search_range days from target_date."""
-    available_dates = []
-   
-    # Search forward from target_date
-    for days_after in range(0, search_range + 1):
-        check_date = target_date + timedelta(days=days_after)
-        is_available, reason = check_date_availability(check_date, clinic_id, doctor_id, is_any_doctor, supabase)
-        if is_available:
-            available_dates.append(check_date)
-            if len(available_dates) >= max_dates:
-                return available_dates
-   
-    # Search backward from target_date
-    for days_before in range(1, search_range + 1):
-        check_date = target_date - timedelta(days=days_before)
-        is_available, reason = check_date_availability(check_date, clinic_id, doctor_id, is_any_doctor, supabase)
-        if is_available:
-            available_dates.append(check_date)
-            if len(available_dates) >= max_dates:
-                return available_dates
-               
-    return available_dates
+    try:
+        if doctor_id == "None":
+            doctor_id = None
+        doctor_ids = candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor, TCM)
+        return nearest_available_dates(supabase, target_date, clinic_id, doctor_ids, duration, TCM, max_dates, search_range)
+    except Exception as e:
+        logger.error(f"[TCM] Error finding nearest available dates: {str(e)}")
+        return []
 
 def handle_future_date_input(whatsapp_number, user_id, supabase, user_data, module_name, date_input):
     """Handle future date input from user."""
@@ -762,8 +537,9 @@ def handle_future_date_confirmation(whatsapp_number, user_id, supabase, user_dat
             is_any_doctor = True
             doctor_id = None
             logger.info(f"[TCM] Doctor selection disabled, using any doctor logic for {whatsapp_number}")
+        duration = user_data[whatsapp_number].get("duration_minutes", 30)
         # Check if the date is available
-        is_available, reason = check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase)
+        is_available, reason = check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, duration=duration)
        
         if is_available:
             # Date is available, proceed to period selection
@@ -780,7 +556,7 @@ def handle_future_date_confirmation(whatsapp_number, user_id, supabase, user_dat
         else:
             # Date not available, suggest nearest dates
             formatted_date_short = format_date_for_button(date_obj)
-            nearest_dates = find_nearest_available_dates(date_obj, clinic_id, doctor_id, is_any_doctor, supabase)
+            nearest_dates = find_nearest_available_dates(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, duration=duration)
            
             if nearest_dates:
                 # Create buttons for nearest dates using DD/MM/YYYY format
@@ -864,127 +640,27 @@ def get_calendar(whatsapp_number, user_id, supabase, user_data, module_name):
         doctor_selection_enabled = get_clinic_doctor_selection(supabase, clinic_id)
        
         logger.info(f"[TCM] Querying calendar for {whatsapp_number}, clinic_id: {clinic_id}, doctor_id: {doctor_id}, any_doctor: {is_any_doctor}, from {start_date} to {end_date}, doctor_selection_enabled: {doctor_selection_enabled}")
+        duration = user_data[whatsapp_number].get("duration_minutes", 30)
+        if doctor_selection_enabled:
+            doctor_ids = candidate_doctor_ids(supabase, clinic_id, doctor_id, is_any_doctor, TCM)
+        else:
+            # Doctor selection is disabled - any assigned doctor (or any clinic doctor) can be auto-assigned
+            assigned_doctor_ids, _ = get_service_assigned_doctors(supabase, service_id)
+            doctor_ids = assigned_doctor_ids or get_clinic_doctor_ids(supabase, clinic_id, TCM)
+
+        # All 14 days of bookings in one read, then one bitmap check per day
+        preload_day_availability(supabase, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"), TCM)
+
         available_dates = []
         for i in range(14):
             date = start_date + timedelta(days=i)
             date_str = date.strftime("%Y-%m-%d")
-            day_name = date.strftime("%A")
-            translated_day = translate_template(whatsapp_number, day_name, supabase)
-            display_str = f"{date.strftime('%d-%m-%Y')} ({translated_day})"
-            clinic_schedule = get_clinic_schedule(supabase, clinic_id, date)
-            if not clinic_schedule:
-                logger.info(f"[TCM] Clinic is closed on {date_str}")
-                continue
-            try:
-                start_time = datetime.strptime(f"{date_str} {clinic_schedule['start_time']}", "%Y-%m-%d %H:%M")
-            except ValueError:
-                try:
-                    start_time = datetime.strptime(f"{date_str} {clinic_schedule['start_time']}", "%Y-%m-%d %H:%M:%S")
-                except ValueError as e:
-                    logger.error(f"[TCM] Failed to parse start_time {clinic_schedule['start_time']} for {date_str}: {str(e)}")
-                    continue
-            try:
-                end_time = datetime.strptime(f"{date_str} {clinic_schedule['end_time']}", "%Y-%m-%d %H:%M")
-            except ValueError:
-                try:
-                    end_time = datetime.strptime(f"{date_str} {clinic_schedule['end_time']}", "%Y-%m-%d %H:%M:%S")
-                except ValueError as e:
-                    logger.error(f"[TCM] Failed to parse end_time {clinic_schedule['end_time']} for {date_str}: {str(e)}")
-                    continue
-            lunch_start = None
-            if clinic_schedule["lunch_start"]:
-                try:
-                    lunch_start = datetime.strptime(f"{date_str} {clinic_schedule['lunch_start']}", "%Y-%m-%d %H:%M")
-                except ValueError:
-                    try:
-                        lunch_start = datetime.strptime(f"{date_str} {clinic_schedule['lunch_start']}", "%Y-%m-%d %H:%M:%S")
-                    except ValueError as e:
-                        logger.error(f"[TCM] Failed to parse lunch_start {clinic_schedule['lunch_start']} for {date_str}: {str(e)}")
-                        lunch_start = None
-            lunch_end = None
-            if clinic_schedule["lunch_end"]:
-                try:
-                    lunch_end = datetime.strptime(f"{date_str} {clinic_schedule['lunch_end']}", "%Y-%m-%d %H:%M")
-                except ValueError:
-                    try:
-                        lunch_end = datetime.strptime(f"{date_str} {clinic_schedule['lunch_end']}", "%Y-%m-%d %H:%M:%S")
-                    except ValueError as e:
-                        logger.error(f"[TCM] Failed to parse lunch_end {clinic_schedule['lunch_end']} for {date_str}: {str(e)}")
-                        lunch_end = None
-            total_duration = end_time - start_time
-            lunch_duration = (lunch_end - lunch_start) if lunch_start and lunch_end else timedelta(0)
-            available_duration = total_duration - lunch_duration
-            if available_duration <= timedelta(0):
-                logger.info(f"[TCM] No available time slots for {date_str}")
+            is_available, reason = date_availability(supabase, date, clinic_id, doctor_ids, duration, TCM)
+            if not is_available:
+                logger.info(f"[TCM] No availability on {date_str}: {reason}")
                 continue
-            time_slots = []
-            current_slot = start_time
-            while current_slot < end_time:
-                if lunch_start and lunch_end and lunch_start <= current_slot < lunch_end:
-                    current_slot += timedelta(minutes=15)
-                    continue
-                time_slots.append((current_slot, current_slot.strftime("%H:%M")))
-                current_slot += timedelta(minutes=15)
-            if not time_slots:
-                logger.info(f"[TCM] No available time slots for {date_str}")
-                continue
-            has_available_slot = False
-           
-            if doctor_selection_enabled:
-                # Doctor selection is enabled - check based on selected doctor
-                if is_any_doctor:
-                    doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-                    for slot_time, slot_str in time_slots:
-                        unavailable_doctor_ids = set()
-                       
-                        booked_doctor_ids = set()
-                        # Check tcm_s_bookings table
-                        bookings = supabase.table("tcm_s_bookings").select("doctor_id, original_time, new_time") \
-                            .eq("original_date", date_str) \
-                            .in_("status", ["confirmed", "pending"]) \
-                            .execute().data
-                       
-                        for booking in bookings:
-                            if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
-                                booked_doctor_ids.add(booking["doctor_id"])
-                       
-                        if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
-                            has_available_slot = True
-                            break
-                else:
-                    for slot_time, slot_str in time_slots:
-                        is_booked = False
-                       
-                        # Check tcm_s_bookings table
-                        bookings = supabase.table("tcm_s_bookings").select("id, original_time, new_time") \
-                            .eq("doctor_id", doctor_id) \
-                            .eq("original_date", date_str) \
-                            .in_("status", ["confirmed", "pending"]) \
-                            .execute().data
-                       
-                        for booking in bookings:
-                            if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
-                                is_booked = True
-                                break
-                       
-                        if not is_booked:
-                            has_available_slot = True
-                            break
-            else:
-                # Doctor selection is disabled - check if any doctor can be auto-assigned
-                for slot_time, slot_str in time_slots:
-                    assigned_doctor, reason = get_assigned_doctor_for_slot(
-                        service_id, date_str, slot_str,
-                        user_data[whatsapp_number].get("duration_minutes", 30),
-                        supabase,
-                        clinic_id
-                    )
-                    if assigned_doctor:
-                        has_available_slot = True
-                        break
-           
-            if has_available_slot:
-                available_dates.append({"id": date_str, "title": display_str})
+            translated_day = translate_template(whatsapp_number, date.strftime("%A"), supabase)
+            available_dates.append({"id": date_str, "title": f"{date.strftime('%d-%m-%Y')} ({translated_day})"})
         # Add Future Date option
         display_dates = available_dates[:9] # Take only first 9 available dates
        
@@ -1665,7 +1341,11 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
                     send_interactive_menu(whatsapp_number, supabase)
                     return
                
-                # Find available doctors and collect their metrics
+                # Find available doctors and collect their metrics from one fresh read of the day
+                day = get_day_availability(supabase, date, refresh=True, provider=TCM)
+                assigned_doctors = []
+                if service_id and service_id != "others":
+                    assigned_doctors, _ = get_service_assigned_doctors(supabase, service_id)
                 available_doctors_metrics = []
                
                 for doctor in doctors:
@@ -1682,30 +1362,23 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
                         is_available, reason = check_date_availability(date_obj, clinic_id, d_id, False, supabase, service_id)
                    
                     if is_available:
-                        # Get existing appointments count for this doctor on this day
-                        appointments = supabase.table("tcm_s_bookings").select("id", count="exact") \
-                            .eq("doctor_id", d_id) \
-                            .eq("original_date", date) \
-                            .in_("status", ["confirmed", "pending"]) \
-                            .execute()
-                        total_appointments = appointments.count or 0
+                        # Existing appointments for this doctor on this day
+                        total_appointments = day.appointment_count(d_id)
                        
                         # Calculate a score (lower is better) - prioritize doctors with fewer appointments
                         score = total_appointments * 10
                        
                         # Check if this doctor is assigned to the service
-                        if service_id and service_id != "others":
-                            assigned_doctors, _ = get_service_assigned_doctors(supabase, service_id)
-                            if d_id in assigned_doctors:
-                                score -= 50 # Priority boost for assigned doctors
-                                logger.info(f"[TCM] Doctor {d_id} is service-assigned, giving priority boost")
+                        if d_id in assigned_doctors:
+                            score -= 50 # Priority boost for assigned doctors
+                            logger.info(f"[TCM] Doctor {d_id} is service-assigned, giving priority boost")
                        
                         available_doctors_metrics.append({
                             "id": d_id,
                             "name": d_name,
                             "score": score,
                             "total_appointments": total_appointments,
-                            "is_service_assigned": (service_id and service_id != "others" and d_id in assigned_doctors)
+                            "is_service_assigned": d_id in assigned_doctors
                         })
                
                 if not available_doctors_metrics:
@@ -1723,12 +1396,24 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
                         get_calendar(whatsapp_number, user_id, supabase, user_data, module_name)
                     return
                
-                # Sort by score (lower is better)
-                available_doctors_metrics.sort(key=lambda x: x["score"])
-               
-                # Select the doctor with the best (lowest) score
-                selected_doctor = available_doctors_metrics[0]
-                user_data[whatsapp_number]["doctor_id"] = selected_doctor["id"]
+                # Select the doctor with the best (lowest) score whose slot can still be held;
+                # ties broken by the configured policy
+                metrics_by_id = {m["id"]: m for m in available_doctors_metrics}
+                candidates = list(metrics_by_id)
+                selected_doctor = None
+                while candidates:
+                    candidate_id = pick_doctor(day, candidates, score=lambda d: metrics_by_id[d]["score"], rotation_key=(TCM.name, clinic_id))
+                    user_data[whatsapp_number]["doctor_id"] = candidate_id
+                    if not time_slot or hold_user_slot(supabase, user_data, whatsapp_number, TCM)[0]:
+                        selected_doctor = metrics_by_id[candidate_id]
+                        break
+                    candidates.remove(candidate_id)
+                if not selected_doctor:
+                    user_data[whatsapp_number]["doctor_id"] = None
+                    ask_for_another_time(whatsapp_number, user_id, supabase, user_data, module_name,
+                                         "No doctors available for this date/time. Please select another.",
+                                         show_time_slots=get_time_slots)
+                    return
                 doctor_name = selected_doctor["name"]
                
                 logger.info(f"[TCM] Selected best fit doctor {selected_doctor['id']} ({doctor_name}) for {whatsapp_number} {'at ' + time_slot if time_slot else 'on ' + date}")
@@ -1834,6 +1519,15 @@ def get_available_doctors(whatsapp_number, user_id, supabase, user_data, module_
                     user_data[whatsapp_number]["module"] = None
                     send_interactive_menu(whatsapp_number, supabase)
                     return
+        # Reserve the slot while the user reviews the booking (non-priority methods have no time to hold)
+        if time_slot:
+            held, reason = hold_user_slot(supabase, user_data, whatsapp_number, TCM)
+            if not held:
+                logger.info(f"[TCM] Slot {date} {time_slot} no longer available for {whatsapp_number}: {reason}")
+                ask_for_another_time(whatsapp_number, user_id, supabase, user_data, module_name,
+                                     "Sorry, this time slot was just taken. Please select another.",
+                                     show_time_slots=get_time_slots)
+                return
         # Prepare confirmation message
         service_type = user_data[whatsapp_number].get("service_name", "TCM Service")
         details = user_data[whatsapp_number].get("details", service_type)
@@ -1981,10 +1675,14 @@ def handle_confirm_booking_tcm(whatsapp_number, user_id, supabase, user_data, mo
        
         logger.info(f"[TCM] Inserting booking for {whatsapp_number} into tcm_s_bookings: {booking_data}")
        
-        # Insert into tcm_s_bookings
+        # Insert into tcm_s_bookings, promoting the hold placed when the slot was picked
         try:
-            response = supabase.table("tcm_s_bookings").insert(booking_data).execute()
+            response = insert_held_booking(supabase, user_data[whatsapp_number], "tcm_s_bookings", booking_data, TCM)
             logger.info(f"[TCM] Supabase insert response: {response}")
+        except SlotUnavailableError as e:
+            handle_slot_taken(whatsapp_number, user_id, supabase, user_data, module_name, e,
+                              show_calendar=get_calendar)
+            return
         except Exception as e:
             logger.error(f"[TCM] Failed to insert booking for {whatsapp_number}: {str(e)}")
             send_whatsapp_message(
@@ -2050,6 +1748,8 @@ def handle_confirm_booking_tcm(whatsapp_number, user_id, supabase, user_data, mo
             # Try to delete the booking if message failed
             try:
                 supabase.table("tcm_s_bookings").delete().eq("id", booking_id).execute()
+                invalidate_day_availability(booking_data["original_date"], TCM)
+                cancel_booking_reminders(supabase, "tcm_s_bookings", booking_id)
             except:
                 pass
             send_whatsapp_message(
@@ -2080,6 +1780,9 @@ def handle_cancel_booking_tcm(whatsapp_number, user_id, supabase, user_data):
     """Handle cancel booking - Clear booking data from user_data and reset state."""
     logger.info(f"[TCM] 👋 User {whatsapp_number} CANCELLED - CLEARING BOOKING DATA")
    
+    # Give the held slot back straight away instead of waiting for it to expire
+    release_user_hold(supabase, user_data, whatsapp_number)
+   
     # Clear booking-related data from user_data
     booking_keys = [
         "doctor_id", "date", "time_slot", "duration_minutes",
@@ -2245,279 +1948,10 @@ def handle_edit_choice(whatsapp_number, user_id, supabase, user_data, module_nam
         user_data[whatsapp_number]["state"] = "CONFIRM_BOOKING"
 
 # ================ TIME INPUT HANDLING FUNCTIONS ================
-def parse_time_input(time_str):
-    """Parse various time input formats and convert to HH:MM format (24-hour)."""
-    try:
-        if not time_str or not isinstance(time_str, str):
-            return None
-           
-        # Remove whitespace and convert to lowercase
-        time_str = time_str.strip().lower()
-       
-        # Remove any dots at the end
-        time_str = time_str.rstrip('.')
-       
-        # Handle AM/PM variations
-        has_am = False
-        has_pm = False
-       
-        # Check for AM/PM indicators (more comprehensive)
-        am_patterns = ['a.m.', 'a.m', 'am', 'a']
-        pm_patterns = ['p.m.', 'p.m', 'pm', 'p']
-       
-        for pattern in am_patterns:
-            if pattern in time_str:
-                has_am = True
-                time_str = time_str.replace(pattern, '')
-                break
-               
-        if not has_am:
-            for pattern in pm_patterns:
-                if pattern in time_str:
-                    has_pm = True
-                    time_str = time_str.replace(pattern, '')
-                    break
-       
-        # Remove all non-digit characters except colon and dot
-        time_str = re.sub(r'[^0-9:.]', '', time_str)
-       
-        # If empty after cleaning, return None
-        if not time_str:
-            return None
-       
-        # Replace dots with colons for consistent parsing
-        time_str = time_str.replace('.', ':')
-       
-        # Handle different formats
-        # Case 1: Has colon separator (e.g., "9:30", "14:00")
-        if ':' in time_str:
-            parts = time_str.split(':')
-            if len(parts) == 2:
-                hour_str = parts[0]
-                minute_str = parts[1]
-               
-                # Pad single digit hour
-                if len(hour_str) == 1:
-                    hour_str = '0' + hour_str
-               
-                # Pad minute if needed
-                if len(minute_str) == 1:
-                    minute_str = minute_str + '0'
-                elif len(minute_str) > 2:
-                    minute_str = minute_str[:2]
-               
-                hour = int(hour_str)
-                minute = int(minute_str[:2])
-               
-                # Validate
-                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
-                    return None
-               
-                # Handle AM/PM conversion
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-       
-        # Case 2: No separator (e.g., "0930", "1400", "9", "14")
-        elif time_str.isdigit():
-            length = len(time_str)
-           
-            if length == 4: # HHMM format
-                hour = int(time_str[:2])
-                minute = int(time_str[2:])
-               
-                # Validate
-                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
-                    return None
-               
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-               
-            elif length == 3: # HMM format (e.g., "930" for 9:30)
-                hour = int(time_str[0])
-                minute = int(time_str[1:])
-               
-                # Validate minute
-                if minute < 0 or minute > 59:
-                    return None
-               
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-               
-            elif length == 2: # HH format
-                hour = int(time_str)
-                minute = 0
-               
-                # Validate hour
-                if hour < 0 or hour > 23:
-                    return None
-               
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-               
-            elif length == 1: # H format
-                hour = int(time_str)
-                minute = 0
-               
-                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
-       
-        return None
-       
-    except Exception as e:
-        logger.error(f"[TCM] Error parsing time input '{time_str}': {str(e)}")
-        return None
-
-def convert_12_to_24_hour(hour, minute, has_am, has_pm):
-    """Convert 12-hour format to 24-hour format."""
-    # If no AM/PM specified, assume 24-hour format
-    if not has_am and not has_pm:
-        # If hour is 0-11 and we have no AM/PM, could be ambiguous
-        # But we'll assume 24-hour format for consistency
-        if hour == 12:
-            hour = 12 # 12:00 in 24-hour is 12:00
-        elif hour > 12 and hour <= 23:
-            # Already in 24-hour format
-            pass
-        # hour 0-11 stays as is in 24-hour format
-   
-    # Handle AM
-    elif has_am:
-        if hour == 12:
-            hour = 0 # 12 AM = 00
-        elif hour > 12:
-            return None # Invalid for AM
-        # hour 1-11 stays as is
-   
-    # Handle PM
-    elif has_pm:
-        if hour == 12:
-            hour = 12 # 12 PM = 12
-        elif hour < 12:
-            hour += 12
-   
-    return f"{hour:02d}:{minute:02d}"
-
-def format_time_for_display(time_str):
-    """Convert 24-hour time to 12-hour format with AM/PM."""
-    try:
-        if not time_str:
-            return ""
-       
-        # Parse the time
-        hour, minute = map(int, time_str.split(':'))
-       
-        # Convert to 12-hour format
-        if hour == 0:
-            return f"12:{minute:02d} AM"
-        elif hour < 12:
-            return f"{hour}:{minute:02d} AM"
-        elif hour == 12:
-            return f"12:{minute:02d} PM"
-        else:
-            return f"{hour-12}:{minute:02d} PM"
-           
-    except Exception as e:
-        logger.error(f"[TCM] Error formatting time '{time_str}': {str(e)}")
-        return time_str
-
-def round_to_15_minutes(time_str):
-    """Round time to nearest 15-minute interval."""
-    try:
-        hour, minute = map(int, time_str.split(':'))
-       
-        # Calculate remainder
-        remainder = minute % 15
-       
-        if remainder == 0:
-            # Already on 15-minute interval
-            return f"{hour:02d}:{minute:02d}"
-        elif remainder <= 7:
-            # Round down
-            minute = minute - remainder
-        else:
-            # Round up
-            minute = minute + (15 - remainder)
-            if minute >= 60:
-                hour += 1
-                minute = 0
-                if hour >= 24:
-                    hour = 0
-       
-        return f"{hour:02d}:{minute:02d}"
-       
-    except Exception as e:
-        logger.error(f"[TCM] Error rounding time '{time_str}': {str(e)}")
-        return time_str
-
 def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, duration, supabase):
     """Get all available 15-minute time slots for a specific day."""
     try:
-        # Get clinic schedule
-        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return []
-       
-        # Helper function to parse time
-        def parse_time(t):
-            if not t:
-                return None
-            if len(t) > 5:
-                t = t[:5] # keep only HH:MM
-            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
-       
-        clinic_start = parse_time(clinic_schedule["start_time"])
-        clinic_end = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-        dinner_start = parse_time(clinic_schedule["dinner_start"])
-        dinner_end = parse_time(clinic_schedule["dinner_end"])
-       
-        # Parse all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-       
-        # Check if time slot is during any break
-        def is_during_breaks(slot_time):
-            # Check lunch break
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            # Check dinner break
-            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
-                return True
-            # Check additional breaks
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-       
-        # Generate all possible 15-minute slots
-        all_slots = []
-        current = clinic_start
-       
-        while current < clinic_end:
-            slot_str = current.strftime("%H:%M")
-            slot_end = current + timedelta(minutes=duration)
-           
-            # Check if slot is valid
-            if slot_end > clinic_end:
-                current += timedelta(minutes=15)
-                continue
-           
-            if is_during_breaks(current):
-                current += timedelta(minutes=15)
-                continue
-           
-            # Check availability for this slot
-            is_available, _ = check_slot_availability_tcm(
-                date, slot_str, clinic_id, doctor_id, is_any_doctor, duration, supabase
-            )
-           
-            if is_available:
-                all_slots.append(slot_str)
-           
-            current += timedelta(minutes=15)
-       
-        return all_slots
+        return available_slots_for_day(supabase, date, clinic_id, doctor_id, is_any_doctor, duration, TCM)
        
     except Exception as e:
         logger.error(f"[TCM] Error getting all slots for {date}: {str(e)}")
@@ -2526,78 +1960,7 @@ def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, d
 def check_slot_availability_tcm(date, time_slot, clinic_id, doctor_id, is_any_doctor, duration, supabase):
     """Check if a specific time slot is available for TCM."""
     try:
-        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
-        slot_end = slot_time + timedelta(minutes=duration)
-       
-        # Check clinic schedule
-        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
-        if not clinic_schedule:
-            return False, "clinic_closed"
-       
-        # Helper function to parse time
-        def parse_time(t):
-            if not t:
-                return None
-            if len(t) > 5:
-                t = t[:5] # keep only HH:MM
-            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
-       
-        clinic_start = parse_time(clinic_schedule["start_time"])
-        clinic_end = parse_time(clinic_schedule["end_time"])
-        lunch_start = parse_time(clinic_schedule["lunch_start"])
-        lunch_end = parse_time(clinic_schedule["lunch_end"])
-        dinner_start = parse_time(clinic_schedule["dinner_start"])
-        dinner_end = parse_time(clinic_schedule["dinner_end"])
-       
-        # Parse all breaks
-        breaks = []
-        for break_schedule in clinic_schedule.get("breaks", []):
-            break_start = parse_time(break_schedule["start"])
-            break_end = parse_time(break_schedule["end"])
-            if break_start and break_end:
-                breaks.append((break_start, break_end))
-       
-        # Check if time slot is during any break
-        def is_during_breaks(slot_time):
-            # Check lunch break
-            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
-                return True
-            # Check dinner break
-            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
-                return True
-            # Check additional breaks
-            for break_start, break_end in breaks:
-                if break_start <= slot_time < break_end:
-                    return True
-            return False
-       
-        # Check if slot is within clinic hours and not during breaks
-        if slot_time < clinic_start or slot_end > clinic_end:
-            return False, "outside_clinic_hours"
-       
-        if is_during_breaks(slot_time):
-            return False, "during_break"
-       
-        # Check doctor availability
-        if not is_any_doctor and doctor_id:
-            # Check specific doctor
-            is_available, reason = check_doctor_availability_at_slot(
-                doctor_id, date, time_slot, duration, supabase
-            )
-            return is_available, reason
-        else:
-            # Check any doctor
-            doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
-           
-            for doctor in doctors:
-                is_available, reason = check_doctor_availability_at_slot(
-                    doctor["id"], date, time_slot, duration, supabase
-                )
-                if is_available:
-                    return True, "available"
-           
-            return False, "no_available_doctors"
+        return slot_availability(supabase, date, time_slot, clinic_id, doctor_id, is_any_doctor, duration, TCM, check_hours=True)
        
     except Exception as e:
         logger.error(f"[TCM] Error checking slot availability: {str(e)}")
@@ -12,22 +12,35 @@ from tcm_calendar_utils import (
 )
 from utils import (
     send_whatsapp_message, send_interactive_menu, translate_template,
-    gt_t_tt, gt_tt, send_image_message, gt_dt_tt
+    gt_t_tt, gt_tt, send_image_message, gt_dt_tt, get_user_language
 )
-import requests
+from http_session import http_get
+from geo_cache import get_cached_geo, store_geo, coordinate_cell, throttle, GEOCODE_TTL
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Nominatim's usage policy requires an identifying User-Agent
+NOMINATIM_USER_AGENT = os.getenv("NOMINATIM_USER_AGENT", "TCMBookingApp")
+
 def get_address_from_lat_lon(lat, lon):
-    """Reverse geocode latitude and longitude to address using Nominatim."""
-    url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}&zoom=18&addressdetails=1"
-    headers = {'User-Agent': 'TCMBookingApp'}
+    """Reverse geocode latitude and longitude to address using Nominatim (cached per ~11 m cell)."""
+    cache_key = coordinate_cell(lat, lon)
+    found, cached = get_cached_geo("reverse_geocode", cache_key)
+    if found:
+        return cached if cached is not None else 'Address not found'
+    url = "https://nominatim.openstreetmap.org/reverse"
+    params = {"format": "json", "lat": lat, "lon": lon, "zoom": 18, "addressdetails": 1}
+    headers = {'User-Agent': NOMINATIM_USER_AGENT}
     try:
-        response = requests.get(url, headers=headers)
+        throttle("nominatim")
+        response = http_get(url, params=params, headers=headers, timeout=(5, 10))
         if response.status_code == 200:
             data = response.json()
-            return data.get('display_name', 'Address not found')
+            address = data.get('display_name')
+            store_geo("reverse_geocode", cache_key, address, GEOCODE_TTL)
+            return address or 'Address not found'
         else:
             return 'Address not found'
     except Exception as e:
@@ -138,16 +151,7 @@ def handle_tcm_service(whatsapp_number, user_id, supabase, user_data, message):
     # ------------------------------------------------------------------
     # 1. FETCH USER LANGUAGE
     # ------------------------------------------------------------------
-    language = "en"
-    try:
-        resp = supabase.table("whatsapp_users") \
-            .select("language") \
-            .eq("whatsapp_number", whatsapp_number.lstrip("+")) \
-            .limit(1).execute()
-        if resp.data:
-            language = resp.data[0]["language"]
-    except Exception as e:
-        logger.error(f"[TCM] Error fetching language for {whatsapp_number}: {e}")
+    language = get_user_language(supabase, whatsapp_number)
     # ------------------------------------------------------------------
     # 2. IDLE → Logic modified for Auto-Routing
     # ------------------------------------------------------------------
@@ -0,0 +1,370 @@
+# baseline_calendar_utils.py - FROZEN BASELINE AVAILABILITY CHECKS (CLINIC)
+#
+# Verbatim copies of the calendar_utils functions as they were before the
+# availability service (availability.py) replaced them. They issue one query
+# per slot/doctor against whatever client they are given; the golden tests run
+# them against an in-memory table set. Do not edit: they are the reference.
+import json
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def get_clinic_schedule(supabase, clinic_id, date):
+    """Fetch clinic schedule for a given date including all breaks."""
+    try:
+        date_str = date.strftime("%Y-%m-%d")
+        day_name = date.strftime("%A").lower()
+        day_key = "public_holiday" if day_name == "public holiday" else day_name
+
+        response = supabase.table("c_a_clinic_available_time").select("*").eq("clinic_id", clinic_id).execute()
+        logger.info(f"Supabase response for clinic_id {clinic_id}: {response}")
+        schedule = response.data[0] if response.data and len(response.data) > 0 else None
+
+        if not schedule:
+            logger.error(f"No schedule found for clinic_id: {clinic_id} on {date_str}")
+            return None
+
+        if schedule.get("holiday_self_declared") and date_str in schedule["holiday_self_declared"]:
+            logger.info(f"Date {date_str} is a self-declared holiday for clinic_id: {clinic_id}")
+            return None
+
+        special_dates = schedule.get("special_dates", [])
+        if special_dates is None:
+            special_dates = []
+        if isinstance(special_dates, str):
+            import json
+            special_dates = json.loads(special_dates)
+        for sd in special_dates:
+            if sd.get("date") == date_str:
+                if not sd.get("start_time") or not sd.get("end_time"):
+                    logger.info(f"Special date {date_str} has no valid hours (null start_time or end_time)")
+                    return None
+                
+                # Extract all breaks for special date
+                breaks = []
+                for i in range(1, 6):
+                    break_start = sd.get(f"break{i}_start")
+                    break_end = sd.get(f"break{i}_end")
+                    if break_start and break_end:
+                        breaks.append({"start": break_start, "end": break_end})
+                
+                return {
+                    "start_time": sd.get("start_time"),
+                    "end_time": sd.get("end_time"),
+                    "lunch_start": sd.get("lunch_start"),
+                    "lunch_end": sd.get("lunch_end"),
+                    "dinner_start": sd.get("dinner_start"),
+                    "dinner_end": sd.get("dinner_end"),
+                    "breaks": breaks
+                }
+
+        start_time = schedule.get(f"{day_key}_start")
+        end_time = schedule.get(f"{day_key}_end")
+        lunch_start = schedule.get(f"{day_key}_lunch_start")
+        lunch_end = schedule.get(f"{day_key}_lunch_end")
+        dinner_start = schedule.get(f"{day_key}_dinner_start")
+        dinner_end = schedule.get(f"{day_key}_dinner_end")
+
+        # Extract all breaks for regular day
+        breaks = []
+        for i in range(1, 6):
+            break_start = schedule.get(f"{day_key}_break{i}_start")
+            break_end = schedule.get(f"{day_key}_break{i}_end")
+            if break_start and break_end:
+                breaks.append({"start": break_start, "end": break_end})
+
+        if not start_time or not end_time:
+            logger.info(f"Clinic is closed on {day_name} ({date_str}) due to null start_time or end_time")
+            return None
+
+        logger.info(f"Schedule for {day_name} ({date_str}): start={start_time}, end={end_time}, lunch={lunch_start}-{lunch_end}, dinner={dinner_start}-{dinner_end}, breaks={len(breaks)}")
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "lunch_start": lunch_start,
+            "lunch_end": lunch_end,
+            "dinner_start": dinner_start,
+            "dinner_end": dinner_end,
+            "breaks": breaks
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching clinic schedule for {clinic_id} on {date_str}: {str(e)}", exc_info=True)
+        return None
+
+def check_doctor_availability_at_slot(doctor_id, date, time_slot, duration, supabase):
+    """Check if a specific doctor is available at a given time slot."""
+    try:
+        # Parse time
+        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
+        slot_end = slot_time + timedelta(minutes=duration)
+        
+        # Check unavailability
+        unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date).execute().data
+        for u in unavailability:
+            u_start = datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M")
+            u_end = datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
+            if slot_time < u_end and slot_end > u_start:
+                return False, "doctor_unavailable"
+        
+        # Check existing bookings
+        tables = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
+        for table in tables:
+            bookings = supabase.table(table).select("time, duration_minutes").eq("doctor_id", doctor_id).eq("date", date).execute().data
+            for b in bookings:
+                b_start = datetime.strptime(f"{date} {b['time']}", "%Y-%m-%d %H:%M")
+                b_end = b_start + timedelta(minutes=b["duration_minutes"])
+                if slot_time < b_end and slot_end > b_start:
+                    return False, "slot_booked"
+        
+        # Check reschedule requests
+        reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes").eq("doctor_id", doctor_id).eq("new_date", date).eq("status", "confirmed").execute().data
+        for r in reschedule_bookings:
+            r_start = datetime.strptime(f"{date} {r['new_time']}", "%Y-%m-%d %H:%M")
+            r_end = r_start + timedelta(minutes=r["duration_minutes"])
+            if slot_time < r_end and slot_end > r_start:
+                return False, "slot_booked"
+        
+        return True, "available"
+    
+    except Exception as e:
+        logger.error(f"Error checking doctor availability: {str(e)}")
+        return False, "error"
+
+def check_slot_availability(date, time_slot, clinic_id, doctor_id, is_any_doctor, duration, supabase):
+    """Check if a specific time slot is available."""
+    try:
+        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
+        slot_end = slot_time + timedelta(minutes=duration)
+        
+        # Check doctor unavailability
+        if not is_any_doctor:
+            unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date).execute().data
+            for u in unavailability:
+                u_start = datetime.strptime(f"{date} {u['start_time']}", "%Y-%m-%d %H:%M")
+                u_end = datetime.strptime(f"{date} {u['end_time']}", "%Y-%m-%d %H:%M")
+                if slot_time < u_end and slot_end > u_start:
+                    return False, "doctor_unavailable"
+        
+        # Check existing bookings
+        tables = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
+        for table in tables:
+            if is_any_doctor:
+                bookings = supabase.table(table).select("time, duration_minutes, doctor_id").eq("date", date).execute().data
+            else:
+                bookings = supabase.table(table).select("time, duration_minutes").eq("doctor_id", doctor_id).eq("date", date).execute().data
+            
+            for b in bookings:
+                b_start = datetime.strptime(f"{date} {b['time']}", "%Y-%m-%d %H:%M")
+                b_end = b_start + timedelta(minutes=b["duration_minutes"])
+                if slot_time < b_end and slot_end > b_start:
+                    return False, "slot_booked"
+        
+        # Check reschedule requests
+        if is_any_doctor:
+            reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes, doctor_id").eq("new_date", date).eq("status", "confirmed").execute().data
+        else:
+            reschedule_bookings = supabase.table("c_s_reschedule_requests").select("new_time, duration_minutes").eq("doctor_id", doctor_id).eq("new_date", date).eq("status", "confirmed").execute().data
+        
+        for r in reschedule_bookings:
+            r_start = datetime.strptime(f"{date} {r['new_time']}", "%Y-%m-%d %H:%M")
+            r_end = r_start + timedelta(minutes=r["duration_minutes"])
+            if slot_time < r_end and slot_end > r_start:
+                return False, "slot_booked"
+        
+        # For "any doctor", check if at least one doctor is available
+        if is_any_doctor:
+            doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
+            
+            for doctor in doctors:
+                # Check if this specific doctor is available
+                is_available, _ = check_slot_availability(
+                    date, time_slot, clinic_id, doctor["id"], False, duration, supabase
+                )
+                if is_available:
+                    return True, "available"
+            
+            return False, "no_available_doctors"
+        
+        return True, "available"
+        
+    except Exception as e:
+        logger.error(f"Error checking slot availability: {str(e)}")
+        return False, "error"
+
+def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, duration, supabase):
+    """Get all available 15-minute time slots for a specific day."""
+    try:
+        # Get clinic schedule
+        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
+        if not clinic_schedule:
+            return []
+        
+        # Helper function to parse time
+        def parse_time(t):
+            if not t:
+                return None
+            t = t[:5]  # keep only HH:MM
+            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
+        
+        clinic_start = parse_time(clinic_schedule["start_time"])
+        clinic_end = parse_time(clinic_schedule["end_time"])
+        lunch_start = parse_time(clinic_schedule["lunch_start"])
+        lunch_end = parse_time(clinic_schedule["lunch_end"])
+        dinner_start = parse_time(clinic_schedule["dinner_start"])
+        dinner_end = parse_time(clinic_schedule["dinner_end"])
+        
+        # Parse all breaks
+        breaks = []
+        for break_schedule in clinic_schedule.get("breaks", []):
+            break_start = parse_time(break_schedule["start"])
+            break_end = parse_time(break_schedule["end"])
+            if break_start and break_end:
+                breaks.append((break_start, break_end))
+        
+        # Check if time slot is during any break
+        def is_during_breaks(slot_time):
+            # Check lunch break
+            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
+                return True
+            # Check dinner break
+            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
+                return True
+            # Check additional breaks
+            for break_start, break_end in breaks:
+                if break_start <= slot_time < break_end:
+                    return True
+            return False
+        
+        # Generate all possible 15-minute slots
+        all_slots = []
+        current = clinic_start
+        
+        while current < clinic_end:
+            slot_str = current.strftime("%H:%M")
+            slot_end = current + timedelta(minutes=duration)
+            
+            # Check if slot is valid
+            if slot_end > clinic_end:
+                current += timedelta(minutes=15)
+                continue
+            
+            if is_during_breaks(current):
+                current += timedelta(minutes=15)
+                continue
+            
+            # Check availability for this slot
+            is_available, _ = check_slot_availability(
+                date, slot_str, clinic_id, doctor_id, is_any_doctor, duration, supabase
+            )
+            
+            if is_available:
+                all_slots.append(slot_str)
+            
+            current += timedelta(minutes=15)
+        
+        return all_slots
+        
+    except Exception as e:
+        logger.error(f"Error getting all slots for {date}: {str(e)}")
+        return []
+
+def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase):
+    """Check if a specific date is available for booking."""
+    try:
+        date_str = date_obj.strftime("%Y-%m-%d")
+        
+        # Check clinic schedule
+        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
+        if not clinic_schedule:
+            return False, "clinic_closed"
+            
+        # Parse clinic times
+        def parse_time(t):
+            if not t:
+                return None
+            t = t[:5]  # keep only HH:MM
+            return datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %H:%M")
+
+        start_time = parse_time(clinic_schedule["start_time"])
+        end_time = parse_time(clinic_schedule["end_time"])
+        lunch_start = parse_time(clinic_schedule["lunch_start"])
+        lunch_end = parse_time(clinic_schedule["lunch_end"])
+        
+        # Check all breaks
+        breaks = []
+        for break_schedule in clinic_schedule.get("breaks", []):
+            break_start = parse_time(break_schedule["start"])
+            break_end = parse_time(break_schedule["end"])
+            if break_start and break_end:
+                breaks.append((break_start, break_end))
+
+        def is_during_breaks(slot_time):
+            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
+                return True
+            for break_start, break_end in breaks:
+                if break_start <= slot_time < break_end:
+                    return True
+            return False
+
+        # Generate time slots and check availability
+        time_slots = []
+        current_slot = start_time
+        while current_slot < end_time:
+            if is_during_breaks(current_slot):
+                current_slot += timedelta(minutes=15)
+                continue
+            time_slots.append((current_slot, current_slot.strftime("%H:%M")))
+            current_slot += timedelta(minutes=15)
+
+        if not time_slots:
+            return False, "no_slots"
+
+        # Check doctor availability for at least one slot
+        if is_any_doctor:
+            doctors = supabase.table("c_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
+            for slot_time, slot_str in time_slots:
+                unavailability = supabase.table("c_a_doctor_unavailability").select("doctor_id, start_time, end_time").eq("date", date_str).execute().data
+                unavailable_doctor_ids = {
+                    u["doctor_id"] for u in unavailability
+                    if datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
+                }
+                booked_doctor_ids = set()
+                # Check all booking tables including c_s_vaccination
+                for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
+                    bookings = supabase.table(table).select("doctor_id").eq("date", date_str).eq("time", slot_str).execute().data
+                    booked_doctor_ids.update(b["doctor_id"] for b in bookings)
+                reschedule_bookings = supabase.table("c_s_reschedule_requests").select("doctor_id").eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
+                booked_doctor_ids.update(b["doctor_id"] for b in reschedule_bookings)
+                if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
+                    return True, "available"
+        else:
+            for slot_time, slot_str in time_slots:
+                unavailability = supabase.table("c_a_doctor_unavailability").select("start_time, end_time").eq("doctor_id", doctor_id).eq("date", date_str).execute().data
+                is_unavailable = any(
+                    datetime.strptime(f"{date_str} {u['start_time']}", "%Y-%m-%d %H:%M") <= slot_time < datetime.strptime(f"{date_str} {u['end_time']}", "%Y-%m-%d %H:%M")
+                    for u in unavailability
+                )
+                if is_unavailable:
+                    continue
+                is_booked = False
+                # Check all booking tables including c_s_vaccination
+                for table in ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]:
+                    bookings = supabase.table(table).select("id").eq("doctor_id", doctor_id).eq("date", date_str).eq("time", slot_str).execute().data
+                    if bookings:
+                        is_booked = True
+                        break
+                reschedule_bookings = supabase.table("c_s_reschedule_requests").select("id").eq("doctor_id", doctor_id).eq("new_date", date_str).eq("new_time", slot_str).eq("status", "confirmed").execute().data
+                if reschedule_bookings:
+                    is_booked = True
+                if not is_booked:
+                    return True, "available"
+
+        return False, "no_available_doctors"
+
+    except Exception as e:
+        logger.error(f"Error checking date availability: {str(e)}")
+        return False, "error"
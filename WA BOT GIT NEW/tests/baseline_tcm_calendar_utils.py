@@ -0,0 +1,402 @@
+# baseline_tcm_calendar_utils.py - FROZEN BASELINE AVAILABILITY CHECKS (TCM)
+#
+# Verbatim copies of the tcm_calendar_utils functions as they were before the
+# availability service (availability.py) replaced them. They issue one query
+# per slot/doctor against whatever client they are given; the golden tests run
+# them against an in-memory table set. Do not edit: they are the reference.
+import json
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def get_clinic_schedule(supabase, clinic_id, date):
+    """Fetch TCM clinic schedule for a given date including all breaks."""
+    try:
+        date_str = date.strftime("%Y-%m-%d")
+        day_name = date.strftime("%A").lower()
+        day_key = day_name
+       
+        response = supabase.table("tcm_a_clinic_available_time").select("*").eq("clinic_id", clinic_id).execute()
+       
+        if not response.data:
+            logger.error(f"[TCM] No schedule found for clinic_id: {clinic_id}")
+            return None
+           
+        schedule = response.data[0]
+        # Check self-declared holidays
+        holiday_self_declared = schedule.get("holiday_self_declared")
+        if holiday_self_declared and isinstance(holiday_self_declared, list) and date_str in holiday_self_declared:
+            logger.info(f"[TCM] Date {date_str} is a self-declared holiday for clinic_id: {clinic_id}")
+            return None
+        special_dates = schedule.get("special_dates", [])
+        if special_dates is None:
+            special_dates = []
+        elif isinstance(special_dates, str):
+            try:
+                special_dates = json.loads(special_dates)
+            except json.JSONDecodeError:
+                special_dates = []
+       
+        # Check special dates
+        for sd in special_dates:
+            if sd.get("date") == date_str:
+                if not sd.get("start_time") or not sd.get("end_time"):
+                    logger.info(f"[TCM] Special date {date_str} has no valid hours (null start_time or end_time)")
+                    return None
+               
+                # Extract all breaks for special date
+                breaks = []
+                for i in range(1, 6):
+                    break_start = sd.get(f"break{i}_start")
+                    break_end = sd.get(f"break{i}_end")
+                    if break_start and break_end:
+                        breaks.append({"start": break_start, "end": break_end})
+               
+                return {
+                    "start_time": sd.get("start_time"),
+                    "end_time": sd.get("end_time"),
+                    "lunch_start": sd.get("lunch_start"),
+                    "lunch_end": sd.get("lunch_end"),
+                    "dinner_start": sd.get("dinner_start"),
+                    "dinner_end": sd.get("dinner_end"),
+                    "breaks": breaks
+                }
+        # Get regular schedule for the day
+        start_time = schedule.get(f"{day_key}_start")
+        end_time = schedule.get(f"{day_key}_end")
+        lunch_start = schedule.get(f"{day_key}_lunch_start")
+        lunch_end = schedule.get(f"{day_key}_lunch_end")
+        dinner_start = schedule.get(f"{day_key}_dinner_start")
+        dinner_end = schedule.get(f"{day_key}_dinner_end")
+        # Extract all breaks for regular day
+        breaks = []
+        for i in range(1, 6):
+            break_start = schedule.get(f"{day_key}_break{i}_start")
+            break_end = schedule.get(f"{day_key}_break{i}_end")
+            if break_start and break_end:
+                breaks.append({"start": break_start, "end": break_end})
+        if not start_time or not end_time:
+            logger.info(f"[TCM] Clinic is closed on {day_name} ({date_str}) due to null start_time or end_time")
+            return None
+        logger.info(f"[TCM] Schedule for {day_name} ({date_str}): start={start_time}, end={end_time}, lunch={lunch_start}-{lunch_end}, dinner={dinner_start}-{dinner_end}, breaks={len(breaks)}")
+        return {
+            "start_time": start_time,
+            "end_time": end_time,
+            "lunch_start": lunch_start,
+            "lunch_end": lunch_end,
+            "dinner_start": dinner_start,
+            "dinner_end": dinner_end,
+            "breaks": breaks
+        }
+    except Exception as e:
+        logger.error(f"[TCM] Error fetching clinic schedule for {clinic_id} on {date_str}: {str(e)}", exc_info=True)
+        return None
+
+def check_doctor_availability_at_slot(doctor_id, date, time_slot, duration, supabase):
+    """Check if a specific doctor is available at a given time slot."""
+    try:
+        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
+        slot_end = slot_time + timedelta(minutes=duration)
+       
+        # Check existing bookings in tcm_s_bookings - BOTH original and new times
+        bookings = supabase.table("tcm_s_bookings").select(
+            "original_time, new_time, duration_minutes, status"
+        ).eq("doctor_id", doctor_id) \
+         .eq("original_date", date) \
+         .in_("status", ["confirmed", "pending"]) \
+         .execute().data
+       
+        for b in bookings:
+            # Check original time
+            if b["original_time"]:
+                b_start = datetime.strptime(f"{date} {b['original_time']}", "%Y-%m-%d %H:%M")
+                b_end = b_start + timedelta(minutes=b["duration_minutes"])
+                # Check if slot overlaps with this booking
+                if slot_time < b_end and slot_end > b_start:
+                    return False, "slot_booked"
+           
+            # Check new time for rescheduled appointments
+            if b["new_time"]:
+                r_start = datetime.strptime(f"{date} {b['new_time']}", "%Y-%m-%d %H:%M")
+                r_end = r_start + timedelta(minutes=b["duration_minutes"])
+                if slot_time < r_end and slot_end > r_start:
+                    return False, "slot_booked"
+       
+        return True, "available"
+   
+    except Exception as e:
+        logger.error(f"[TCM] Error checking doctor availability: {str(e)}")
+        return False, "error"
+
+def check_slot_availability_tcm(date, time_slot, clinic_id, doctor_id, is_any_doctor, duration, supabase):
+    """Check if a specific time slot is available for TCM."""
+    try:
+        slot_time = datetime.strptime(f"{date} {time_slot}", "%Y-%m-%d %H:%M")
+        slot_end = slot_time + timedelta(minutes=duration)
+       
+        # Check clinic schedule
+        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
+        if not clinic_schedule:
+            return False, "clinic_closed"
+       
+        # Helper function to parse time
+        def parse_time(t):
+            if not t:
+                return None
+            if len(t) > 5:
+                t = t[:5] # keep only HH:MM
+            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
+       
+        clinic_start = parse_time(clinic_schedule["start_time"])
+        clinic_end = parse_time(clinic_schedule["end_time"])
+        lunch_start = parse_time(clinic_schedule["lunch_start"])
+        lunch_end = parse_time(clinic_schedule["lunch_end"])
+        dinner_start = parse_time(clinic_schedule["dinner_start"])
+        dinner_end = parse_time(clinic_schedule["dinner_end"])
+       
+        # Parse all breaks
+        breaks = []
+        for break_schedule in clinic_schedule.get("breaks", []):
+            break_start = parse_time(break_schedule["start"])
+            break_end = parse_time(break_schedule["end"])
+            if break_start and break_end:
+                breaks.append((break_start, break_end))
+       
+        # Check if time slot is during any break
+        def is_during_breaks(slot_time):
+            # Check lunch break
+            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
+                return True
+            # Check dinner break
+            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
+                return True
+            # Check additional breaks
+            for break_start, break_end in breaks:
+                if break_start <= slot_time < break_end:
+                    return True
+            return False
+       
+        # Check if slot is within clinic hours and not during breaks
+        if slot_time < clinic_start or slot_end > clinic_end:
+            return False, "outside_clinic_hours"
+       
+        if is_during_breaks(slot_time):
+            return False, "during_break"
+       
+        # Check doctor availability
+        if not is_any_doctor and doctor_id:
+            # Check specific doctor
+            is_available, reason = check_doctor_availability_at_slot(
+                doctor_id, date, time_slot, duration, supabase
+            )
+            return is_available, reason
+        else:
+            # Check any doctor
+            doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
+           
+            for doctor in doctors:
+                is_available, reason = check_doctor_availability_at_slot(
+                    doctor["id"], date, time_slot, duration, supabase
+                )
+                if is_available:
+                    return True, "available"
+           
+            return False, "no_available_doctors"
+       
+    except Exception as e:
+        logger.error(f"[TCM] Error checking slot availability: {str(e)}")
+        return False, "error"
+
+def get_all_available_slots_for_day(date, clinic_id, doctor_id, is_any_doctor, duration, supabase):
+    """Get all available 15-minute time slots for a specific day."""
+    try:
+        # Get clinic schedule
+        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
+        if not clinic_schedule:
+            return []
+       
+        # Helper function to parse time
+        def parse_time(t):
+            if not t:
+                return None
+            if len(t) > 5:
+                t = t[:5] # keep only HH:MM
+            return datetime.strptime(f"{date} {t}", "%Y-%m-%d %H:%M")
+       
+        clinic_start = parse_time(clinic_schedule["start_time"])
+        clinic_end = parse_time(clinic_schedule["end_time"])
+        lunch_start = parse_time(clinic_schedule["lunch_start"])
+        lunch_end = parse_time(clinic_schedule["lunch_end"])
+        dinner_start = parse_time(clinic_schedule["dinner_start"])
+        dinner_end = parse_time(clinic_schedule["dinner_end"])
+       
+        # Parse all breaks
+        breaks = []
+        for break_schedule in clinic_schedule.get("breaks", []):
+            break_start = parse_time(break_schedule["start"])
+            break_end = parse_time(break_schedule["end"])
+            if break_start and break_end:
+                breaks.append((break_start, break_end))
+       
+        # Check if time slot is during any break
+        def is_during_breaks(slot_time):
+            # Check lunch break
+            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
+                return True
+            # Check dinner break
+            if dinner_start and dinner_end and dinner_start <= slot_time < dinner_end:
+                return True
+            # Check additional breaks
+            for break_start, break_end in breaks:
+                if break_start <= slot_time < break_end:
+                    return True
+            return False
+       
+        # Generate all possible 15-minute slots
+        all_slots = []
+        current = clinic_start
+       
+        while current < clinic_end:
+            slot_str = current.strftime("%H:%M")
+            slot_end = current + timedelta(minutes=duration)
+           
+            # Check if slot is valid
+            if slot_end > clinic_end:
+                current += timedelta(minutes=15)
+                continue
+           
+            if is_during_breaks(current):
+                current += timedelta(minutes=15)
+                continue
+           
+            # Check availability for this slot
+            is_available, _ = check_slot_availability_tcm(
+                date, slot_str, clinic_id, doctor_id, is_any_doctor, duration, supabase
+            )
+           
+            if is_available:
+                all_slots.append(slot_str)
+           
+            current += timedelta(minutes=15)
+       
+        return all_slots
+       
+    except Exception as e:
+        logger.error(f"[TCM] Error getting all slots for {date}: {str(e)}")
+        return []
+
+def check_date_availability(date_obj, clinic_id, doctor_id, is_any_doctor, supabase, service_id=None):
+    """Check if a specific date is available for booking in TCM clinic."""
+    try:
+        date_str = date_obj.strftime("%Y-%m-%d")
+       
+        # Check clinic schedule
+        clinic_schedule = get_clinic_schedule(supabase, clinic_id, date_obj)
+        if not clinic_schedule:
+            return False, "clinic_closed"
+           
+        # Parse clinic times
+        def parse_time(t):
+            if not t:
+                return None
+            if len(t) > 5:
+                t = t[:5] # keep only HH:MM
+            return datetime.strptime(f"{date_str} {t}", "%Y-%m-%d %H:%M")
+        start_time = parse_time(clinic_schedule["start_time"])
+        end_time = parse_time(clinic_schedule["end_time"])
+        lunch_start = parse_time(clinic_schedule["lunch_start"])
+        lunch_end = parse_time(clinic_schedule["lunch_end"])
+       
+        # Check all breaks
+        breaks = []
+        for break_schedule in clinic_schedule.get("breaks", []):
+            break_start = parse_time(break_schedule["start"])
+            break_end = parse_time(break_schedule["end"])
+            if break_start and break_end:
+                breaks.append((break_start, break_end))
+        def is_during_breaks(slot_time):
+            if lunch_start and lunch_end and lunch_start <= slot_time < lunch_end:
+                return True
+            for break_start, break_end in breaks:
+                if break_start <= slot_time < break_end:
+                    return True
+            return False
+        # Generate time slots and check availability
+        time_slots = []
+        current_slot = start_time
+        while current_slot < end_time:
+            if is_during_breaks(current_slot):
+                current_slot += timedelta(minutes=15)
+                continue
+            time_slots.append((current_slot, current_slot.strftime("%H:%M")))
+            current_slot += timedelta(minutes=15)
+        if not time_slots:
+            return False, "no_slots"
+        # Check doctor availability for at least one slot
+        if is_any_doctor:
+            doctors = supabase.table("tcm_a_doctors").select("id").eq("clinic_id", clinic_id).execute().data
+            for slot_time, slot_str in time_slots:
+                unavailable_doctor_ids = set()
+               
+                booked_doctor_ids = set()
+                # Check tcm_s_bookings table for confirmed bookings
+                bookings_query = supabase.table("tcm_s_bookings").select("doctor_id, original_time, new_time") \
+                    .eq("original_date", date_str) \
+                    .in_("status", ["confirmed", "pending"])
+               
+                # Only add doctor_id filter if it's not None and not "None"
+                if doctor_id and doctor_id != "None":
+                    bookings_query = bookings_query.eq("doctor_id", doctor_id)
+               
+                bookings = bookings_query.execute().data
+               
+                for booking in bookings:
+                    # Check original time slot
+                    if booking["original_time"] == slot_str:
+                        booked_doctor_ids.add(booking["doctor_id"])
+                    # Check new time slot for rescheduled appointments
+                    if booking["new_time"] == slot_str:
+                        booked_doctor_ids.add(booking["doctor_id"])
+               
+                if any(d["id"] not in unavailable_doctor_ids and d["id"] not in booked_doctor_ids for d in doctors):
+                    return True, "available"
+        else:
+            for slot_time, slot_str in time_slots:
+                # Check if specific doctor is booked
+                is_booked = False
+               
+                # Check tcm_s_bookings table - FIXED: Only filter by doctor_id if it's not None
+                if doctor_id and doctor_id != "None":
+                    bookings = supabase.table("tcm_s_bookings").select("id, original_time, new_time") \
+                        .eq("doctor_id", doctor_id) \
+                        .eq("original_date", date_str) \
+                        .in_("status", ["confirmed", "pending"]) \
+                        .execute().data
+                   
+                    for booking in bookings:
+                        if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
+                            is_booked = True
+                            break
+                else:
+                    # If doctor_id is None, check if any bookings exist for this time slot
+                    bookings = supabase.table("tcm_s_bookings").select("id, original_time, new_time") \
+                        .eq("original_date", date_str) \
+                        .in_("status", ["confirmed", "pending"]) \
+                        .execute().data
+                   
+                    # If there are any bookings at this time, it's booked
+                    for booking in bookings:
+                        if booking["original_time"] == slot_str or booking["new_time"] == slot_str:
+                            is_booked = True
+                            break
+               
+                if not is_booked:
+                    return True, "available"
+        return False, "no_available_doctors"
+    except Exception as e:
+        logger.error(f"[TCM] Error checking date availability: {str(e)}", exc_info=True)
+        return False, "error"
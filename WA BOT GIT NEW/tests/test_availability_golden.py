@@ -0,0 +1,333 @@
+# test_availability_golden.py - AVAILABILITY SERVICE AGAINST THE BASELINE CHECKS
+#
+# Seeded random clinics (opening hours, breaks, special dates, holidays) and
+# bookings are loaded into an in-memory Supabase stand-in. Every answer from
+# availability.py is compared with the frozen baseline functions in
+# baseline_calendar_utils.py / baseline_tcm_calendar_utils.py.
+#
+# Identical by construction:
+# - doctor_slot_availability == check_doctor_availability_at_slot (CLINIC and TCM)
+# - slot_availability == check_slot_availability for one chosen doctor (CLINIC)
+# - slot_availability(check_hours=True) == check_slot_availability_tcm (TCM)
+# - available_slots_for_day == get_all_available_slots_for_day for one chosen
+#   doctor (CLINIC) and for every doctor choice (TCM)
+#
+# Pinned behaviour changes (each compared against the answer the change promises,
+# built from the baseline single-doctor checks):
+# - CLINIC "any doctor" slots: at least one clinic doctor is free for the whole
+#   appointment. The baseline blocked a slot when any doctor had an overlapping
+#   booking.
+# - CLINIC with no doctor chosen: treated as "any doctor". The baseline queried
+#   doctor_id = NULL and found the slot free.
+# - Date checks (CLINIC and TCM): a date is available when one of the candidate
+#   doctors has a slot that fits the service duration, closing time and every
+#   break. The baseline matched exact booking start times, ignored duration,
+#   dinner and closing time.
+#
+# Bookings, unavailability and slot probes are on the quarter-hour grid, like
+# every time the bot offers; opening times and breaks are not always on it.
+#
+# Run next to main.py: python -m pytest tests
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import availability
+import clinic_schedule
+from availability import (
+    CLINIC, TCM, available_slots_for_day, candidate_doctor_ids, date_availability, doctor_slot_availability,
+    slot_availability
+)
+import baseline_calendar_utils as base_clinic
+import baseline_tcm_calendar_utils as base_tcm
+
+SEEDS = range(8)
+CLINIC_ID = "clinic-1"
+DOCTORS = ["doc-a", "doc-b", "doc-c"]
+DURATIONS = [15, 30, 45, 60]
+HORIZON_DAYS = 8
+# Probed slot starts: 07:00-22:45 on the quarter hour
+PROBE_TIMES = [f"{m // 60:02d}:{m % 60:02d}" for m in range(7 * 60, 23 * 60, 15)]
+CLINIC_BOOKING_TABLES = ["c_s_checkup", "c_s_consultation", "c_s_vaccination", "c_s_pending_bookings"]
+
+
+# ----------------------------------------------------------------
+# IN-MEMORY SUPABASE
+# ----------------------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """The select/eq/in_/gte/lte/execute subset both the baseline and the service use."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) <= value)
+        return self
+
+    def execute(self):
+        return FakeResponse([dict(row) for row in self.rows if all(f(row) for f in self.filters)])
+
+
+class FakeSupabase:
+    def __init__(self, tables: dict):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeQuery(self.tables.get(name, []))
+
+
+# ----------------------------------------------------------------
+# SEEDED FIXTURES
+# ----------------------------------------------------------------
+
+def _clock(minutes: int, seconds: bool = False) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}" + (":00" if seconds else "")
+
+
+def _random_hours(rng):
+    """{field: 'HH:MM:SS'} for one open day, or None for a closed one."""
+    if rng.random() < 0.15:
+        return None
+    open_at = rng.choice([480, 510, 540, 550, 600])           # 09:10 is off the quarter-hour grid
+    close_at = rng.choice([1020, 1030, 1080, 1270, 1320])     # 17:10 and 21:10 likewise
+    hours = {"start": open_at, "end": close_at}
+    if rng.random() < 0.7:
+        hours["lunch_start"], hours["lunch_end"] = rng.choice([(720, 780), (735, 800)])
+    if close_at > 1170 and rng.random() < 0.6:
+        hours["dinner_start"], hours["dinner_end"] = 1110, 1170
+    for i in range(1, rng.randint(1, 3)):
+        start = rng.randrange(open_at, close_at - 60, 5)
+        hours[f"break{i}_start"], hours[f"break{i}_end"] = start, start + rng.choice([10, 15, 30, 45])
+    return {field: _clock(minutes, seconds=True) for field, minutes in hours.items()}
+
+
+def _schedule_row(rng, dates):
+    row = {"clinic_id": CLINIC_ID}
+    for day in clinic_schedule.WEEKDAYS:
+        for field, value in (_random_hours(rng) or {}).items():
+            row[f"{day}_{field}"] = value
+    holiday, special, closed_special = rng.sample(dates, 3)
+    row["holiday_self_declared"] = [holiday]
+    special_hours = None
+    while special_hours is None:
+        special_hours = _random_hours(rng)
+    special_date = {"start_time" if f == "start" else "end_time" if f == "end" else f: v for f, v in special_hours.items()}
+    row["special_dates"] = [{"date": special, **special_date}, {"date": closed_special, "start_time": None, "end_time": None}]
+    return row
+
+
+def _random_bookings(rng, dates, make_row):
+    rows = []
+    for date in dates:
+        for doctor_id in DOCTORS:
+            for _ in range(rng.randint(0, 5)):
+                rows.append(make_row(date, doctor_id, rng.randrange(7 * 60, 22 * 60, 15), rng.choice(DURATIONS)))
+    return rows
+
+
+def build_tables(seed: int):
+    rng = random.Random(seed)
+    first = datetime.now().date() + timedelta(days=1)
+    dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(HORIZON_DAYS)]
+    tables = {
+        "c_a_clinic_available_time": [_schedule_row(rng, dates)],
+        "tcm_a_clinic_available_time": [_schedule_row(rng, dates)],
+        "c_a_doctors": [{"id": d, "clinic_id": CLINIC_ID} for d in DOCTORS],
+        "tcm_a_doctors": [{"id": d, "clinic_id": CLINIC_ID} for d in DOCTORS],
+    }
+    for table in CLINIC_BOOKING_TABLES:
+        tables[table] = _random_bookings(rng, dates, lambda date, doctor_id, start, duration: {
+            "doctor_id": doctor_id, "date": date, "time": _clock(start), "duration_minutes": duration
+        })
+    tables["c_s_reschedule_requests"] = _random_bookings(rng, dates, lambda date, doctor_id, start, duration: {
+        "doctor_id": doctor_id, "new_date": date, "new_time": _clock(start), "duration_minutes": duration,
+        "status": rng.choice(["confirmed", "pending"])
+    })
+    tables["c_a_doctor_unavailability"] = [
+        {"doctor_id": doctor_id, "date": date, "start_time": _clock(start), "end_time": _clock(start + rng.choice([30, 60, 120]))}
+        for date in dates for doctor_id in DOCTORS if rng.random() < 0.3
+        for start in [rng.randrange(8 * 60, 20 * 60, 15)]
+    ]
+    tables["tcm_s_bookings"] = _random_bookings(rng, dates, lambda date, doctor_id, start, duration: {
+        "doctor_id": doctor_id, "original_date": date, "original_time": _clock(start),
+        "new_time": _clock(rng.randrange(7 * 60, 22 * 60, 15)) if rng.random() < 0.3 else None,
+        "duration_minutes": duration, "status": rng.choice(["confirmed", "pending", "cancelled"])
+    })
+    return FakeSupabase(tables), dates, rng
+
+
+@pytest.fixture(params=SEEDS)
+def world(request):
+    # The service caches days, rosters and schedule templates across calls
+    availability.invalidate_day_availability()
+    availability._rosters.clear()
+    clinic_schedule.invalidate_clinic_schedule()
+    return build_tables(request.param)
+
+
+def _doctor_choices():
+    """(doctor_id, is_any_doctor) as the booking flows pass them."""
+    return [(d, False) for d in DOCTORS] + [(None, False), (None, True), (DOCTORS[0], True)]
+
+
+# ----------------------------------------------------------------
+# EXPECTED ANSWERS FOR THE PINNED CHANGES
+# ----------------------------------------------------------------
+
+def _clinic_any_doctor_slot(supabase, date, time_slot, duration):
+    free = any(base_clinic.check_doctor_availability_at_slot(d, date, time_slot, duration, supabase)[0] for d in DOCTORS)
+    return (True, "available") if free else (False, "no_available_doctors")
+
+
+def _slots_for_any_of(baseline, supabase, date, doctor_ids, duration):
+    """Union of the baseline single-doctor slot lists, in time order."""
+    slots = set()
+    for doctor_id in doctor_ids:
+        slots.update(baseline.get_all_available_slots_for_day(date, CLINIC_ID, doctor_id, False, duration, supabase))
+    return sorted(slots)
+
+
+# ----------------------------------------------------------------
+# TESTS
+# ----------------------------------------------------------------
+
+@pytest.mark.parametrize("provider, baseline", [(CLINIC, base_clinic), (TCM, base_tcm)], ids=["clinic", "tcm"])
+def test_doctor_slot_availability_matches_baseline(world, provider, baseline):
+    supabase, dates, rng = world
+    for date in dates:
+        duration = rng.choice(DURATIONS)
+        for doctor_id in DOCTORS:
+            for time_slot in PROBE_TIMES:
+                expected = baseline.check_doctor_availability_at_slot(doctor_id, date, time_slot, duration, supabase)
+                assert doctor_slot_availability(supabase, doctor_id, date, time_slot, duration, provider) == expected, \
+                    (date, doctor_id, time_slot, duration)
+
+
+def test_clinic_slot_availability(world):
+    supabase, dates, rng = world
+    for date in dates:
+        duration = rng.choice(DURATIONS)
+        for doctor_id, is_any_doctor in _doctor_choices():
+            for time_slot in PROBE_TIMES:
+                got = slot_availability(supabase, date, time_slot, CLINIC_ID, doctor_id, is_any_doctor, duration)
+                if is_any_doctor or not doctor_id:
+                    expected = _clinic_any_doctor_slot(supabase, date, time_slot, duration)
+                else:
+                    expected = base_clinic.check_slot_availability(date, time_slot, CLINIC_ID, doctor_id, False, duration, supabase)
+                assert got == expected, (date, doctor_id, is_any_doctor, time_slot, duration)
+
+
+def test_tcm_slot_availability_matches_baseline(world):
+    supabase, dates, rng = world
+    for date in dates:
+        duration = rng.choice(DURATIONS)
+        for doctor_id, is_any_doctor in _doctor_choices():
+            for time_slot in PROBE_TIMES:
+                expected = base_tcm.check_slot_availability_tcm(date, time_slot, CLINIC_ID, doctor_id, is_any_doctor, duration, supabase)
+                got = slot_availability(supabase, date, time_slot, CLINIC_ID, doctor_id, is_any_doctor, duration, TCM, check_hours=True)
+                assert got == expected, (date, doctor_id, is_any_doctor, time_slot, duration)
+
+
+def test_clinic_slots_for_day(world):
+    supabase, dates, _ = world
+    for date in dates:
+        for duration in DURATIONS:
+            for doctor_id, is_any_doctor in _doctor_choices():
+                got = available_slots_for_day(supabase, date, CLINIC_ID, doctor_id, is_any_doctor, duration)
+                if is_any_doctor or not doctor_id:
+                    expected = _slots_for_any_of(base_clinic, supabase, date, DOCTORS, duration)
+                else:
+                    expected = base_clinic.get_all_available_slots_for_day(date, CLINIC_ID, doctor_id, False, duration, supabase)
+                assert got == expected, (date, doctor_id, is_any_doctor, duration)
+
+
+def test_tcm_slots_for_day_match_baseline(world):
+    supabase, dates, _ = world
+    for date in dates:
+        for duration in DURATIONS:
+            for doctor_id, is_any_doctor in _doctor_choices():
+                expected = base_tcm.get_all_available_slots_for_day(date, CLINIC_ID, doctor_id, is_any_doctor, duration, supabase)
+                got = available_slots_for_day(supabase, date, CLINIC_ID, doctor_id, is_any_doctor, duration, TCM)
+                assert got == expected, (date, doctor_id, is_any_doctor, duration)
+
+
+@pytest.mark.parametrize("provider, baseline", [(CLINIC, base_clinic), (TCM, base_tcm)], ids=["clinic", "tcm"])
+def test_date_availability(world, provider, baseline):
+    supabase, dates, _ = world
+    for date in dates:
+        date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+        for duration in DURATIONS:
+            for doctor_id, is_any_doctor in _doctor_choices():
+                doctor_ids = candidate_doctor_ids(supabase, CLINIC_ID, doctor_id, is_any_doctor, provider)
+                available, reason = date_availability(supabase, date_obj, CLINIC_ID, doctor_ids, duration, provider)
+                if baseline.get_clinic_schedule(supabase, CLINIC_ID, date_obj) is None:
+                    assert (available, reason) == (False, "clinic_closed"), (date, doctor_id)
+                    continue
+                expected = bool(_slots_for_any_of(baseline, supabase, date, doctor_ids, duration))
+                assert available == expected, (date, doctor_id, is_any_doctor, duration, reason)
+
+
+def test_any_doctor_change_is_exercised():
+    """The random fixtures must hit slots where the baseline "any doctor" answer differs."""
+    differences = 0
+    for seed in SEEDS:
+        availability.invalidate_day_availability()
+        availability._rosters.clear()
+        clinic_schedule.invalidate_clinic_schedule()
+        supabase, dates, _ = build_tables(seed)
+        for date in dates:
+            for time_slot in PROBE_TIMES:
+                old = base_clinic.check_slot_availability(date, time_slot, CLINIC_ID, None, True, 30, supabase)
+                differences += old != slot_availability(supabase, date, time_slot, CLINIC_ID, None, True, 30)
+    assert differences
+
+
+@pytest.mark.parametrize("provider, baseline", [(CLINIC, base_clinic), (TCM, base_tcm)], ids=["clinic", "tcm"])
+def test_date_check_uses_duration(provider, baseline):
+    """
+    Random days are rarely full, so the date change is pinned on one built by
+    hand: open 09:00-10:00, the only doctor booked 09:30-09:45. The baseline
+    saw free start times; no 60-minute appointment fits.
+    """
+    availability.invalidate_day_availability()
+    availability._rosters.clear()
+    clinic_schedule.invalidate_clinic_schedule()
+    date_obj = datetime.now().date() + timedelta(days=2)
+    date = date_obj.strftime("%Y-%m-%d")
+    day = date_obj.strftime("%A").lower()
+    hours = {"clinic_id": CLINIC_ID, f"{day}_start": "09:00:00", f"{day}_end": "10:00:00"}
+    supabase = FakeSupabase({
+        "c_a_clinic_available_time": [hours],
+        "tcm_a_clinic_available_time": [hours],
+        "c_a_doctors": [{"id": DOCTORS[0], "clinic_id": CLINIC_ID}],
+        "tcm_a_doctors": [{"id": DOCTORS[0], "clinic_id": CLINIC_ID}],
+        "c_s_checkup": [{"doctor_id": DOCTORS[0], "date": date, "time": "09:30", "duration_minutes": 15}],
+        "tcm_s_bookings": [{"doctor_id": DOCTORS[0], "original_date": date, "original_time": "09:30", "new_time": None,
+                            "duration_minutes": 15, "status": "confirmed"}],
+    })
+    assert baseline.check_date_availability(date_obj, CLINIC_ID, DOCTORS[0], False, supabase) == (True, "available")
+    assert date_availability(supabase, date_obj, CLINIC_ID, [DOCTORS[0]], 60, provider) == (False, "no_available_doctors")
+    assert date_availability(supabase, date_obj, CLINIC_ID, [DOCTORS[0]], 30, provider) == (True, "available")
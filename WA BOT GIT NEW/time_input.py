@@ -0,0 +1,210 @@
+# time_input.py - FREE-FORM TIME PARSING SHARED BY THE CLINIC AND TCM CALENDARS
+import logging
+import re
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_time_input(time_str):
+    """Parse various time input formats and convert to HH:MM format (24-hour)."""
+    try:
+        if not time_str or not isinstance(time_str, str):
+            return None
+            
+        # Remove whitespace and convert to lowercase
+        time_str = time_str.strip().lower()
+        
+        # Remove any dots at the end
+        time_str = time_str.rstrip('.')
+        
+        # Handle AM/PM variations
+        has_am = False
+        has_pm = False
+        
+        # Check for AM/PM indicators (more comprehensive)
+        am_patterns = ['a.m.', 'a.m', 'am', 'a']
+        pm_patterns = ['p.m.', 'p.m', 'pm', 'p']
+        
+        for pattern in am_patterns:
+            if pattern in time_str:
+                has_am = True
+                time_str = time_str.replace(pattern, '')
+                break
+                
+        if not has_am:
+            for pattern in pm_patterns:
+                if pattern in time_str:
+                    has_pm = True
+                    time_str = time_str.replace(pattern, '')
+                    break
+        
+        # Remove all non-digit characters except colon and dot
+        time_str = re.sub(r'[^0-9:.]', '', time_str)
+        
+        # If empty after cleaning, return None
+        if not time_str:
+            return None
+        
+        # Replace dots with colons for consistent parsing
+        time_str = time_str.replace('.', ':')
+        
+        # Handle different formats
+        # Case 1: Has colon separator (e.g., "9:30", "14:00")
+        if ':' in time_str:
+            parts = time_str.split(':')
+            if len(parts) == 2:
+                hour_str = parts[0]
+                minute_str = parts[1]
+                
+                # Pad single digit hour
+                if len(hour_str) == 1:
+                    hour_str = '0' + hour_str
+                
+                # Pad minute if needed
+                if len(minute_str) == 1:
+                    minute_str = minute_str + '0'
+                elif len(minute_str) > 2:
+                    minute_str = minute_str[:2]
+                
+                hour = int(hour_str)
+                minute = int(minute_str[:2])
+                
+                # Validate
+                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
+                    return None
+                
+                # Handle AM/PM conversion
+                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
+        
+        # Case 2: No separator (e.g., "0930", "1400", "9", "14")
+        elif time_str.isdigit():
+            length = len(time_str)
+            
+            if length == 4:  # HHMM format
+                hour = int(time_str[:2])
+                minute = int(time_str[2:])
+                
+                # Validate
+                if hour < 0 or hour > 23 or minute < 0 or minute > 59:
+                    return None
+                
+                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
+                
+            elif length == 3:  # HMM format (e.g., "930" for 9:30)
+                hour = int(time_str[0])
+                minute = int(time_str[1:])
+                
+                # Validate minute
+                if minute < 0 or minute > 59:
+                    return None
+                
+                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
+                
+            elif length == 2:  # HH format
+                hour = int(time_str)
+                minute = 0
+                
+                # Validate hour
+                if hour < 0 or hour > 23:
+                    return None
+                
+                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
+                
+            elif length == 1:  # H format
+                hour = int(time_str)
+                minute = 0
+                
+                return convert_12_to_24_hour(hour, minute, has_am, has_pm)
+        
+        return None
+        
+    except Exception as e:
+        logger.error(f"Error parsing time input '{time_str}': {str(e)}")
+        return None
+
+
+def convert_12_to_24_hour(hour, minute, has_am, has_pm):
+    """Convert 12-hour format to 24-hour format."""
+    # If no AM/PM specified, assume 24-hour format
+    if not has_am and not has_pm:
+        # If hour is 0-11 and we have no AM/PM, could be ambiguous
+        # But we'll assume 24-hour format for consistency
+        if hour == 12:
+            hour = 12  # 12:00 in 24-hour is 12:00
+        elif hour > 12 and hour <= 23:
+            # Already in 24-hour format
+            pass
+        # hour 0-11 stays as is in 24-hour format
+    
+    # Handle AM
+    elif has_am:
+        if hour == 12:
+            hour = 0  # 12 AM = 00
+        elif hour > 12:
+            return None  # Invalid for AM
+        # hour 1-11 stays as is
+    
+    # Handle PM
+    elif has_pm:
+        if hour == 12:
+            hour = 12  # 12 PM = 12
+        elif hour < 12:
+            hour += 12
+    
+    return f"{hour:02d}:{minute:02d}"
+
+
+def format_time_for_display(time_str):
+    """Convert 24-hour time to 12-hour format with AM/PM."""
+    try:
+        if not time_str:
+            return ""
+        
+        # Parse the time
+        hour, minute = map(int, time_str.split(':'))
+        
+        # Convert to 12-hour format
+        if hour == 0:
+            return f"12:{minute:02d} AM"
+        elif hour < 12:
+            return f"{hour}:{minute:02d} AM"
+        elif hour == 12:
+            return f"12:{minute:02d} PM"
+        else:
+            return f"{hour-12}:{minute:02d} PM"
+            
+    except Exception as e:
+        logger.error(f"Error formatting time '{time_str}': {str(e)}")
+        return time_str
+
+
+def round_to_15_minutes(time_str):
+    """Round time to nearest 15-minute interval."""
+    try:
+        hour, minute = map(int, time_str.split(':'))
+        
+        # Calculate remainder
+        remainder = minute % 15
+        
+        if remainder == 0:
+            # Already on 15-minute interval
+            return f"{hour:02d}:{minute:02d}"
+        elif remainder <= 7:
+            # Round down
+            minute = minute - remainder
+        else:
+            # Round up
+            minute = minute + (15 - remainder)
+            if minute >= 60:
+                hour += 1
+                minute = 0
+                if hour >= 24:
+                    hour = 0
+        
+        return f"{hour:02d}:{minute:02d}"
+        
+    except Exception as e:
+        logger.error(f"Error rounding time '{time_str}': {str(e)}")
+        return time_str
@@ -0,0 +1,897 @@
+# tm_dictionary.py - ENGLISH TO TAMIL DICTIONARY SOURCE
+#
+# Build input only: translation_tables.py reads this literal with ast and compiles it
+# to compiled_translations/tm.marshal. It is never imported at runtime, so the
+# bot does not hold both the literal and the compiled table in memory.
+
+# Translation dictionary for English to Tamil
+EN_TO_TM = {
+    # HEADER
+    "AnyHealth Bot": "AnyHealth பாட்",
+    "Profiles": "சுயவிவரங்கள்",
+    "Options for {}": "{}க்கான விருப்பங்கள்",
+    "Select Visit for Report": "அறிக்கைக்கான வருகையைத் தேர்ந்தெடுக்கவும்",
+    "Select Document": "ஆவணத்தைத் தேர்ந்தெடுக்கவும்",
+    "Select Race": "இனத்தைத் தேர்ந்தெடுக்கவும்",
+    "Select Religion": "மதத்தைத் தேர்ந்தெடுக்கவும்",
+    "Select Blood Type": "ரத்த வகையைத் தேர்ந்தெடுக்கவும்",
+    "Remove Profile": "சுயவிவரத்தை அகற்று",
+    "Changed Numbers": "மாற்றப்பட்ட எண்கள்",
+    "Action Required": "நடவடிக்கை தேவை",
+    "Confirmed": "உறுதிப்படுத்தப்பட்டது",
+    "Pending": "நிலுவையில்",
+    "View Booking Options": "முன்பதிவு விருப்பங்களைக் காண்க",
+    "📍 Current Address (Pickup)": "📍 தற்போதைய முகவரி (பிக்-அப்)",
+    "📍 Pickup Address Found": "📍 பிக்-அப் முகவரி கண்டறியப்பட்டது",
+    "📍 Destination Address Found": "📍 இலக்கு முகவரி கண்டறியப்பட்டது",
+    "📱 Destination Emergency Contact": "📱 இலக்கு அவசரத் தொடர்பு",
+    "📎 Attachments": "📎 இணைப்புகள்",
+    "📝 Remarks": "📝 குறிப்புகள்",
+    "📅 Select Transfer Date": "📅 பரிமாற்ற தேதியைத் தேர்ந்தெடுக்கவும்",
+    "⏰ Select 2-Hour Slot ({period})": "⏰ 2-மணி நேர இடைவெளியைத் தேர்ந்தெடுக்கவும் ({period})",
+    "⏱️ Select 15-Minute Interval": "⏱️ 15-நிமிட இடைவெளியைத் தேர்ந்தெடுக்கவும்",
+    "🏥 Current Hospital Address Found": "🏥 தற்போதைய மருத்துவமனை முகவரி கண்டறியப்பட்டது",
+    "🏥 Destination Hospital Address Found": "🏥 இலக்கு மருத்துவமனை முகவரி கண்டறியப்பட்டது",
+    "🚑 Non-Emergency Ambulance": "🚑 அவசரம் அல்லாத ஆம்புலன்ஸ்",
+    "🌿 TCM Services": "🌿 TCM சேவைகள்",
+
+    # BODY
+    "Please select your preferred language:": "தயவுசெய்து உங்கள் விருப்பமான மொழியைத் தேர்ந்தெடுக்கவும்:",
+    "Welcome to our clinic! Please select a booking option.": "எங்கள் மருத்துவமனைக்கு வரவேற்கிறோம்! முன்பதிவு விருப்பத்தைத் தேர்ந்தெடுக்கவும்.",
+    "Please choose a booking option:": "முன்பதிவு விருப்பத்தைத் தேர்ந்தெடுக்கவும்:",
+    "⚠️ *Main Menu Confirmation*\n\nAre you sure you want to go back to the main menu?\nThis will cancel your current action.": "⚠️ *முதன்மை மெனு உறுதிப்படுத்தல்*\n\nமுதன்மை மெனுவுக்குத் திரும்ப விரும்புகிறீர்களா?\nஇது உங்கள் தற்போதைய செயலை ரத்து செய்யும்.",
+    "Please select the type of non-emergency transport you need:\n\n• Scheduled patient transport\n• Advance booking required (24 hours)\n• Professional medical team": "தேவையான அவசரம் அல்லாத பரிமாற்ற வகையைத் தேர்ந்தெடுக்கவும்:\n\n• திட்டமிடப்பட்ட நோயாளி பரிமாற்றம்\n• முன்கூட்டிய முன்பதிவு தேவை (24 மணி நேரம்)\n• தொழில்முறை மருத்துவ குழு",
+    "Please share your current location:": "தயவுசெய்து உங்கள் தற்போதைய இடத்தைப் பகிரவும்:",
+    "Session expired. Returning to main menu.": "அமர்வு காலாவதியானது. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Continuing with your previous action.": "முந்தைய செயலுடன் தொடர்கிறது.",
+    "Could not restore previous action. Returning to main menu.": "முந்தைய செயலை மீட்டமைக்க முடியவில்லை. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Error: No service selected. Please start over.": "பிழை: சேவை தேர்ந்தெடுக்கப்படவில்லை. மீண்டும் தொடங்கவும்.",
+    "Do you have any remarks for {} ({} min){}?": "{} ({} நிமிடம்){} குறித்து கருத்து உள்ளதா?",
+    "Please enter your remarks:": "தயவுசெய்து உங்கள் கருத்துகளை உள்ளிடவும்:",
+    "Please enter your preferred date as DD/MM/YYYY, DD-MM-YYYY or DD MM YYYY:": "தயவுசெய்து DD/MM/YYYY, DD-MM-YYYY அல்லது DD MM YYYY வடிவத்தில் உங்கள் விருப்ப தேதியை உள்ளிடவும்:",
+    "Please enter your preferred time (e.g., 9:30, 2pm, 1430):": "தயவுசெய்து உங்கள் விருப்ப நேரத்தை உள்ளிடவும் (எ.கா., 9:30, 2pm, 1430):",
+    "Error saving vaccination booking. Please try again.": "தடுப்பூசி முன்பதிவைச் சேமிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid input. Please use the buttons provided.": "தவறான உள்ளீடு. வழங்கப்பட்ட பொத்தான்களைப் பயன்படுத்தவும்.",
+    "✅ Your vaccination booking has been submitted!\n\n": "✅ உங்கள் தடுப்பூசி முன்பதிவு சமர்ப்பிக்கப்பட்டது!\n\n",
+    "Vaccine: ": "தடுப்பூசி: ",
+    "Date: ": "தேதி: ",
+    "Time: ": "நேரம்: ",
+    "Duration: ": "காலம்: ",
+    " minutes\n\n": " நிமிடங்கள்\n\n",
+    "Booking is pending approval. You'll be notified once confirmed.\n": "முன்பதிவு ஒப்புதலுக்கு நிலுவையில் உள்ளது. உறுதிப்படுத்தப்பட்டதும் அறிவிக்கப்படுவீர்கள்.\n",
+    "Booking ID: ": "முன்பதிவு ஐடி: ",
+    "🏠 *AMBULANCE SERVICE: HOME TO HOME TRANSFER*": "🏠 *ஆம்புலன்ஸ் சேவை: வீட்டிலிருந்து வீட்டிற்கு பரிமாற்றம்*",
+    "This service helps transfer patients between homes (e.g., moving to family home).": "இந்தச் சேவை நோயாளர்களை வீடுகளுக்கு இடையே மாற்ற உதவுகிறது (எ.கா., குடும்ப வீட்டிற்கு நகர்த்துவது).",
+    "We'll collect information for your home-to-home transfer.": "உங்கள் வீட்டிலிருந்து வீட்டிற்கு பரிமாற்றத்திற்கான தகவல்களை சேகரிப்போம்.",
+    "Please answer the following questions one by one.": "தயவுசெய்து பின்வரும் கேள்விகளுக்கு ஒவ்வொன்றாக பதிலளிக்கவும்.",
+    "*IMPORTANT:*": "*முக்கியமானது:*",
+    "• Provide accurate addresses for both locations": "• இரு இடங்களுக்கும் சரியான முகவரிகளை வழங்கவும்",
+    "• Ensure patient is stable for transfer": "• பரிமாற்றத்திற்கு நோயாளர் நிலையானவர் என்பதை உறுதிப்படுத்தவும்",
+    "• Have all necessary medical equipment ready": "• அனைத்து தேவையான மருத்துவ உபகரணங்களும் தயாராக உள்ளதா என்பதை உறுதிப்படுத்தவும்",
+    "• Coordinate with family members at both locations": "• இரு இடங்களிலும் உள்ள குடும்ப உறுப்பினர்களுடன் ஒருங்கிணைக்கவும்",
+    "*QUESTIONS TO FOLLOW:*": "*பின்வரும் கேள்விகள்:*",
+    "1. Patient full name": "1. நோயாளியின் முழுப் பெயர்",
+    "2. Patient IC number": "2. நோயாளியின் IC எண்",
+    "3. Patient phone number": "3. நோயாளியின் தொலைபேசி எண்",
+    "4. Emergency contact at pickup location": "4. பிக்-அப் இடத்தில் அவசரத் தொடர்பு",
+    "5. Emergency contact phone at pickup location": "5. பிக்-அப் இடத்தில் அவசரத் தொலைபேசி எண்",
+    "6. Current address (Pickup) with location sharing option": "6. தற்போதைய முகவரி (பிக்-அப்) இட பகிர்வு விருப்பத்துடன்",
+    "7. Destination address (manual input)": "7. இலக்கு முகவரி (கைமுறை உள்ளீடு)",
+    "8. Reason for transfer": "8. பரிமாற்ற காரணம்",
+    "9. Medical condition": "9. மருத்துவ நிலை",
+    "*After these questions, we'll ask for destination emergency contact, attachments, and schedule.*": "*இந்த கேள்விகளுக்குப் பிறகு, இலக்கு அவசரத் தொடர்பு, இணைப்புகள் மற்றும் அட்டவணை கேட்கப்படும்.*",
+    "You can cancel anytime by typing 'cancel'.": "எந்த நேரத்திலும் 'cancel' என்று தட்டச்சு செய்து ரத்து செய்யலாம்.",
+    "6. *Current address (Pickup)*": "6. *தற்போதைய முகவரி (பிக்-அப்)*",
+    "How would you like to provide your current address?": "உங்கள் தற்போதைய முகவரியை எவ்வாறு வழங்க விரும்புகிறீர்கள்?",
+    "• *Share Location:* Send your current location (recommended)": "• *இடத்தைப் பகிரவும்:* உங்கள் தற்போதைய இடத்தை அனுப்பவும் (பரிந்துரைக்கப்படுகிறது)",
+    "• *Type Address:* Enter your full address manually": "• *முகவரியை உள்ளிடவும்:* உங்கள் முழு முகவரியை கைமுறையாக உள்ளிடவும்",
+    "Example of manual address:": "கைமுறை முகவரியின் எடுத்துக்காட்டு:",
+    "Please type your full current address:": "தயவுசெய்து உங்கள் முழு தற்போதைய முகவரியை உள்ளிடவும்:",
+    "Example:": "எடுத்துக்காட்டு:",
+    "Include:": "சேர்க்கவும்:",
+    "• House/building number": "• வீடு/கட்டட எண்",
+    "• Street name": "• தெரு பெயர்",
+    "• Area/Taman": "• பகுதி/தாமான்",
+    "• Postcode and City": "• அஞ்சல் குறியீடு மற்றும் நகரம்",
+    "• State": "• மாநிலம்",
+    "We found this address:": "இந்த முகவரியைக் கண்டறிந்தோம்:",
+    "Is this your correct pickup address?": "இது உங்கள் சரியான பிக்-அப் முகவரியா?",
+    "7. *Destination address*": "7. *இலக்கு முகவரி*",
+    "Please type the full destination address:": "தயவுசெய்து முழு இலக்கு முகவரியை உள்ளிடவும்:",
+    "Example:": "எடுத்துக்காட்டு:",
+    "Include:": "சேர்க்கவும்:",
+    "• House/building number": "• வீடு/கட்டட எண்",
+    "• Street name": "• தெரு பெயர்",
+    "• Area/Taman": "• பகுதி/தாமான்",
+    "• Postcode and City": "• அஞ்சல் குறியீடு மற்றும் நகரம்",
+    "• State": "• மாநிலம்",
+    "We found this address:": "இந்த முகவரியைக் கண்டறிந்தோம்:",
+    "Is this your correct destination address?": "இது உங்கள் சரியான இலக்கு முகவரியா?",
+    "8. *Reason for transfer*": "8. *பரிமாற்ற காரணம்*",
+    "Please explain why you need this home-to-home transfer:": "இந்த வீட்டிலிருந்து வீட்டிற்கு பரிமாற்றம் ஏன் தேவை என்பதை விளக்கவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Moving to family home for care": "• பராமரிப்புக்காக குடும்ப வீட்டிற்கு நகர்த்துவது",
+    "• Returning from temporary stay": "• தற்காலிக தங்குதலிலிருந்து திரும்புவது",
+    "• Home modification needed": "• வீட்டு மாற்றம் தேவை",
+    "• Closer to medical facilities": "• மருத்துவ வசதிகளுக்கு அருகில்",
+    "• Change of residence": "• குடியிருப்பு மாற்றம்",
+    "9. *Medical condition*": "9. *மருத்துவ நிலை*",
+    "Please describe the patient's current medical condition:": "நோயாளியின் தற்போதைய மருத்துவ நிலையை விவரிக்கவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Post-stroke recovery": "• பக்கவாதத்திற்குப் பின் மீட்பு",
+    "• Mobility limited": "• இயக்கம் வரையறுக்கப்பட்டுள்ளது",
+    "• Requires oxygen therapy": "• ஆக்ஸிஜன் சிகிச்சை தேவை",
+    "• Stable condition for transfer": "• பரிமாற்றத்திற்கு நிலையான நிலை",
+    "• Recent surgery": "• சமீபத்திய அறுவை சிகிச்சை",
+    "Would you like to provide an emergency contact at the destination?": "இலக்கில் அவசரத் தொடர்பை வழங்க விரும்புகிறீர்களா?",
+    "This is optional but recommended for better coordination at the destination location.": "இது விருப்பமானது, ஆனால் இலக்கு இடத்தில் சிறந்த ஒருங்கிணைப்புக்கு பரிந்துரைக்கப்படுகிறது.",
+    "Please provide the emergency contact name at the destination:": "இலக்கில் அவசரத் தொடர்பு பெயரை வழங்கவும்:",
+    "Example: Rahman bin Ali or Aishah binti Hassan": "எடுத்துக்காட்டு: ரஹ்மான் பின் அலி அல்லது ஐஷா பிந்தி ஹசன்",
+    "Please provide the emergency contact phone at the destination:": "இலக்கில் அவசரத் தொலைபேசி எண்ணை வழங்கவும்:",
+    "Example: 012-3456789 or 019-8765432": "எடுத்துக்காட்டு: 012-3456789 அல்லது 019-8765432",
+    "You can upload attachments (photos/documents) related to this transfer.": "இந்த பரிமாற்றத்துடன் தொடர்புடைய இணைப்புகளை (புகைப்படங்கள்/ஆவணங்கள்) பதிவேற்றலாம்.",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Medical reports": "• மருத்துவ அறிக்கைகள்",
+    "• Doctor's clearance for transfer": "• பரிமாற்றத்திற்கான மருத்துவர் அனுமதி",
+    "• Insurance documents": "• காப்பீட்டு ஆவணங்கள்",
+    "• Prescriptions": "• மருந்து பதிவுகள்",
+    "You can upload multiple attachments. When done, click 'Next'.": "பல இணைப்புகளைப் பதிவேற்றலாம். முடிந்ததும், 'அடுத்து' என்பதைக் கிளிக் செய்யவும்.",
+    "Do you have any additional remarks or special instructions?": "கூடுதல் கருத்துகள் அல்லது சிறப்பு வழிமுறைகள் உள்ளதா?",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Specific route preferences": "• குறிப்பிட்ட வழித்தட விருப்பங்கள்",
+    "• Special medical equipment needed": "• தேவையான சிறப்பு மருத்துவ உபகரணங்கள்",
+    "• Time constraints": "• நேரக் கட்டுப்பாடுகள்",
+    "• Additional patient information": "• கூடுதல் நோயாளி தகவல்",
+    "You can add remarks or skip to continue.": "கருத்துகளைச் சேர்க்கலாம் அல்லது தொடர தவிர்க்கலாம்.",
+    "Please type your remarks or special instructions:": "தயவுசெய்து உங்கள் கருத்துகள் அல்லது சிறப்பு வழிமுறைகளை உள்ளிடவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Patient needs wheelchair assistance": "• நோயாளிக்கு வீல்சேர் உதவி தேவை",
+    "• Please use back entrance": "• பின்புற நுழைவாயிலைப் பயன்படுத்தவும்",
+    "• Patient is fasting": "• நோயாளி நோன்பு இருக்கிறார்",
+    "• Special handling requirements": "• சிறப்பு கையாளுதல் தேவைகள்",
+    "Please select the transfer date:": "பரிமாற்ற தேதியைத் தேர்ந்தெடுக்கவும்:",
+    "*Today:*": "*இன்று:*",
+    "*Tomorrow:*": "*நாளை:*",
+    "If you need another date, select 'Others' and enter DD/MM/YYYY format.": "வேறு தேதி தேவைப்பட்டால், 'மற்றவை' தேர்ந்தெடுத்து DD/MM/YYYY வடிவத்தில் உள்ளிடவும்.",
+    "Please select AM or PM for the transfer time:": "பரிமாற்ற நேரத்திற்கு AM அல்லது PM தேர்ந்தெடுக்கவும்:",
+    "Please select a 2-hour time slot for transfer:": "பரிமாற்றத்திற்கான 2-மணி நேர இடைவெளியைத் தேர்ந்தெடுக்கவும்:",
+    "Selected Date:": "தேர்ந்தெடுக்கப்பட்ட தேதி:",
+    "Period:": "காலம்:",
+    "After selecting a slot, you'll choose the exact 15-minute interval.": "இடைவெளியைத் தேர்ந்தெடுத்த பிறகு, சரியான 15-நிமிட இடைவெளியைத் தேர்ந்தெடுப்பீர்கள்.",
+    "Please select the exact transfer time:": "சரியான பரிமாற்ற நேரத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Selected Date:": "தேர்ந்தெடுக்கப்பட்ட தேதி:",
+    "Selected Slot:": "தேர்ந்தெடுக்கப்பட்ட இடைவெளி:",
+    "Choose your preferred 15-minute interval within this slot.": "இந்த இடைவெளியில் உங்களுக்கு விருப்பமான 15-நிமிட இடைவெளியைத் தேர்ந்தெடுக்கவும்.",
+    "Error starting transfer request. Please try again.": "பரிமாற்ற கோரிக்கையைத் தொடங்குவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Home transfer cancelled. Returning to main menu.": "வீடு பரிமாற்றம் ரத்து செய்யப்பட்டது. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Please provide a valid answer.": "சரியான பதிலை வழங்கவும்.",
+    "❌ *Invalid IC number format*": "❌ *தவறான IC எண் வடிவம்*",
+    "IC must be 12 digits.": "IC 12 இலக்கங்களாக இருக்க வேண்டும்.",
+    "Accepted formats:": "ஏற்றுக்கொள்ளப்பட்ட வடிவங்கள்:",
+    "• 801212-14-5678": "• 801212-14-5678",
+    "• 801212145678": "• 801212145678",
+    "• 801212 14 5678": "• 801212 14 5678",
+    "Please re-enter the patient's IC number:": "நோயாளியின் IC எண்ணை மீண்டும் உள்ளிடவும்:",
+    "Error processing your answer. Please try again.": "உங்கள் பதிலைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ Unsupported file type.": "❌ ஆதரிக்கப்படாத கோப்பு வகை.",
+    "Please send images (JPEG, PNG) or documents (PDF, DOC) only.": "புகைப்படங்கள் (JPEG, PNG) அல்லது ஆவணங்கள் (PDF, DOC) மட்டுமே அனுப்பவும்.",
+    "Error: Could not get file information. Please try again.": "பிழை: கோப்புத் தகவலைப் பெற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ Failed to download file from WhatsApp.": "❌ WhatsApp இலிருந்து கோப்பைப் பதிவிறக்க முடியவில்லை.",
+    "Please try sending the file again.": "கோப்பை மீண்டும் அனுப்ப முயற்சிக்கவும்.",
+    "✅ *Attachment successfully saved!*": "✅ *இணைப்பு வெற்றிகரமாக சேமிக்கப்பட்டது!*",
+    "You can send more attachments or click 'Next' to continue.": "மேலும் இணைப்புகளை அனுப்பலாம் அல்லது தொடர 'அடுத்து' கிளிக் செய்யலாம்.",
+    "❌ Failed to save attachment.": "❌ இணைப்பைச் சேமிப்பதில் தோல்வி.",
+    "Please try again or click 'Skip' to continue without attachments.": "மீண்டும் முயற்சிக்கவும் அல்லது இணைப்புகள் இல்லாமல் தொடர 'தவிர்க்கவும்' கிளிக் செய்யவும்.",
+    "Error processing attachment. Please try again.": "இணைப்பைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid selection. Please try again.": "தவறான தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "Date cannot be in the past.": "தேதி கடந்த காலத்தில் இருக்க முடியாது.",
+    "Please enter a future date in DD/MM/YYYY format.": "DD/MM/YYYY வடிவத்தில் எதிர்கால தேதியை உள்ளிடவும்.",
+    "Invalid date format.": "தவறான தேதி வடிவம்.",
+    "Please enter date in DD/MM/YYYY format.": "DD/MM/YYYY வடிவத்தில் தேதியை உள்ளிடவும்.",
+    "Example: 25/12/2024": "எடுத்துக்காட்டு: 25/12/2024",
+    "Error selecting time interval. Please try again.": "நேர இடைவெளியைத் தேர்ந்தெடுப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error submitting transfer request. Please try again.": "பரிமாற்ற கோரிக்கையைச் சமர்ப்பிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ *HOME TO HOME TRANSFER CONFIRMED*": "✅ *வீட்டிலிருந்து வீட்டிற்கு பரிமாற்றம் உறுதிப்படுத்தப்பட்டது*",
+    "Your home-to-home transfer request has been received.": "உங்கள் வீட்டிலிருந்து வீட்டிற்கு பரிமாற்ற கோரிக்கை பெறப்பட்டது.",
+    "Our team will contact you to arrange details.": "விவரங்களை ஏற்பாடு செய்ய எங்கள் குழு உங்களைத் தொடர்பு கொள்ளும்.",
+    "*Next Steps:*": "*அடுத்த கட்டங்கள்:*",
+    "1. Team will verify details": "1. குழு விவரங்களை சரிபார்க்கும்",
+    "2. You'll receive confirmation call": "2. உறுதிப்படுத்தல் அழைப்பு கிடைக்கும்",
+    "3. Transfer schedule will be arranged": "3. பரிமாற்ற அட்டவணை ஏற்பாடு செய்யப்படும்",
+    "Thank you for using AnyHealth Ambulance Service! 🚑": "AnyHealth ஆம்புலன்ஸ் சேவையைப் பயன்படுத்தியதற்கு நன்றி! 🚑",
+    "🏥 *AMBULANCE SERVICE: HOSPITAL TO HOSPITAL TRANSFER*": "🏥 *ஆம்புலன்ஸ் சேவை: மருத்துவமனையிலிருந்து மருத்துவமனை பரிமாற்றம்*",
+    "This service helps transfer patients between hospitals for specialized care.": "இந்தச் சேவை நோயாளர்களை சிறப்பு சிகிச்சைக்காக மருத்துவமனைகளுக்கு இடையே மாற்ற உதவுகிறது.",
+    "We'll collect information for your inter-hospital transfer.": "உங்கள் மருத்துவமனை இடை பரிமாற்றத்திற்கான தகவல்களை சேகரிப்போம்.",
+    "Please answer the following questions one by one.": "தயவுசெய்து பின்வரும் கேள்விகளுக்கு ஒவ்வொன்றாக பதிலளிக்கவும்.",
+    "*IMPORTANT:*": "*முக்கியமானது:*",
+    "• Ensure both hospitals are aware of the transfer": "• பரிமாற்றம் பற்றி இரு மருத்துவமனைகளும் அறிந்துள்ளன என்பதை உறுதிப்படுத்தவும்",
+    "• Provide accurate hospital names": "• சரியான மருத்துவமனை பெயர்களை வழங்கவும்",
+    "• We'll automatically find hospital addresses": "• மருத்துவமனை முகவரிகளை தானாகவே கண்டுபிடிப்போம்",
+    "• Have medical files ready for transfer": "• பரிமாற்றத்திற்கான மருத்துவ கோப்புகளை தயாராக வைத்திருங்கள்",
+    "---": "---",
+    "*QUESTIONS TO FOLLOW:*": "*பின்வரும் கேள்விகள்:*",
+    "1. Patient name": "1. நோயாளியின் பெயர்",
+    "2. Patient IC number": "2. நோயாளியின் IC எண்",
+    "3. Patient phone number": "3. நோயாளியின் தொலைபேசி எண்",
+    "4. Emergency contact name": "4. அவசரத் தொடர்பு பெயர்",
+    "5. Emergency contact phone": "5. அவசரத் தொலைபேசி எண்",
+    "6. Current hospital name (we'll find the address)": "6. தற்போதைய மருத்துவமனை பெயர் (முகவரியைக் கண்டுபிடிப்போம்)",
+    "7. Ward number and level (e.g., Ward 5A, Level 3)": "7. வார்டு எண் மற்றும் நிலை (எ.கா., வார்டு 5A, நிலை 3)",
+    "8. Destination hospital name (we'll find the address)": "8. இலக்கு மருத்துவமனை பெயர் (முகவரியைக் கண்டுபிடிப்போம்)",
+    "*After these questions, you can upload attachments, add remarks, and schedule the transfer.*": "*இந்த கேள்விகளுக்குப் பிறகு, இணைப்புகளைப் பதிவேற்றலாம், கருத்துகளைச் சேர்க்கலாம் மற்றும் பரிமாற்றத்தை அட்டவணைப்படுத்தலாம்.*",
+    "You can cancel anytime by typing 'cancel'.": "எந்த நேரத்திலும் 'cancel' என்று தட்டச்சு செய்து ரத்து செய்யலாம்.",
+    "6. *Current hospital name*": "6. *தற்போதைய மருத்துவமனை பெயர்*",
+    "Please type the name of the current hospital:": "தயவுசெய்து தற்போதைய மருத்துவமனையின் பெயரை உள்ளிடவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Hospital Kuala Lumpur": "• கோலாலம்பூர் மருத்துவமனை",
+    "• Sunway Medical Centre": "• சன்வே மருத்துவ மையம்",
+    "• Pantai Hospital Kuala Lumpur": "• பந்தாய் மருத்துவமனை கோலாலம்பூர்",
+    "• University Malaya Medical Centre": "• மலாயா பல்கலைக்கழக மருத்துவ மையம்",
+    "We'll automatically find the address for you.": "முகவரியைத் தானாகவே கண்டுபிடிப்போம்.",
+    "We found this address for *{hospital_name}*:": "*{hospital_name}* க்கான இந்த முகவரியைக் கண்டறிந்தோம்:",
+    "Is this the correct hospital address?": "இது சரியான மருத்துவமனை முகவரியா?",
+    "Please type the current hospital address manually:": "தயவுசெய்து தற்போதைய மருத்துவமனை முகவரியை கைமுறையாக உள்ளிடவும்:",
+    "Example:": "எடுத்துக்காட்டு:",
+    "Jalan Pahang, 53000 Kuala Lumpur, Wilayah Persekutuan Kuala Lumpur": "ஜாலான் பகாங், 53000 கோலாலம்பூர், விலாயா பெர்சகுதுவான் கோலாலம்பூர்",
+    "Include full address with postcode and state.": "அஞ்சல் குறியீடு மற்றும் மாநிலத்துடன் முழு முகவரியைச் சேர்க்கவும்.",
+    "7. *Ward number and level*": "7. *வார்டு எண் மற்றும் நிலை*",
+    "Please provide the ward number and level:": "வார்டு எண் மற்றும் நிலையை வழங்கவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Ward 5A, Level 3": "• வார்டு 5A, நிலை 3",
+    "• ICU, Level 5": "• ICU, நிலை 5",
+    "• Ward 3B, Ground Floor": "• வார்டு 3B, தரை மாடி",
+    "• Private Suite, Level 2": "• தனியார் சூட், நிலை 2",
+    "Enter both ward and level together.": "வார்டு மற்றும் நிலை இரண்டையும் ஒன்றாக உள்ளிடவும்.",
+    "8. *Destination hospital name*": "8. *இலக்கு மருத்துவமனை பெயர்*",
+    "Please type the name of the destination hospital:": "இலக்கு மருத்துவமனையின் பெயரை உள்ளிடவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Hospital Kuala Lumpur": "• கோலாலம்பூர் மருத்துவமனை",
+    "• Sunway Medical Centre": "• சன்வே மருத்துவ மையம்",
+    "• Pantai Hospital Kuala Lumpur": "• பந்தாய் மருத்துவமனை கோலாலம்பூர்",
+    "• University Malaya Medical Centre": "• மலாயா பல்கலைக்கழக மருத்துவ மையம்",
+    "We'll automatically find the address for you.": "முகவரியைத் தானாகவே கண்டுபிடிப்போம்.",
+    "We found this address for *{hospital_name}*:": "*{hospital_name}* க்கான இந்த முகவரியைக் கண்டறிந்தோம்:",
+    "Is this the correct hospital address?": "இது சரியான மருத்துவமனை முகவரியா?",
+    "Please type the destination hospital address manually:": "இலக்கு மருத்துவமனை முகவரியை கைமுறையாக உள்ளிடவும்:",
+    "Example:": "எடுத்துக்காட்டு:",
+    "Jalan Pahang, 53000 Kuala Lumpur, Wilayah Persekutuan Kuala Lumpur": "ஜாலான் பகாங், 53000 கோலாலம்பூர், விலாயா பெர்சகுதுவான் கோலாலம்பூர்",
+    "Include full address with postcode and state.": "அஞ்சல் குறியீடு மற்றும் மாநிலத்துடன் முழு முகவரியைச் சேர்க்கவும்.",
+    "You can upload attachments (photos/documents) related to this transfer.": "இந்த பரிமாற்றத்துடன் தொடர்புடைய இணைப்புகளை (புகைப்படங்கள்/ஆவணங்கள்) பதிவேற்றலாம்.",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Medical reports": "• மருத்துவ அறிக்கைகள்",
+    "• Doctor's referral letters": "• மருத்துவர் பரிந்துரை கடிதங்கள்",
+    "• Insurance documents": "• காப்பீட்டு ஆவணங்கள்",
+    "• Transfer forms": "• பரிமாற்ற படிவங்கள்",
+    "You can upload multiple attachments. When done, click 'Next'.": "பல இணைப்புகளைப் பதிவேற்றலாம். முடிந்ததும், 'அடுத்து' என்பதைக் கிளிக் செய்யவும்.",
+    "Do you have any additional remarks or special instructions?": "கூடுதல் கருத்துகள் அல்லது சிறப்பு வழிமுறைகள் உள்ளதா?",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Specific medical equipment needed": "• தேவையான குறிப்பிட்ட மருத்துவ உபகரணங்கள்",
+    "• Time constraints for transfer": "• பரிமாற்றத்திற்கான நேரக் கட்டுப்பாடுகள்",
+    "• Special handling requirements": "• சிறப்பு கையாளுதல் தேவைகள்",
+    "• Additional patient information": "• கூடுதல் நோயாளி தகவல்",
+    "You can add remarks or skip to continue.": "கருத்துகளைச் சேர்க்கலாம் அல்லது தொடர தவிர்க்கலாம்.",
+    "Please type your remarks or special instructions:": "தயவுசெய்து உங்கள் கருத்துகள் அல்லது சிறப்பு வழிமுறைகளை உள்ளிடவும்:",
+    "Examples:": "எடுத்துக்காட்டுகள்:",
+    "• Patient requires ventilator during transfer": "• பரிமாற்றத்தின் போது நோயாளிக்கு வென்டிலேட்டர் தேவை",
+    "• Specific route preferred": "• குறிப்பிட்ட வழித்தடம் விருப்பமானது",
+    "• Need ambulance with ICU facilities": "• ICU வசதிகளுடன் ஆம்புலன்ஸ் தேவை",
+    "• Coordination with specific hospital staff": "• குறிப்பிட்ட மருத்துவமனை ஊழியர்களுடன் ஒருங்கிணைப்பு",
+    "Please select the transfer date:": "பரிமாற்ற தேதியைத் தேர்ந்தெடுக்கவும்:",
+    "*Today:*": "*இன்று:*",
+    "*Tomorrow:*": "*நாளை:*",
+    "If you need another date, select 'Others' and enter DD/MM/YYYY format.": "வேறு தேதி தேவைப்பட்டால், 'மற்றவை' தேர்ந்தெடுத்து DD/MM/YYYY வடிவத்தில் உள்ளிடவும்.",
+    "Please select AM or PM for the transfer time:": "பரிமாற்ற நேரத்திற்கு AM அல்லது PM தேர்ந்தெடுக்கவும்:",
+    "Please select a 2-hour time slot for the transfer:": "பரிமாற்றத்திற்கான 2-மணி நேர இடைவெளியைத் தேர்ந்தெடுக்கவும்:",
+    "Selected Date:": "தேர்ந்தெடுக்கப்பட்ட தேதி:",
+    "Period:": "காலம்:",
+    "After selecting a slot, you'll choose the exact 15-minute interval.": "இடைவெளியைத் தேர்ந்தெடுத்த பிறகு, சரியான 15-நிமிட இடைவெளியைத் தேர்ந்தெடுப்பீர்கள்.",
+    "Please select the exact time for the transfer:": "பரிமாற்றத்திற்கான சரியான நேரத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Selected Date:": "தேர்ந்தெடுக்கப்பட்ட தேதி:",
+    "Selected Slot:": "தேர்ந்தெடுக்கப்பட்ட இடைவெளி:",
+    "Choose your preferred 15-minute interval within this slot.": "இந்த இடைவெளியில் உங்களுக்கு விருப்பமான 15-நிமிட இடைவெளியைத் தேர்ந்தெடுக்கவும்.",
+    "Error starting transfer request. Please try again.": "பரிமாற்ற கோரிக்கையைத் தொடங்குவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Could not find address for this hospital. Please provide the address manually.": "இந்த மருத்துவமனைக்கான முகவரியைக் கண்டுபிடிக்க முடியவில்லை. முகவரியை கைமுறையாக வழங்கவும்.",
+    "Please enter the transfer date in DD/MM/YYYY format:": "DD/MM/YYYY வடிவத்தில் பரிமாற்ற தேதியை உள்ளிடவும்:",
+    "Example: 25/12/2024": "எடுத்துக்காட்டு: 25/12/2024",
+    "Error scheduling date. Please try again.": "தேதியை அட்டவணைப்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error selecting time interval. Please try again.": "நேர இடைவெளியைத் தேர்ந்தெடுப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Hospital transfer cancelled. Returning to main menu.": "மருத்துவமனை பரிமாற்றம் ரத்து செய்யப்பட்டது. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Please provide a valid answer.": "சரியான பதிலை வழங்கவும்.",
+    "❌ *Invalid IC number format*": "❌ *தவறான IC எண் வடிவம்*",
+    "IC must be 12 digits.": "IC 12 இலக்கங்களாக இருக்க வேண்டும்.",
+    "Accepted formats:": "ஏற்றுக்கொள்ளப்பட்ட வடிவங்கள்:",
+    "• 801212-14-5678": "• 801212-14-5678",
+    "• 801212145678": "• 801212145678",
+    "• 801212 14 5678": "• 801212 14 5678",
+    "Please re-enter the patient's IC number:": "நோயாளியின் IC எண்ணை மீண்டும் உள்ளிடவும்:",
+    "Error processing your answer. Please try again.": "உங்கள் பதிலைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Unsupported file type. Please send images (JPEG, PNG) or documents (PDF, DOC) only.": "ஆதரிக்கப்படாத கோப்பு வகை. புகைப்படங்கள் (JPEG, PNG) அல்லது ஆவணங்கள் (PDF, DOC) மட்டுமே அனுப்பவும்.",
+    "Error: Could not get file information. Please try again.": "பிழை: கோப்புத் தகவலைப் பெற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Failed to download file from WhatsApp. Please try sending the file again.": "WhatsApp இலிருந்து கோப்பைப் பதிவிறக்க முடியவில்லை. கோப்பை மீண்டும் அனுப்ப முயற்சிக்கவும்.",
+    "Failed to save attachment. Please try again or click 'Skip' to continue without attachments.": "இணைப்பைச் சேமிப்பதில் தோல்வி. மீண்டும் முயற்சிக்கவும் அல்லது இணைப்புகள் இல்லாமல் தொடர 'தவிர்க்கவும்' கிளிக் செய்யவும்.",
+    "Error processing attachment. Please try again.": "இணைப்பைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid selection. Please try again.": "தவறான தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "Date cannot be in the past. Please enter a future date in DD/MM/YYYY format.": "தேதி கடந்த காலத்தில் இருக்க முடியாது. DD/MM/YYYY வடிவத்தில் எதிர்கால தேதியை உள்ளிடவும்.",
+    "Invalid date format. Please enter date in DD/MM/YYYY format.": "தவறான தேதி வடிவம். DD/MM/YYYY வடிவத்தில் தேதியை உள்ளிடவும்.",
+    "Example: 25/12/2024": "எடுத்துக்காட்டு: 25/12/2024",
+    "Error submitting transfer request. Please try again.": "பரிமாற்ற கோரிக்கையைச் சமர்ப்பிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ *HOSPITAL TO HOSPITAL TRANSFER CONFIRMED*": "✅ *மருத்துவமனையிலிருந்து மருத்துவமனை பரிமாற்றம் உறுதிப்படுத்தப்பட்டது*",
+    "Your inter-hospital transfer request has been received. Our team will coordinate with both hospitals.": "உங்கள் மருத்துவமனை இடை பரிமாற்ற கோரிக்கை பெறப்பட்டது. எங்கள் குழு இரு மருத்துவமனைகளுடனும் ஒருங்கிணைக்கும்.",
+    "*Next Steps:*": "*அடுத்த கட்டங்கள்:*",
+    "1. Team will contact both hospitals": "1. குழு இரு மருத்துவமனைகளையும் தொடர்பு கொள்ளும்",
+    "2. You'll receive confirmation call": "2. உறுதிப்படுத்தல் அழைப்பு கிடைக்கும்",
+    "3. Transfer schedule will be arranged": "3. பரிமாற்ற அட்டவணை ஏற்பாடு செய்யப்படும்",
+    "Thank you for using AnyHealth Ambulance Service! 🚑": "AnyHealth ஆம்புலன்ஸ் சேவையைப் பயன்படுத்தியதற்கு நன்றி! 🚑",
+    "I couldn't understand the time format. Please try entering the time again, or let me help you choose from available slots.": "நேர வடிவத்தை புரிந்துகொள்ள முடியவில்லை. நேரத்தை மீண்டும் உள்ளிட முயற்சிக்கவும், அல்லது கிடைக்கும் இடைவெளிகளிலிருந்து தேர்ந்தெடுக்க உதவுகிறேன்.",
+    "Great! {formatted_display_time} is available. Is this the time you want?": "சிறப்பு! {formatted_display_time} கிடைக்கிறது. இது நீங்கள் விரும்பும் நேரமா?",
+    "Unfortunately {formatted_display_time} is not available. The closest available time is {formatted_closest} (just {minutes_diff} minutes difference). Would you like to book this instead?": "துரதிர்ஷ்டவசமாக {formatted_display_time} கிடைக்கவில்லை. அருகிலுள்ள கிடைக்கும் நேரம் {formatted_closest} ({minutes_diff} நிமிடங்கள் வித்தியாசம்). இதை மாற்றாக பதிவு செய்ய விரும்புகிறீர்களா?",
+    "Unfortunately {formatted_display_time} is not available. The closest available time is {formatted_closest}. Would you like to book this instead?": "துரதிர்ஷ்டவசமாக {formatted_display_time} கிடைக்கவில்லை. அருகிலுள்ள கிடைக்கும் நேரம் {formatted_closest}. இதை மாற்றாக பதிவு செய்ய விரும்புகிறீர்களா?",
+    "No available slots near {formatted_display_time}. Would you like to try a different time or let me help you choose from available slots?": "{formatted_display_time} அருகே கிடைக்கும் இடைவெளிகள் இல்லை. வேறு நேரத்தை முயற்சிக்க விரும்புகிறீர்களா அல்லது கிடைக்கும் இடைவெளிகளிலிருந்து தேர்ந்தெடுக்க உதவ வேண்டுமா?",
+    "Select a doctor for your appointment or choose 'Any Doctor':": "உங்கள் நியமனத்திற்கான மருத்துவரைத் தேர்ந்தெடுக்கவும் அல்லது 'எந்த மருத்துவரும்' தேர்வு செய்யவும்:",
+    "Select a date for your appointment:": "உங்கள் நியமனத்திற்கான தேதியைத் தேர்ந்தெடுக்கவும்:",
+    "Select {duration}min slot for {date} {hour}:": "{date} {hour} க்கான {duration} நிமிட இடைவெளியைத் தேர்ந்தெடுக்கவும்:",
+    "What would you like to edit?": "எதைத் திருத்த விரும்புகிறீர்கள்?",
+    "Is this the correct date: {formatted_date}?": "இது சரியான தேதியா: {formatted_date}?",
+    "Selected date {formatted_date_short} is not available. Here are the nearest available dates:": "தேர்ந்தெடுக்கப்பட்ட தேதி {formatted_date_short} கிடைக்கவில்லை. அருகிலுள்ள கிடைக்கும் தேதிகள் இங்கே:",
+    "Confirm your booking:\n• Service: {}\n• Doctor: {}\n• Date: {}\n• Time: {}\n• Duration: {} min\n• Details: {}\n• Reminder: {}": "உங்கள் முன்பதிவை உறுதிப்படுத்துக:\n• சேவை: {}\n• மருத்துவர்: {}\n• தேதி: {}\n• நேரம்: {}\n• காலம்: {} நிமிடங்கள்\n• விவரங்கள்: {}\n• நினைவூட்டல்: {}",
+    "Confirm your booking:\n• Service: {}\n• Doctor: {}\n• Date: {}\n• Time: {}\n• Duration: {} min\n• Details: {}": "உங்கள் முன்பதிவை உறுதிப்படுத்துக:\n• சேவை: {}\n• மருத்துவர்: {}\n• தேதி: {}\n• நேரம்: {}\n• காலம்: {} நிமிடங்கள்\n• விவரங்கள்: {}",
+    "Your checkup booking is pending approval by the admin.": "உங்கள் சரிபார்ப்பு முன்பதிவு நிர்வாகியின் ஒப்புதலுக்கு நிலுவையில் உள்ளது.",
+    "Your consultation booking is pending approval by the admin.": "உங்கள் கலந்தாய்வு முன்பதிவு நிர்வாகியின் ஒப்புதலுக்கு நிலுவையில் உள்ளது.",
+    "Your vaccination booking is pending approval by the admin.": "உங்கள் தடுப்பூசி முன்பதிவு நிர்வாகியின் ஒப்புதலுக்கு நிலுவையில் உள்ளது.",
+    "Your health screening booking is pending approval by the admin.": "உங்கள் சுகாதார பரிசோதனை முன்பதிவு நிர்வாகியின் ஒப்புதலுக்கு நிலுவையில் உள்ளது.",
+    "Error processing time. Please try again.": "நேரத்தைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No doctors available. Please contact support.": "மருத்துவர்கள் இல்லை. ஆதரவைத் தொடர்பு கொள்ளவும்.",
+    "Unable to fetch doctors. Please try again.": "மருத்துவர்களைப் பெற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "An error occurred while fetching doctors: {str(e)}. Please try again.": "மருத்துவர்களைப் பெறும் போது பிழை ஏற்பட்டது: {str(e)}. மீண்டும் முயற்சிக்கவும்.",
+    "Time slot not found. Please try again.": "நேர இடைவெளி கிடைக்கவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Error confirming time. Please try again.": "நேரத்தை உறுதிப்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error processing choice. Please try again.": "தேர்வைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No available dates in the next 14 days. Please {}.": "அடுத்த 14 நாட்களில் கிடைக்கும் தேதிகள் இல்லை. தயவுசெய்து {}.",
+    "Unable to fetch calendar. Please try again.": "நாட்காட்டியைப் பெற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "An error occurred while fetching the calendar: {str(e)}. Please try again.": "நாட்காட்டியைப் பெறும் போது பிழை ஏற்பட்டது: {str(e)}. மீண்டும் முயற்சிக்கவும்.",
+    "No available hours for this date. Please select another date.": "இந்த தேதிக்கு கிடைக்கும் மணி நேரங்கள் இல்லை. வேறு தேதியைத் தேர்ந்தெடுக்கவும்.",
+    "Unable to fetch hours. Please try again.": "மணி நேரங்களைப் பெற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "An error occurred while fetching hours: {str(e)}. Please try again.": "மணி நேரங்களைப் பெறும் போது பிழை ஏற்பட்டது: {str(e)}. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid period selection. Please try again.": "தவறான காலகட்டத் தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "No available hours in this period. Please select another date.": "இந்த காலகட்டத்தில் கிடைக்கும் மணி நேரங்கள் இல்லை. வேறு தேதியைத் தேர்ந்தெடுக்கவும்.",
+    "No available time slots.": "கிடைக்கும் நேர இடைவெளிகள் இல்லை.",
+    "Error loading slots.": "இடைவெளிகளை ஏற்றுவதில் பிழை.",
+    "No doctors available. Please try again later.": "மருத்துவர்கள் இல்லை. பின்னர் மீண்டும் முயற்சிக்கவும்.",
+    "No doctors available for this time slot. Please select another.": "இந்த நேர இடைவெளிக்கு மருத்துவர்கள் இல்லை. வேறு ஒன்றைத் தேர்ந்தெடுக்கவும்.",
+    "An error occurred while confirming the booking: {str(e)}. Please try again.": "முன்பதிவை உறுதிப்படுத்தும் போது பிழை ஏற்பட்டது: {str(e)}. மீண்டும் முயற்சிக்கவும்.",
+    "Error loading edit options. Please try again.": "திருத்த விருப்பங்களை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid edit option. Please try again.": "தவறான திருத்த விருப்பம். மீண்டும் முயற்சிக்கவும்.",
+    "Error processing edit choice. Please try again.": "திருத்த தேர்வைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Failed to save booking. Please try again.": "முன்பதிவைச் சேமிப்பதில் தோல்வி. மீண்டும் முயற்சிக்கவும்.",
+    "Failed to send confirmation. Booking cancelled. Please try again.": "உறுதிப்படுத்தல் அனுப்ப முடியவில்லை. முன்பதிவு ரத்து செய்யப்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "An error occurred while confirming the booking: {str(e)}. Please try again.": "முன்பதிவை உறுதிப்படுத்தும் போது பிழை ஏற்பட்டது: {str(e)}. மீண்டும் முயற்சிக்கவும்.",
+    "Booking has been cancelled.": "முன்பதிவு ரத்து செய்யப்பட்டது.",
+    "Invalid date format. Please enter date as DD/MM/YYYY, DD-MM-YYYY or DD MM YYYY:": "தவறான தேதி வடிவம். DD/MM/YYYY, DD-MM-YYYY அல்லது DD MM YYYY என தேதியை உள்ளிடவும்:",
+    "Please select a future date. Enter date as DD/MM/YYYY:": "எதிர்கால தேதியைத் தேர்ந்தெடுக்கவும். DD/MM/YYYY என தேதியை உள்ளிடவும்:",
+    "Error processing date. Please try again.": "தேதியைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Date not found. Please try again.": "தேதி கிடைக்கவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Error confirming date. Please try again.": "தேதியை உறுதிப்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No available dates found near {formatted_date_short}. Please enter a different date as DD/MM/YYYY:": "{formatted_date_short} அருகில் கிடைக்கும் தேதிகள் இல்லை. DD/MM/YYYY என வேறு தேதியை உள்ளிடவும்:",
+    "Monday": "திங்கள்",
+    "Tuesday": "செவ்வாய்",
+    "Wednesday": "புதன்",
+    "Thursday": "வியாழன்",
+    "Friday": "வெள்ளி",
+    "Saturday": "சனி",
+    "Sunday": "ஞாயிறு",
+    "Checkup": "சரிபார்ப்பு",
+    "Vaccination": "தடுப்பூசி",
+    "Consultation": "கலந்தாய்வு",
+    "Health Screening": "சுகாதார பரிசோதனை",
+    "Appointment": "நியமனம்",
+    "Do you have any remarks for {} ({} min){}?": "{} ({} நிமிடம்){} குறித்து கருத்து உள்ளதா?",
+    "Error: No service selected. Please start over.": "பிழை: சேவை தேர்ந்தெடுக்கப்படவில்லை. மீண்டும் தொடங்கவும்.",
+    "Please enter your remarks:": "தயவுசெய்து உங்கள் கருத்துகளை உள்ளிடவும்:",
+    "Please enter your preferred date as DD/MM/YYYY, DD-MM-YYYY or DD MM YYYY:": "தயவுசெய்து DD/MM/YYYY, DD-MM-YYYY அல்லது DD MM YYYY என உங்கள் விருப்ப தேதியை உள்ளிடவும்:",
+    "Please enter your preferred time (e.g., 9:30, 2pm, 1430):": "தயவுசெய்து உங்கள் விருப்ப நேரத்தை உள்ளிடவும் (எ.கா., 9:30, 2pm, 1430):",
+    "✅ Your checkup booking has been submitted!\n\nService: {}\nDate: {}\nTime: {}\nDuration: {} minutes\n\nBooking is pending approval. You'll be notified once confirmed.\nBooking ID: {}...": "✅ உங்கள் சரிபார்ப்பு முன்பதிவு சமர்ப்பிக்கப்பட்டது!\n\nசேவை: {}\nதேதி: {}\nநேரம்: {}\nகாலம்: {} நிமிடங்கள்\n\nமுன்பதிவு ஒப்புதலுக்கு நிலுவையில் உள்ளது. உறுதிப்படுத்தப்பட்டதும் அறிவிக்கப்படுவீர்கள்.\nமுன்பதிவு ஐடி: {}...",
+    "Error saving checkup booking. Please try again.": "சரிபார்ப்பு முன்பதிவைச் சேமிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid input. Please use the buttons provided.": "தவறான உள்ளீடு. வழங்கப்பட்ட பொத்தான்களைப் பயன்படுத்தவும்.",
+    "Please describe your symptoms or health concerns:": "உங்கள் அறிகுறிகள் அல்லது சுகாதார கவலைகளை விவரிக்கவும்:",
+    "What would you like to do next?": "அடுத்து என்ன செய்ய விரும்புகிறீர்கள்?",
+    "Select a profile to view or manage{}:": "காண அல்லது நிர்வகிக்க சுயவிவரத்தைத் தேர்ந்தெடுக்கவும்{}:",
+    "What would you like to view?": "என்ன காண விரும்புகிறீர்கள்?",
+    "Select a visit to view documents{}:": "ஆவணங்களைக் காண வருகையைத் தேர்ந்தெடுக்கவும்{}:",
+    "Select a document to download:": "பதிவிறக்க ஆவணத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Select race:": "இனத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Select religion:": "மதத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Select blood type:": "ரத்த வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Continue with profile removal?": "சுயவிவர நீக்கம் தொடர்வதா?",
+    "Select a profile to remove:": "அகற்ற சுயவிவரத்தைத் தேர்ந்தெடுக்கவும்:",
+    "Edit Profiles Menu:": "சுயவிவரங்கள் திருத்த மெனு:",
+    "Select booking type:": "முன்பதிவு வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Select a booking to manage or reschedule from {} category:": "{} வகையிலிருந்து நிர்வகிக்க அல்லது மீண்டும் அட்டவணைப்படுத்த முன்பதிவைத் தேர்ந்தெடுக்கவும்:",
+    "Selected: {}": "தேர்ந்தெடுக்கப்பட்டது: {}",
+    "Selected: {}\n\nDoctor has requested to reschedule this appointment.": "தேர்ந்தெடுக்கப்பட்டது: {}\n\nஇந்த நியமனத்தை மீண்டும் அட்டவணைப்படுத்த மருத்துவர் கோரியுள்ளார்.",
+    "Selected: {}\n\nAmbulance bookings cannot be modified via WhatsApp. Please contact the ambulance service directly for any changes.": "தேர்ந்தெடுக்கப்பட்டது: {}\n\nஆம்புலன்ஸ் முன்பதிவுகளை WhatsApp மூலம் மாற்ற முடியாது. எந்த மாற்றங்களுக்கும் நேரடியாக ஆம்புலன்ஸ் சேவையைத் தொடர்பு கொள்ளவும்.",
+    "Selected date: {}. Confirm?": "தேர்ந்தெடுக்கப்பட்ட தேதி: {}. உறுதிப்படுத்தவா?",
+    "Selected time: {}\n\nConfirm this time slot?": "தேர்ந்தெடுக்கப்பட்ட நேரம்: {}\n\nஇந்த நேர இடைவெளியை உறுதிப்படுத்தவா?",
+    "Confirm reschedule:{} \n\nOriginal Booking:\n• Type: {}\n• Date: {}\n• Time: {}\n\nNew Booking:\n• Doctor: {}\n• Date: {}\n• Time: {}\n• Duration: {} min": "மீள் அட்டவணையை உறுதிப்படுத்துக:{} \n\nஅசல் முன்பதிவு:\n• வகை: {}\n• தேதி: {}\n• நேரம்: {}\n\nபுதிய முன்பதிவு:\n• மருத்துவர்: {}\n• தேதி: {}\n• நேரம்: {}\n• காலம்: {} நிமிடங்கள்",
+    "MC, Invoice, Referral letter, Report": "மருத்துவ சான்றிதழ், விலைப்பட்டியல், பரிந்துரை கடிதம், அறிக்கை",
+    "Returning to main menu.": "முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Continuing with your previous action.": "முந்தைய செயலுடன் தொடர்கிறது.",
+    "Could not restore previous action. Returning to main menu.": "முந்தைய செயலை மீட்டமைக்க முடியவில்லை. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Error registering user. Please try again.": "பயனரை பதிவு செய்வதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Please use the menu buttons provided for selection.": "தேர்வுக்கு வழங்கப்பட்ட மெனு பொத்தான்களைப் பயன்படுத்தவும்.",
+    "An error occurred while setting up your booking. Please try again.": "உங்கள் முன்பதிவை அமைக்கும் போது பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "Clinic information not found. Please try again.": "மருத்துவமனை தகவல் கிடைக்கவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Error retrieving clinic information. Please try again.": "மருத்துவமனை தகவலை மீட்டெடுப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No clinic found with that keyword. Please try a different search.": "அந்த முக்கிய சொல்லுடன் மருத்துவமனை கிடைக்கவில்லை. வேறு தேடலை முயற்சிக்கவும்.",
+    "Error setting language. Please try again.": "மொழியை அமைக்கும் போது பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error storing temp_data:": "temp_data சேமிப்பதில் பிழை:",
+    "Invalid input. Returning to main menu.": "தவறான உள்ளீடு. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "An error occurred. Please try again.": "பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "Please select an option from the menu.": "மெனுவிலிருந்து ஒரு விருப்பத்தைத் தேர்ந்தெடுக்கவும்.",
+    "Language set to {selected_language}.": "மொழி {selected_language} என அமைக்கப்பட்டது.",
+    "Select a service type:": "சேவை வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Please select a clinic:": "மருத்துவமனையைத் தேர்ந்தெடுக்கவும்:",
+    "Please select a {category} service:": "{category} சேவையைத் தேர்ந்தெடுக்கவும்:",
+    "Please use the menu below to select an option:": "விருப்பத்தைத் தேர்ந்தெடுக்க கீழே உள்ள மெனுவைப் பயன்படுத்தவும்:",
+    "SELECT DOCTOR\n\nWhich doctor would you like to book with?": "மருத்துவரைத் தேர்ந்தெடுக்கவும்\n\nஎந்த மருத்துவருடன் முன்பதிவு செய்ய விரும்புகிறீர்கள்?",
+    "SELECT TIME\n\nChoose your preferred time slot:": "நேரத்தைத் தேர்ந்தெடுக்கவும்\n\nஉங்கள் விருப்ப நேர இடைவெளியைத் தேர்ந்தெடுக்கவும்:",
+    "Location received. However, location sharing is not expected in this context. Please use the menu buttons provided for selection.": "இடம் பெறப்பட்டது. இருப்பினும், இந்த சூழலில் இடப் பகிர்வு எதிர்பார்க்கப்படவில்லை. தேர்வுக்கு வழங்கப்பட்ட மெனு பொத்தான்களைப் பயன்படுத்தவும்.",
+    "Error processing location. Please try again.": "இடத்தைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "File received. However, file upload is not expected in this context. Please use the menu buttons provided for selection.": "கோப்பு பெறப்பட்டது. இருப்பினும், இந்த சூழலில் கோப்பு பதிவேற்றம் எதிர்பார்க்கப்படவில்லை. தேர்வுக்கு வழங்கப்பட்ட மெனு பொத்தான்களைப் பயன்படுத்தவும்.",
+    "Error processing file. Please try again.": "கோப்பைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error displaying the booking menu. Please try again.": "முன்பதிவு மெனுவைக் காண்பிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Unable to load services. Please try again.": "சேவைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Unable to load clinics. Please try again.": "மருத்துவமனைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid selection. Please try again.": "தவறான தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid input. Returning to main menu.": "தவறான உள்ளீடு. முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Invalid button selection. Please try again.": "தவறான பொத்தான் தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "{service_name}\n\n{service_description} are coming soon!\n\nWe're working to bring you the best {service_description}. Please check back later or contact our hotline for more information:\n📞 {hotline}": "{service_name}\n\n{service_description} விரைவில் வருகிறது!\n\nசிறந்த {service_description} கொண்டு வர நாங்கள் பணியாற்றுகிறோம். மேலும் தகவலுக்கு பின்னர் சரிபார்க்கவும் அல்லது எங்கள் ஹாட்லைனைத் தொடர்பு கொள்ளவும்:\n📞 {hotline}",
+    "Your checkup booking is confirmed on {date} at {time}.": "உங்கள் சரிபார்ப்பு முன்பதிவு {date} அன்று {time} மணிக்கு உறுதிப்படுத்தப்பட்டது.",
+    "Your consultation booking is confirmed on {date} at {time}.": "உங்கள் கலந்தாய்வு முன்பதிவு {date} அன்று {time} மணிக்கு உறுதிப்படுத்தப்பட்டது.",
+    "Your vaccination booking for {vaccine_type} is confirmed on {date} at {time}.": "உங்கள் {vaccine_type} தடுப்பூசி முன்பதிவு {date} அன்று {time} மணிக்கு உறுதிப்படுத்தப்பட்டது.",
+    "Your TCM {booking_type} booking is confirmed on {date} at {time}.": "உங்கள் TCM {booking_type} முன்பதிவு {date} அன்று {time} மணிக்கு உறுதிப்படுத்தப்பட்டது.",
+    "Reminder: Your {details} is in {time_desc}": "நினைவூட்டல்: உங்கள் {details} {time_desc} இல் உள்ளது",
+    " - {remark}": " - {remark}",
+    "Custom reminder: Your {details} is in {reminder_duration} hours": "தனிப்பயன் நினைவூட்டல்: உங்கள் {details} {reminder_duration} மணி நேரத்தில் உள்ளது",
+    "Reminder: Your TCM {booking_type} is in {time_desc}": "நினைவூட்டல்: உங்கள் TCM {booking_type} {time_desc} இல் உள்ளது",
+    "Custom reminder: Your TCM {booking_type} is in {reminder_duration} hours": "தனிப்பயன் நினைவூட்டல்: உங்கள் TCM {booking_type} {reminder_duration} மணி நேரத்தில் உள்ளது",
+    "Reminder: Your {service_type} for {patient_name} is scheduled tomorrow at {time}.": "நினைவூட்டல்: {patient_name} க்கான உங்கள் {service_type} நாளை {time} மணிக்கு அட்டவணை செய்யப்பட்டுள்ளது.",
+    "No new notifications found.": "புதிய அறிவிப்புகள் இல்லை.",
+    "Error: User not found.": "பிழை: பயனர் கிடைக்கவில்லை.",
+    "N/A": "ப/இ",
+    "Error displaying notifications. Please try again.": "அறிவிப்புகளைக் காண்பிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Thank you for acknowledging!": "அங்கீகரித்ததற்கு நன்றி!",
+    "{len(message_parts)} notification(s) displayed!": "{len(message_parts)} அறிவிப்பு(கள்) காட்டப்பட்டது!",
+    "Appointment": "நியமனம்",
+    "Vaccination": "தடுப்பூசி",
+    "TCM Appointment": "TCM நியமனம்",
+    "consultation": "கலந்தாய்வு",
+    "Patient": "நோயாளி",
+    "1 week": "1 வாரம்",
+    "1 day": "1 நாள்",
+    "{hours} hours": "{hours} மணி நேரம்",
+    "Home to Home Transfer": "வீட்டிலிருந்து வீட்டிற்கு பரிமாற்றம்",
+    "Home to Hospital Transfer": "வீட்டிலிருந்து மருத்துவமனை பரிமாற்றம்",
+    "Hospital to Home Discharge": "மருத்துவமனையிலிருந்து வீட்டிற்கு வெளியேறுதல்",
+    "Hospital to Hospital Transfer": "மருத்துவமனையிலிருந்து மருத்துவமனை பரிமாற்றம்",
+    "Please describe your symptoms:": "உங்கள் அறிகுறிகளை விவரிக்கவும்:",
+    "Do you have any additional remarks about your symptoms?": "உங்கள் அறிகுறிகள் குறித்து கூடுதல் கருத்துகள் உள்ளதா?",
+    "Please enter your additional remarks:": "உங்கள் கூடுதல் கருத்துகளை உள்ளிடவும்:",
+    "✅ Your GP consultation booking has been submitted!\n\nDoctor: {doctor}\nDate: {date}\nTime: {time}\nDuration: {duration} minutes\nSymptoms: {symptoms}...\n\nBooking is pending approval. You'll be notified once confirmed.\nBooking ID: {booking_id}...": "✅ உங்கள் GP கலந்தாய்வு முன்பதிவு சமர்ப்பிக்கப்பட்டது!\n\nமருத்துவர்: {doctor}\nதேதி: {date}\nநேரம்: {time}\nகாலம்: {duration} நிமிடங்கள்\nஅறிகுறிகள்: {symptoms}...\n\nமுன்பதிவு ஒப்புதலுக்கு நிலுவையில் உள்ளது. உறுதிப்படுத்தப்பட்டதும் அறிவிக்கப்படுவீர்கள்.\nமுன்பதிவு ஐடி: {booking_id}...",
+    "Error saving booking. Please try again or contact clinic for assistance.": "முன்பதிவைச் சேமிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும் அல்லது உதவிக்கு மருத்துவமனையைத் தொடர்பு கொள்ளவும்.",
+    "Clinic not selected. Please contact support.": "மருத்துவமனை தேர்ந்தெடுக்கப்படவில்லை. ஆதரவைத் தொடர்பு கொள்ளவும்.",
+    "Select AM or PM for {}:": "{} க்கு AM அல்லது PM தேர்ந்தெடுக்கவும்:",
+    "Select an hour range for {}:": "{} க்கான மணி நேர வரம்பைத் தேர்ந்தெடுக்கவும்:",
+    "Confirm your TCM booking:": "உங்கள் TCM முன்பதிவை உறுதிப்படுத்துக:",
+    "• Service: {}": "• சேவை: {}",
+    "• Method: {}": "• முறை: {}",
+    "• Doctor: {}": "• மருத்துவர்: {}",
+    "• Doctor: Assigned by Clinic": "• மருத்துவர்: மருத்துவமனையால் நியமிக்கப்பட்டது",
+    "• Date: {}": "• தேதி: {}",
+    "• Time: {}": "• நேரம்: {}",
+    "• Duration: {} min": "• காலம்: {} நிமிடங்கள்",
+    "• Details: {}": "• விவரங்கள்: {}",
+    "• Address: {}": "• முகவரி: {}",
+    "• Reminder: {}": "• நினைவூட்டல்: {}",
+    "Due to the appointment method allowing for doctor flexibility, the doctor will contact you by 10 AM on the selected date. Note: Your booking may be rescheduled, and you may need to go to 'upcoming bookings' to accept or decline the suggested time after notification has been sent to you.": "மருத்துவர் நெகிழ்வுத்தன்மையை அனுமதிக்கும் நியமன முறை காரணமாக, மருத்துவர் தேர்ந்தெடுக்கப்பட்ட தேதியில் காலை 10 மணிக்குள் உங்களைத் தொடர்பு கொள்வார். குறிப்பு: உங்கள் முன்பதிவு மீண்டும் அட்டவணைப்படுத்தப்படலாம், மற்றும் அறிவிப்பு அனுப்பப்பட்ட பிறகு பரிந்துரைக்கப்பட்ட நேரத்தை ஏற்க அல்லது நிராகரிக்க 'வரவிருக்கும் முன்பதிவுகள்' செல்ல வேண்டியிருக்கலாம்.",
+    "An error occurred while confirming the booking. Please try again.": "முன்பதிவை உறுதிப்படுத்தும் போது பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "The TCM booking is not placed": "TCM முன்பதிவு வைக்கப்படவில்லை",
+    "Doctor selection is not enabled for this clinic. Please contact the clinic directly for doctor changes.": "இந்த மருத்துவமனைக்கு மருத்துவர் தேர்வு இயக்கப்படவில்லை. மருத்துவர் மாற்றங்களுக்கு நேரடியாக மருத்துவமனையைத் தொடர்பு கொள்ளவும்.",
+    "Please share your current location or enter your address manually:": "உங்கள் தற்போதைய இடத்தைப் பகிரவும் அல்லது உங்கள் முகவரியை கைமுறையாக உள்ளிடவும்:",
+    "Unable to retrieve address from location. Please enter manually:": "இடத்திலிருந்து முகவரியைப் பெற முடியவில்லை. கைமுறையாக உள்ளிடவும்:",
+    "Is this address correct?\n{}": "இந்த முகவரி சரியானதா?\n{}",
+    "Please enter a valid address:": "சரியான முகவரியை உள்ளிடவும்:",
+    "Please edit the address and send it back:": "முகவரியைத் திருத்தி மீண்டும் அனுப்பவும்:",
+    "Do you have any remarks for {} ({} min)?": "{} ({} நிமிடம்) குறித்து கருத்து உள்ளதா?",
+    "Clinic not found. Please select another clinic.": "மருத்துவமனை கிடைக்கவில்லை. வேறு மருத்துவமனையைத் தேர்ந்தெடுக்கவும்.",
+    "Now please select a treatment category:": "இப்போது சிகிச்சை வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Unable to load clinic information. Please try again.": "மருத்துவமனை தகவலை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Unable to load TCM services. Please try again.": "TCM சேவைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "No {} clinics available at the moment. Please select another service type.": "இப்போது {} மருத்துவமனைகள் இல்லை. வேறு சேவை வகையைத் தேர்ந்தெடுக்கவும்.",
+    "Unable to load TCM clinics. Please try again.": "TCM மருத்துவமனைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "No categories available for this clinic. Please select another clinic.": "இந்த மருத்துவமனைக்கு வகைகள் இல்லை. வேறு மருத்துவமனையைத் தேர்ந்தெடுக்கவும்.",
+    "Unable to load categories. Please try again.": "வகைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Error: Clinic or category not selected. Please start over.": "பிழை: மருத்துவமனை அல்லது வகை தேர்ந்தெடுக்கப்படவில்லை. மீண்டும் தொடங்கவும்.",
+    "No services available in this category. Please select another category.": "இந்த வகையில் சேவைகள் இல்லை. வேறு வகையைத் தேர்ந்தெடுக்கவும்.",
+    "Unable to load services. Please try again.": "சேவைகளை ஏற்ற முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Please select the type of TCM service you need:": "தேவையான TCM சேவை வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Please select a {} clinic:": "{} மருத்துவமனையைத் தேர்ந்தெடுக்கவும்:",
+    "Please select a treatment category:": "சிகிச்சை வகையைத் தேர்ந்தெடுக்கவும்:",
+    "Please select a treatment service:": "சிகிச்சை சேவையைத் தேர்ந்தெடுக்கவும்:",
+    "Patient information not found. Please select a patient first.": "நோயாளி தகவல் கிடைக்கவில்லை. முதலில் நோயாளியைத் தேர்ந்தெடுக்கவும்.",
+    "No details available": "விவரங்கள் இல்லை",
+    "Quantity:": "அளவு:",
+    "Dosage:": "மருந்தளவு:",
+    "Method:": "முறை:",
+    "Take:": "எடுத்துக் கொள்ளவும்:",
+    "before meal": "உணவுக்கு முன்",
+    "after meal": "உணவுக்குப் பின்",
+    "with meal": "உணவுடன்",
+    "on empty stomach": "வெறும் வயிற்றில்",
+    "Purpose:": "நோக்கம்:",
+    "Note:": "குறிப்பு:",
+    "Duration:": "காலம்:",
+    "Frequency:": "அதிர்வெண்:",
+    "No medications or items found for any visit.": "எந்த வருகைக்கும் மருந்துகள் அல்லது பொருட்கள் கிடைக்கவில்லை.",
+    "💊 **Medications:**": "💊 **மருந்துகள்:**",
+    "🩺 **Equipment:**": "🩺 **உபகரணங்கள்:**",
+    "🛒 **Products:**": "🛒 **தயாரிப்புகள்:**",
+    "📞 **Contact your clinic if you have any questions.**": "📞 **ஏதேனும் கேள்விகள் இருந்தால் உங்கள் மருத்துவமனையைத் தொடர்பு கொள்ளவும்.**",
+    "Error loading all medications. Please try again.": "அனைத்து மருந்துகளையும் ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error loading profiles. Please try again.": "சுயவிவரங்களை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Patient not found.": "நோயாளி கிடைக்கவில்லை.",
+    "Account locked. Please contact contact@anyhealth.asia to unlock.": "கணக்கு பூட்டப்பட்டுள்ளது. பூட்டை திறக்க contact@anyhealth.asia ஐத் தொடர்பு கொள்ளவும்.",
+    "Error in verification. Please try again.": "சரிபார்ப்பில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Verification failed. Please try again.": "சரிபார்ப்பு தோல்வியடைந்தது. மீண்டும் முயற்சிக்கவும்.",
+    "No visits found for {}.": "{} க்கு வருகைகள் இல்லை.",
+    "Error loading disease information. Please try again.": "நோய் தகவலை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No disease diagnoses found for this patient.": "இந்த நோயாளிக்கு நோய் நாடல்கள் இல்லை.",
+    "Diagnosis:": "நோய் நாடல்:",
+    "Suspected Disease:": "சந்தேக நோய்:",
+    "📞 Contact your clinic for more information.": "📞 மேலும் தகவலுக்கு உங்கள் மருத்துவமனையைத் தொடர்பு கொள்ளவும்.",
+    "Medication & Routine module is currently unavailable. Please try again later.": "மருந்து & வழக்கமான தொகுதி தற்போது கிடைக்கவில்லை. பின்னர் மீண்டும் முயற்சிக்கவும்.",
+    "Error loading medication details. Please try again.": "மருந்து விவரங்களை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No visiting history found for {}.": "{} க்கு வருகை வரலாறு இல்லை.",
+    "Error loading visiting history. Please try again.": "வருகை வரலாற்றை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error displaying visits. Please try again.": "வருகைகளைக் காண்பிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "No documents available for this visit.": "இந்த வருகைக்கு ஆவணங்கள் இல்லை.",
+    "Error loading documents. Please try again.": "ஆவணங்களை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Medical Certificate": "மருத்துவ சான்றிதழ்",
+    "Invoice": "விலைப்பட்டியல்",
+    "Referral Letter": "பரிந்துரை கடிதம்",
+    "Consultation Report": "கலந்தாய்வு அறிக்கை",
+    "Document not available. Please select another document.": "ஆவணம் கிடைக்கவில்லை. வேறு ஆவணத்தைத் தேர்ந்தெடுக்கவும்.",
+    "Error sending document. Please try again.": "ஆவணத்தை அனுப்புவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "IC must be 12 digits": "IC 12 இலக்கங்களாக இருக்க வேண்டும்",
+    "Please enter the IC number (12 digits):\nFormat: XXXXXX-XX-XXXX or XXXXXX XX XXXX or XXXXXXXXXXXX\n\nNote: Only Malaysian IC accepted, no passport.": "IC எண்ணை உள்ளிடவும் (12 இலக்கங்கள்):\nவடிவம்: XXXXXX-XX-XXXX அல்லது XXXXXX XX XXXX அல்லது XXXXXXXXXXXX\n\nகுறிப்பு: மலேசிய IC மட்டுமே ஏற்றுக்கொள்ளப்படுகிறது, பாஸ்போர்ட் இல்லை.",
+    "Invalid IC: {}. Please enter a valid 12-digit Malaysian IC:": "தவறான IC: {}. சரியான 12-இலக்க மலேசிய IC ஐ உள்ளிடவும்:",
+    "❌ This IC has reached maximum detachment attempts.\nPlease email contact@anyhealth.asia or visit partner clinics.": "❌ இந்த IC அதிகபட்ச பிரிப்பு முயற்சிகளை எட்டிவிட்டது.\ncontact@anyhealth.asia க்கு மின்னஞ்சல் அனுப்பவும் அல்லது பங்காளர் மருத்துவமனைகளைச் சந்திக்கவும்.",
+    "✅ This IC is already registered to your account.": "✅ இந்த IC ஏற்கனவே உங்கள் கணக்கில் பதிவு செய்யப்பட்டுள்ளது.",
+    "Please enter the full name:": "முழுப் பெயரை உள்ளிடவும்:",
+    "Invalid name. Please enter a valid name (minimum 2 characters):": "தவறான பெயர். சரியான பெயரை உள்ளிடவும் (குறைந்தது 2 எழுத்துகள்):",
+    "Please specify the race:": "இனத்தைக் குறிப்பிடவும்:",
+    "Please specify the religion:": "மதத்தைக் குறிப்பிடவும்:",
+    "Error: WhatsApp user not found. Please try again.": "பிழை: WhatsApp பயனர் கிடைக்கவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "Error creating profile: {}": "சுயவிவரத்தை உருவாக்குவதில் பிழை: {}",
+    "No profiles found to remove.": "அகற்ற சுயவிவரங்கள் இல்லை.",
+    "Error loading profiles for removal. Please try again.": "அகற்றுவதற்கான சுயவிவரங்களை ஏற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "⚠️ WARNING: Removing a profile will erase all previous data.\nTo undo this action, you will need to visit our nearest partner clinics.\n\nAre you sure you want to continue?": "⚠️ எச்சரிக்கை: சுயவிவரத்தை அகற்றுவது அனைத்து முந்தைய தரவுகளையும் அழிக்கும்.\nஇந்த செயலை தவிர்க்க, எங்கள் அருகிலுள்ள பங்காளர் மருத்துவமனைகளைச் சந்திக்க வேண்டும்.\n\nதொடர விரும்புகிறீர்களா?",
+    "Profile removal cancelled.": "சுயவிவர நீக்கம் ரத்து செய்யப்பட்டது.",
+    "Profile removed successfully.": "சுயவிவரம் வெற்றிகரமாக அகற்றப்பட்டது.",
+    "Error removing profile. Please try again.": "சுயவிவரத்தை அகற்றுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "⚠️ *CHANGED NUMBERS*": "⚠️ *மாற்றப்பட்ட எண்கள்*",
+    "Error starting process. Please try again.": "செயல்முறையைத் தொடங்குவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "⚠️ For security, please retype your full phone number starting with 60... (e.g., 601223456789):": "⚠️ பாதுகாப்பிற்காக, 60... உடன் தொடங்கும் உங்கள் முழு தொலைபேசி எண்ணை மீண்டும் தட்டச்சு செய்யவும் (எ.கா., 601223456789):",
+    "Too many failed attempts. Reset process cancelled.": "அதிக முயற்சிகள் தோல்வியடைந்தன. மீட்டமைப்பு செயல்முறை ரத்து செய்யப்பட்டது.",
+    "User not found.": "பயனர் கிடைக்கவில்லை.",
+    "Phone number does not match. {} attempt(s) left.\nPlease retype your full phone number starting with 60...:": "தொலைபேசி எண் பொருந்தவில்லை. {} முயற்சி(கள்) மீதம் உள்ளது.\n60... உடன் தொடங்கும் உங்கள் முழு தொலைபேசி எண்ணை மீண்டும் தட்டச்சு செய்யவும்:",
+    "Phone verification failed. Reset process cancelled.": "தொலைபேசி சரிபார்ப்பு தோல்வியடைந்தது. மீட்டமைப்பு செயல்முறை ரத்து செய்யப்பட்டது.",
+    "Error verifying phone number. Please try again.": "தொலைபேசி எண்ணைச் சரிபார்ப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ All profiles have been reset successfully!\n\nYour WhatsApp account has been refreshed with no profiles.": "✅ அனைத்து சுயவிவரங்களும் வெற்றிகரமாக மீட்டமைக்கப்பட்டன!\n\nஉங்கள் WhatsApp கணக்கு எந்த சுயவிவரங்களும் இல்லாமல் புதுப்பிக்கப்பட்டது.",
+    "Error during reset process. Please try again.": "மீட்டமைப்பு செயல்முறையில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error starting verification. Please try again.": "சரிபார்ப்பைத் தொடங்குவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Step 1/4: Enter the full name:": "படி 1/4: முழுப் பெயரை உள்ளிடவும்:",
+    "Error verifying name. Please try again.": "பெயரைச் சரிபார்ப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Step 2/4: Enter the race (e.g., Malay, Chinese, Indian, etc.):": "படி 2/4: இனத்தை உள்ளிடவும் (எ.கா., மலாய், சீன, இந்தியன், முதலியன):",
+    "Error verifying race. Please try again.": "இனத்தைச் சரிபார்ப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Step 3/4: Enter the religion:": "படி 3/4: மதத்தை உள்ளிடவும்:",
+    "Error verifying religion. Please try again.": "மதத்தைச் சரிபார்ப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Step 4/4: Enter the blood type (e.g., A+, B-, O+):": "படி 4/4: ரத்த வகையை உள்ளிடவும் (எ.கா., A+, B-, O+):",
+    "✅ Profile detached successfully!\n\nThe profile is now available for reattachment.\nTo add it to your account, please email contact@anyhealth.asia or visit partner clinics.": "✅ சுயவிவரம் வெற்றிகரமாக பிரிக்கப்பட்டது!\n\nசுயவிவரம் இப்போது மீண்டும் இணைப்பதற்கு கிடைக்கிறது.\nஅதை உங்கள் கணக்கில் சேர்க்க, contact@anyhealth.asia க்கு மின்னஞ்சல் அனுப்பவும் அல்லது பங்காளர் மருத்துவமனைகளைச் சந்திக்கவும்.",
+    "❌ Verification failed 3 times.\nProfile is now locked.\nPlease email contact@anyhealth.asia or visit partner clinics.": "❌ சரிபார்ப்பு 3 முறை தோல்வியடைந்தது.\nசுயவிவரம் இப்போது பூட்டப்பட்டுள்ளது.\ncontact@anyhealth.asia க்கு மின்னஞ்சல் அனுப்பவும் அல்லது பங்காளர் மருத்துவமனைகளைச் சந்திக்கவும்.",
+    "❌ Verification failed.\nYou have {} attempt(s) left.\nPlease try again or visit partner clinics.": "❌ சரிபார்ப்பு தோல்வியடைந்தது.\nஉங்களுக்கு {} முயற்சி(கள்) மீதம் உள்ளது.\nமீண்டும் முயற்சிக்கவும் அல்லது பங்காளர் மருத்துவமனைகளைச் சந்திக்கவும்.",
+    "Error completing verification. Please try again.": "சரிபார்ப்பை முடிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ IC not found in our system.": "❌ எங்கள் கணினியில் IC கிடைக்கவில்லை.",
+    "✅ This IC is not attached to any WhatsApp account.\nYou can add it directly.": "✅ இந்த IC எந்த WhatsApp கணக்குடனும் இணைக்கப்படவில்லை.\nநீங்கள் அதை நேரடியாக சேர்க்கலாம்.",
+    "✅ This IC is already attached to your current account.\nNo need to detach.": "✅ இந்த IC ஏற்கனவே உங்கள் தற்போதைய கணக்குடன் இணைக்கப்பட்டுள்ளது.\nபிரிக்க தேவையில்லை.",
+    "❌ This IC has reached maximum detachment attempts (3).\nPlease email contact@anyhealth.asia or visit partner clinics.": "❌ இந்த IC அதிகபட்ச பிரிப்பு முயற்சிகளை (3) எட்டிவிட்டது.\ncontact@anyhealth.asia க்கு மின்னஞ்சல் அனுப்பவும் அல்லது பங்காளர் மருத்துவமனைகளைச் சந்திக்கவும்.",
+    "Detachment cancelled.": "பிரிப்பு ரத்து செய்யப்பட்டது.",
+    "⚠️ *RESET ACCOUNT WARNING*": "⚠️ *கணக்கு மீட்டமைப்பு எச்சரிக்கை*",
+    "⚠️ *DETACH FROM OLD NUMBER*": "⚠️ *பழைய எண்ணிலிருந்து பிரிக்கவும்*",
+    "Please enter the 12-digit IC of the profile to detach:": "பிரிக்க வேண்டிய சுயவிவரத்தின் 12-இலக்க IC ஐ உள்ளிடவும்:",
+    "An error occurred in edit module. Please try again.": "திருத்த தொகுதியில் பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "User not found. Please ensure your number is registered.": "பயனர் கிடைக்கவில்லை. உங்கள் எண் பதிவு செய்யப்பட்டுள்ளதா என்பதை உறுதிப்படுத்தவும்.",
+    "Error fetching user information. Please try again.": "பயனர் தகவலைப் பெறுவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Unknown": "அறியப்படாத",
+    "Unknown Clinic": "அறியப்படாத மருத்துவமனை",
+    "Unknown TCM Doctor": "அறியப்படாத TCM மருத்துவர்",
+    "Unknown TCM Clinic": "அறியப்படாத TCM மருத்துவமனை",
+    "Unknown Provider": "அறியப்படாத வழங்குநர்",
+    "You have no upcoming bookings.": "உங்களுக்கு வரவிருக்கும் முன்பதிவுகள் இல்லை.",
+    "No bookings found in any category.": "எந்த வகையிலும் முன்பதிவுகள் இல்லை.",
+    "Invalid booking selection. Please try again.": "தவறான முன்பதிவு தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "⚠️ REPEATED VISIT CANCELLATION\n\nThis is part of a repeated visit series. Do you want to cancel just this booking or all future repeated bookings?": "⚠️ மீண்டும் மீண்டும் வருகை ரத்து\n\nஇது மீண்டும் மீண்டும் வருகை தொடரின் ஒரு பகுதியாகும். இந்த முன்பதிவை மட்டும் ரத்து செய்ய விரும்புகிறீர்களா அல்லது அனைத்து எதிர்கால மீண்டும் மீண்டும் முன்பதிவுகளையும் ரத்து செய்ய விரும்புகிறீர்களா?",
+    "❌ CANCELLATION FAILED\n\nBooking not found. It may have already been cancelled.": "❌ ரத்து தோல்வியடைந்தது\n\nமுன்பதிவு கிடைக்கவில்லை. அது ஏற்கனவே ரத்து செய்யப்பட்டிருக்கலாம்.",
+    "✅ BOOKING CANCELLED\n\nYour booking has been successfully cancelled.": "✅ முன்பதிவு ரத்து செய்யப்பட்டது\n\nஉங்கள் முன்பதிவு வெற்றிகரமாக ரத்து செய்யப்பட்டது.",
+    "❌ ERROR\n\nError cancelling booking. Please try again.": "❌ பிழை\n\nமுன்பதிவை ரத்து செய்வதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ ERROR\n\nReschedule request not found or has invalid data. Please try again.": "❌ பிழை\n\nமீள் அட்டவணை கோரிக்கை கிடைக்கவில்லை அல்லது தவறான தரவு உள்ளது. மீண்டும் முயற்சிக்கவும்.",
+    "Invalid booking type for reschedule request.": "மீள் அட்டவணை கோரிக்கைக்கு தவறான முன்பதிவு வகை.",
+    "✅ ACCEPTED RESCHEDULE\n\nYou have accepted the reschedule. Your {} is now confirmed on {} at {}.": "✅ ஏற்றுக்கொள்ளப்பட்ட மீள் அட்டவணை\n\nநீங்கள் மீள் அட்டவணையை ஏற்றுக்கொண்டீர்கள். உங்கள் {} இப்போது {} அன்று {} மணிக்கு உறுதிப்படுத்தப்பட்டது.",
+    "✅ DECLINED RESCHEDULE\n\nYou have declined the reschedule request.": "✅ நிராகரிக்கப்பட்ட மீள் அட்டவணை\n\nநீங்கள் மீள் அட்டவணை கோரிக்கையை நிராகரித்தீர்கள்.",
+    "❌ ERROR\n\nError declining reschedule. Please try again.": "❌ பிழை\n\nமீள் அட்டவணையை நிராகரிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ TCM RESCHEDULE ACCEPTED\n\nYou have accepted the reschedule. Your TCM {} is now confirmed on {} at {} with Dr. {}.": "✅ TCM மீள் அட்டவணை ஏற்றுக்கொள்ளப்பட்டது\n\nநீங்கள் மீள் அட்டவணையை ஏற்றுக்கொண்டீர்கள். உங்கள் TCM {} இப்போது {} அன்று {} மணிக்கு டாக்டர். {} உடன் உறுதிப்படுத்தப்பட்டது.",
+    "❌ ERROR\n\nError accepting TCM reschedule. Please try again.": "❌ பிழை\n\nTCM மீள் அட்டவணையை ஏற்கும் போது பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "TCM Doctor": "TCM மருத்துவர்",
+    "✅ TCM RESCHEDULE DECLINED\n\nYou have declined the reschedule request. Your TCM {} remains confirmed on {} at {} with Dr. {}.": "✅ TCM மீள் அட்டவணை நிராகரிக்கப்பட்டது\n\nநீங்கள் மீள் அட்டவணை கோரிக்கையை நிராகரித்தீர்கள். உங்கள் TCM {} {} அன்று {} மணிக்கு டாக்டர். {} உடன் உறுதிப்படுத்தப்பட்டதாக உள்ளது.",
+    "✅ TCM RESCHEDULE DECLINED\n\nYou have declined the reschedule request.": "✅ TCM மீள் அட்டவணை நிராகரிக்கப்பட்டது\n\nநீங்கள் மீள் அட்டவணை கோரிக்கையை நிராகரித்தீர்கள்.",
+    "❌ ERROR\n\nError declining TCM reschedule. Please try again.": "❌ பிழை\n\nTCM மீள் அட்டவணையை நிராகரிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ ERROR\n\nError processing cancellation. Please try again.": "❌ பிழை\n\nரத்து செயலாக்கத்தில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ ALL REPEATED BOOKINGS CANCELLED\n\nAll repeated bookings in this series have been cancelled.": "✅ அனைத்து மீண்டும் மீண்டும் முன்பதிவுகள் ரத்து செய்யப்பட்டன\n\nஇந்த தொடரில் உள்ள அனைத்து மீண்டும் மீண்டும் முன்பதிவுகளும் ரத்து செய்யப்பட்டன.",
+    "❌ ERROR\n\nError cancelling repeated bookings. Please try again.": "❌ பிழை\n\nமீண்டும் மீண்டும் முன்பதிவுகளை ரத்து செய்வதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "This is part of a repeated visit series. Only this specific appointment will be rescheduled. Continue?": "இது மீண்டும் மீண்டும் வருகை தொடரின் ஒரு பகுதியாகும். இந்த குறிப்பிட்ட நியமனம் மட்டுமே மீண்டும் அட்டவணைப்படுத்தப்படும். தொடரவா?",
+    "Error processing reschedule confirmation. Please try again.": "மீள் அட்டவணை உறுதிப்படுத்தலைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ RESCHEDULE CANCELLED\n\nYour booking remains unchanged.": "❌ மீள் அட்டவணை ரத்து செய்யப்பட்டது\n\nஉங்கள் முன்பதிவு மாறாமல் உள்ளது.",
+    "Error confirming reschedule. Please try again.": "மீள் அட்டவணையை உறுதிப்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ RESCHEDULE FAILED\n\nAn error occurred while processing your reschedule request. Please try again or contact support.": "❌ மீள் அட்டவணை தோல்வியடைந்தது\n\nஉங்கள் மீள் அட்டவணை கோரிக்கையைச் செயல்படுத்தும் போது பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும் அல்லது ஆதரவைத் தொடர்பு கொள்ளவும்.",
+    "❌ ERROR\n\nAn unexpected error occurred. Please try again.": "❌ பிழை\n\nஎதிர்பாராத பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "❌ SESSION EXPIRED\n\nPlease start the reschedule process again.": "❌ அமர்வு காலாவதியானது\n\nமீள் அட்டவணை செயல்முறையை மீண்டும் தொடங்கவும்.",
+    "Error fetching default doctor for clinic {}": "மருத்துவமனை {} க்கான இயல்புநிலை மருத்துவரைப் பெறுவதில் பிழை",
+    "❌ UNABLE TO COMPLETE\n\nUnable to complete reschedule. No doctor information available. Please contact support.": "❌ முடிக்க முடியவில்லை\n\nமீள் அட்டவணையை முடிக்க முடியவில்லை. மருத்துவர் தகவல் இல்லை. ஆதரவைத் தொடர்பு கொள்ளவும்.",
+    "✅ RESCHEDULE SUCCESSFUL!{}\n\n{} rescheduled to {} at {} with Dr. {}.\n\nStatus: PENDING CONFIRMATION": "✅ மீள் அட்டவணை வெற்றிகரமானது!{}\n\n{} {} அன்று {} மணிக்கு டாக்டர். {} உடன் மீண்டும் அட்டவணைப்படுத்தப்பட்டது.\n\nநிலை: உறுதிப்படுத்தலுக்கு நிலுவையில்",
+    "❌ DATABASE ERROR\n\nError saving reschedule. Please try again.": "❌ தரவுத்தள பிழை\n\nமீள் அட்டவணையைச் சேமிப்பதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error fetching TCM doctor name: {}": "TCM மருத்துவர் பெயரைப் பெறுவதில் பிழை: {}",
+    "✅ TCM RESCHEDULE SUCCESSFUL!{}\n\nTCM {} rescheduled to {} at {} with Dr. {}.\n\nStatus: PENDING CONFIRMATION": "✅ TCM மீள் அட்டவணை வெற்றிகரமானது!{}\n\nTCM {} {} அன்று {} மணிக்கு டாக்டர். {} உடன் மீண்டும் அட்டவணைப்படுத்தப்பட்டது.\n\nநிலை: உறுதிப்படுத்தலுக்கு நிலுவையில்",
+    "Error fetching updated TCM booking: {}": "புதுப்பிக்கப்பட்ட TCM முன்பதிவைப் பெறுவதில் பிழை: {}",
+    "✅ TCM RESCHEDULE SUCCESSFUL!\n\nYour TCM appointment has been rescheduled.\n\nStatus: PENDING CONFIRMATION": "✅ TCM மீள் அட்டவணை வெற்றிகரமானது!\n\nஉங்கள் TCM நியமனம் மீண்டும் அட்டவணைப்படுத்தப்பட்டது.\n\nநிலை: உறுதிப்படுத்தலுக்கு நிலுவையில்",
+    "❌ TCM RESCHEDULE FAILED\n\nError rescheduling TCM appointment. Please try again.": "❌ TCM மீள் அட்டவணை தோல்வியடைந்தது\n\nTCM நியமனத்தை மீண்டும் அட்டவணைப்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "❌ RESCHEDULE CANCELLED\n\nYour TCM booking reschedule has been cancelled.": "❌ மீள் அட்டவணை ரத்து செய்யப்பட்டது\n\nஉங்கள் TCM முன்பதிவு மீள் அட்டவணை ரத்து செய்யப்பட்டது.",
+    "❌ ERROR\n\nError cancelling TCM reschedule. Please try again.": "❌ பிழை\n\nTCM மீள் அட்டவணையை ரத்து செய்வதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Returning to main menu.": "முதன்மை மெனுவுக்குத் திரும்புகிறது.",
+    "Ambulance bookings cannot be rescheduled or cancelled via WhatsApp. Please contact the ambulance service directly for any changes.": "ஆம்புலன்ஸ் முன்பதிவுகளை WhatsApp மூலம் மீண்டும் அட்டவணைப்படுத்தவோ ரத்து செய்யவோ முடியாது. எந்த மாற்றங்களுக்கும் நேரடியாக ஆம்புலன்ஸ் சேவையைத் தொடர்பு கொள்ளவும்.",
+    "Invalid selection. Please try again.": "தவறான தேர்வு. மீண்டும் முயற்சிக்கவும்.",
+    "Error processing booking type selection. Please try again.": "முன்பதிவு வகை தேர்வைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "An unexpected error occurred while fetching upcoming bookings. Please try again.": "வரவிருக்கும் முன்பதிவுகளைப் பெறும் போது எதிர்பாராத பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "❌ SYSTEM ERROR\n\nAn error occurred in the booking system. Please try again.": "❌ கணினி பிழை\n\nமுன்பதிவு கணினியில் பிழை ஏற்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "No bookings found in the {} category.": "{} வகையில் முன்பதிவுகள் இல்லை.",
+    "Error processing booking selection. Please try again.": "முன்பதிவு தேர்வைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Error processing action. Please try again.": "செயலைச் செயல்படுத்துவதில் பிழை. மீண்டும் முயற்சிக்கவும்.",
+    "Doctor": "மருத்துவர்",
+    "Any Doctor": "எந்த மருத்துவரும்",
+    "Would you like to book an appointment at this clinic?": "இந்த மருத்துவமனையில் நியமனம் பதிவு செய்ய விரும்புகிறீர்களா?",
+
+    # BUTTON
+    "Menu": "மெனு",
+    "Booking Options": "முன்பதிவு விருப்பங்கள்",
+    "✅ Yes": "✅ ஆம்",
+    "❌ No": "❌ இல்லை",
+    "Select Service": "சேவையைத் தேர்ந்தெடுக்கவும்",
+    "Noted": "கவனிக்கப்பட்டது",
+    "Select Language": "மொழியைத் தேர்ந்தெடுக்கவும்",
+    "✅ Yes, Book": "✅ ஆம், பதிவு செய்க",
+    "❌ No, Just Browsing": "❌ இல்லை, உலாவுகிறேன்",
+    "Back": "பின் செல்",
+    "More Doctors": "மேலும் மருத்துவர்கள்",
+    "Select Option": "விருப்பத்தைத் தேர்ந்தெடுக்கவும்",
+    "Yes": "ஆம்",
+    "No": "இல்லை",
+    "📍 Share Location": "📍 இடத்தைப் பகிரவும்",
+    "📝 Type Address": "📝 முகவரியை உள்ளிடவும்",
+    "✅ Yes, Correct": "✅ ஆம், சரி",
+    "✏️ Edit Address": "✏️ முகவரியைத் திருத்தவும்",
+    "Next": "அடுத்து",
+    "Skip": "தவிர்க்கவும்",
+    "Add Remarks": "கருத்துகளைச் சேர்க்கவும்",
+    "Today": "இன்று",
+    "Tomorrow": "நாளை",
+    "Others": "மற்றவை",
+    "AM (12am - 11:45am)": "காலை (12am - 11:45am)",
+    "PM (12pm - 11:45pm)": "மாலை (12pm - 11:45pm)",
+    "Select Time Slot": "நேர இடைவெளியைத் தேர்ந்தெடுக்கவும்",
+    "Select Time": "நேரத்தைத் தேர்ந்தெடுக்கவும்",
+    "❌ No, Different": "❌ இல்லை, வேறு",
+    "Choose Doctor": "மருத்துவரைத் தேர்ந்தெடுக்கவும்",
+    "Any Doctor": "எந்த மருத்துவரும்",
+    "Choose Date": "தேதியைத் தேர்ந்தெடுக்கவும்",
+    "📅 Future Date": "📅 எதிர்கால தேதி",
+    "AM": "காலை",
+    "PM": "மாலை",
+    "Choose Hour": "மணி நேரத்தைத் தேர்ந்தெடுக்கவும்",
+    "Choose Slot": "இடைவெளியைத் தேர்ந்தெடுக்கவும்",
+    "Confirm": "உறுதிப்படுத்துக",
+    "Edit": "திருத்து",
+    "Cancel": "ரத்து செய்க",
+    "Edit Option": "திருத்த விருப்பம்",
+    "Change Time": "நேரத்தை மாற்றவும்",
+    "Change Date": "தேதியை மாற்றவும்",
+    "Change Doctor": "மருத்துவரை மாற்றவும்",
+    "Change Service": "சேவையை மாற்றவும்",
+    "Try Again": "மீண்டும் முயற்சிக்கவும்",
+    "Help Me Choose": "தேர்வு செய்ய உதவுக",
+    "Find Another": "வேறொன்றைக் கண்டறியவும்",
+    "Try Another Time": "வேறு நேரத்தை முயற்சிக்கவும்",
+    "Choose Method": "முறையைத் தேர்ந்தெடுக்கவும்",
+    "🔙 Back to Type Selection": "🔙 வகை தேர்வுக்குத் திரும்புக",
+    "🔙 Back to Clinics": "🔙 மருத்துவமனைகளுக்குத் திரும்புக",
+    "🔙 Back to Categories": "🔙 வகைகளுக்குத் திரும்புக",
+    "Select Type": "வகையைத் தேர்ந்தெடுக்கவும்",
+    "Chiropractic": "கைரோபிராக்டிக்",
+    "Physiotherapy": "உடற்பயிற்சி மருத்துவம்",
+    "🔙 Back to Services": "🔙 சேவைகளுக்குத் திரும்புக",
+    "Select Clinic": "மருத்துவமனையைத் தேர்ந்தெடுக்கவும்",
+    "Select Category": "வகையைத் தேர்ந்தெடுக்கவும்",
+    "Select Service": "சேவையைத் தேர்ந்தெடுக்கவும்",
+    "🔙 Back to Options": "🔙 விருப்பங்களுக்குத் திரும்புக",
+    "Manage Profiles": "சுயவிவரங்களை நிர்வகிக்கவும்",
+    "Select Visit": "வருகையைத் தேர்ந்தெடுக்கவும்",
+    "📄 Another Document": "📄 மற்றொரு ஆவணம்",
+    "🔙 Back to Edit Menu": "🔙 திருத்த மெனுவுக்குத் திரும்புக",
+    "🔙 Back to Religion": "🔙 மதத்துக்குத் திரும்புக",
+    "Select Profile": "சுயவிவரத்தைத் தேர்ந்தெடுக்கவும்",
+    "➕ Add Profile": "➕ சுயவிவரத்தைச் சேர்க்கவும்",
+    "➖ Remove Profile": "➖ சுயவிவரத்தை அகற்றவும்",
+    "🔙 Back to Profiles": "🔙 சுயவிவரங்களுக்குத் திரும்புக",
+    "Yes, detach": "ஆம், பிரிக்கவும்",
+    "No, cancel": "இல்லை, ரத்து செய்க",
+    "Yes, reset": "ஆம், மீட்டமைக்கவும்",
+    "No, cancel": "இல்லை, ரத்து செய்க",
+    "Select Type": "வகையைத் தேர்ந்தெடுக்கவும்",
+    "Choose Booking": "முன்பதிவைத் தேர்ந்தெடுக்கவும்",
+    "Accept": "ஏற்கவும்",
+    "Decline": "நிராகரிக்கவும்",
+    "Back to Home": "முகப்புக்குத் திரும்புக",
+    "Reschedule": "மீண்டும் அட்டவணைப்படுத்துக",
+    "Cancel Booking": "முன்பதிவை ரத்து செய்க",
+    "Choose Another": "வேறொன்றைத் தேர்ந்தெடுக்கவும்",
+    "Confirm Time": "நேரத்தை உறுதிப்படுத்துக",
+    "Back": "பின் செல்",
+    "Reschedule One": "ஒன்றை மீள் அட்டவணைப்படுத்துக",
+    "Back to actions": "செயல்களுக்குத் திரும்புக",
+    "Cancel This One Only": "இதை மட்டும் ரத்து செய்க",
+    "Cancel All Repeated": "அனைத்து மீண்டும் மீண்டும் ரத்து செய்க",
+
+    # FOOTER
+    "Select an option to proceed": "தொடர ஒரு விருப்பத்தைத் தேர்ந்தெடுக்கவும்",
+    "Choose an option below": "கீழே உள்ள விருப்பத்தைத் தேர்ந்தெடுக்கவும்",
+    "Choose a language to proceed": "தொடர மொழியைத் தேர்ந்தெடுக்கவும்",
+    "Choose a service to proceed": "தொடர சேவையைத் தேர்ந்தெடுக்கவும்",
+    "Choose a clinic to proceed": "தொடர மருத்துவமனையைத் தேர்ந்தெடுக்கவும்",
+    "Choose a service type to proceed": "தொடர சேவை வகையைத் தேர்ந்தெடுக்கவும்",
+    "Choose a category to proceed": "தொடர வகையைத் தேர்ந்தெடுக்கவும்",
+
+    # SECTION TITLES
+    "Main Options": "முதன்மை விருப்பங்கள்",
+    "Booking Services": "முன்பதிவு சேவைகள்",
+    "Available Services": "கிடைக்கும் சேவைகள்",
+    "Languages": "மொழிகள்",
+    "Service Booking": "சேவை முன்பதிவு",
+    "Available Clinics": "கிடைக்கும் மருத்துவமனைகள்",
+    "Booking Options": "முன்பதிவு விருப்பங்கள்",
+    "Your Profiles": "உங்கள் சுயவிவரங்கள்",
+    "Available Options": "கிடைக்கும் விருப்பங்கள்",
+    "Visiting History": "வருகை வரலாறு",
+    "Available Documents": "கிடைக்கும் ஆவணங்கள்",
+    "Available Races": "கிடைக்கும் இனங்கள்",
+    "Available Religions": "கிடைக்கும் மதங்கள்",
+    "Blood Types": "ரத்த வகைகள்",
+    "Booking Categories": "முன்பதிவு வகைகள்",
+    "{} Bookings": "{} முன்பதிவுகள்",
+    "Available Doctors": "கிடைக்கும் மருத்துவர்கள்",
+    "Available Dates": "கிடைக்கும் தேதிகள்",
+    "{period} Hours": "{period} மணி நேரங்கள்",
+    "{}min Slots": "{}நிமிட இடைவெளிகள்",
+    "Edit Options": "திருத்த விருப்பங்கள்",
+    "TCM Service Types": "TCM சேவை வகைகள்",
+    "Available {} Clinics": "கிடைக்கும் {} மருத்துவமனைகள்",
+    "Treatment Categories": "சிகிச்சை வகைகள்",
+    "Available Methods": "கிடைக்கும் முறைகள்",
+    "Available Services": "கிடைக்கும் சேவைகள்",
+
+    # LIST ROW TITLES
+    "👤 Profile": "👤 சுயவிவரம்",
+    "🏥 Service Booking": "🏥 சேவை முன்பதிவு",
+    "📅 Upcoming Booking": "📅 வரவிருக்கும் முன்பதிவு",
+    "❓ Help": "❓ உதவி",
+    "🌐 Languages": "🌐 மொழிகள்",
+    "🔔 Notification": "🔔 அறிவிப்பு",
+    "📞 Clinic Enquiries": "📞 மருத்துவமனை விசாரணைகள்",
+    "👨‍⚕️ General GP Visit": "👨‍⚕️ பொது GP வருகை",
+    "🩺 Checkup & Test": "🩺 சரிபார்ப்பு & சோதனை",
+    "💉 Vaccination": "💉 தடுப்பூசி",
+    "🔙 Back to Main Menu": "🔙 முதன்மை மெனுவுக்குத் திரும்புக",
+    "🏠 → 🏥 Home to Hosp": "🏠 → 🏥 வீட்டிலிருந்து மருத்துவமனை",
+    "🏠 → 🏠 Home to Home": "🏠 → 🏠 வீட்டிலிருந்து வீடு",
+    "🏥 → 🏠 Hosp to Home": "🏥 → 🏠 மருத்துவமனையிலிருந்து வீடு",
+    "🏥 → 🏥 Hosp to Hosp": "🏥 → 🏥 மருத்துவமனையிலிருந்து மருத்துவமனை",
+    "English": "English",
+    "Bahasa Malaysia": "Bahasa Malaysia",
+    "中文": "中文",
+    "தமிழ்": "தமிழ்",
+    "🏥 Clinic Services": "🏥 மருத்துவமனை சேவைகள்",
+    "🌿 TCM Services": "🌿 TCM சேவைகள்",
+    "🚑 Ambulance Service": "🚑 ஆம்புலன்ஸ் சேவை",
+    "💅 Aesthetic": "💅 அழகியல்",
+    "🏨 Hospital": "🏨 மருத்துவமனை",
+    "💉 Dialysis": "💉 டயாலிசிஸ்",
+    "👴 Elderly Care": "👴 முதியோர் பராமரிப்பு",
+    "🔙 Back to Main": "🔙 முதன்மைக்குத் திரும்புக",
+    "🔙 Back to Booking": "🔙 முன்பதிவுக்குத் திரும்புக",
+    "Health Screening Plan": "சுகாதார பரிசோதனை திட்டம்",
+    "View Upcoming Bookings": "வரவிருக்கும் முன்பதிவுகளைக் காண்க",
+    "📝 Edit Profiles": "📝 சுயவிவரங்களைத் திருத்துக",
+    "🔄 Changed Numbers": "🔄 மாற்றப்பட்ட எண்கள்",
+    "➡️ Next Page": "➡️ அடுத்த பக்கம்",
+    "⬅️ Previous Page": "⬅️ முந்தைய பக்கம்",
+    "🔙 Back to Menu": "🔙 மெனுவுக்குத் திரும்புக",
+    "⚔️ Enemy (Disease)": "⚔️ எதிரி (நோய்)",
+    "💊 Med & Routine": "💊 மருந்து & வழக்கம்",
+    "📄 Report": "📄 அறிக்கை",
+    "🔙 Back to Profiles": "🔙 சுயவிவரங்களுக்குத் திரும்புக",
+    "📄 Medical Certificate": "📄 மருத்துவ சான்றிதழ்",
+    "💰 Bill/Invoice": "💰 பில்/விலைப்பட்டியல்",
+    "📋 Referral Letter": "📋 பரிந்துரை கடிதம்",
+    "📊 Consultation Report": "📊 கலந்தாய்வு அறிக்கை",
+    "Malay": "மலாய்",
+    "Chinese": "சீன",
+    "Indian": "இந்தியன்",
+    "Bumiputera Sabah": "புமிபுதெரா சபா",
+    "Bumiputera Sarawak": "புமிபுதெரா சரவாக்",
+    "Others": "மற்றவை",
+    "Muslim": "முஸ்லிம்",
+    "Buddhist": "பௌத்த",
+    "Christian": "கிறிஸ்தவ",
+    "Hindu": "இந்து",
+    "Sikh": "சீக்கிய",
+    "🔄 Reset account": "🔄 கணக்கை மீட்டமைக்கவும்",
+    "📱 Detach from old": "📱 பழையதிலிருந்து பிரிக்கவும்",
+    "❌ Cancel": "❌ ரத்து செய்க",
+    "Action Required": "நடவடிக்கை தேவை",
+    "Confirmed": "உறுதிப்படுத்தப்பட்டது",
+    "Pending": "நிலுவையில்",
+    "🔙 Back": "🔙 பின் செல்",
+    "Booking {}": "முன்பதிவு {}",
+
+    # LIST ROW DESCRIPTIONS
+    "GP, Checkup, Vaccination, Health Screening": "GP, சரிபார்ப்பு, தடுப்பூசி, சுகாதார பரிசோதனை",
+    "Chiro, Physio, Rehab, Traditional Medicine": "கைரோ, உடற்பயிற்சி மருத்துவம், மீள்வு, பாரம்பரிய மருத்துவம்",
+    "Non-emergency medical transport": "அவசரம் அல்லாத மருத்துவ போக்குவரத்து",
+    "Coming soon": "விரைவில் வருகிறது",
+    "Coming soon": "விரைவில் வருகிறது",
+    "Coming soon": "விரைவில் வருகிறது",
+    "Coming soon": "விரைவில் வருகிறது",
+    "View diagnosed conditions": "நோய் நாடல்களைக் காண்க",
+    "View all medications and items": "அனைத்து மருந்துகள் மற்றும் பொருட்களைக் காண்க",
+    "Select visit for MC, Invoice, etc.": "மருத்துவ சான்றிதழ், விலைப்பட்டியல் போன்றவற்றிற்கு வருகையைத் தேர்ந்தெடுக்கவும்",
+    "Start fresh with new account": "புதிய கணக்குடன் புதிதாகத் தொடங்கவும்",
+    "Move profile from old number": "பழைய எண்ணிலிருந்து சுயவிவரத்தை நகர்த்தவும்",
+    "{} booking(s) need your action": "{} முன்பதிவு(கள்) உங்கள் நடவடிக்கை தேவை",
+    "{} confirmed booking(s)": "{} உறுதிப்படுத்தப்பட்ட முன்பதிவு(கள்)",
+    "{} pending booking(s)": "{} நிலுவையில் உள்ள முன்பதிவு(கள்)",
+    "Return to main menu": "முதன்மை மெனுவுக்குத் திரும்புக",
+    "Spinal adjustments, posture correction": "முதுகெலும்பு சரிசெய்தல், நிலைப்பாடு திருத்தம்",
+    "Muscle therapy, joint mobilization": "தசை சிகிச்சை, மூட்டு இயக்கம்",
+
+    # Existing translation from your example (kept for consistency)
+    "Sorry, clinic information is not available at the moment.": "மன்னிக்கவும், இப்போது மருத்துவமனை தகவல் கிடைக்கவில்லை.",
+    "Clinic Enquiries": "மருத்துவமனை விசாரணைகள்",
+    "Failed to save booking. Please try again.": "முன்பதிவு சேமிக்க முடியவில்லை. மீண்டும் முயற்சிக்கவும்.",
+    "✅ Your TCM booking has been submitted!": "✅ உங்கள் TCM முன்பதிவு சமர்ப்பிக்கப்பட்டது!",
+    "Service: {}": "சேவை: {}",
+    "Date: {}": "தேதி: {}",
+    "Time: {}": "நேரம்: {}",
+    "Duration: {} minutes": "கால அளவு: {} நிமிடங்கள்",
+    "Method: {}": "முறை: {}",
+    "Due to doctor flexibility, the doctor will contact you by 10 AM on the selected date. Your booking may be rescheduled - please check your upcoming bookings to accept or decline suggested times.": "மருத்துவர் நெகிழ்வுத்தன்மை காரணமாக, மருத்துவர் தேர்ந்தெடுக்கப்பட்ட தேதியில் காலை 10 மணிக்குள் உங்களைத் தொடர்புகொள்வார். உங்கள் முன்பதிவு மீண்டும் திட்டமிடப்படலாம் - பரிந்துரைக்கப்பட்ட நேரங்களை ஏற்க அல்லது நிராகரிக்க உங்கள் வரவிருக்கும் முன்பதிவுகளைச் சரிபார்க்கவும்.",
+    "Booking is pending approval. You'll be notified once confirmed.": "முன்பதிவு ஒப்புதலுக்காக காத்திருக்கிறது. உறுதிப்படுத்தப்பட்டவுடன் உங்களுக்கு அறிவிக்கப்படும்.",
+    "Booking ID: {}": "முன்பதிவு ஐடி: {}",
+    "Failed to send confirmation. Booking cancelled. Please try again.": "உறுதிப்படுத்தல் அனுப்ப முடியவில்லை. முன்பதிவு ரத்து செய்யப்பட்டது. மீண்டும் முயற்சிக்கவும்.",
+    "An error occurred while confirming the booking: {}. Please try again.": "முன்பதிவு உறுதிப்படுத்தும் போது பிழை ஏற்பட்டது: {}. மீண்டும் முயற்சிக்கவும்."
+}
@@ -0,0 +1,288 @@
+# translation_cache.py - PERSISTENT TRANSLATION MEMO FOR GOOGLE TRANSLATE RESULTS
+import argparse
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from protected_names import get_protected_index, restore_placeholders
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+TRANSLATION_CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_cache.sqlite3")
+)
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+# Google Translate v2 accepts up to 128 segments per request
+GOOGLE_TRANSLATE_BATCH_SIZE = 100
+
+
+def _content_key(text: str, target_language: str) -> str:
+    """Content address for a (source text, target language) pair."""
+    return hashlib.sha256(f"{target_language}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two-tier translation memo:
+    - in-memory LRU for the hot set
+    - SQLite table on disk so translations survive restarts
+    Only successful Google Translate results are stored; fallbacks are not.
+    """
+
+    def __init__(self, path: str = TRANSLATION_CACHE_PATH, maxsize: int = TRANSLATION_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _connection(self):
+        if self._conn is None:
+            try:
+                self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " key TEXT PRIMARY KEY,"
+                    " target_language TEXT NOT NULL,"
+                    " source_text TEXT NOT NULL,"
+                    " translated_text TEXT NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                logger.error(f"Could not open translation cache at {self.path}: {e}")
+                self._conn = None
+        return self._conn
+
+    def _remember(self, key: str, translated_text: str):
+        self._memory[key] = translated_text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, target_language: str):
+        key = _content_key(text, target_language)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    row = conn.execute("SELECT translated_text FROM translations WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        self._remember(key, row[0])
+                        self.disk_hits += 1
+                        return row[0]
+                except Exception as e:
+                    logger.warning(f"Translation cache read failed: {e}")
+
+            self.misses += 1
+            return None
+
+    def put(self, text: str, target_language: str, translated_text: str):
+        if not text or translated_text is None:
+            return
+        key = _content_key(text, target_language)
+        with self._lock:
+            self._remember(key, translated_text)
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, target_language, source_text, translated_text, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, target_language, text, translated_text, time.time())
+                )
+                conn.commit()
+                self.writes += 1
+            except Exception as e:
+                logger.warning(f"Translation cache write failed: {e}")
+
+    def disk_summary(self) -> dict:
+        """Number of stored translations per target language."""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return {}
+            rows = conn.execute("SELECT target_language, COUNT(*) FROM translations GROUP BY target_language").fetchall()
+            return {language: count for language, count in rows}
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_size": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_translation_cache = TranslationCache()
+
+
+def get_cached_translation(text: str, target_language: str):
+    """Return a memoized translation, or None if it has never been translated."""
+    return _translation_cache.get(text, target_language)
+
+
+def store_translation(text: str, target_language: str, translated_text: str):
+    """Memoize a successful translation in memory and on disk."""
+    _translation_cache.put(text, target_language, translated_text)
+
+
+def get_translation_cache_stats() -> dict:
+    return _translation_cache.stats()
+
+
+# ----------------------------------------------------------------
+# BATCH TRANSLATION
+# ----------------------------------------------------------------
+
+def _google_translate_many(translate_client, sources, target_language, postprocess=None, **translate_kwargs) -> dict:
+    """
+    Translate a list of strings with as few Google Translate requests as possible.
+    Returns {source: translated}; sources that failed all retries are omitted.
+    """
+    translations = {}
+    for start in range(0, len(sources), GOOGLE_TRANSLATE_BATCH_SIZE):
+        chunk = sources[start:start + GOOGLE_TRANSLATE_BATCH_SIZE]
+        for attempt in range(3):
+            try:
+                results = translate_client.translate(
+                    chunk, source_language="en", target_language=target_language, **translate_kwargs
+                )
+                for source, result in zip(chunk, results):
+                    if result and "translatedText" in result:
+                        translated = result["translatedText"]
+                        if postprocess:
+                            translated = postprocess(translated)
+                        translations[source] = translated
+                        store_translation(source, target_language, translated)
+                break
+            except Exception as e:
+                logger.warning(f"Batch translate attempt {attempt + 1} failed for {len(chunk)} strings: {e}")
+                if attempt < 2:
+                    time.sleep(2 ** attempt)
+    return translations
+
+
+def translate_batch(texts, dictionary, translate_client, target_language: str, supabase=None,
+                    doctor_name: str = None, postprocess=None, **translate_kwargs) -> list:
+    """
+    Batch counterpart of the *_gt_tt translators. Every text goes through the
+    same protected-name, dictionary and memo checks; all remaining misses are
+    sent to Google Translate together. Returns translations in input order.
+    """
+    results = list(texts)
+    protected_index = get_protected_index(supabase)
+    pending = {}  # text_to_translate -> [(index, placeholders)]
+
+    for i, text in enumerate(texts):
+        if not text or protected_index.contains_protected(text):
+            continue
+
+        placeholders = {}
+        text_to_translate = text
+        if supabase:
+            text_to_translate, placeholders = protected_index.protect(text)
+        elif doctor_name and doctor_name in text_to_translate:
+            placeholders["__DOCTOR_NAME__"] = doctor_name
+            text_to_translate = text_to_translate.replace(doctor_name, "__DOCTOR_NAME__")
+
+        translated_text = dictionary.get(text_to_translate)
+        if translated_text is None:
+            translated_text = get_cached_translation(text_to_translate, target_language)
+        if translated_text is None:
+            pending.setdefault(text_to_translate, []).append((i, placeholders))
+            continue
+        results[i] = restore_placeholders(translated_text, placeholders)
+
+    translations = {}
+    if pending and translate_client:
+        logger.info(f"Batch translating {len(pending)} strings to {target_language}")
+        translations = _google_translate_many(
+            translate_client, list(pending), target_language, postprocess, **translate_kwargs
+        )
+
+    for source, targets in pending.items():
+        translated_text = translations.get(source, source)
+        for i, placeholders in targets:
+            results[i] = restore_placeholders(translated_text, placeholders)
+
+    return results
+
+
+# ----------------------------------------------------------------
+# OFFLINE WARM-UP
+# ----------------------------------------------------------------
+
+def warm_translation_cache(supabase, languages=("bm", "cn", "tm")) -> int:
+    """
+    Pre-translate every c_a_clinic_service service_name/description so live
+    traffic is served from the memo. Goes through the *_gt_tt translators so
+    dictionary hits and protected names behave exactly as they do live.
+    Returns the number of distinct source strings processed.
+    """
+    from bm_match import bm_gt_tt
+    from cn_match import cn_gt_tt
+    from tm_match import tm_gt_tt
+
+    translators = {"bm": bm_gt_tt, "cn": cn_gt_tt, "tm": tm_gt_tt}
+
+    rows = supabase.table("c_a_clinic_service").select("service_name, description").execute().data or []
+    texts = set()
+    for row in rows:
+        for field in ("service_name", "description"):
+            value = row.get(field)
+            if value and value.strip():
+                texts.add(value)
+
+    logger.info(f"Warming translation cache with {len(texts)} strings for {', '.join(languages)}")
+    for language in languages:
+        translate_func = translators.get(language)
+        if not translate_func:
+            logger.warning(f"No translator for language {language}, skipping")
+            continue
+        for text in sorted(texts):
+            translate_func(text, supabase)
+
+    logger.info(f"Translation cache warm-up complete: {get_translation_cache_stats()}")
+    return len(texts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Translation cache maintenance")
+    parser.add_argument("command", choices=["warm", "stats"])
+    parser.add_argument("--languages", default="bm,cn,tm", help="Comma-separated language codes to warm")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        from supabase import create_client
+        client = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+        warm_translation_cache(client, tuple(l.strip() for l in args.languages.split(",") if l.strip()))
+    else:
+        print(_translation_cache.disk_summary())
@@ -0,0 +1,258 @@
+# translation_tables.py - PRECOMPILED TRANSLATION DICTIONARIES WITH NORMALIZED LOOKUP
+import logging
+import marshal
+import os
+import re
+import threading
+import unicodedata
+
+# Set up logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILED_TABLES_DIR = os.getenv("COMPILED_TABLES_DIR", os.path.join(BASE_DIR, "compiled_translations"))
+
+# Bump when the artifact layout or normalize_key changes
+TABLE_FORMAT_VERSION = 1
+
+# language -> (source module file, dictionary variable)
+TABLE_SOURCES = {
+    "en": ("en_match.py", "EN_TO_EN"),
+    "bm": ("bm_dictionary.py", "EN_TO_BM"),
+    "cn": ("cn_dictionary.py", "EN_TO_CN"),
+    "tm": ("tm_dictionary.py", "EN_TO_TM"),
+}
+
+_VARIATION_SELECTORS = re.compile("[\ufe0e\ufe0f]")
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t\u00a0]+")
+
+
+def normalize_key(text: str) -> str:
+    """
+    Lookup key that ignores presentation-only differences:
+    Unicode NFC form, emoji variation selectors, repeated spaces and
+    leading/trailing whitespace on each line.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = _VARIATION_SELECTORS.sub("", text)
+    lines = [_HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return "\n".join(lines).strip()
+
+
+def _source_path(language: str) -> str:
+    return os.path.join(BASE_DIR, TABLE_SOURCES[language][0])
+
+
+def _artifact_path(language: str) -> str:
+    return os.path.join(COMPILED_TABLES_DIR, f"{language}.marshal")
+
+
+def _source_stamp(language: str) -> list:
+    stat = os.stat(_source_path(language))
+    return [TABLE_FORMAT_VERSION, stat.st_size, int(stat.st_mtime)]
+
+
+def _extract_dictionary(language: str) -> dict:
+    """Read the dictionary literal out of its source module without importing it."""
+    import ast
+    filename, variable = TABLE_SOURCES[language]
+    with open(_source_path(language), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=filename)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == variable for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{variable} not found in {filename}")
+
+
+def compile_table(language: str) -> dict:
+    """Build the exact and normalized maps for one language."""
+    exact = _extract_dictionary(language)
+    normalized = {}
+    for key, value in exact.items():
+        normalized.setdefault(normalize_key(key), value)
+    return {"stamp": _source_stamp(language), "exact": exact, "normalized": normalized}
+
+
+def _write_table(language: str, table: dict):
+    os.makedirs(COMPILED_TABLES_DIR, exist_ok=True)
+    tmp_path = _artifact_path(language) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        marshal.dump(table, f)
+    os.replace(tmp_path, _artifact_path(language))
+
+
+def build_tables(languages=None) -> dict:
+    """Write compiled artifacts for the given languages (all by default)."""
+    sizes = {}
+    for language in languages or TABLE_SOURCES:
+        table = compile_table(language)
+        _write_table(language, table)
+        sizes[language] = len(table["exact"])
+        logger.info(f"Compiled {language} translation table: {sizes[language]} entries")
+    return sizes
+
+
+class TranslationTable:
+    """Read-only exact + normalized lookup for one language."""
+
+    def __init__(self, exact: dict, normalized: dict):
+        self._exact = exact
+        self._normalized = normalized
+
+    def __len__(self):
+        return len(self._exact)
+
+    def __contains__(self, text):
+        return self.get(text) is not None
+
+    def get(self, text, default=None):
+        if not text:
+            return default
+        value = self._exact.get(text)
+        if value is not None:
+            return value
+        return self._normalized.get(normalize_key(text), default)
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def _load_table(language: str) -> TranslationTable:
+    artifact = _artifact_path(language)
+    try:
+        with open(artifact, "rb") as f:
+            table = marshal.load(f)
+        if table.get("stamp") == _source_stamp(language):
+            return TranslationTable(table["exact"], table["normalized"])
+        logger.info(f"Compiled {language} translation table is stale, rebuilding")
+    except FileNotFoundError:
+        logger.info(f"No compiled {language} translation table, building one")
+    except Exception as e:
+        logger.warning(f"Could not load compiled {language} translation table: {e}")
+
+    table = compile_table(language)
+    try:
+        _write_table(language, table)
+    except OSError as e:
+        # Read-only deployments still work, they just compile in memory each start
+        logger.warning(f"Could not write compiled {language} translation table: {e}")
+    return TranslationTable(table["exact"], table["normalized"])
+
+
+def get_table(language: str) -> TranslationTable:
+    """Return the translation table for a language, loading it on first use."""
+    table = _tables.get(language)
+    if table is not None:
+        return table
+    with _tables_lock:
+        if language not in _tables:
+            _tables[language] = _load_table(language)
+        return _tables[language]
+
+
+def lookup_translation(language: str, text: str):
+    """Exact match first, then normalized match. Returns None on a miss."""
+    return get_table(language).get(text)
+
+
+# ----------------------------------------------------------------
+# BENCHMARK
+# ----------------------------------------------------------------
+
+# Every snippet imports the real language module, as the lazy proxy in utils does,
+# and looks one string up. Baseline: the module's own dependencies only.
+_BASELINE_SNIPPET = """
+import sys
+sys.path.insert(0, {base!r})
+import dotenv, protected_names, translation_cache, translation_tables
+from google.cloud import translate_v2
+"""
+
+# Before: the module also defined its dictionary literal (imported next to it here)
+_EAGER_SNIPPET = """
+import sys
+sys.path.insert(0, {base!r})
+sys.path.insert(0, {bench_dir!r})
+import {module}, bench_literal
+bench_literal.{variable}.get("Confirm")
+"""
+
+# Now: the module holds no literal; the first lookup loads the compiled table
+_LAZY_SNIPPET = """
+import sys
+sys.path.insert(0, {base!r})
+import {module}
+{module}.{language}_translate_template("Confirm")
+"""
+
+_MEASURE_SUFFIX = """
+import resource, time
+_elapsed = time.perf_counter() - _start
+_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open("/proc/self/status") as f:
+        _rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+except OSError:
+    pass
+print(_elapsed, _rss)
+"""
+
+
+def _measure(snippet: str, runs: int):
+    import subprocess
+    import sys
+    timings, rss = [], []
+    for _ in range(runs):
+        # logging/re are already loaded by every bot process, keep them out of the numbers
+        code = "import logging, re, time\n_start = time.perf_counter()\n" + snippet + _MEASURE_SUFFIX
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+        rss.append(int(output[1]))
+    return min(timings), min(rss)
+
+
+def benchmark(runs: int = 5, language: str = "bm"):
+    """
+    Startup time and RSS of importing one language module plus one lookup,
+    with the dictionary as a module-level literal (before) vs the compiled
+    table loaded on first lookup (now), over the module's own dependencies.
+    """
+    import shutil
+    import tempfile
+    build_tables([language])
+    module = f"{language}_match"
+    variable = TABLE_SOURCES[language][1]
+    bench_dir = tempfile.mkdtemp(prefix="translation_bench_")
+    try:
+        with open(os.path.join(bench_dir, "bench_literal.py"), "w", encoding="utf-8") as f:
+            f.write(f"{variable} = {_extract_dictionary(language)!r}\n")
+        baseline_time, baseline_rss = _measure(_BASELINE_SNIPPET.format(base=BASE_DIR), runs)
+        eager_time, eager_rss = _measure(
+            _EAGER_SNIPPET.format(base=BASE_DIR, bench_dir=bench_dir, module=module, variable=variable), runs
+        )
+    finally:
+        shutil.rmtree(bench_dir, ignore_errors=True)
+    lazy_time, lazy_rss = _measure(_LAZY_SNIPPET.format(base=BASE_DIR, module=module, language=language), runs)
+    print(f"{'import ' + module + ' + 1 lookup':<32}{'ms':>10}{'extra RSS KB':>14}")
+    print(f"{'dict literal in module':<32}{(eager_time - baseline_time) * 1000:>10.2f}{eager_rss - baseline_rss:>14}")
+    print(f"{'compiled table on first use':<32}{(lazy_time - baseline_time) * 1000:>10.2f}{lazy_rss - baseline_rss:>14}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Compile translation dictionaries")
+    parser.add_argument("command", choices=["build", "bench"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--language", default="bm", choices=[language for language in TABLE_SOURCES if language != "en"])
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        build_tables()
+        print(f"Built translation tables in {(time.perf_counter() - start) * 1000:.1f} ms")
+    else:
+        benchmark(args.runs, args.language)
@@ -5,13 +5,22 @@ import json
 from dotenv import load_dotenv
 import os
 from en_match import en_translate_template
-from cn_match import cn_translate_template, cn_gt_tt, cn_gt_t_tt
-from bm_match import bm_translate_template, bm_gt_tt, bm_gt_t_tt
-from tm_match import tm_translate_template, tm_gt_tt, tm_gt_t_tt
+from http_session import http_get, http_post
+from geo_cache import (
+    get_cached_geo, store_geo, normalize_address, coordinate_cell, throttle, GEOCODE_TTL, ROAD_DISTANCE_TTL
+)
+import importlib
 import time
 import math
 import base64
 import mimetypes
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # Batch distances fall back to a plain loop
+    np = None
 
 
 # Load environment variables
@@ -19,6 +28,35 @@ load_dotenv()
 mimetypes.init()
 
 
+def _lazy_translator(module_name: str, attr: str):
+    """
+    Proxy for a function in bm_match/cn_match/tm_match. The module (its dictionary
+    and Google Translate client) is only imported the first time a user of that
+    language needs it.
+    """
+    def _call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+    _call.__name__ = attr
+    return _call
+
+
+bm_translate_template = _lazy_translator("bm_match", "bm_translate_template")
+bm_gt_tt = _lazy_translator("bm_match", "bm_gt_tt")
+bm_gt_t_tt = _lazy_translator("bm_match", "bm_gt_t_tt")
+bm_gt_tt_many = _lazy_translator("bm_match", "bm_gt_tt_many")
+bm_truncate_text = _lazy_translator("bm_match", "truncate_text")
+cn_translate_template = _lazy_translator("cn_match", "cn_translate_template")
+cn_gt_tt = _lazy_translator("cn_match", "cn_gt_tt")
+cn_gt_t_tt = _lazy_translator("cn_match", "cn_gt_t_tt")
+cn_gt_tt_many = _lazy_translator("cn_match", "cn_gt_tt_many")
+cn_truncate_text = _lazy_translator("cn_match", "truncate_text")
+tm_translate_template = _lazy_translator("tm_match", "tm_translate_template")
+tm_gt_tt = _lazy_translator("tm_match", "tm_gt_tt")
+tm_gt_t_tt = _lazy_translator("tm_match", "tm_gt_t_tt")
+tm_gt_tt_many = _lazy_translator("tm_match", "tm_gt_tt_many")
+tm_truncate_text = _lazy_translator("tm_match", "truncate_text")
+
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,6 +70,17 @@ WHATSAPP_API_URL = f"https://graph.facebook.com/v20.0/{PHONE_NUMBER_ID}/messages
 CLINIC_LATITUDE = 2.9917412
 CLINIC_LONGITUDE = 101.6156008
 MAX_DISTANCE_KM = 20
+EARTH_RADIUS_KM = 6371.0
+
+# All clinic coordinates are read from one table and kept for this long (seconds)
+CLINIC_LOCATIONS_TABLE = os.getenv("CLINIC_LOCATIONS_TABLE", "c_a_clinics")
+CLINIC_LAT_COLUMN = os.getenv("CLINIC_LAT_COLUMN", "latitude")
+CLINIC_LNG_COLUMN = os.getenv("CLINIC_LNG_COLUMN", "longitude")
+# Optional per-clinic radius; clinics without one use MAX_DISTANCE_KM
+CLINIC_RADIUS_COLUMN = os.getenv("CLINIC_RADIUS_COLUMN", "service_radius_km")
+CLINIC_LOCATIONS_TTL = int(os.getenv("CLINIC_LOCATIONS_TTL", "600"))
+# Clinics that dispatch ambulances have this column set; emergencies are only matched to them
+AMBULANCE_BASE_COLUMN = os.getenv("AMBULANCE_BASE_COLUMN", "has_ambulance")
 
 # Global variables for rate limiting
 _last_template_sent = {}
@@ -39,6 +88,10 @@ _last_reengagement_sent = {}
 _last_notification_sent = {}  # Track when notifications were sent to prevent duplicates
 _last_followup_sent = {}  # Separate tracking for follow-up messages
 
+# User profile cache settings (language, user_id, name per whatsapp_number)
+USER_PROFILE_CACHE_TTL = int(os.getenv("USER_PROFILE_CACHE_TTL", "600"))  # seconds
+USER_PROFILE_CACHE_SIZE = int(os.getenv("USER_PROFILE_CACHE_SIZE", "5000"))
+
 # ----------------------------------------------------------------
 # NEW: Notification Badge Function
 # ----------------------------------------------------------------
@@ -152,27 +205,183 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     """
     try:
         # Convert decimal degrees to radians
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+        lat1_rad = math.radians(float(lat1))
+        lon1_rad = math.radians(float(lon1))
+        lat2_rad = math.radians(float(lat2))
+        lon2_rad = math.radians(float(lon2))
         
         # Haversine formula
         dlon = lon2_rad - lon1_rad
         dlat = lat2_rad - lat1_rad
-        a = math.sin(dlat/2)*2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)*2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
         
-        # Earth's radius in kilometers
-        radius = 6371.0
-        
-        distance = radius * c
+        distance = EARTH_RADIUS_KM * c
         return distance
         
     except Exception as e:
         logger.error(f"Error calculating distance: {e}", exc_info=True)
         return None
 
+def distances(origin, latitudes, longitudes):
+    """
+    Haversine km from origin (lat, lng) to every point in the parallel
+    latitudes/longitudes sequences, computed as one array operation.
+    Returns a numpy array when numpy is installed, otherwise a list.
+    """
+    origin_lat, origin_lng = math.radians(float(origin[0])), math.radians(float(origin[1]))
+    if np is not None:
+        lats = np.radians(np.asarray(latitudes, dtype=float))
+        lngs = np.radians(np.asarray(longitudes, dtype=float))
+        a = np.sin((lats - origin_lat) / 2) ** 2 + \
+            math.cos(origin_lat) * np.cos(lats) * np.sin((lngs - origin_lng) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    cos_origin = math.cos(origin_lat)
+    result = []
+    for lat, lng in zip(latitudes, longitudes):
+        lat, lng = math.radians(float(lat)), math.radians(float(lng))
+        a = math.sin((lat - origin_lat) / 2) ** 2 + cos_origin * math.cos(lat) * math.sin((lng - origin_lng) / 2) ** 2
+        result.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+    return result
+
+class ClinicLocations:
+    """
+    Every located clinic as parallel coordinate/radius arrays, so "which
+    clinics can serve this patient" is one distances() call over all of them.
+    """
+
+    def __init__(self, rows: list):
+        self.loaded_at = time.time()
+        self.clinics, latitudes, longitudes, radii = [], [], [], []
+        for row in rows:
+            try:
+                lat, lng = float(row[CLINIC_LAT_COLUMN]), float(row[CLINIC_LNG_COLUMN])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.clinics.append(row)
+            latitudes.append(lat)
+            longitudes.append(lng)
+            # None: the caller's default radius applies
+            radii.append(float(row[CLINIC_RADIUS_COLUMN]) if row.get(CLINIC_RADIUS_COLUMN) else None)
+        self.skipped = len(rows) - len(self.clinics)
+        self.latitudes = np.asarray(latitudes, dtype=float) if np is not None else latitudes
+        self.longitudes = np.asarray(longitudes, dtype=float) if np is not None else longitudes
+        self.radii = radii
+        self._subsets = {}
+
+    def flagged(self, column: str) -> "ClinicLocations":
+        """The clinics with `column` set, as their own ClinicLocations (built once per load)."""
+        subset = self._subsets.get(column)
+        if subset is None:
+            subset = ClinicLocations([row for row in self.clinics if row.get(column)])
+            subset.loaded_at = self.loaded_at
+            self._subsets[column] = subset
+        return subset
+
+    def radius(self, index: int, default_radius_km: float = MAX_DISTANCE_KM) -> float:
+        return self.radii[index] if self.radii[index] is not None else default_radius_km
+
+    def serving(self, patient_lat, patient_lng, default_radius_km: float = MAX_DISTANCE_KM) -> list:
+        """(clinic, distance_km) for every clinic whose radius covers the patient, nearest first."""
+        if not self.clinics:
+            return []
+        km = distances((patient_lat, patient_lng), self.latitudes, self.longitudes)
+        radii = [self.radius(i, default_radius_km) for i in range(len(self.clinics))]
+        if np is not None:
+            inside = np.flatnonzero(km <= np.asarray(radii))
+            order = inside[np.argsort(km[inside])]
+            return [(self.clinics[i], float(km[i])) for i in order]
+        inside = [i for i, d in enumerate(km) if d <= radii[i]]
+        return [(self.clinics[i], km[i]) for i in sorted(inside, key=lambda i: km[i])]
+
+    def nearest(self, patient_lat, patient_lng):
+        """(clinic, distance_km) for the closest clinic regardless of radius, or None."""
+        if not self.clinics:
+            return None
+        km = distances((patient_lat, patient_lng), self.latitudes, self.longitudes)
+        index = int(np.argmin(km)) if np is not None else min(range(len(km)), key=lambda i: km[i])
+        return self.clinics[index], float(km[index])
+
+
+_clinic_locations = None
+_clinic_locations_lock = threading.Lock()
+
+def get_clinic_locations(supabase, refresh: bool = False) -> ClinicLocations:
+    """All clinic coordinates from one query, reused for CLINIC_LOCATIONS_TTL seconds."""
+    global _clinic_locations
+    with _clinic_locations_lock:
+        locations = _clinic_locations
+    if locations and not refresh and time.time() - locations.loaded_at < CLINIC_LOCATIONS_TTL:
+        return locations
+    try:
+        rows = supabase.table(CLINIC_LOCATIONS_TABLE).select("*").execute().data or []
+    except Exception as e:
+        logger.error(f"Could not load clinic locations from {CLINIC_LOCATIONS_TABLE}: {e}")
+        return locations or ClinicLocations([])
+    locations = ClinicLocations(rows)
+    if locations.skipped:
+        logger.warning(f"{locations.skipped} clinics in {CLINIC_LOCATIONS_TABLE} have no coordinates")
+    with _clinic_locations_lock:
+        _clinic_locations = locations
+    return locations
+
+_DEFAULT_CLINIC = {CLINIC_LAT_COLUMN: CLINIC_LATITUDE, CLINIC_LNG_COLUMN: CLINIC_LONGITUDE}
+
+def find_serving_clinics(supabase, patient_lat, patient_lng, default_radius_km: float = MAX_DISTANCE_KM, only: str = None) -> list:
+    """
+    Clinics whose service radius covers the patient, nearest first, as
+    (clinic_row, straight_line_km). Clinics without their own radius use
+    default_radius_km; with `only`, just the clinics that have that column set
+    are considered. When no such clinic has coordinates the configured
+    CLINIC_LATITUDE/LONGITUDE clinic is checked instead.
+    """
+    locations = get_clinic_locations(supabase)
+    if only:
+        locations = locations.flagged(only)
+    if not locations.clinics:
+        distance_km = calculate_distance(CLINIC_LATITUDE, CLINIC_LONGITUDE, patient_lat, patient_lng)
+        return [(_DEFAULT_CLINIC, distance_km)] if distance_km is not None and distance_km <= default_radius_km else []
+    return locations.serving(patient_lat, patient_lng, default_radius_km)
+
+def find_nearest_clinic(supabase, patient_lat, patient_lng, only: str = None):
+    """(clinic_row, straight_line_km) for the closest clinic (with `only` set), in or out of its radius."""
+    locations = get_clinic_locations(supabase)
+    if only:
+        locations = locations.flagged(only)
+    nearest = locations.nearest(patient_lat, patient_lng)
+    if nearest is None:
+        return _DEFAULT_CLINIC, calculate_distance(CLINIC_LATITUDE, CLINIC_LONGITUDE, patient_lat, patient_lng)
+    return nearest
+
+def benchmark_distances(points: int = 100000, repeat: int = 5) -> dict:
+    """Check distances() against calculate_distance() and time both over random points."""
+    import random
+    origin = (CLINIC_LATITUDE, CLINIC_LONGITUDE)
+    latitudes = [random.uniform(-60, 60) for _ in range(points)]
+    longitudes = [random.uniform(-180, 180) for _ in range(points)]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        scalar = [calculate_distance(origin[0], origin[1], lat, lng) for lat, lng in zip(latitudes, longitudes)]
+    scalar_seconds = (time.perf_counter() - started) / repeat
+
+    lat_array = np.asarray(latitudes) if np is not None else latitudes
+    lng_array = np.asarray(longitudes) if np is not None else longitudes
+    started = time.perf_counter()
+    for _ in range(repeat):
+        batch = distances(origin, lat_array, lng_array)
+    batch_seconds = (time.perf_counter() - started) / repeat
+
+    return {
+        "points": points,
+        "numpy": np is not None,
+        "max_abs_error_km": max(abs(a - float(b)) for a, b in zip(scalar, batch)),
+        "scalar_points_per_second": round(points / scalar_seconds),
+        "batch_points_per_second": round(points / batch_seconds),
+        "speedup": round(scalar_seconds / batch_seconds, 1),
+    }
+
 def calculate_road_distance(origin_lat, origin_lng, dest_lat, dest_lng):
     """
     Calculate road distance using Google Maps Distance Matrix API.
@@ -184,6 +393,12 @@ def calculate_road_distance(origin_lat, origin_lng, dest_lat, dest_lng):
             logger.warning("Google Maps API key not configured, using Haversine formula")
             return calculate_distance(origin_lat, origin_lng, dest_lat, dest_lng)
         
+        # Same origin/destination cells resolve locally; a cached "no route" skips the API too
+        cache_key = f"{coordinate_cell(origin_lat, origin_lng)}>{coordinate_cell(dest_lat, dest_lng)}"
+        found, cached_km = get_cached_geo("road_distance", cache_key)
+        if found:
+            return cached_km if cached_km is not None else calculate_distance(origin_lat, origin_lng, dest_lat, dest_lng)
+        
         url = "https://maps.googleapis.com/maps/api/distancematrix/json"
         params = {
             "origins": f"{origin_lat},{origin_lng}",
@@ -194,13 +409,16 @@ def calculate_road_distance(origin_lat, origin_lng, dest_lat, dest_lng):
             "mode": "driving"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        throttle("google")
+        response = http_get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
         
         if data.get("status") == "OK" and data.get("rows"):
             element = data["rows"][0]["elements"][0]
+            if element.get("status") in ("NOT_FOUND", "ZERO_RESULTS"):
+                store_geo("road_distance", cache_key, None, ROAD_DISTANCE_TTL)
             if element.get("status") == "OK":
                 distance_meters = element["distance"]["value"]
                 distance_km = distance_meters / 1000
@@ -212,6 +430,7 @@ def calculate_road_distance(origin_lat, origin_lng, dest_lat, dest_lng):
                 logger.info(f"Road distance calculated: {distance_km:.2f} km, "
                            f"estimated travel time: {duration_minutes:.1f} minutes")
                 
+                store_geo("road_distance", cache_key, distance_km, ROAD_DISTANCE_TTL)
                 return distance_km
         
         logger.warning(f"Google Maps API failed: {data.get('status', 'Unknown error')}")
@@ -228,21 +447,36 @@ def calculate_road_distance(origin_lat, origin_lng, dest_lat, dest_lng):
         logger.error(f"Error calculating road distance: {e}, using Haversine formula", exc_info=True)
         return calculate_distance(origin_lat, origin_lng, dest_lat, dest_lng)
 
-def check_distance_from_clinic(patient_lat, patient_lng):
+def check_distance_from_clinic(patient_lat, patient_lng, supabase=None, default_radius_km: float = MAX_DISTANCE_KM):
     """
     Check if patient location is within service radius.
+    With a supabase client every clinic is considered: the straight-line
+    check over all clinics runs first, and only the nearest clinic that
+    passes it is checked by road.
     """
     try:
+        clinic_lat, clinic_lng, radius_km = CLINIC_LATITUDE, CLINIC_LONGITUDE, default_radius_km
+        if supabase is not None:
+            candidates = find_serving_clinics(supabase, patient_lat, patient_lng, default_radius_km)
+            if not candidates:
+                message = "Location is outside the service radius of every clinic"
+                logger.info(f"Distance check: {message}")
+                _, nearest_km = find_nearest_clinic(supabase, patient_lat, patient_lng)
+                return False, nearest_km or 0, message
+            clinic, _ = candidates[0]
+            clinic_lat, clinic_lng = float(clinic[CLINIC_LAT_COLUMN]), float(clinic[CLINIC_LNG_COLUMN])
+            radius_km = float(clinic.get(CLINIC_RADIUS_COLUMN) or default_radius_km)
+
         # Try road distance first
         distance_km = calculate_road_distance(
-            CLINIC_LATITUDE, CLINIC_LONGITUDE,
+            clinic_lat, clinic_lng,
             patient_lat, patient_lng
         )
         
         if distance_km is None:
             # Fallback to straight-line distance
             distance_km = calculate_distance(
-                CLINIC_LATITUDE, CLINIC_LONGITUDE,
+                clinic_lat, clinic_lng,
                 patient_lat, patient_lng
             )
             distance_type = "straight-line"
@@ -254,13 +488,13 @@ def check_distance_from_clinic(patient_lat, patient_lng):
             return True, 0, "Distance calculation failed"
         
         # Check if within service radius
-        is_within_radius = distance_km <= MAX_DISTANCE_KM
+        is_within_radius = distance_km <= radius_km
         
         if is_within_radius:
             message = f"Location is within service radius ({distance_km:.1f} km {distance_type} distance)"
         else:
             message = (f"Location is {distance_km:.1f} km away ({distance_type} distance), "
-                      f"exceeds {MAX_DISTANCE_KM} km service radius")
+                      f"exceeds {radius_km:g} km service radius")
         
         logger.info(f"Distance check: {message}")
         return is_within_radius, distance_km, message
@@ -320,6 +554,149 @@ def lookup_clinic_by_keyword(supabase, keyword: str):
         logger.error(f"Error looking up clinic by keyword {keyword}: {e}", exc_info=True)
         return None
 
+# ----------------------------------------------------------------
+# USER PROFILE CACHE
+# ----------------------------------------------------------------
+
+class UserProfileCache:
+    """
+    Bounded TTL/LRU cache of whatsapp_users profiles keyed by normalized number.
+    Each entry holds {"id", "language", "user_name"}. Thread-safe, since Flask
+    request threads and the scheduler thread share it.
+    """
+
+    def __init__(self, maxsize: int = USER_PROFILE_CACHE_SIZE, ttl: int = USER_PROFILE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # number -> (expires_at, profile)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, number: str):
+        with self._lock:
+            entry = self._entries.get(number)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, profile = entry
+            if expires_at < time.time():
+                del self._entries[number]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(number)
+            self.hits += 1
+            return profile
+
+    def set(self, number: str, profile: dict):
+        with self._lock:
+            self._entries[number] = (time.time() + self.ttl, profile)
+            self._entries.move_to_end(number)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def update(self, number: str, **fields):
+        """Patch a cached profile in place (e.g. after a language write)."""
+        with self._lock:
+            entry = self._entries.get(number)
+            if entry is None:
+                return False
+            entry[1].update(fields)
+            return True
+
+    def invalidate(self, number: str = None):
+        with self._lock:
+            if number is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(number, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_user_profile_cache = UserProfileCache()
+
+
+def _normalize_number(whatsapp_number: str) -> str:
+    return (whatsapp_number or "").lstrip("+").strip()
+
+
+def get_user_profile(supabase, whatsapp_number: str) -> dict:
+    """
+    Return the cached profile {"id", "language", "user_name"} for a number,
+    loading it from whatsapp_users on a miss. Returns None for unknown users;
+    those are not cached so that registration is picked up immediately.
+    """
+    from_number_norm = _normalize_number(whatsapp_number)
+    profile = _user_profile_cache.get(from_number_norm)
+    if profile is not None:
+        return profile
+
+    number_variants = [from_number_norm, f"+{from_number_norm}"]
+    response = supabase.table("whatsapp_users").select("id, language, user_name").in_("whatsapp_number", number_variants).limit(1).execute()
+    if not response.data:
+        return None
+
+    row = response.data[0]
+    profile = {
+        "id": row.get("id"),
+        "language": row.get("language") or "en",
+        "user_name": row.get("user_name"),
+    }
+    _user_profile_cache.set(from_number_norm, profile)
+    return profile
+
+
+def prime_user_profiles(rows) -> int:
+    """
+    Seed the profile cache from whatsapp_users rows that a batch job already
+    fetched (needs whatsapp_number, id, language, user_name), so later per-user
+    language lookups in the same job are cache hits. Returns the number primed.
+    """
+    primed = 0
+    for row in rows or []:
+        number = row.get("whatsapp_number")
+        if not number or not row.get("id"):
+            continue
+        _user_profile_cache.set(_normalize_number(number), {
+            "id": row.get("id"),
+            "language": row.get("language") or "en",
+            "user_name": row.get("user_name"),
+        })
+        primed += 1
+    return primed
+
+
+def invalidate_user_profile(whatsapp_number: str = None, language: str = None):
+    """
+    Drop a number's cached profile (or the whole cache when no number is given).
+    When the new language is known it is written through instead, so the next
+    render does not need a round-trip.
+    """
+    if whatsapp_number is None:
+        _user_profile_cache.invalidate()
+        return
+    from_number_norm = _normalize_number(whatsapp_number)
+    if language is not None and _user_profile_cache.update(from_number_norm, language=language):
+        return
+    _user_profile_cache.invalidate(from_number_norm)
+
+
+def get_user_cache_stats() -> dict:
+    """Hit/miss counters for the user profile cache."""
+    return _user_profile_cache.stats()
+
 # ----------------------------------------------------------------
 # USER MANAGEMENT FUNCTIONS
 # ----------------------------------------------------------------
@@ -327,14 +704,11 @@ def lookup_clinic_by_keyword(supabase, keyword: str):
 def get_user_id(supabase, whatsapp_number: str) -> str:
     """Fetch user_id from whatsapp_users table based on whatsapp_number."""
     try:
-        from_number_norm = whatsapp_number.lstrip("+").strip()
-        number_variants = [from_number_norm, f"+{from_number_norm}"]
-        logger.info(f"Fetching user_id for whatsapp_number: {number_variants}")
-        response = supabase.table("whatsapp_users").select("id").in_("whatsapp_number", number_variants).limit(1).execute()
-        if response.data:
-            user_id = response.data[0]["id"]
-            logger.info(f"Found user_id: {user_id} for whatsapp_number: {from_number_norm}")
-            return user_id
+        from_number_norm = _normalize_number(whatsapp_number)
+        profile = get_user_profile(supabase, from_number_norm)
+        if profile and profile.get("id"):
+            logger.debug(f"Found user_id: {profile['id']} for whatsapp_number: {from_number_norm}")
+            return profile["id"]
         logger.warning(f"No user_id found for whatsapp_number: {from_number_norm}")
         return None
     except Exception as e:
@@ -344,11 +718,9 @@ def get_user_id(supabase, whatsapp_number: str) -> str:
 def get_user_language(supabase, whatsapp_number: str) -> str:
     """Fetch user's language preference."""
     try:
-        from_number_norm = whatsapp_number.lstrip("+").strip()
-        number_variants = [from_number_norm, f"+{from_number_norm}"]
-        response = supabase.table("whatsapp_users").select("language").in_("whatsapp_number", number_variants).limit(1).execute()
-        if response.data:
-            return response.data[0]["language"]
+        profile = get_user_profile(supabase, whatsapp_number)
+        if profile:
+            return profile["language"]
         return "en"
     except Exception as e:
         logger.error(f"Error fetching language for {whatsapp_number}: {e}")
@@ -465,6 +837,73 @@ def translate_template(whatsapp_number: str, text: str, supabase=None) -> str:
         logger.error(f"Error selecting translation for {whatsapp_number}: {e}, defaulting to English", exc_info=True)
         return en_translate_template(text)
 
+def _truncate_description(text: str) -> str:
+    """Apply the 72 character description limit used by gt_dt_tt."""
+    if text and len(text) > 72:
+        return text[:69] + "..."
+    return text
+
+def translate_many(whatsapp_number: str, texts: list, supabase=None, kind="gt", doctor_name: str = None) -> list:
+    """
+    Translate a list of strings for one user in a single pass.
+    The user's language is resolved once; dictionary and memo hits are served
+    locally and all remaining misses go to Google Translate in one batch.
+
+    kind (one value for all texts, or a list with one kind per text):
+        "template" - same as translate_template (dictionary only)
+        "gt"       - same as gt_tt
+        "gt_t"     - same as gt_t_tt (truncated for buttons/titles)
+        "gt_dt"    - same as gt_dt_tt (72 character descriptions)
+    Returns translations in input order.
+    """
+    texts = list(texts)
+    try:
+        if not supabase or not hasattr(supabase, 'table'):
+            logger.warning(f"Supabase client not provided or invalid for {whatsapp_number}, returning original text")
+            return texts
+
+        kinds = list(kind) if isinstance(kind, (list, tuple)) else [kind] * len(texts)
+        language = get_user_language(supabase, whatsapp_number)
+        logger.debug(f"Language for {whatsapp_number}: {language}")
+
+        template_functions = {
+            "en": en_translate_template,
+            "bm": bm_translate_template,
+            "cn": cn_translate_template,
+            "tm": tm_translate_template,
+        }
+        batch_functions = {"bm": bm_gt_tt_many, "cn": cn_gt_tt_many, "tm": tm_gt_tt_many}
+        truncate_functions = {"bm": bm_truncate_text, "cn": cn_truncate_text, "tm": tm_truncate_text}
+
+        results = list(texts)
+
+        # Dictionary-only strings
+        template_func = template_functions.get(language, en_translate_template)
+        for i, (text, text_kind) in enumerate(zip(texts, kinds)):
+            if text_kind == "template":
+                results[i] = template_func(text, supabase)
+
+        # Dynamic strings: one batch for every gt/gt_t/gt_dt entry
+        dynamic_indexes = [i for i, text_kind in enumerate(kinds) if text_kind != "template"]
+        if dynamic_indexes and language in batch_functions:
+            translated = batch_functions[language]([texts[i] for i in dynamic_indexes], supabase, doctor_name)
+            for i, translated_text in zip(dynamic_indexes, translated):
+                results[i] = translated_text
+
+        # Per-kind truncation (English titles are not truncated, matching gt_t_tt)
+        for i in dynamic_indexes:
+            if not results[i]:
+                continue
+            if kinds[i] == "gt_t" and language in truncate_functions:
+                results[i] = truncate_functions[language](results[i], 20)
+            elif kinds[i] == "gt_dt":
+                results[i] = _truncate_description(results[i])
+
+        return results
+    except Exception as e:
+        logger.error(f"Error in translate_many for {whatsapp_number}: {e}, returning original text", exc_info=True)
+        return texts
+
 # ----------------------------------------------------------------
 # GEOCODING FUNCTION
 # ----------------------------------------------------------------
@@ -484,6 +923,12 @@ def geocode_address(address: str) -> dict:
             logger.warning("Google Maps API key not configured")
             return None
         
+        # Repeat addresses (hospitals, patients' homes) resolve locally
+        cache_key = normalize_address(address)
+        found, cached = get_cached_geo("geocode", cache_key)
+        if found:
+            return cached
+        
         url = "https://maps.googleapis.com/maps/api/geocode/json"
         params = {
             "address": address,
@@ -493,7 +938,8 @@ def geocode_address(address: str) -> dict:
         }
         
         logger.info(f"Geocoding address: {address}")
-        response = requests.get(url, params=params, timeout=10)
+        throttle("google")
+        response = http_get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -505,13 +951,17 @@ def geocode_address(address: str) -> dict:
             
             logger.info(f"Geocoding successful: {formatted_address} - Lat: {location['lat']}, Lng: {location['lng']}")
             
-            return {
+            result = {
                 "latitude": location["lat"],
                 "longitude": location["lng"],
                 "formatted_address": formatted_address
             }
+            store_geo("geocode", cache_key, result, GEOCODE_TTL)
+            return result
         else:
             logger.warning(f"Geocoding failed for address: {address}. Status: {data.get('status')}")
+            if data.get("status") == "ZERO_RESULTS":
+                store_geo("geocode", cache_key, None, GEOCODE_TTL)
             return None
             
     except requests.exceptions.Timeout:
@@ -582,20 +1032,6 @@ def send_notification_with_fallback(to: str, message: str, reminder_type: str, s
     
     interactive_success = send_interactive_notification_with_header_footer_button(to, translated_message, reminder_type, supabase)
 
-    if interactive_success:
-        logger.info(f"FREE INTERACTIVE notification with header/footer/button strategy SUCCESS for {to}")
-        _last_notification_sent[notification_key] = now
-        return True
-        
-    # STEP 1: Try FREE INTERACTIVE notification with header/footer/button first
-    logger.info(f"Step 1: Sending FREE INTERACTIVE notification to {to}")
-    
-    # Use gt_tt to translate the message based on user's language
-    translated_message = gt_tt(to, message, supabase)
-    logger.info(f"Translated message ({get_user_language(supabase, to)}): {translated_message[:100]}...")
-    
-    interactive_success = send_interactive_notification_with_header_footer_button(to, translated_message, reminder_type, supabase)
-
     if interactive_success:
         logger.info(f"FREE INTERACTIVE notification with header/footer/button strategy SUCCESS for {to}")
         _last_notification_sent[notification_key] = now
@@ -630,12 +1066,75 @@ def send_notification_with_fallback(to: str, message: str, reminder_type: str, s
     logger.error(f"All notification strategies FAILED for {to}.")
     return False
 
+# ---------------------------------------------------------------------
+# FUNCTION: send_notification_digest
+# ---------------------------------------------------------------------
+# WhatsApp rejects interactive bodies longer than this
+INTERACTIVE_BODY_LIMIT = 1024
+BOOKING_REMINDER_TYPES = ["dayc", "weekc", "a_day", "confirm", "reschedule", "transfer", "general"]
+
+
+def send_notification_digest(to: str, messages: list, reminder_types: list, supabase=None) -> bool:
+    """
+    Deliver several due notifications for one user as ONE message instead of
+    one send each: a free interactive digest with a single button, falling
+    back to one general template (one paid send for the whole group).
+
+    The button is nav_view_booking when every item is a booking reminder and
+    nav_notifications otherwise (or when the list had to be cut short), since
+    the full list is always available under Notifications.
+    """
+    to = to.strip()
+    if not to.startswith("+"):
+        to = f"+{to}"
+
+    lines = [gt_tt(to, message, supabase) for message in messages]
+    # Templates are translated once (and memoized), then filled in
+    body = gt_tt(to, "You have {count} new notifications:", supabase).format(count=len(messages))
+    more_template = gt_tt(to, "...and {count} more in Notifications.", supabase)
+    shown = 0
+    for line in lines:
+        candidate = f"{body}\n\n• {line}"
+        # Keep room for the "more" line (template plus separator and count) unless this is the last item
+        if len(candidate) + (len(more_template) + 8 if shown + 1 < len(lines) else 0) > INTERACTIVE_BODY_LIMIT:
+            break
+        body = candidate
+        shown += 1
+    truncated = shown < len(lines)
+    if truncated:
+        body = f"{body}\n\n" + more_template.format(count=len(lines) - shown)
+
+    if not truncated and all(reminder_type in BOOKING_REMINDER_TYPES for reminder_type in reminder_types):
+        button_id, state, module = "nav_view_booking", "VIEW_BOOKING_SUBMENU", "view_booking"
+    else:
+        button_id, state, module = "nav_notifications", "NOTIFICATION_MENU", "notification"
+
+    # Update user state BEFORE sending, as for single notifications
+    try:
+        supabase.table("whatsapp_users").update({
+            "state": state,
+            "module": module
+        }).eq("whatsapp_number", to.lstrip('+').strip()).execute()
+    except Exception as e:
+        logger.error(f"Error updating user state for notification digest: {e}")
+
+    logger.info(f"Sending digest of {len(messages)} notifications to {to} ({shown} listed, button {button_id})")
+    if send_interactive_notification_with_header_footer_button(to, body, "general", supabase, button_id=button_id):
+        return True
+
+    logger.info(f"FREE INTERACTIVE digest failed for {to}, attempting one TEMPLATE fallback...")
+    if send_template_message(to, f"general_{get_user_language(supabase, to)}", supabase):
+        return True
+
+    logger.error(f"All notification digest strategies FAILED for {to}.")
+    return False
+
 # ---------------------------------------------------------------------
 # FUNCTION: send_interactive_notification_with_header_footer_button
 # ---------------------------------------------------------------------
 # utils.py - UPDATED FUNCTION
 
-def send_interactive_notification_with_header_footer_button(to: str, message: str, reminder_type: str = "general", supabase=None) -> bool:
+def send_interactive_notification_with_header_footer_button(to: str, message: str, reminder_type: str = "general", supabase=None, button_id: str = None) -> bool:
     """
     Send interactive notification with header/footer and dynamic button based on reminder_type.
     
@@ -653,6 +1152,8 @@ def send_interactive_notification_with_header_footer_button(to: str, message: st
     
     Default (Fallback): notification_noted
         Titles: English: Noted | Malay: Faham | Chinese: 明白 | Tamil: குறிப்பிட்டார்
+
+    Pass button_id to choose the button directly (used for digests).
     """
     to = to.strip()
     if not to.startswith("+"):
@@ -662,10 +1163,11 @@ def send_interactive_notification_with_header_footer_button(to: str, message: st
     language = get_user_language(supabase, to) if supabase else "en"
     
     # 1. Map reminder_type to button group - FIXED TO MATCH YOUR DESCRIPTION
-    button_id = "notification_noted"  # Default fallback
-    if reminder_type in ["customc", "cancel", "a_cancel"]:
+    if button_id:
+        pass  # Chosen by the caller
+    elif reminder_type in ["customc", "cancel", "a_cancel"]:
         button_id = "nav_notifications"
-    elif reminder_type in ["dayc", "weekc", "a_day", "confirm", "reschedule", "transfer", "general"]:
+    elif reminder_type in BOOKING_REMINDER_TYPES:
         button_id = "nav_view_booking"
     elif reminder_type in ["reportc"]:
         button_id = "nav_profile"
@@ -744,7 +1246,7 @@ def send_interactive_notification_with_header_footer_button(to: str, message: st
     try:
         logger.info(f"Attempting FREE INTERACTIVE notification with dynamic button to {to}, type: {reminder_type}, button: {button_id}")
         
-        response = requests.post(WHATSAPP_API_URL, headers=headers, json=payload)
+        response = http_post(WHATSAPP_API_URL, headers=headers, json=payload)
         
         # Check if request was successful
         if response.status_code == 200:
@@ -798,7 +1300,7 @@ def send_free_notification(to: str, message: str, supabase=None) -> bool:
 
     try:
         logger.info(f"Attempting FREE TEXT notification to {to}: {body_text}")
-        response = requests.post(WHATSAPP_API_URL, headers=headers, json=payload)
+        response = http_post(WHATSAPP_API_URL, headers=headers, json=payload)
         resp_json = response.json()
         
         # --- Detect 24-hour rule violation ---
@@ -895,7 +1397,7 @@ def send_template_message(to: str, template_name: str, supabase=None) -> bool:
 
     try:
         logger.info(f"Sending TEMPLATE to {to}: {template_name} with language {template_language_code}")
-        response = requests.post(WHATSAPP_API_URL, json=data, headers=headers)
+        response = http_post(WHATSAPP_API_URL, json=data, headers=headers)
         resp_json = response.json()
 
         if response.status_code == 200 and "messages" in resp_json:
@@ -930,16 +1432,21 @@ def send_whatsapp_message(to: str, message_type: str, content: dict, supabase=No
     
     elif message_type == "interactive":
         interactive = content.get("interactive", {})
+        # Static header/footer/menu button go through translate_template in one pass
+        static_fields = []
         if interactive.get("header", {}).get("type") == "text":
-            interactive["header"]["text"] = translate_template(to, interactive["header"].get("text", ""), supabase)
+            static_fields.append((interactive["header"], "text"))
+        if interactive.get("footer"):
+            static_fields.append((interactive["footer"], "text"))
+        if interactive.get("action", {}).get("button"):
+            static_fields.append((interactive["action"], "button"))
+        if static_fields:
+            translated_fields = translate_many(to, [field.get(key, "") for field, key in static_fields], supabase, kind="template")
+            for (field, key), translated in zip(static_fields, translated_fields):
+                field[key] = translated
         body_text = interactive["body"].get("text", "")
         # Use gt_tt for body text in interactive messages (dynamic content)
         interactive["body"]["text"] = gt_tt(to, body_text, supabase)
-        if interactive.get("footer"):
-            interactive["footer"]["text"] = translate_template(to, interactive["footer"].get("text", ""), supabase)
-        if interactive.get("action", {}).get("button"):
-            # Use translate_template for menu buttons (static text)
-            interactive["action"]["button"] = translate_template(to, interactive["action"].get("button", ""), supabase)
         
         # For sections and rows, we assume they are already translated
         # by the calling function
@@ -986,7 +1493,7 @@ def send_whatsapp_message(to: str, message_type: str, content: dict, supabase=No
     }
     try:
         logger.info(f"Sending payload to {to}: {json.dumps(data, indent=2, ensure_ascii=False)}")
-        response = requests.post(WHATSAPP_API_URL, json=data, headers=headers)
+        response = http_post(WHATSAPP_API_URL, json=data, headers=headers)
         response.raise_for_status()
         logger.info(f"Reply sent to {to}: {response.json()}")
         return True
@@ -1367,7 +1874,7 @@ def send_image_message(to: str, image_url: str, supabase=None, caption: str = No
 
     try:
         logger.info(f"Sending image with caption to {to}: {image_url}")
-        response = requests.post(WHATSAPP_API_URL, json=data, headers=headers)
+        response = http_post(WHATSAPP_API_URL, json=data, headers=headers)
         response.raise_for_status()
         logger.info(f"Image sent to {to}")
         return True
@@ -1404,7 +1911,7 @@ def send_document(to: str, document_url: str, caption: str = None, filename: str
 
     try:
         logger.info(f"Sending document to {to}: {document_url}")
-        response = requests.post(WHATSAPP_API_URL, json=payload, headers=headers)
+        response = http_post(WHATSAPP_API_URL, json=payload, headers=headers)
         response.raise_for_status()
         logger.info(f"Document sent to {to}")
         return True
@@ -1488,7 +1995,7 @@ def download_whatsapp_media(media_id: str) -> bytes:
             return None
         
         # First, get the media URL from WhatsApp API
-        media_url_response = requests.get(
+        media_url_response = http_get(
             f"https://graph.facebook.com/v20.0/{media_id}",
             headers={"Authorization": f"Bearer {whatsapp_token}"},
             timeout=30
@@ -1508,7 +2015,7 @@ def download_whatsapp_media(media_id: str) -> bytes:
         logger.info(f"Downloading media from: {media_url}")
         
         # Download the actual media file
-        media_response = requests.get(
+        media_response = http_get(
             media_url,
             headers={"Authorization": f"Bearer {whatsapp_token}"},
             timeout=60
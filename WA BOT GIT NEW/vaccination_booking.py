@@ -8,11 +8,12 @@ from calendar_utils import (
     # NEW: Time input functions
     handle_time_input, handle_time_confirmation, handle_retry_time_or_help,
     # NEW: Edit functions
-    show_edit_options, handle_edit_choice
+    show_edit_options, handle_edit_choice, handle_slot_taken
 )
+from slot_holds import insert_held_booking, SlotUnavailableError
 from utils import (
     send_whatsapp_message, send_interactive_menu, translate_template,
-    gt_t_tt, gt_tt, send_image_message, gt_dt_tt
+    gt_t_tt, gt_tt, send_image_message, gt_dt_tt, get_user_language
 )
 from clinicfd import handle_clinic_enquiries
 import time
@@ -24,17 +25,8 @@ def handle_vaccination(whatsapp_number, user_id, supabase, user_data, message):
     state = user_data.get(whatsapp_number, {}).get("state", "IDLE")
     logger.info(f"Handling vaccination for {whatsapp_number}, state: {state}")
 
-    # Fetch user language
-    language = "en"
-    try:
-        response = supabase.table("whatsapp_users") \
-            .select("language") \
-            .eq("whatsapp_number", whatsapp_number.lstrip("+")) \
-            .limit(1).execute()
-        if response.data:
-            language = response.data[0]["language"]
-    except Exception as e:
-        logger.error(f"Error fetching language for {whatsapp_number}: {e}")
+    # Fetch user language (cached profile lookup; falls back to "en")
+    language = get_user_language(supabase, whatsapp_number)
 
     # -------------------------------------------------------------------------
     # IDLE – Start flow: Show service details and ask for remarks
@@ -444,7 +436,7 @@ def handle_vaccination(whatsapp_number, user_id, supabase, user_data, message):
                     "checkin": False
                 }
                 
-                supabase.table("c_s_pending_bookings").insert(booking_data).execute()
+                insert_held_booking(supabase, user_data[whatsapp_number], "c_s_pending_bookings", booking_data)
                 logger.info(f"Vaccination booking saved to pending: {pending_id} for {whatsapp_number}")
                 
                 # Build confirmation message with proper translation
@@ -480,6 +472,9 @@ def handle_vaccination(whatsapp_number, user_id, supabase, user_data, message):
                 send_interactive_menu(whatsapp_number, supabase)
                 return True
                 
+            except SlotUnavailableError as e:
+                handle_slot_taken(whatsapp_number, user_id, supabase, user_data, "vaccination_booking", e)
+                return False
             except Exception as e:
                 logger.error(f"Error saving vaccination booking for {whatsapp_number}: {e}", exc_info=True)
                 send_whatsapp_message(
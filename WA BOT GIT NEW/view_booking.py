@@ -23,6 +23,7 @@ from tcm_calendar_utils import (
     handle_confirm_booking_tcm,
     handle_cancel_booking_tcm
 )
+from reminder_schedule import refresh_booking_reminders, cancel_booking_reminders
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -2044,6 +2045,7 @@ def handle_accept_reschedule(whatsapp_number, user_id, supabase, user_data, resc
         # Insert new booking and delete reschedule request
         supabase.table(table).insert(booking_data).execute()
         supabase.table("c_s_reschedule_requests").delete().eq("id", reschedule_id).execute()
+        refresh_booking_reminders(supabase, table, booking_data["id"])
         
         # Send success message
         booking_type_translated = translate_template(whatsapp_number, data['booking_type'].capitalize(), supabase)
@@ -2136,6 +2138,7 @@ def handle_accept_tcm_reschedule(whatsapp_number, user_id, supabase, user_data,
         }
         
         supabase.table("tcm_s_bookings").update(update_data).eq("id", booking_id).execute()
+        refresh_booking_reminders(supabase, "tcm_s_bookings", booking_id)
         
         # Get doctor name for success message (stays in English)
         try:
@@ -2191,6 +2194,7 @@ def handle_decline_tcm_reschedule(whatsapp_number, user_id, supabase, user_data,
         }
         
         supabase.table("tcm_s_bookings").update(update_data).eq("id", booking_id).execute()
+        refresh_booking_reminders(supabase, "tcm_s_bookings", booking_id)
         
         # Get original booking details for message
         booking_data = supabase.table("tcm_s_bookings").select("original_date, original_time, booking_type, doctor_id").eq("id", booking_id).execute().data
@@ -2368,6 +2372,7 @@ def handle_normal_cancellation(whatsapp_number, user_id, supabase, user_data, or
                 "updated_at": datetime.now().isoformat()
             }
             supabase.table(table_name).update(update_data).eq("id", original_id).execute()
+            cancel_booking_reminders(supabase, table_name, original_id)
             logger.info(f"Cancelled TCM booking {original_id} by setting status to cancelled for {whatsapp_number}")
         else:
             # For conventional bookings, delete the record
@@ -2386,6 +2391,7 @@ def handle_normal_cancellation(whatsapp_number, user_id, supabase, user_data, or
             
             # Delete the booking
             supabase.table(table_name).delete().eq("id", original_id).execute()
+            cancel_booking_reminders(supabase, table_name, original_id)
             logger.info(f"Cancelled booking {original_id} from {table_name} for {whatsapp_number}")
         
         send_whatsapp_message(
@@ -3246,6 +3252,7 @@ def save_reschedule_to_database(whatsapp_number, user_id, supabase, user_data):
 
         # Delete original booking (from confirmed or pending tables)
         supabase.table(table_name).delete().eq("id", original_id).execute()
+        cancel_booking_reminders(supabase, table_name, original_id)
         
         # Get doctor name for success message (stays in English)
         try:
@@ -3344,6 +3351,7 @@ def save_tcm_reschedule_to_database(whatsapp_number, user_id, supabase, user_dat
         
         # Update the TCM booking - only affect original_date, original_time, status, and possibly service_id
         supabase.table("tcm_s_bookings").update(update_data).eq("id", original_id).execute()
+        refresh_booking_reminders(supabase, "tcm_s_bookings", original_id)
         
         # Get doctor name for success message (stays in English)
         try:
@@ -0,0 +1,147 @@
+# webhook_queue.py - IN-PROCESS WORK QUEUE FOR WEBHOOK INGESTION
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+WEBHOOK_QUEUE_MAXSIZE = int(os.getenv("WEBHOOK_QUEUE_MAXSIZE", "1000"))  # per shard
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "25"))  # seconds
+
+_STOP = object()
+
+
+class ShardedWorkQueue:
+    """
+    Fixed pool of worker threads, one FIFO queue per worker.
+    Items are routed by a stable hash of their key (the WhatsApp number), so
+    one user's webhooks are handled strictly in arrival order while different
+    users are handled in parallel.
+    """
+
+    def __init__(self, handler, num_workers: int = WEBHOOK_WORKERS, maxsize: int = WEBHOOK_QUEUE_MAXSIZE, name: str = "webhook"):
+        self.handler = handler
+        self.name = name
+        self.num_workers = max(1, num_workers)
+        self._queues = [queue.Queue(maxsize=maxsize) for _ in range(self.num_workers)]
+        self._threads = []
+        self._accepting = False
+        self._stats_lock = threading.Lock()
+        self.enqueued = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+        self.max_run = 0.0
+
+    def start(self):
+        if self._threads:
+            return
+        self._accepting = True
+        for index, shard in enumerate(self._queues):
+            thread = threading.Thread(target=self._worker, args=(shard,), name=f"{self.name}-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.num_workers} {self.name} workers")
+
+    def _shard_for(self, key: str) -> queue.Queue:
+        return self._queues[zlib.crc32((key or "").encode("utf-8")) % self.num_workers]
+
+    def submit(self, key: str, item) -> bool:
+        """Queue an item for its key's shard. Returns False if stopped or the shard is full."""
+        if not self._accepting:
+            return False
+        try:
+            self._shard_for(key).put_nowait((time.monotonic(), key, item))
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            logger.warning(f"{self.name} queue shard full, rejecting item for {key}")
+            return False
+        with self._stats_lock:
+            self.enqueued += 1
+        return True
+
+    def _worker(self, shard: queue.Queue):
+        while True:
+            entry = shard.get()
+            if entry is _STOP:
+                shard.task_done()
+                return
+            enqueued_at, key, item = entry
+            started = time.monotonic()
+            ok = True
+            try:
+                result = self.handler(item)
+                logger.info(f"{self.name} item for {key} handled: {result}")
+            except Exception as e:
+                ok = False
+                logger.error(f"Error handling {self.name} item for {key}: {e}", exc_info=True)
+            finally:
+                finished = time.monotonic()
+                wait, run = started - enqueued_at, finished - started
+                with self._stats_lock:
+                    self.processed += 1
+                    self.failed += 0 if ok else 1
+                    self.total_wait += wait
+                    self.max_wait = max(self.max_wait, wait)
+                    self.total_run += run
+                    self.max_run = max(self.max_run, run)
+                shard.task_done()
+
+    def stop(self, timeout: float = WEBHOOK_DRAIN_TIMEOUT):
+        """Stop accepting work and let the workers finish what is already queued."""
+        if not self._threads:
+            return
+        self._accepting = False
+        logger.info(f"Draining {self.name} queue ({self.depth()} items pending)")
+        deadline = time.monotonic() + timeout
+        for shard in self._queues:
+            # A full shard frees space as its worker drains; never wait past the deadline for it
+            try:
+                shard.put(_STOP, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                logger.warning(f"{self.name} queue shard still full at the drain deadline")
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        leftover = self.depth()
+        if leftover:
+            logger.warning(f"{self.name} queue drain timed out with {leftover} items pending")
+        self._threads = []
+
+    def depth(self) -> int:
+        return sum(shard.qsize() for shard in self._queues)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            processed = self.processed
+            return {
+                "workers": self.num_workers,
+                "depth": self.depth(),
+                "shard_depths": [shard.qsize() for shard in self._queues],
+                "enqueued": self.enqueued,
+                "rejected": self.rejected,
+                "processed": processed,
+                "failed": self.failed,
+                "avg_wait_ms": round(self.total_wait / processed * 1000, 2) if processed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_run_ms": round(self.total_run / processed * 1000, 2) if processed else 0.0,
+                "max_run_ms": round(self.max_run * 1000, 2),
+            }
+
+
+def start_webhook_queue(handler) -> ShardedWorkQueue:
+    """Create and start the webhook queue, draining it on interpreter shutdown."""
+    work_queue = ShardedWorkQueue(handler)
+    work_queue.start()
+    atexit.register(work_queue.stop)
+    return work_queue
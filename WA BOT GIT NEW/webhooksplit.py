@@ -10,6 +10,7 @@ import pytz
 # Add these imports at the top:
 import os
 from dotenv import load_dotenv
+from webhook_queue import start_webhook_queue
 
 
 # Load environment variables
@@ -34,8 +35,8 @@ ACCOUNT_MAP = {
 }
 
 
-# Start schedulers in threads
-threading.Thread(target=main.run_scheduler, daemon=True).start()
+# Start the job scheduler (once per process; main.py no longer starts it on import)
+main.start_scheduler()
 #threading.Thread(target=dr_main.run_scheduler, daemon=True).start()
 # threading.Thread(target=queue_main.run_scheduler, daemon=True).start()
 # threading.Thread(target=auto_main.run_scheduler, daemon=True).start()
@@ -155,7 +156,228 @@ def handle_notification_noted_directly(whatsapp_number: str, supabase) -> bool:
         logger.error(f"Error handling notification noted directly: {e}")
         return False
 
-# webhooksplit.py - UPDATED webhook handler
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose in-process cache counters for monitoring."""
+    from utils import get_user_cache_stats
+    from translation_cache import get_translation_cache_stats
+    from http_session import get_http_stats
+    from notification_dispatch import get_dispatch_stats
+    from clinic_schedule import get_clinic_schedule_cache_stats
+    from slot_holds import get_slot_hold_stats
+    from ambulance_dispatch import get_dispatch_index_stats
+    from geo_cache import get_geo_cache_stats
+    from reminder_schedule import get_reminder_schedule_stats
+    from job_scheduler import get_scheduler_stats
+    from leader_election import get_leader_stats
+    return {
+        "user_profile_cache": get_user_cache_stats(),
+        "translation_cache": get_translation_cache_stats(),
+        "webhook_queue": webhook_queue.stats(),
+        "mailboxes": main.get_mailbox_stats(),
+        "http": get_http_stats(),
+        "notification_dispatch": get_dispatch_stats(),
+        "clinic_schedule_cache": get_clinic_schedule_cache_stats(),
+        "slot_holds": get_slot_hold_stats(),
+        "ambulance_dispatch": get_dispatch_index_stats(),
+        "geo_cache": get_geo_cache_stats(),
+        "reminder_schedule": get_reminder_schedule_stats(),
+        "scheduler": {**get_scheduler_stats(), "leader": get_leader_stats()},
+    }, 200
+
+
+# ----------------------------------------------------------------
+# QUEUED WEBHOOK PROCESSING
+# ----------------------------------------------------------------
+
+def _webhook_key(value: dict) -> str:
+    """WhatsApp number a webhook value belongs to, used to keep each user's events in order."""
+    if value.get("messages"):
+        return value["messages"][0].get("from", "")
+    if value.get("statuses"):
+        return value["statuses"][0].get("recipient_id", "")
+    return ""
+
+
+def process_webhook_value(value: dict) -> str:
+    """
+    Handle one webhook value. Runs on a webhook_queue worker after the HTTP
+    request has already been acknowledged; the returned string is only logged.
+    """
+    # --- Detect STATUS updates (read, delivered, sent) ---
+    if "statuses" in value:
+        status_info = value["statuses"][0]
+        status = status_info.get("status")
+        recipient = status_info.get("recipient_id")
+       
+        logger.info(f"Message status update: {status} for {recipient}")
+       
+        # Handle "read" status to update notification seen column
+        if status == "read":
+            logger.info(f"📖 Message read by {recipient}")
+            try:
+                # Import the function to update notification seen status
+                from notification import update_notification_seen_status
+               
+                # Update notification seen status for this user
+                success = update_notification_seen_status(recipient, supabase)
+                if success:
+                    logger.info(f"✅ Successfully updated notification seen status for {recipient}")
+                else:
+                    logger.warning(f"⚠️ Failed to update notification seen status for {recipient}")
+            except Exception as e:
+                logger.error(f"❌ Error updating notification seen status: {e}", exc_info=True)
+            return "Read status processed"
+       
+        # --- Detect FAILED messages from WhatsApp ---
+        if status == "failed":
+            errors = status_info.get("errors", [])
+            if errors:
+                code = errors[0].get("code")
+                if code == 131047:
+                    logger.warning(f"⚠️ Message failed due to 24-hour rule for {recipient}")
+                    from utils import handle_reengagement_error, send_template_for_notification
+                   
+                    # Try to find the original notification type for this recipient
+                    try:
+                        # Get the most recent notification (sent OR unsent) for this user to determine the type
+                        # Look for notifications in the last 24 hours
+                        twenty_four_hours_ago = (datetime.now(pytz.timezone("Asia/Kuala_Lumpur")) - timedelta(hours=24)).isoformat()
+                       
+                        response = supabase.table("c_notifications").select(
+                            "reminder_type"
+                        ).eq("whatsapp_number", recipient.lstrip('+')).gte("time", twenty_four_hours_ago).order("time", desc=True).limit(1).execute()
+                       
+                        if response.data and response.data[0].get("reminder_type"):
+                            reminder_type = response.data[0]["reminder_type"]
+                            logger.info(f"📋 Found recent notification type: {reminder_type} for {recipient}")
+                           
+                            # Try to send the specific template for this notification type
+                            specific_success = send_template_for_notification(recipient, reminder_type, supabase)
+                            if specific_success:
+                                logger.info(f"✅ Specific template sent for {reminder_type} to {recipient}")
+                                return "Handled 24h reengagement with specific template"
+                            else:
+                                logger.warning(f"⚠️ Specific template failed, falling back to general template for {recipient}")
+                        else:
+                            logger.info(f"ℹ️ No recent notifications found for {recipient}, using general template")
+                           
+                    except Exception as e:
+                        logger.error(f"Error finding notification type for {recipient}: {e}")
+                   
+                    # Fallback to general reengagement template
+                    handle_reengagement_error(recipient, supabase)
+                    return "Handled 24h reengagement"
+                else:
+                    logger.warning(f"❌ Message failed for {recipient} with code {code}: {errors[0].get('message')}")
+        return "Status processed"
+
+
+    # --- Handle MESSAGES ---
+    if "messages" in value:
+        messages = value["messages"]
+        contacts = value.get("contacts", [])
+       
+        if not messages:
+            logger.info("No messages in webhook")
+            return "No messages"
+       
+        whatsapp_number = messages[0]["from"]
+        logger.info(f"Processing message from {whatsapp_number}")
+       
+        # ===== HANDLE TEMPLATE RESPONSES FIRST =====
+        message_type = messages[0].get("type")
+       
+        # Handle button responses (interactive)
+        if message_type == "interactive":
+            interactive_type = messages[0]["interactive"]["type"]
+            if interactive_type == "button_reply":
+                button_id = messages[0]["interactive"]["button_reply"]["id"]
+               
+                # Check if it's a follow-up response button
+                if button_id.startswith("followup_"):
+                    logger.info(f"Follow-up button response detected: {button_id} from {whatsapp_number}")
+                   
+                    # Handle it directly instead of forwarding to main.py
+                    if handle_followup_response_directly(whatsapp_number, button_id, supabase):
+                        logger.info(f"✅ Follow-up button response handled directly")
+                        return "Follow-up button processed"
+                    else:
+                        logger.error(f"Failed to handle follow-up button response")
+                        return "Failed to handle follow-up"
+               
+                # Handle Dynamic Navigation Buttons (Groups A, B, and C)
+                elif button_id in ["notification_noted", "nav_notifications", "nav_view_booking", "nav_profile"]:
+                    logger.info(f"Navigation button detected: {button_id} from {whatsapp_number}")
+                   
+                    from notification import handle_notification_noted, display_and_clear_notifications
+                    from view_booking import handle_view_upcoming_booking
+                    from utils import get_user_id
+                    import main # Access the brain's memory
+
+
+                    # 1. Silent DB Update (Marks as noted, but NO "Thank You" message)
+                    handle_notification_noted(whatsapp_number, supabase, skip_ui=True)
+
+
+                    # 2. Prime the state in main.py to prevent "Invalid Selection"
+                    if whatsapp_number not in main.user_data:
+                        main.user_data[whatsapp_number] = {"state": "IDLE", "processing": False, "module": None}
+
+
+                    # 3. Direct Routing & State Setting
+                    if button_id == "nav_notifications":
+                        main.user_data[whatsapp_number].update({"module": "notification", "state": "VIEWING"})
+                        display_and_clear_notifications(supabase, whatsapp_number)
+                       
+                    elif button_id == "nav_view_booking":
+                        u_id = get_user_id(supabase, whatsapp_number)
+                        # Tell main.py we are now in the view_booking module
+                        main.user_data[whatsapp_number].update({"module": "view_booking", "state": "VIEW_BOOKING_SUBMENU"})
+                        handle_view_upcoming_booking(whatsapp_number, u_id, supabase, main.user_data)
+                       
+                    elif button_id == "nav_profile":
+                        from individual import handle_individual_start
+                        u_id = get_user_id(supabase, whatsapp_number)
+                        main.user_data[whatsapp_number].update({"module": "individual", "state": "IDLE"})
+                        handle_individual_start(whatsapp_number, u_id, supabase, main.user_data)
+                   
+                    elif button_id == "notification_noted":
+                        # The only one that gets the "Thank you" and Main Menu
+                        handle_notification_noted(whatsapp_number, supabase, skip_ui=False)
+                   
+                    return "Navigation processed"
+       
+        # Handle text messages (could be template responses)
+        elif message_type == "text":
+            message_text = messages[0]["text"]["body"].strip()
+            logger.info(f"Text message received: {message_text} from {whatsapp_number}")
+           
+            # First try to detect if it's a follow-up template response
+            if detect_template_response_in_webhook(message_text, whatsapp_number):
+                logger.info(f"✅ Template response handled in webhook for {whatsapp_number}")
+                return "Template response processed"
+       
+        # For ALL messages (including those that weren't follow-up responses),
+        # pass them to the main handler
+        phone_number_id = value["metadata"]["phone_number_id"]
+        handler = ACCOUNT_MAP.get(phone_number_id)
+        if handler:
+            handler(value)
+            logger.info(f"Message forwarded to main handler")
+        else:
+            logger.error(f"No handler for phone_number_id {phone_number_id}")
+            return "No handler"
+       
+        return "Message processed"
+
+
+    # If we get here, it's not a status or message we recognize
+    logger.warning(f"Unhandled webhook value type: {value.keys()}")
+    return "Unhandled webhook type"
+
+
+webhook_queue = start_webhook_queue(process_webhook_value)
 
 
 @app.route("/webhook", methods=["GET", "POST"])
@@ -172,187 +394,16 @@ def webhook():
         if not data or "entry" not in data:
             return "Invalid payload", 400
 
-
         try:
             value = data["entry"][0]["changes"][0]["value"]
+        except (KeyError, IndexError, TypeError):
+            return "Invalid payload", 400
 
-
-            # --- Detect STATUS updates (read, delivered, sent) ---
-            if "statuses" in value:
-                status_info = value["statuses"][0]
-                status = status_info.get("status")
-                recipient = status_info.get("recipient_id")
-               
-                logger.info(f"Message status update: {status} for {recipient}")
-               
-                # Handle "read" status to update notification seen column
-                if status == "read":
-                    logger.info(f"📖 Message read by {recipient}")
-                    try:
-                        # Import the function to update notification seen status
-                        from notification import update_notification_seen_status
-                       
-                        # Update notification seen status for this user
-                        success = update_notification_seen_status(recipient, supabase)
-                        if success:
-                            logger.info(f"✅ Successfully updated notification seen status for {recipient}")
-                        else:
-                            logger.warning(f"⚠️ Failed to update notification seen status for {recipient}")
-                    except Exception as e:
-                        logger.error(f"❌ Error updating notification seen status: {e}", exc_info=True)
-                    return "Read status processed", 200
-               
-                # --- Detect FAILED messages from WhatsApp ---
-                if status == "failed":
-                    errors = status_info.get("errors", [])
-                    if errors:
-                        code = errors[0].get("code")
-                        if code == 131047:
-                            logger.warning(f"⚠️ Message failed due to 24-hour rule for {recipient}")
-                            from utils import handle_reengagement_error, send_template_for_notification
-                           
-                            # Try to find the original notification type for this recipient
-                            try:
-                                # Get the most recent notification (sent OR unsent) for this user to determine the type
-                                # Look for notifications in the last 24 hours
-                                twenty_four_hours_ago = (datetime.now(pytz.timezone("Asia/Kuala_Lumpur")) - timedelta(hours=24)).isoformat()
-                               
-                                response = supabase.table("c_notifications").select(
-                                    "reminder_type"
-                                ).eq("whatsapp_number", recipient.lstrip('+')).gte("time", twenty_four_hours_ago).order("time", desc=True).limit(1).execute()
-                               
-                                if response.data and response.data[0].get("reminder_type"):
-                                    reminder_type = response.data[0]["reminder_type"]
-                                    logger.info(f"📋 Found recent notification type: {reminder_type} for {recipient}")
-                                   
-                                    # Try to send the specific template for this notification type
-                                    specific_success = send_template_for_notification(recipient, reminder_type, supabase)
-                                    if specific_success:
-                                        logger.info(f"✅ Specific template sent for {reminder_type} to {recipient}")
-                                        return "Handled 24h reengagement with specific template", 200
-                                    else:
-                                        logger.warning(f"⚠️ Specific template failed, falling back to general template for {recipient}")
-                                else:
-                                    logger.info(f"ℹ️ No recent notifications found for {recipient}, using general template")
-                                   
-                            except Exception as e:
-                                logger.error(f"Error finding notification type for {recipient}: {e}")
-                           
-                            # Fallback to general reengagement template
-                            handle_reengagement_error(recipient, supabase)
-                            return "Handled 24h reengagement", 200
-                        else:
-                            logger.warning(f"❌ Message failed for {recipient} with code {code}: {errors[0].get('message')}")
-                return "Status processed", 200
-
-
-            # --- Handle MESSAGES ---
-            if "messages" in value:
-                messages = value["messages"]
-                contacts = value.get("contacts", [])
-               
-                if not messages:
-                    logger.info("No messages in webhook")
-                    return "No messages", 200
-               
-                whatsapp_number = messages[0]["from"]
-                logger.info(f"Processing message from {whatsapp_number}")
-               
-                # ===== HANDLE TEMPLATE RESPONSES FIRST =====
-                message_type = messages[0].get("type")
-               
-                # Handle button responses (interactive)
-                if message_type == "interactive":
-                    interactive_type = messages[0]["interactive"]["type"]
-                    if interactive_type == "button_reply":
-                        button_id = messages[0]["interactive"]["button_reply"]["id"]
-                       
-                        # Check if it's a follow-up response button
-                        if button_id.startswith("followup_"):
-                            logger.info(f"Follow-up button response detected: {button_id} from {whatsapp_number}")
-                           
-                            # Handle it directly instead of forwarding to main.py
-                            if handle_followup_response_directly(whatsapp_number, button_id, supabase):
-                                logger.info(f"✅ Follow-up button response handled directly")
-                                return "Follow-up button processed", 200
-                            else:
-                                logger.error(f"Failed to handle follow-up button response")
-                                return "Failed to handle follow-up", 500
-                       
-                        # Handle Dynamic Navigation Buttons (Groups A, B, and C)
-                        elif button_id in ["notification_noted", "nav_notifications", "nav_view_booking", "nav_profile"]:
-                            logger.info(f"Navigation button detected: {button_id} from {whatsapp_number}")
-                           
-                            from notification import handle_notification_noted, display_and_clear_notifications
-                            from view_booking import handle_view_upcoming_booking
-                            from utils import get_user_id
-                            import main # Access the brain's memory
-
-
-                            # 1. Silent DB Update (Marks as noted, but NO "Thank You" message)
-                            handle_notification_noted(whatsapp_number, supabase, skip_ui=True)
-
-
-                            # 2. Prime the state in main.py to prevent "Invalid Selection"
-                            if whatsapp_number not in main.user_data:
-                                main.user_data[whatsapp_number] = {"state": "IDLE", "processing": False, "module": None}
-
-
-                            # 3. Direct Routing & State Setting
-                            if button_id == "nav_notifications":
-                                main.user_data[whatsapp_number].update({"module": "notification", "state": "VIEWING"})
-                                display_and_clear_notifications(supabase, whatsapp_number)
-                               
-                            elif button_id == "nav_view_booking":
-                                u_id = get_user_id(supabase, whatsapp_number)
-                                # Tell main.py we are now in the view_booking module
-                                main.user_data[whatsapp_number].update({"module": "view_booking", "state": "VIEW_BOOKING_SUBMENU"})
-                                handle_view_upcoming_booking(whatsapp_number, u_id, supabase, main.user_data)
-                               
-                            elif button_id == "nav_profile":
-                                from individual import handle_individual_start
-                                u_id = get_user_id(supabase, whatsapp_number)
-                                main.user_data[whatsapp_number].update({"module": "individual", "state": "IDLE"})
-                                handle_individual_start(whatsapp_number, u_id, supabase, main.user_data)
-                           
-                            elif button_id == "notification_noted":
-                                # The only one that gets the "Thank you" and Main Menu
-                                handle_notification_noted(whatsapp_number, supabase, skip_ui=False)
-                           
-                            return "Navigation processed", 200
-               
-                # Handle text messages (could be template responses)
-                elif message_type == "text":
-                    message_text = messages[0]["text"]["body"].strip()
-                    logger.info(f"Text message received: {message_text} from {whatsapp_number}")
-                   
-                    # First try to detect if it's a follow-up template response
-                    if detect_template_response_in_webhook(message_text, whatsapp_number):
-                        logger.info(f"✅ Template response handled in webhook for {whatsapp_number}")
-                        return "Template response processed", 200
-               
-                # For ALL messages (including those that weren't follow-up responses),
-                # pass them to the main handler
-                phone_number_id = value["metadata"]["phone_number_id"]
-                handler = ACCOUNT_MAP.get(phone_number_id)
-                if handler:
-                    handler(value)
-                    logger.info(f"Message forwarded to main handler")
-                else:
-                    logger.error(f"No handler for phone_number_id {phone_number_id}")
-                    return "No handler", 404
-               
-                return "Message processed", 200
-
-
-            # If we get here, it's not a status or message we recognize
-            logger.warning(f"Unhandled webhook value type: {value.keys()}")
-            return "Unhandled webhook type", 200
-
-
-        except Exception as e:
-            logger.error(f"Error processing webhook: {e}", exc_info=True)
-            return f"Error: {str(e)}", 500
+        # Acknowledge straight away; the work happens on the queue workers
+        if not webhook_queue.submit(_webhook_key(value), value):
+            # Non-2xx makes WhatsApp redeliver later instead of losing the event
+            return "Queue unavailable", 503
+        return "Queued", 200
 
 
     return "Method not allowed", 405